@@ -1,4 +1,8 @@
+ATTRIBUTES_KEY = "attributes"
+CURSOR_KEY = "cursor"
 MESSAGE_KEY = "message"
+NEXT_CURSOR_KEY = "next_cursor"
+PAGE_SIZE_KEY = "page_size"
 STATUS_KEY = "status"
 SUCCESS_KEY = "success"
 
@@ -1 +1,2 @@
+AWS_CODE_ACCESS_DENIED = "AccessDenied"
 AWS_CODE_REQUEST_TIMEOUT = "RequestTimeout"
@@ -0,0 +1,39 @@
+from logging import Logger
+
+from linz_logger import get_log
+
+from ..datasets_model import DATASET_RECORD_TYPE, datasets_model_with_meta
+from ..logging_keys import GIT_COMMIT, LOG_MESSAGE_DATASET_RECORD_TYPES_BACKFILLED
+from ..parameter_store import ParameterName, get_param, preload_params
+from ..types import JsonObject
+
+LOGGER: Logger = get_log()
+
+preload_params(ParameterName.GIT_COMMIT, ParameterName.STORAGE_DATASETS_TABLE_NAME)
+
+
+def lambda_handler(_event: JsonObject, _context: bytes) -> JsonObject:
+    """
+    Add the record type to datasets created before the listing index existed, so that they are
+    listed. Runs during deployments, and does nothing once every dataset has a record type.
+    """
+    datasets_model_class = datasets_model_with_meta()
+    datasets = datasets_model_class.scan(
+        filter_condition=datasets_model_class.record_type.does_not_exist(),
+        attributes_to_get=[datasets_model_class.id.attr_name],
+    )
+
+    count = 0
+    for dataset in datasets:
+        # Don't recreate datasets deleted since the scan
+        dataset.update(
+            actions=[datasets_model_class.record_type.set(DATASET_RECORD_TYPE)],
+            condition=datasets_model_class.id.exists(),
+        )
+        count += 1
+
+    LOGGER.debug(
+        LOG_MESSAGE_DATASET_RECORD_TYPES_BACKFILLED,
+        extra={"count": count, GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+    )
+    return {}
@@ -0,0 +1,74 @@
+"""Buffered DynamoDB writes."""
+from logging import Logger
+from threading import Lock
+from typing import TYPE_CHECKING, Dict, Generic, Tuple, Type, TypeVar
+
+from linz_logger import get_log
+
+from .logging_keys import GIT_COMMIT
+from .parameter_store import ParameterName, get_param
+
+if TYPE_CHECKING:
+    from .processing_assets_model import ProcessingAssetsModelBase
+    from .validation_results_model import ValidationResultsModelBase
+
+# https://docs.aws.amazon.com/amazondynamodb/latest/APIReference/API_BatchWriteItem.html
+BATCH_WRITE_ITEM_LIMIT = 25
+
+LOGGER: Logger = get_log()
+LOG_MESSAGE_BATCH_WRITE_FLUSHED = "BatchWrite:Flushed"
+
+ModelT = TypeVar("ModelT", "ProcessingAssetsModelBase", "ValidationResultsModelBase")
+
+
+class BatchWriter(Generic[ModelT]):
+    """
+    Collects items and writes them to DynamoDB using `BatchWriteItem` requests of up to
+    `BATCH_WRITE_ITEM_LIMIT` items, rather than one `PutItem` request per item.
+
+    PynamoDB retries unprocessed items with exponential backoff, raising `PutError` if they are
+    still unprocessed after the model's `max_retry_attempts`.
+
+    Items are not guaranteed to be written until `flush` has been called.
+    """
+
+    def __init__(self, model_class: Type[ModelT]):
+        self.model_class: Type[ModelT] = model_class
+        self.pending_items: Dict[Tuple[str, str], ModelT] = {}
+        self.item_count = 0
+        self.batch_count = 0
+        self.lock = Lock()
+
+    def save(self, item: ModelT) -> None:
+        with self.lock:
+            # A batch can't contain the same key twice, so the last write wins, like with `save()`
+            self.pending_items[(item.pk, item.sk)] = item
+
+            if len(self.pending_items) == BATCH_WRITE_ITEM_LIMIT:
+                self.write_pending_items()
+
+    def flush(self) -> None:
+        with self.lock:
+            self.write_pending_items()
+
+        LOGGER.debug(
+            LOG_MESSAGE_BATCH_WRITE_FLUSHED,
+            extra={
+                "table_name": self.model_class.Meta.table_name,
+                "item_count": self.item_count,
+                "batch_count": self.batch_count,
+                GIT_COMMIT: get_param(ParameterName.GIT_COMMIT),
+            },
+        )
+
+    def write_pending_items(self) -> None:
+        if not self.pending_items:
+            return
+
+        with self.model_class.batch_write() as batch:
+            for item in self.pending_items.values():
+                batch.save(item)
+
+        self.item_count += len(self.pending_items)
+        self.batch_count += 1
+        self.pending_items.clear()
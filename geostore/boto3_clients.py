@@ -0,0 +1,57 @@
+"""
+Shared boto3 clients and resources, created on first use rather than at import time so that a
+Lambda function only loads the botocore service models of the clients it actually uses.
+"""
+from functools import partial
+from threading import Lock
+from typing import Any, Callable, Dict
+
+import boto3
+
+from .boto3_config import CONFIG, SERVICE_CONFIGS
+
+CLIENTS: Dict[str, Any] = {}
+RESOURCES: Dict[str, Any] = {}
+# Creating clients with the default boto3 session is not thread safe
+CREATION_LOCK = Lock()
+
+
+class LazyBoto3Object:  # pylint:disable=too-few-public-methods
+    """
+    Stands in for a client or resource until one of its attributes is used. Attributes set on this
+    object (for example by `unittest.mock.patch`) shadow those of the shared client or resource.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.factory(), name)
+
+
+def get_client(service_name: str) -> Any:
+    if service_name not in CLIENTS:
+        with CREATION_LOCK:
+            if service_name not in CLIENTS:
+                CLIENTS[service_name] = boto3.client(  # type: ignore[call-overload]
+                    service_name, config=SERVICE_CONFIGS.get(service_name, CONFIG)
+                )
+    return CLIENTS[service_name]
+
+
+def get_resource(service_name: str) -> Any:
+    if service_name not in RESOURCES:
+        with CREATION_LOCK:
+            if service_name not in RESOURCES:
+                RESOURCES[service_name] = boto3.resource(  # type: ignore[call-overload]
+                    service_name, config=CONFIG
+                )
+    return RESOURCES[service_name]
+
+
+def lazy_client(service_name: str) -> Any:
+    return LazyBoto3Object(partial(get_client, service_name))
+
+
+def lazy_resource(service_name: str) -> Any:
+    return LazyBoto3Object(partial(get_resource, service_name))
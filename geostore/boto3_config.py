@@ -1,3 +1,8 @@
 from botocore.config import Config
 
 CONFIG = Config(retries={"max_attempts": 5, "mode": "standard"})
+
+# Synchronous invocations wait for the invoked function, which may run for up to 15 minutes
+LAMBDA_CONFIG = CONFIG.merge(Config(read_timeout=15 * 60))
+
+SERVICE_CONFIGS = {"lambda": LAMBDA_CONFIG}
@@ -5,23 +5,29 @@ from optparse import OptionParser, Values  # pylint: disable=deprecated-module
 from linz_logger import get_log
 
 from ..models import DB_KEY_SEPARATOR
+from ..parameter_store import ParameterName, preload_params
 from ..processing_assets_model import ProcessingAssetType
-from ..s3_utils import get_s3_url_reader
+from ..s3_utils import get_s3_staging_file_checker, get_s3_url_reader
 from ..step_function import AssetGarbageCollector, get_hash_key
 from ..validation_results_model import ValidationResultFactory
 from .utils import ChecksumUtils, get_job_offset
 
 ASSETS_TABLE_NAME_ARGUMENT = "--assets-table-name"
+BATCH_SIZE_ARGUMENT = "--batch-size"
 CURRENT_VERSION_ID_ARGUMENT = "--current-version-id"
 DATASET_ID_ARGUMENT = "--dataset-id"
 DATASET_TITLE_ARGUMENT = "--dataset-title"
 FIRST_ITEM_ARGUMENT = "--first-item"
+ITERATION_SIZE_ARGUMENT = "--iteration-size"
 NEW_VERSION_ID_ARGUMENT = "--new-version-id"
 RESULTS_TABLE_NAME_ARGUMENT = "--results-table-name"
 S3_ROLE_ARN_ARGUMENT = "--s3-role-arn"
+VERIFY_CHECKSUMS_ON_IMPORT_ARGUMENT = "--verify-checksums-on-import"
 
 LOGGER: Logger = get_log()
 
+preload_params(ParameterName.GIT_COMMIT, ParameterName.S3_USERS_ROLE_ARN)
+
 
 def parse_arguments() -> Values:
     parser = OptionParser()
@@ -30,9 +36,12 @@ def parse_arguments() -> Values:
     parser.add_option(CURRENT_VERSION_ID_ARGUMENT)
     parser.add_option(DATASET_TITLE_ARGUMENT)
     parser.add_option(FIRST_ITEM_ARGUMENT, type=int)
+    parser.add_option(ITERATION_SIZE_ARGUMENT, type=int)
+    parser.add_option(BATCH_SIZE_ARGUMENT, type=int, default=1)
     parser.add_option(RESULTS_TABLE_NAME_ARGUMENT)
     parser.add_option(ASSETS_TABLE_NAME_ARGUMENT)
     parser.add_option(S3_ROLE_ARN_ARGUMENT)
+    parser.add_option(VERIFY_CHECKSUMS_ON_IMPORT_ARGUMENT, action="store_true", default=False)
     (options, _args) = parser.parse_args()
 
     for option in parser.option_list:
@@ -45,15 +54,22 @@ def parse_arguments() -> Values:
 def main() -> None:
     arguments = parse_arguments()
 
-    index = arguments.first_item + get_job_offset()
+    first_index = arguments.first_item + get_job_offset() * arguments.batch_size
+    end_index = first_index + arguments.batch_size
+    if arguments.iteration_size is not None:
+        end_index = min(end_index, arguments.first_item + arguments.iteration_size)
     hash_key = get_hash_key(arguments.dataset_id, arguments.new_version_id)
-    range_key = f"{ProcessingAssetType.DATA.value}{DB_KEY_SEPARATOR}{index}"
+    range_keys = [
+        f"{ProcessingAssetType.DATA.value}{DB_KEY_SEPARATOR}{index}"
+        for index in range(first_index, end_index)
+    ]
     validation_result_factory = ValidationResultFactory(hash_key, arguments.results_table_name)
     s3_url_reader = get_s3_url_reader(arguments.s3_role_arn, arguments.dataset_title, LOGGER)
 
     asset_garbage_collector = AssetGarbageCollector(
         arguments.dataset_id,
         arguments.current_version_id,
+        arguments.new_version_id,
         ProcessingAssetType.DATA,
         LOGGER,
         arguments.assets_table_name,
@@ -65,8 +81,20 @@ def main() -> None:
         s3_url_reader,
         asset_garbage_collector,
         LOGGER,
+        staging_file_checker=(
+            get_s3_staging_file_checker(arguments.s3_role_arn)
+            if arguments.verify_checksums_on_import
+            else None
+        ),
     )
-    utils.run(hash_key, range_key)
+    try:
+        if len(range_keys) == 1:
+            utils.run(hash_key, range_keys[0])
+        else:
+            utils.run_batch(hash_key, range_keys)
+    finally:
+        asset_garbage_collector.flush()
+        validation_result_factory.flush()
 
 
 if __name__ == "__main__":
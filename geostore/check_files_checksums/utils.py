@@ -1,34 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from logging import Logger
 from os import environ
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, BinaryIO, Callable, List, Optional, Union
 
 from botocore.exceptions import ClientError
 from botocore.response import StreamingBody
 from multihash import FUNCS, decode
 
 from ..api_keys import MESSAGE_KEY
+from ..batch_writer import BatchWriter
 from ..check import Check
 from ..error_response_keys import ERROR_KEY
 from ..logging_keys import GIT_COMMIT, LOG_MESSAGE_VALIDATION_COMPLETE
 from ..parameter_store import ParameterName, get_param
-from ..processing_assets_model import processing_assets_model_with_meta
-from ..s3 import CHUNK_SIZE
-from ..s3_utils import GeostoreS3Response
+from ..processing_assets_model import ProcessingAssetsModelBase, processing_assets_model_with_meta
+from ..s3_utils import GeostoreS3Response, S3RangedReader
 from ..step_function import AssetGarbageCollector, Outcome
 from ..types import JsonObject
 from ..validation_results_model import ValidationResult, ValidationResultFactory
 
 ARRAY_INDEX_VARIABLE_NAME = "AWS_BATCH_JOB_ARRAY_INDEX"
+MAX_CHUNK_SIZE_VARIABLE_NAME = "GEOSTORE_CHECKSUM_MAX_CHUNK_SIZE"
+
+MIN_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_CHUNK_SIZE = 8 * 1024 * 1024  # Same as the default S3 multipart chunk size
+
+# Matches the default botocore connection pool size, so the S3 client is shared without blocking
+MAX_CONCURRENT_CHECKSUMS = 10
 
 if TYPE_CHECKING:
     from hashlib import _Hash
 
 
-def get_multihash_digest(digest_algorithm_code: int, body: StreamingBody) -> bytes:
+def get_multihash_digest(
+    digest_algorithm_code: int,
+    body: Union[StreamingBody, S3RangedReader, BinaryIO],
+    max_chunk_size: int = DEFAULT_MAX_CHUNK_SIZE,
+) -> bytes:
+    """
+    Chunks start small, so that small files don't allocate a large buffer, and double on every
+    full read until they reach `max_chunk_size`. Bodies which support `readinto` are read into a
+    reused buffer; others (like `StreamingBody`) are read a whole chunk at a time.
+    """
     hash_object: "_Hash" = FUNCS[digest_algorithm_code]()
-    for chunk in body.iter_chunks(chunk_size=CHUNK_SIZE):
-        hash_object.update(chunk)
-    return hash_object.digest()
+    chunk_size = min(MIN_CHUNK_SIZE, max_chunk_size)
+    buffer = memoryview(bytearray(chunk_size))
+    readinto = getattr(body, "readinto", None)
+
+    while True:
+        if readinto is None:
+            chunk = body.read(chunk_size)
+            read_size = len(chunk)
+            hash_object.update(chunk)
+        else:
+            read_size = readinto(buffer[:chunk_size])
+            hash_object.update(buffer[:read_size])
+
+        if read_size == 0:
+            return hash_object.digest()
+
+        if read_size == chunk_size and chunk_size < max_chunk_size:
+            chunk_size = min(chunk_size * 2, max_chunk_size)
+            if readinto is not None:
+                buffer = memoryview(bytearray(chunk_size))
+
+
+def get_max_chunk_size() -> int:
+    return int(environ.get(MAX_CHUNK_SIZE_VARIABLE_NAME, DEFAULT_MAX_CHUNK_SIZE))
 
 
 class ChecksumUtils:
@@ -39,12 +78,16 @@ class ChecksumUtils:
         url_reader: Callable[[str], GeostoreS3Response],
         asset_garbage_collector: AssetGarbageCollector,
         logger: Logger,
+        *,
+        staging_file_checker: Optional[Callable[[str], bool]] = None,
     ):
         self.validation_result_factory = validation_result_factory
         self.url_reader = url_reader
         self.asset_garbage_collector = asset_garbage_collector
 
         self.logger = logger
+        # Only set when verifying checksums on import
+        self.staging_file_checker = staging_file_checker
 
         self.processing_assets_model = processing_assets_model_with_meta(
             assets_table_name=processing_assets_table_name
@@ -72,22 +115,70 @@ class ChecksumUtils:
             )
             raise
 
-        s3_response = self.get_s3_object(processing_item.url)
-
-        self.validate_url_multihash(
-            processing_item.url, processing_item.multihash, s3_response.response
-        )
+        self.validate_processing_item(processing_item)
 
         processing_item.update(
             actions=[
-                self.processing_assets_model.exists_in_staging.set(s3_response.file_in_staging)
+                self.processing_assets_model.exists_in_staging.set(
+                    processing_item.exists_in_staging
+                )
             ]
         )
 
+    def run_batch(self, hash_key: str, range_keys: List[str]) -> None:
+        processing_items = {
+            processing_item.sk: processing_item
+            for processing_item in self.processing_assets_model.batch_get(
+                [(hash_key, range_key) for range_key in range_keys]
+            )
+        }
+
+        missing_range_keys = [
+            range_key for range_key in range_keys if range_key not in processing_items
+        ]
+        if missing_range_keys:
+            self.log_failure(
+                {
+                    ERROR_KEY: {MESSAGE_KEY: "Items do not exist"},
+                    "parameters": {"hash_key": hash_key, "range_keys": missing_range_keys},
+                }
+            )
+            raise self.processing_assets_model.DoesNotExist()
+
+        processing_assets_writer = BatchWriter(self.processing_assets_model)
+
+        def validate_and_save(processing_item: ProcessingAssetsModelBase) -> None:
+            self.validate_processing_item(processing_item)
+            processing_assets_writer.save(processing_item)
+
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CHECKSUMS) as executor:
+                # Consume the results to raise the first error, once every item has been processed
+                list(executor.map(validate_and_save, processing_items.values()))
+        finally:
+            processing_assets_writer.flush()
+
+    def validate_processing_item(self, processing_item: ProcessingAssetsModelBase) -> None:
+        # The import checks the multihash of staged files while copying them, so they aren't read
+        if self.staging_file_checker is not None and self.is_in_staging(
+            processing_item.url, self.staging_file_checker
+        ):
+            processing_item.exists_in_staging = True
+        else:
+            s3_response = self.get_s3_object(processing_item.url)
+
+            # Closing a ranged reader also stops its download threads
+            with closing(s3_response.response):
+                self.validate_url_multihash(
+                    processing_item.url, processing_item.multihash, s3_response.response
+                )
+
+            processing_item.exists_in_staging = s3_response.file_in_staging
+
         self.asset_garbage_collector.mark_asset_as_replaced(processing_item.filename)
 
     def validate_url_multihash(
-        self, url: str, hex_multihash: str, s3_file_object: StreamingBody
+        self, url: str, hex_multihash: str, s3_file_object: Union[StreamingBody, S3RangedReader]
     ) -> None:
         multihash_bytes = bytes.fromhex(hex_multihash)
         try:
@@ -107,7 +198,9 @@ class ChecksumUtils:
             )
             raise
 
-        actual_hash = get_multihash_digest(ord(multihash_bytes[:1]), s3_file_object)
+        actual_hash = get_multihash_digest(
+            ord(multihash_bytes[:1]), s3_file_object, get_max_chunk_size()
+        )
         if actual_hash == expected_hash:
             self.logger.info(
                 LOG_MESSAGE_VALIDATION_COMPLETE,
@@ -128,36 +221,46 @@ class ChecksumUtils:
                 url, Check.CHECKSUM, ValidationResult.FAILED, details=content
             )
 
+    def is_in_staging(self, url: str, staging_file_checker: Callable[[str], bool]) -> bool:
+        try:
+            return staging_file_checker(url)
+        except ClientError as error:
+            self.save_client_error(url, error)
+            raise
+
     def get_s3_object(self, url: str) -> GeostoreS3Response:
         try:
             return self.url_reader(url)
         except ClientError as error:
-            error_code = error.response["Error"]["Code"]
-            if error_code == "NoSuchKey":
-                self.validation_result_factory.save(
-                    url,
-                    Check.FILE_NOT_FOUND,
-                    ValidationResult.FAILED,
-                    details={
-                        MESSAGE_KEY: f"Could not find asset file '{url}' "
-                        f"in staging bucket or in the Geostore."
-                    },
-                )
-            else:
-                self.validation_result_factory.save(
-                    url,
-                    Check.UNKNOWN_CLIENT_ERROR,
-                    ValidationResult.FAILED,
-                    details={
-                        MESSAGE_KEY: (
-                            f"Unknown client error fetching '{url}'."
-                            f" Client error code: '{error_code}'."
-                            f" Client error message: '{error.response['Error']['Message']}'"
-                        ),
-                    },
-                )
+            self.save_client_error(url, error)
             raise
 
+    def save_client_error(self, url: str, error: ClientError) -> None:
+        error_code = error.response["Error"]["Code"]
+        if error_code == "NoSuchKey":
+            self.validation_result_factory.save(
+                url,
+                Check.FILE_NOT_FOUND,
+                ValidationResult.FAILED,
+                details={
+                    MESSAGE_KEY: f"Could not find asset file '{url}' "
+                    f"in staging bucket or in the Geostore."
+                },
+            )
+        else:
+            self.validation_result_factory.save(
+                url,
+                Check.UNKNOWN_CLIENT_ERROR,
+                ValidationResult.FAILED,
+                details={
+                    MESSAGE_KEY: (
+                        f"Unknown client error fetching '{url}'."
+                        f" Client error code: '{error_code}'."
+                        f" Client error message: '{error.response['Error']['Message']}'"
+                    ),
+                },
+            )
+
 
 def get_job_offset() -> int:
     return int(environ.get(ARRAY_INDEX_VARIABLE_NAME, 0))
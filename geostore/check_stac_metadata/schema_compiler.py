@@ -0,0 +1,83 @@
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urljoin
+
+from jsonschema import RefResolver
+
+from ..types import JsonObject
+
+REFERENCE_KEY = "$ref"
+ID_KEY = "$id"
+
+
+def compile_schemas(schema_store: Dict[str, JsonObject]) -> Dict[str, JsonObject]:
+    """
+    Inline every `$ref` of every schema in the store, so validation doesn't have to resolve them.
+
+    Recursive references can't be inlined, so they are kept as absolute URLs to be resolved from
+    the original schema store. Definitions referenced from several places are only compiled once,
+    and the compiled schemas share them.
+    """
+    inlined: Dict[str, Any] = {}
+    return {
+        uri: compile_schema(schema, RefResolver.from_schema(schema, store=schema_store), inlined)
+        for uri, schema in schema_store.items()
+    }
+
+
+def compile_schema(
+    schema: Any,
+    resolver: RefResolver,
+    inlined: Dict[str, Any],
+    reference_stack: Tuple[str, ...] = (),
+) -> Any:
+    if isinstance(schema, list):
+        return [compile_schema(value, resolver, inlined, reference_stack) for value in schema]
+
+    if not isinstance(schema, dict):
+        return schema
+
+    reference = schema.get(REFERENCE_KEY)
+    if isinstance(reference, str):
+        # Draft 7 ignores any keywords next to a reference
+        return inline_reference(reference, resolver, inlined, reference_stack)
+
+    scope = schema.get(ID_KEY)
+    with_scope = push_scope(resolver, scope if isinstance(scope, str) else None)
+    try:
+        return {
+            key: compile_schema(value, resolver, inlined, reference_stack)
+            for key, value in schema.items()
+        }
+    finally:
+        if with_scope:
+            resolver.pop_scope()
+
+
+def inline_reference(
+    reference: str,
+    resolver: RefResolver,
+    inlined: Dict[str, Any],
+    reference_stack: Tuple[str, ...],
+) -> Any:
+    url, resolved = resolver.resolve(reference)
+
+    if url in reference_stack:
+        # Recursive references can't be inlined; keep them absolute so they resolve from anywhere
+        return {REFERENCE_KEY: url}
+
+    if url not in inlined:
+        resolver.push_scope(url)
+        try:
+            inlined[url] = compile_schema(resolved, resolver, inlined, (*reference_stack, url))
+        finally:
+            resolver.pop_scope()
+
+    return inlined[url]
+
+
+def push_scope(resolver: RefResolver, scope: Optional[str]) -> bool:
+    if scope is None:
+        return False
+
+    resolver.push_scope(urljoin(resolver.resolution_scope, scope))
+    return True
@@ -1,8 +1,10 @@
 from functools import cached_property, lru_cache
-from json import load
+from json import dump, load
 from os import scandir
-from os.path import dirname, join
+from os.path import dirname, isfile, join
 from re import fullmatch
+from sys import argv
+from typing import Dict, Optional
 
 from jsonschema import Draft7Validator, FormatChecker, RefResolver
 from jsonschema._utils import URIDict
@@ -11,6 +13,7 @@ from packaging.version import parse
 
 from ..stac_format import LINZ_STAC_EXTENSIONS_LOCAL_PATH
 from ..types import JsonObject
+from .schema_compiler import compile_schemas
 
 
 class Schema:
@@ -63,8 +66,7 @@ STAC_ITEM_SPEC_PATH = f"{STAC_SPEC_PATH}/item-spec/json-schema"
 ITEM_SCHEMA = Schema(f"{STAC_ITEM_SPEC_PATH}/item.json")
 QUALITY_SCHEMA_PATH = f"{LINZ_STAC_EXTENSIONS_URL_PATH}/quality/schema.json"
 
-schema_store = {}
-for schema in [
+SCHEMAS = [
     CATALOG_SCHEMA,
     Schema(f"{STAC_SPEC_PATH}/collection-spec/json-schema/collection.json"),
     FILE_SCHEMA,
@@ -80,24 +82,102 @@ for schema in [
     Schema(PROJECTION_STAC_SCHEMA_PATH),
     Schema(VERSION_STAC_SCHEMA_PATH),
     Schema(join(LINZ_STAC_EXTENSIONS_LOCAL_PATH, QUALITY_SCHEMA_PATH)),
-]:
-    # Normalize URLs the same way as jsonschema does
-    schema_store[schema.uri] = schema.as_dict
+]
+
+# Written into the Lambda bundle, so cold starts don't have to read and compile the schemas
+SCHEMAS_SNAPSHOT_FILE_NAME = "compiled_schemas.json"
+SCHEMAS_SNAPSHOT_PATH = join(dirname(__file__), SCHEMAS_SNAPSHOT_FILE_NAME)
+SCHEMA_STORE_KEY = "schema_store"
+COMPILED_SCHEMAS_KEY = "compiled_schemas"
 
 BaseSTACValidator = extend(Draft7Validator)
 BaseSTACValidator.format_checker = FormatChecker()
 
-STACCatalogSchemaValidator = extend(BaseSTACValidator)(
-    resolver=RefResolver.from_schema(CATALOG_SCHEMA.as_dict, store=schema_store),
-    schema=CATALOG_SCHEMA.as_dict,
-)
 
-STACCollectionSchemaValidator = extend(BaseSTACValidator)(
-    resolver=RefResolver.from_schema(LINZ_SCHEMA.as_dict, store=schema_store),
-    schema=LINZ_SCHEMA.as_dict,
-)
+@lru_cache
+def get_schemas_snapshot() -> Optional[Dict[str, Dict[str, JsonObject]]]:
+    if not isfile(SCHEMAS_SNAPSHOT_PATH):
+        return None
 
-STACItemSchemaValidator = extend(BaseSTACValidator)(
-    resolver=RefResolver.from_schema(LINZ_SCHEMA.as_dict, store=schema_store),
-    schema=LINZ_SCHEMA.as_dict,
-)
+    with open(SCHEMAS_SNAPSHOT_PATH, encoding="utf-8") as file_pointer:
+        result: Dict[str, Dict[str, JsonObject]] = load(file_pointer)
+        return result
+
+
+@lru_cache
+def get_schema_store() -> Dict[str, JsonObject]:
+    snapshot = get_schemas_snapshot()
+    if snapshot is not None:
+        return snapshot[SCHEMA_STORE_KEY]
+
+    # Normalize URLs the same way as jsonschema does
+    return {schema.uri: schema.as_dict for schema in SCHEMAS}
+
+
+@lru_cache
+def get_compiled_schemas() -> Dict[str, JsonObject]:
+    snapshot = get_schemas_snapshot()
+    if snapshot is not None:
+        return snapshot[COMPILED_SCHEMAS_KEY]
+
+    return compile_schemas(get_schema_store())
+
+
+def write_schemas_snapshot(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file_pointer:
+        dump(
+            {
+                SCHEMA_STORE_KEY: get_schema_store(),
+                COMPILED_SCHEMAS_KEY: get_compiled_schemas(),
+            },
+            file_pointer,
+        )
+
+
+@lru_cache
+def get_validator(schema_uri: str) -> Draft7Validator:
+    """Validator which resolves every `$ref` in the original schemas each time it's used."""
+    return create_validator(get_schema_store()[schema_uri], schema_uri)
+
+
+@lru_cache
+def get_compiled_validator(schema_uri: str) -> Draft7Validator:
+    """Validator for the schema with all non-recursive `$ref`s resolved up front."""
+    return create_validator(get_compiled_schemas()[schema_uri], schema_uri)
+
+
+def create_validator(schema: JsonObject, schema_uri: str) -> Draft7Validator:
+    # Recursive references left in compiled schemas are resolved from the original schemas
+    schema_store = get_schema_store()
+    return extend(BaseSTACValidator)(
+        resolver=RefResolver.from_schema(schema_store[schema_uri], store=schema_store),
+        schema=schema,
+    )
+
+
+class STACSchemaValidator:  # pylint:disable=too-few-public-methods
+    """
+    Validates against the compiled schema, and reports failures against the original schema.
+
+    Errors from the compiled schema would include the whole inlined schema, and their schema paths
+    wouldn't match the `$ref`s of the original schemas.
+    """
+
+    def __init__(self, schema_uri: str):
+        self.schema_uri = schema_uri
+
+    def validate(self, instance: JsonObject) -> None:
+        if get_compiled_validator(self.schema_uri).is_valid(instance):
+            return
+
+        get_validator(self.schema_uri).validate(instance)
+
+
+STACCatalogSchemaValidator = STACSchemaValidator(CATALOG_SCHEMA.uri)
+
+STACCollectionSchemaValidator = STACSchemaValidator(LINZ_SCHEMA.uri)
+
+STACItemSchemaValidator = STACSchemaValidator(LINZ_SCHEMA.uri)
+
+if __name__ == "__main__":
+    write_schemas_snapshot(argv[1])
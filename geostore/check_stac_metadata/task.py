@@ -1,10 +1,12 @@
 from logging import Logger
+from typing import Optional
 
 from botocore.exceptions import ClientError
 from jsonschema import ValidationError, validate
 from linz_logger import get_log
 
 from ..api_keys import SUCCESS_KEY
+from ..environment import incremental_versions
 from ..error_response_keys import ERROR_MESSAGE_KEY
 from ..logging_keys import (
     GIT_COMMIT,
@@ -12,11 +14,12 @@ from ..logging_keys import (
     LOG_MESSAGE_LAMBDA_START,
     LOG_MESSAGE_VALIDATION_COMPLETE,
 )
-from ..parameter_store import ParameterName, get_param
+from ..parameter_store import ParameterName, get_param, preload_params
 from ..processing_assets_model import ProcessingAssetType
 from ..s3_utils import get_s3_url_reader
 from ..step_function import AssetGarbageCollector, Outcome, get_hash_key
 from ..step_function_keys import (
+    ASSET_COUNT_KEY,
     CURRENT_VERSION_ID_KEY,
     DATASET_ID_KEY,
     DATASET_TITLE_KEY,
@@ -26,10 +29,17 @@ from ..step_function_keys import (
 )
 from ..types import JsonObject
 from ..validation_results_model import ValidationResultFactory
-from .utils import STACDatasetValidator
+from .utils import STACDatasetValidator, UnchangedAssetFinder
 
 LOGGER: Logger = get_log()
 
+preload_params(
+    ParameterName.GIT_COMMIT,
+    ParameterName.PROCESSING_ASSETS_TABLE_NAME,
+    ParameterName.S3_USERS_ROLE_ARN,
+    ParameterName.STORAGE_VALIDATION_RESULTS_TABLE_NAME,
+)
+
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     LOGGER.debug(
@@ -75,6 +85,7 @@ def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
 
     try:
         s3_url_reader = get_s3_url_reader(event[S3_ROLE_ARN_KEY], event[DATASET_TITLE_KEY], LOGGER)
+        unchanged_asset_finder = get_unchanged_asset_finder(event)
     except ClientError as error:
         LOGGER.warning(
             LOG_MESSAGE_LAMBDA_FAILURE,
@@ -85,6 +96,7 @@ def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     asset_garbage_collector = AssetGarbageCollector(
         event[DATASET_ID_KEY],
         event[CURRENT_VERSION_ID_KEY],
+        event[NEW_VERSION_ID_KEY],
         ProcessingAssetType.METADATA,
         LOGGER,
     )
@@ -96,8 +108,36 @@ def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     )
 
     validator = STACDatasetValidator(
-        hash_key, s3_url_reader, asset_garbage_collector, validation_result_factory
+        hash_key,
+        s3_url_reader,
+        asset_garbage_collector,
+        validation_result_factory,
+        unchanged_asset_finder=unchanged_asset_finder,
     )
 
-    validator.run(event[METADATA_URL_KEY])
-    return {SUCCESS_KEY: True}
+    try:
+        validator.run(event[METADATA_URL_KEY])
+    finally:
+        asset_garbage_collector.flush()
+        validation_result_factory.flush()
+        if unchanged_asset_finder is not None:
+            unchanged_asset_finder.flush()
+
+    return {SUCCESS_KEY: True, ASSET_COUNT_KEY: validator.changed_asset_count}
+
+
+def get_unchanged_asset_finder(event: JsonObject) -> Optional[UnchangedAssetFinder]:
+    if not incremental_versions():
+        return None
+
+    return UnchangedAssetFinder(
+        event[S3_ROLE_ARN_KEY],
+        event[DATASET_TITLE_KEY],
+        AssetGarbageCollector(
+            event[DATASET_ID_KEY],
+            event[CURRENT_VERSION_ID_KEY],
+            event[NEW_VERSION_ID_KEY],
+            ProcessingAssetType.DATA,
+            LOGGER,
+        ),
+    )
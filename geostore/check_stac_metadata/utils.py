@@ -1,21 +1,30 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import lru_cache
+from io import BytesIO
 from json import JSONDecodeError, load
 from logging import Logger
 from os.path import basename, dirname
-from typing import Any, Callable, Dict, List, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from botocore.exceptions import ClientError
-from jsonschema import Draft7Validator, ValidationError
+from botocore.response import StreamingBody
+from jsonschema import ValidationError
 from linz_logger import get_log
 
 from ..api_keys import MESSAGE_KEY
+from ..batch_writer import BatchWriter
 from ..check import Check
 from ..logging_keys import GIT_COMMIT, LOG_MESSAGE_VALIDATION_COMPLETE
 from ..models import DB_KEY_SEPARATOR
 from ..parameter_store import ParameterName, get_param
-from ..processing_assets_model import ProcessingAssetType, processing_assets_model_with_meta
-from ..s3 import S3_URL_PREFIX
-from ..s3_utils import GeostoreS3Response
+from ..processing_assets_model import (
+    ProcessingAssetType,
+    ProcessingAssetsModelBase,
+    processing_assets_model_with_meta,
+)
+from ..resources import Resource
+from ..s3 import S3_URL_PREFIX, get_s3_client_for_role
+from ..s3_utils import GeostoreS3Response, get_bucket_and_key_from_url
 from ..stac_format import (
     LINZ_STAC_SECURITY_CLASSIFICATION_KEY,
     LINZ_STAC_SECURITY_CLASSIFICATION_UNCLASSIFIED,
@@ -38,11 +47,12 @@ from .stac_validators import (
     STACCatalogSchemaValidator,
     STACCollectionSchemaValidator,
     STACItemSchemaValidator,
+    STACSchemaValidator,
 )
 
 LOGGER: Logger = get_log()
 
-STAC_TYPE_VALIDATION_MAP: Dict[str, Draft7Validator] = {
+STAC_TYPE_VALIDATION_MAP: Dict[str, STACSchemaValidator] = {
     STAC_TYPE_CATALOG: STACCatalogSchemaValidator,
     STAC_TYPE_COLLECTION: STACCollectionSchemaValidator,
     STAC_TYPE_ITEM: STACItemSchemaValidator,
@@ -55,6 +65,9 @@ PROCESSING_ASSET_FILE_IN_STAGING_KEY = "file_in_staging"
 EXPLICITLY_RELATIVE_PATH_PREFIX = "./"
 LOG_MESSAGE_STAC_ASSET_INFO = "STACAsset:Info"
 
+# Matches the default botocore connection pool size, so reads don't queue for a connection
+DEFAULT_MAX_CONCURRENT_READS = 10
+
 
 @lru_cache
 def maybe_convert_relative_url_to_absolute(url_or_path: str, parent_url: str) -> str:
@@ -75,25 +88,88 @@ def is_instance_of_catalog_or_collection(stac_type: str) -> bool:
     return stac_type in (STAC_TYPE_COLLECTION, STAC_TYPE_CATALOG)
 
 
+class UnchangedAssetFinder:
+    """
+    Finds the assets which are identical to the ones in the current dataset version, so they don't
+    have to be checksummed and copied again.
+    """
+
+    def __init__(
+        self, s3_role_arn: str, dataset_title: str, asset_garbage_collector: AssetGarbageCollector
+    ):
+        self.dataset_title = dataset_title
+        self.asset_garbage_collector = asset_garbage_collector
+        self.staging_s3_client = get_s3_client_for_role(s3_role_arn)
+        self.geostore_s3_client = get_s3_client_for_role(get_param(ParameterName.S3_USERS_ROLE_ARN))
+
+    def get_unchanged_assets(self, url: str, multihash: str) -> List[ProcessingAssetsModelBase]:
+        """
+        Return the current version assets which are identical to the new one, or an empty list if
+        the new asset has to go through the full checksum and import.
+        """
+        filename = basename(url)
+        current_assets = self.asset_garbage_collector.get_current_assets(filename)
+
+        if not current_assets or any(asset.multihash != multihash for asset in current_assets):
+            return []
+
+        if not self.matches_stored_object(url, filename):
+            return []
+
+        return current_assets
+
+    def matches_stored_object(self, url: str, filename: str) -> bool:
+        bucket_name, key = get_bucket_and_key_from_url(url)
+
+        try:
+            staging_object = self.staging_s3_client.head_object(Bucket=bucket_name, Key=key)
+            geostore_object = self.geostore_s3_client.head_object(
+                Bucket=Resource.STORAGE_BUCKET_NAME.resource_name,
+                Key=f"{self.dataset_title}/{filename}",
+            )
+        except ClientError:
+            # Missing or unreadable objects are left to the checksum job to report
+            return False
+
+        return (
+            staging_object["ContentLength"] == geostore_object["ContentLength"]
+            and staging_object["ETag"] == geostore_object["ETag"]
+        )
+
+    def mark_assets_as_replaced(self, assets: List[ProcessingAssetsModelBase]) -> None:
+        self.asset_garbage_collector.mark_assets_as_replaced(assets)
+
+    def flush(self) -> None:
+        self.asset_garbage_collector.flush()
+
+
 class STACDatasetValidator:
     # pylint:disable=too-many-instance-attributes
-    def __init__(
+    def __init__(  # pylint:disable=too-many-arguments
         self,
         hash_key: str,
         url_reader: Callable[[str], GeostoreS3Response],
         asset_garbage_collector: AssetGarbageCollector,
         validation_result_factory: ValidationResultFactory,
+        *,
+        max_concurrent_reads: int = DEFAULT_MAX_CONCURRENT_READS,
+        unchanged_asset_finder: Optional[UnchangedAssetFinder] = None,
     ):
         self.hash_key = hash_key
         self.url_reader = url_reader
         self.asset_garbage_collector = asset_garbage_collector
         self.validation_result_factory = validation_result_factory
+        self.max_concurrent_reads = max_concurrent_reads
+        self.unchanged_asset_finder = unchanged_asset_finder
+        self.changed_asset_count = 0
 
-        self.traversed_urls: List[str] = []
+        self.traversed_urls: Dict[str, None] = {}  # Insertion-ordered set
+        self.prefetched_responses: Dict[str, "Future[GeostoreS3Response]"] = {}
         self.dataset_assets: List[Dict[str, str]] = []
         self.dataset_metadata: List[Dict[str, Union[bool, str]]] = []
 
         self.processing_assets_model = processing_assets_model_with_meta()
+        self.processing_assets_writer = BatchWriter(self.processing_assets_model)
 
     def run(self, metadata_url: str) -> None:
         if not is_s3_url(metadata_url):
@@ -167,29 +243,94 @@ class STACDatasetValidator:
             asset_url = metadata_file[PROCESSING_ASSET_URL_KEY]
             assert isinstance(asset_url, str)
 
-            self.processing_assets_model(
-                hash_key=self.hash_key,
-                range_key=f"{ProcessingAssetType.METADATA.value}{DB_KEY_SEPARATOR}{index}",
-                url=asset_url,
-                filename=basename(asset_url),
-                exists_in_staging=metadata_file[PROCESSING_ASSET_FILE_IN_STAGING_KEY],
-            ).save()
+            self.processing_assets_writer.save(
+                self.processing_assets_model(
+                    hash_key=self.hash_key,
+                    range_key=f"{ProcessingAssetType.METADATA.value}{DB_KEY_SEPARATOR}{index}",
+                    url=asset_url,
+                    filename=basename(asset_url),
+                    exists_in_staging=metadata_file[PROCESSING_ASSET_FILE_IN_STAGING_KEY],
+                )
+            )
+
+        self.processing_assets_writer.flush()
 
     def process_assets(self) -> None:
-        for index, asset in enumerate(self.dataset_assets):
-            asset_url = asset[PROCESSING_ASSET_URL_KEY]
-            assert isinstance(asset_url, str)
+        """
+        Unchanged assets are indexed after all the others, so the checksum jobs can iterate over
+        the changed ones only.
+        """
+        changed_assets, unchanged_assets = self.partition_unchanged_assets()
+        self.changed_asset_count = len(changed_assets)
+
+        for index, asset in enumerate(changed_assets):
+            self.save_asset(index, asset)
+
+        for index, asset in enumerate(unchanged_assets, start=len(changed_assets)):
+            self.save_asset(index, asset, exists_in_staging=False, unchanged=True)
+
+        self.processing_assets_writer.flush()
+
+    def partition_unchanged_assets(self) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        unchanged_asset_finder = self.unchanged_asset_finder
+        if unchanged_asset_finder is None:
+            return self.dataset_assets, []
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_reads) as executor:
+            current_assets_per_asset = executor.map(
+                unchanged_asset_finder.get_unchanged_assets,
+                [asset[PROCESSING_ASSET_URL_KEY] for asset in self.dataset_assets],
+                [asset[PROCESSING_ASSET_MULTIHASH_KEY] for asset in self.dataset_assets],
+            )
+
+            changed_assets = []
+            unchanged_assets = []
+            for asset, current_assets in zip(self.dataset_assets, current_assets_per_asset):
+                if current_assets:
+                    unchanged_asset_finder.mark_assets_as_replaced(current_assets)
+                    unchanged_assets.append(asset)
+                else:
+                    changed_assets.append(asset)
+
+        return changed_assets, unchanged_assets
 
+    def save_asset(
+        self,
+        index: int,
+        asset: Dict[str, str],
+        *,
+        exists_in_staging: Optional[bool] = None,
+        unchanged: Optional[bool] = None,
+    ) -> None:
+        asset_url = asset[PROCESSING_ASSET_URL_KEY]
+        self.processing_assets_writer.save(
             self.processing_assets_model(
                 hash_key=self.hash_key,
                 range_key=f"{ProcessingAssetType.DATA.value}{DB_KEY_SEPARATOR}{index}",
                 url=asset_url,
                 filename=basename(asset_url),
                 multihash=asset[PROCESSING_ASSET_MULTIHASH_KEY],
-            ).save()
+                exists_in_staging=exists_in_staging,
+                unchanged=unchanged,
+            )
+        )
 
-    def validate(self, url: str) -> None:  # pylint: disable=too-complex
-        self.traversed_urls.append(url)
+    def validate(self, url: str) -> None:
+        """
+        Traverse the metadata tree depth-first, in the same order as a purely sequential walk, while
+        reading the next few linked metadata files from S3 in the background.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrent_reads)
+        try:
+            self.validate_recursively(url, executor)
+        finally:
+            executor.shutdown(cancel_futures=True)
+            self.prefetched_responses.clear()
+
+    def validate_recursively(  # pylint: disable=too-complex
+        self, url: str, executor: ThreadPoolExecutor
+    ) -> None:
+        self.traversed_urls[url] = None
         s3_response = self.get_object(url)
         object_json = self.get_s3_url_as_object_json(url, s3_response)
 
@@ -248,14 +389,36 @@ class STACDatasetValidator:
             )
             self.dataset_assets.append(asset_dict)
 
-        for link_object in object_json[STAC_LINKS_KEY]:
-            if link_object[STAC_REL_KEY] not in [STAC_REL_CHILD, STAC_REL_ITEM]:
-                continue
+        next_urls = list(
+            dict.fromkeys(
+                maybe_convert_relative_url_to_absolute(link_object[STAC_HREF_KEY], url)
+                for link_object in object_json[STAC_LINKS_KEY]
+                if link_object[STAC_REL_KEY] in [STAC_REL_CHILD, STAC_REL_ITEM]
+            )
+        )
 
-            next_url = maybe_convert_relative_url_to_absolute(link_object[STAC_HREF_KEY], url)
+        for index, next_url in enumerate(next_urls):
+            self.prefetch(next_urls[index : index + self.max_concurrent_reads], executor)
 
             if next_url not in self.traversed_urls:
-                self.validate(next_url)
+                self.validate_recursively(next_url, executor)
+
+    def prefetch(self, urls: Iterable[str], executor: ThreadPoolExecutor) -> None:
+        for url in urls:
+            if url not in self.traversed_urls and url not in self.prefetched_responses:
+                self.prefetched_responses[url] = executor.submit(self.read_url_into_memory, url)
+
+    def read_url_into_memory(self, url: str) -> GeostoreS3Response:
+        s3_response = self.url_reader(url)
+        body = s3_response.response.read()
+        return GeostoreS3Response(
+            StreamingBody(BytesIO(body), len(body)), s3_response.file_in_staging
+        )
+
+    def read_url(self, url: str) -> GeostoreS3Response:
+        if (prefetched_response := self.prefetched_responses.pop(url, None)) is not None:
+            return prefetched_response.result()
+        return self.url_reader(url)
 
     def get_s3_url_as_object_json(self, url: str, s3_response: GeostoreS3Response) -> JsonObject:
         try:
@@ -272,7 +435,7 @@ class STACDatasetValidator:
 
     def get_object(self, url: str) -> GeostoreS3Response:
         try:
-            s3_response = self.url_reader(url)
+            s3_response = self.read_url(url)
         except ClientError as error:
             if error.response["Error"]["Code"] == "NoSuchKey":
                 self.validation_result_factory.save(
@@ -5,7 +5,7 @@ from importlib.metadata import version
 from json import dumps, load
 from os import environ
 from pathlib import Path
-from typing import Callable, Optional, Union
+from typing import Callable, Iterator, Optional, Union
 
 import boto3
 from botocore.exceptions import NoCredentialsError, NoRegionError
@@ -13,19 +13,28 @@ from single_source import get_version
 from typer import Exit, Option, Typer, echo, secho
 from typer.colors import GREEN, RED, YELLOW
 
-from .api_keys import MESSAGE_KEY
+from .api_keys import ATTRIBUTES_KEY, CURSOR_KEY, MESSAGE_KEY, NEXT_CURSOR_KEY, PAGE_SIZE_KEY
 from .aws_keys import BODY_KEY, HTTP_METHOD_KEY, STATUS_CODE_KEY
 from .dataset_properties import TITLE_CHARACTERS
 from .environment import ENV_NAME_VARIABLE_NAME, PRODUCTION_ENVIRONMENT_NAME
+from .pagination import (
+    DEFAULT_DATASETS_PAGE_SIZE,
+    DEFAULT_VALIDATION_ERRORS_PAGE_SIZE,
+    MAX_DATASETS_PAGE_SIZE,
+    MAX_VALIDATION_ERRORS_PAGE_SIZE,
+)
 from .resources import Resource
 from .step_function_keys import (
+    DATASETS_KEY,
     DATASET_ID_SHORT_KEY,
     DATASET_TITLE_KEY,
     DESCRIPTION_KEY,
+    ERRORS_KEY,
     EXECUTION_ARN_KEY,
     METADATA_URL_KEY,
     NEW_VERSION_ID_KEY,
     S3_ROLE_ARN_KEY,
+    VALIDATION_KEY,
 )
 from .types import JsonList, JsonObject
 
@@ -35,11 +44,13 @@ ENVIRONMENT_NAME_ARGUMENT = "--environment-name"
 EXECUTION_ARN_ARGUMENT = "--execution-arn"
 ID_ARGUMENT = "--id"
 METADATA_URL_ARGUMENT = "--metadata-url"
+PAGE_SIZE_ARGUMENT = "--page-size"
 S3_ROLE_ARN_ARGUMENT = "--s3-role-arn"
 TITLE_ARGUMENT = "--title"
 VERSION_FLAG = "--version"
 
 DATASET_ID_HELP = "Dataset ID, as printed when running `geostore dataset create`."
+EXECUTION_ARN_HELP = "Execution ARN, as printed when running `geostore version create`."
 
 HTTP_METHOD_CREATE = "POST"
 HTTP_METHOD_RETRIEVE = "GET"
@@ -113,34 +124,56 @@ def dataset_create(
 
 
 @dataset_app.command(name="list", help="List datasets.")
-def dataset_list(*, id_: Optional[str] = Option(None, ID_ARGUMENT, help=DATASET_ID_HELP)) -> None:
-    body = {}
-    get_output: GetOutputFunctionType
-
+def dataset_list(
+    *,
+    id_: Optional[str] = Option(None, ID_ARGUMENT, help=DATASET_ID_HELP),
+    page_size: int = Option(
+        DEFAULT_DATASETS_PAGE_SIZE,
+        PAGE_SIZE_ARGUMENT,
+        min=1,
+        max=MAX_DATASETS_PAGE_SIZE,
+        help="Number of datasets to retrieve per request.",
+    ),
+) -> None:
     if id_ is None:
-
-        def get_list_output(response_body: JsonList) -> str:
-            return "\n".join([entry[DATASET_TITLE_KEY] for entry in response_body])
-
-        get_output = get_list_output
-
+        dataset_list_all(page_size)
     else:
+        dataset_list_single(id_)
 
-        def get_single_output(response_body: JsonObject) -> str:
-            title = response_body[DATASET_TITLE_KEY]
-            assert isinstance(title, str)
-            return title
 
-        body[DATASET_ID_SHORT_KEY] = id_
-        get_output = get_single_output
+def dataset_list_single(dataset_id: str) -> None:
+    def get_output(response_body: JsonObject) -> str:
+        title = response_body[DATASET_TITLE_KEY]
+        assert isinstance(title, str)
+        return title
 
     handle_api_request(
         Resource.DATASETS_ENDPOINT_FUNCTION_NAME.resource_name,
-        {HTTP_METHOD_KEY: HTTP_METHOD_RETRIEVE, BODY_KEY: body},
+        {HTTP_METHOD_KEY: HTTP_METHOD_RETRIEVE, BODY_KEY: {DATASET_ID_SHORT_KEY: dataset_id}},
         get_output=get_output,
     )
 
 
+def dataset_list_all(page_size: int) -> None:
+    def get_next_cursor(response_body: JsonObject) -> Optional[str]:
+        next_cursor: Optional[str] = response_body.get(NEXT_CURSOR_KEY)
+        return next_cursor
+
+    pages = get_api_response_pages(
+        Resource.DATASETS_ENDPOINT_FUNCTION_NAME.resource_name,
+        {
+            HTTP_METHOD_KEY: HTTP_METHOD_RETRIEVE,
+            BODY_KEY: {PAGE_SIZE_KEY: page_size, ATTRIBUTES_KEY: [DATASET_TITLE_KEY]},
+        },
+        get_next_cursor=get_next_cursor,
+    )
+    for response_body in pages:
+        for entry in response_body[DATASETS_KEY]:
+            secho(entry[DATASET_TITLE_KEY], fg=GREEN)
+
+    sys.exit(ExitCode.SUCCESS)
+
+
 @dataset_app.command(name="delete", help="Delete a dataset.")
 def dataset_delete(id_: str = Option(..., ID_ARGUMENT, help=DATASET_ID_HELP)) -> None:
     handle_api_request(
@@ -185,11 +218,7 @@ def dataset_version_create(
 
 @dataset_version_app.command(name="status", help="Get status of dataset version creation.")
 def dataset_version_status(
-    execution_arn: str = Option(
-        ...,
-        EXECUTION_ARN_ARGUMENT,
-        help="Execution ARN, as printed when running `geostore version create`.",
-    )
+    execution_arn: str = Option(..., EXECUTION_ARN_ARGUMENT, help=EXECUTION_ARN_HELP)
 ) -> None:
     def get_output(response_body: JsonObject) -> str:
         return dumps(response_body)
@@ -201,18 +230,80 @@ def dataset_version_status(
     )
 
 
+@dataset_version_app.command(
+    name="validation-errors",
+    help="List all validation errors of a dataset version creation, one JSON object per line.",
+)
+def dataset_version_validation_errors(
+    execution_arn: str = Option(..., EXECUTION_ARN_ARGUMENT, help=EXECUTION_ARN_HELP),
+    page_size: int = Option(
+        DEFAULT_VALIDATION_ERRORS_PAGE_SIZE,
+        PAGE_SIZE_ARGUMENT,
+        min=1,
+        max=MAX_VALIDATION_ERRORS_PAGE_SIZE,
+        help="Number of validation errors to retrieve per request.",
+    ),
+) -> None:
+    def get_next_cursor(response_body: JsonObject) -> Optional[str]:
+        next_cursor: Optional[str] = response_body[VALIDATION_KEY].get(NEXT_CURSOR_KEY)
+        return next_cursor
+
+    pages = get_api_response_pages(
+        Resource.IMPORT_STATUS_ENDPOINT_FUNCTION_NAME.resource_name,
+        {
+            HTTP_METHOD_KEY: HTTP_METHOD_RETRIEVE,
+            BODY_KEY: {EXECUTION_ARN_KEY: execution_arn, PAGE_SIZE_KEY: page_size},
+        },
+        get_next_cursor=get_next_cursor,
+    )
+    for response_body in pages:
+        for error in response_body[VALIDATION_KEY][ERRORS_KEY]:
+            secho(dumps(error), fg=GREEN)
+
+    sys.exit(ExitCode.SUCCESS)
+
+
+def get_api_response_pages(
+    function_name: str,
+    request_object: JsonObject,
+    *,
+    get_next_cursor: Callable[[JsonObject], Optional[str]],
+) -> Iterator[JsonObject]:
+    """Yield each successful response body as soon as it arrives, following the cursors."""
+    while True:
+        response_payload = get_successful_response_payload(function_name, request_object)
+        response_body: JsonObject = response_payload[BODY_KEY]
+        yield response_body
+
+        next_cursor = get_next_cursor(response_body)
+        if next_cursor is None:
+            return
+
+        request_object = {
+            **request_object,
+            BODY_KEY: {**request_object[BODY_KEY], CURSOR_KEY: next_cursor},
+        }
+
+
 def handle_api_request(
     function_name: str, request_object: JsonObject, *, get_output: Optional[GetOutputFunctionType]
 ) -> None:
+    response_body = get_successful_response_payload(function_name, request_object)[BODY_KEY]
+
+    if get_output is not None:
+        output = get_output(response_body)
+        secho(output, fg=GREEN)
+    sys.exit(ExitCode.SUCCESS)
+
+
+def get_successful_response_payload(function_name: str, request_object: JsonObject) -> JsonObject:
+    """Exit with an error message unless the API request succeeds."""
     response_payload = invoke_lambda(function_name, request_object)
     status_code = response_payload[STATUS_CODE_KEY]
     response_body = response_payload[BODY_KEY]
 
     if status_code in [HTTPStatus.OK, HTTPStatus.CREATED, HTTPStatus.NO_CONTENT]:
-        if get_output is not None:
-            output = get_output(response_body)
-            secho(output, fg=GREEN)
-        sys.exit(ExitCode.SUCCESS)
+        return response_payload
 
     if status_code == HTTPStatus.CONFLICT:
         secho(response_body[MESSAGE_KEY], err=True, fg=YELLOW)
@@ -1,19 +1,36 @@
+from math import ceil
+from typing import Optional
+
 from jsonschema import validate
 
 from ..models import DATASET_ID_PREFIX, DB_KEY_SEPARATOR, VERSION_ID_PREFIX
-from ..parameter_store import ParameterName, get_param
+from ..parameter_store import ParameterName, get_param, preload_params
 from ..processing_assets_model import ProcessingAssetType, processing_assets_model_with_meta
-from ..step_function_keys import DATASET_ID_KEY, METADATA_URL_KEY, NEW_VERSION_ID_KEY
+from ..step_function_keys import (
+    ASSET_COUNT_KEY,
+    CHECK_STAC_METADATA_KEY,
+    DATASET_ID_KEY,
+    METADATA_URL_KEY,
+    NEW_VERSION_ID_KEY,
+)
 from ..types import JsonObject
 
-MAX_ITERATION_SIZE = 10_000
+# Assets checked by each Batch array job
+MAX_SLICE_SIZE = 10_000
+# Keeps the list of slices well within the Step Functions payload size limit
+MAX_SLICES_PER_ITERATION = 100
+MAX_ITERATION_SIZE = MAX_SLICE_SIZE * MAX_SLICES_PER_ITERATION
+BATCH_SIZE = 10
 
+ARRAY_SIZE_KEY = "array_size"
 ASSETS_TABLE_NAME_KEY = "assets_table_name"
+BATCH_SIZE_KEY = "batch_size"
 CONTENT_KEY = "content"
 FIRST_ITEM_KEY = "first_item"
 ITERATION_SIZE_KEY = "iteration_size"
 NEXT_ITEM_KEY = "next_item"
 RESULTS_TABLE_NAME_KEY = "results_table_name"
+SLICES_KEY = "slices"
 
 EVENT_SCHEMA = {
     "type": "object",
@@ -32,10 +49,15 @@ EVENT_SCHEMA = {
                     "minimum": MAX_ITERATION_SIZE,
                     "multipleOf": MAX_ITERATION_SIZE,
                 },
+                SLICES_KEY: {"type": "array"},
             },
             "required": [FIRST_ITEM_KEY, ITERATION_SIZE_KEY, NEXT_ITEM_KEY],
             "additionalProperties": False,
         },
+        CHECK_STAC_METADATA_KEY: {
+            "type": "object",
+            "properties": {ASSET_COUNT_KEY: {"type": "integer", "minimum": 0}},
+        },
         DATASET_ID_KEY: {"type": "string"},
         METADATA_URL_KEY: {"type": "string"},
         NEW_VERSION_ID_KEY: {"type": "string"},
@@ -44,6 +66,12 @@ EVENT_SCHEMA = {
     "additionalProperties": True,
 }
 
+preload_params(
+    ParameterName.GIT_COMMIT,
+    ParameterName.PROCESSING_ASSETS_TABLE_NAME,
+    ParameterName.STORAGE_VALIDATION_RESULTS_TABLE_NAME,
+)
+
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     validate(event, EVENT_SCHEMA)
@@ -54,19 +82,7 @@ def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     else:
         first_item_index = 0
 
-    dataset_id = event[DATASET_ID_KEY]
-    version_id = event[NEW_VERSION_ID_KEY]
-
-    processing_assets_model = processing_assets_model_with_meta()
-
-    asset_count = processing_assets_model.count(
-        hash_key=(
-            f"{DATASET_ID_PREFIX}{dataset_id}{DB_KEY_SEPARATOR}{VERSION_ID_PREFIX}{version_id}"
-        ),
-        range_key_condition=processing_assets_model.sk.startswith(
-            f"{ProcessingAssetType.DATA.value}{DB_KEY_SEPARATOR}"
-        ),
-    )
+    asset_count = get_asset_count(event)
 
     remaining_assets = asset_count - first_item_index
     if remaining_assets > MAX_ITERATION_SIZE:
@@ -76,10 +92,51 @@ def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
         next_item_index = -1
         iteration_size = remaining_assets
 
+    assets_table_name = get_param(ParameterName.PROCESSING_ASSETS_TABLE_NAME)
+    results_table_name = get_param(ParameterName.STORAGE_VALIDATION_RESULTS_TABLE_NAME)
+    slices = []
+    for slice_first_item_index in range(
+        first_item_index, first_item_index + iteration_size, MAX_SLICE_SIZE
+    ):
+        slice_size = min(MAX_SLICE_SIZE, first_item_index + iteration_size - slice_first_item_index)
+        slices.append(
+            {
+                FIRST_ITEM_KEY: str(slice_first_item_index),
+                ITERATION_SIZE_KEY: slice_size,
+                BATCH_SIZE_KEY: str(BATCH_SIZE),
+                ARRAY_SIZE_KEY: ceil(slice_size / BATCH_SIZE),
+                ASSETS_TABLE_NAME_KEY: assets_table_name,
+                RESULTS_TABLE_NAME_KEY: results_table_name,
+            }
+        )
+
     return {
         FIRST_ITEM_KEY: str(first_item_index),
         ITERATION_SIZE_KEY: iteration_size,
         NEXT_ITEM_KEY: next_item_index,
-        ASSETS_TABLE_NAME_KEY: get_param(ParameterName.PROCESSING_ASSETS_TABLE_NAME),
-        RESULTS_TABLE_NAME_KEY: get_param(ParameterName.STORAGE_VALIDATION_RESULTS_TABLE_NAME),
+        SLICES_KEY: slices,
     }
+
+
+def get_asset_count(event: JsonObject) -> int:
+    """
+    The metadata check reports how many assets it saved, so the assets only have to be counted
+    when it didn't, for example for executions started before it did so.
+    """
+    asset_count: Optional[int] = event.get(CHECK_STAC_METADATA_KEY, {}).get(ASSET_COUNT_KEY)
+    if asset_count is not None:
+        return asset_count
+
+    processing_assets_model = processing_assets_model_with_meta()
+
+    return processing_assets_model.count(
+        hash_key=(
+            f"{DATASET_ID_PREFIX}{event[DATASET_ID_KEY]}"
+            f"{DB_KEY_SEPARATOR}{VERSION_ID_PREFIX}{event[NEW_VERSION_ID_KEY]}"
+        ),
+        range_key_condition=processing_assets_model.sk.startswith(
+            f"{ProcessingAssetType.DATA.value}{DB_KEY_SEPARATOR}"
+        ),
+        # Unchanged assets are indexed after all the others, and are not checksummed again
+        filter_condition=processing_assets_model.unchanged.does_not_exist(),
+    )
@@ -5,14 +5,13 @@ from json import dumps
 from logging import Logger
 from typing import TYPE_CHECKING
 
-import boto3
 from jsonschema import ValidationError, validate
 from linz_logger import get_log
 from pynamodb.exceptions import DoesNotExist
 from ulid import ULID
 
 from ..api_responses import error_response, success_response
-from ..boto3_config import CONFIG
+from ..boto3_clients import lazy_client
 from ..datasets_model import datasets_model_with_meta, human_readable_ulid
 from ..logging_keys import (
     GIT_COMMIT,
@@ -22,8 +21,6 @@ from ..logging_keys import (
 )
 from ..models import DATASET_ID_PREFIX
 from ..parameter_store import ParameterName, get_param
-from ..processing_assets_model import processing_assets_model_with_meta
-from ..step_function import get_hash_key
 from ..step_function_keys import (
     CURRENT_VERSION_EMPTY_VALUE,
     CURRENT_VERSION_ID_KEY,
@@ -45,7 +42,7 @@ else:
     # In production we want to avoid depending on a package which has no runtime impact
     SFNClient = object  # pragma: no mutate
 
-STEP_FUNCTIONS_CLIENT: SFNClient = boto3.client("stepfunctions", config=CONFIG)
+STEP_FUNCTIONS_CLIENT: SFNClient = lazy_client("stepfunctions")
 LOGGER: Logger = get_log()
 
 
@@ -95,13 +92,6 @@ def create_dataset_version(body: JsonObject) -> JsonObject:
     dataset_version_id = human_readable_ulid(ULID.from_datetime(now))
     current_dataset_version = dataset.current_dataset_version or CURRENT_VERSION_EMPTY_VALUE
 
-    processing_assets_model = processing_assets_model_with_meta()
-    for item in processing_assets_model.query(
-        get_hash_key(dataset_id, current_dataset_version),
-        filter_condition=processing_assets_model.replaced_in_new_version.exists(),
-    ):
-        item.update(actions=[processing_assets_model.replaced_in_new_version.remove()])
-
     # execute step function
     step_functions_input = {
         DATASET_ID_KEY: dataset.dataset_id,
@@ -4,6 +4,7 @@ Dataset-versions endpoint Lambda function.
 from typing import Callable, MutableMapping
 
 from ..api_responses import handle_request
+from ..parameter_store import ParameterName, preload_params
 from ..types import JsonObject
 from .create import create_dataset_version
 
@@ -11,6 +12,13 @@ REQUEST_HANDLERS: MutableMapping[str, Callable[[JsonObject], JsonObject]] = {
     "POST": create_dataset_version,
 }
 
+preload_params(
+    ParameterName.GIT_COMMIT,
+    ParameterName.PROCESSING_ASSETS_TABLE_NAME,
+    ParameterName.PROCESSING_DATASET_VERSION_CREATION_STEP_FUNCTION_ARN,
+    ParameterName.STORAGE_DATASETS_TABLE_NAME,
+)
+
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     return handle_request(event, REQUEST_HANDLERS)
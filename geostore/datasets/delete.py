@@ -2,12 +2,11 @@
 from http import HTTPStatus
 from typing import TYPE_CHECKING
 
-import boto3
 from jsonschema import ValidationError, validate
 from pynamodb.exceptions import DoesNotExist
 
 from ..api_responses import error_response, success_response
-from ..boto3_config import CONFIG
+from ..boto3_clients import lazy_client
 from ..datasets_model import datasets_model_with_meta
 from ..models import DATASET_ID_PREFIX
 from ..resources import Resource
@@ -21,7 +20,7 @@ else:
     # In production we want to avoid depending on a package which has no runtime impact
     S3Client = object  # pragma: no mutate
 
-S3_CLIENT: S3Client = boto3.client("s3", config=CONFIG)
+S3_CLIENT: S3Client = lazy_client("s3")
 
 
 def delete_dataset(body: JsonObject) -> JsonObject:
@@ -8,7 +8,7 @@ from linz_logger import get_log
 
 from ..api_responses import handle_request
 from ..logging_keys import GIT_COMMIT, LOG_MESSAGE_LAMBDA_START
-from ..parameter_store import ParameterName, get_param
+from ..parameter_store import ParameterName, get_param, preload_params
 from ..types import JsonObject
 from .create import create_dataset
 from .delete import delete_dataset
@@ -24,6 +24,12 @@ REQUEST_HANDLERS: MutableMapping[str, Callable[[JsonObject], JsonObject]] = {
 
 LOGGER: Logger = get_log()
 
+preload_params(
+    ParameterName.GIT_COMMIT,
+    ParameterName.STORAGE_DATASETS_TABLE_NAME,
+    ParameterName.UPDATE_CATALOG_MESSAGE_QUEUE_NAME,
+)
+
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     LOGGER.debug(
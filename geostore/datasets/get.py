@@ -9,7 +9,7 @@ from ..datasets_model import datasets_model_with_meta
 from ..models import DATASET_ID_PREFIX
 from ..step_function_keys import DATASET_ID_SHORT_KEY, DATASET_TITLE_KEY
 from ..types import JsonObject
-from .list import list_datasets
+from .list import LIST_REQUEST_KEYS, list_datasets
 
 
 def handle_get(body: JsonObject) -> JsonObject:
@@ -19,8 +19,8 @@ def handle_get(body: JsonObject) -> JsonObject:
     if DATASET_TITLE_KEY in body:
         return get_dataset_filter(body)
 
-    if body == {}:
-        return list_datasets()
+    if set(body) <= LIST_REQUEST_KEYS:
+        return list_datasets(body)
 
     return error_response(HTTPStatus.BAD_REQUEST, "Unhandled request")
 
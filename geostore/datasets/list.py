@@ -1,25 +1,90 @@
 """List all datasets function."""
 from http import HTTPStatus
+from typing import List, Optional
 
-from ..api_responses import success_response
-from ..datasets_model import datasets_model_with_meta
-from ..models import DATASET_ID_PREFIX
+from jsonschema import ValidationError, validate
+
+from ..api_keys import ATTRIBUTES_KEY, CURSOR_KEY, NEXT_CURSOR_KEY, PAGE_SIZE_KEY
+from ..api_responses import error_response, success_response
+from ..datasets_model import DATASET_RECORD_TYPE, DatasetsModelBase, datasets_model_with_meta
+from ..pagination import MAX_DATASETS_PAGE_SIZE, decode_cursor, encode_cursor
+from ..step_function_keys import DATASETS_KEY, DATASET_ID_SHORT_KEY, DATASET_TITLE_KEY
 from ..types import JsonObject
 
+LIST_REQUEST_KEYS = {ATTRIBUTES_KEY, CURSOR_KEY, PAGE_SIZE_KEY}
+
+# Response keys of the dataset attributes which can be requested
+DATASET_ATTRIBUTE_NAMES = {
+    DATASET_ID_SHORT_KEY: DatasetsModelBase.id.attr_name,
+    DATASET_TITLE_KEY: DatasetsModelBase.title.attr_name,
+    "created_at": DatasetsModelBase.created_at.attr_name,
+    "updated_at": DatasetsModelBase.updated_at.attr_name,
+    "current_dataset_version": DatasetsModelBase.current_dataset_version.attr_name,
+}
+
+
+def list_datasets(body: JsonObject) -> JsonObject:
+    """
+    GET: List Datasets ordered by title.
+
+    Without a page size all the datasets are returned as a list. Otherwise a page of datasets is
+    returned, with the cursor of the next page if there may be more datasets.
+    """
+
+    body_schema = {
+        "type": "object",
+        "properties": {
+            PAGE_SIZE_KEY: {"type": "integer", "minimum": 1, "maximum": MAX_DATASETS_PAGE_SIZE},
+            CURSOR_KEY: {"type": "string"},
+            ATTRIBUTES_KEY: {
+                "type": "array",
+                "items": {"type": "string", "enum": list(DATASET_ATTRIBUTE_NAMES)},
+                "minItems": 1,
+                "uniqueItems": True,
+            },
+        },
+        "dependentRequired": {CURSOR_KEY: [PAGE_SIZE_KEY]},
+    }
 
-def list_datasets() -> JsonObject:
-    """GET: List all Datasets."""
+    # request body validation
+    try:
+        validate(body, body_schema)
+        start_key = decode_cursor(body.get(CURSOR_KEY))
+    except ValidationError as err:
+        return error_response(HTTPStatus.BAD_REQUEST, err.message)
+    except ValueError:
+        return error_response(HTTPStatus.BAD_REQUEST, f"Invalid {CURSOR_KEY}")
 
-    # list all datasets
+    # list datasets from the listing index
+    page_size = body.get(PAGE_SIZE_KEY)
     datasets_model_class = datasets_model_with_meta()
-    datasets = datasets_model_class.scan(
-        filter_condition=datasets_model_class.id.startswith(DATASET_ID_PREFIX)
+    datasets = datasets_model_class.datasets_list_idx.query(
+        hash_key=DATASET_RECORD_TYPE,
+        limit=page_size,
+        page_size=page_size,
+        last_evaluated_key=start_key,
+        attributes_to_get=get_attributes_to_get(body.get(ATTRIBUTES_KEY)),
     )
+    datasets_list = [dataset.as_dict() for dataset in datasets]
 
     # return response
-    resp_body = []
-    for dataset in datasets:
-        resp_item = dataset.as_dict()
-        resp_body.append(resp_item)
+    if page_size is None:
+        return success_response(HTTPStatus.OK, datasets_list)
+
+    resp_body: JsonObject = {DATASETS_KEY: datasets_list}
+    next_cursor = encode_cursor(datasets.last_evaluated_key)
+    if next_cursor is not None:
+        resp_body[NEXT_CURSOR_KEY] = next_cursor
 
     return success_response(HTTPStatus.OK, resp_body)
+
+
+def get_attributes_to_get(attributes: Optional[List[str]]) -> Optional[List[str]]:
+    if attributes is None:
+        return None
+
+    # The ID is always included to identify the datasets
+    return sorted(
+        {DatasetsModelBase.id.attr_name}
+        | {DATASET_ATTRIBUTE_NAMES[attribute] for attribute in attributes}
+    )
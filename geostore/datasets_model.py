@@ -14,6 +14,8 @@ from .clock import now
 from .models import DATASET_ID_PREFIX, DB_KEY_SEPARATOR
 from .parameter_store import ParameterName, get_param
 
+DATASET_RECORD_TYPE = "DATASET"
+
 
 def human_readable_ulid(ulid: ULID) -> str:
     """
@@ -43,6 +45,22 @@ class DatasetsTitleIdx(GlobalSecondaryIndex["DatasetsModelBase"]):  # type: igno
     title = UnicodeAttribute(hash_key=True)
 
 
+class DatasetsListIdx(GlobalSecondaryIndex["DatasetsModelBase"]):  # type: ignore[no-untyped-call]
+    """Dataset listing global index, with every dataset in one partition ordered by title."""
+
+    @dataclass
+    class Meta:
+        """Meta class."""
+
+        index_name = "datasets_list"
+        read_capacity_units = 1
+        write_capacity_units = 1
+        projection = AllProjection()
+
+    record_type = UnicodeAttribute(hash_key=True)
+    title = UnicodeAttribute(range_key=True)
+
+
 class DatasetsModelBase(Model):
     """Dataset model."""
 
@@ -55,13 +73,20 @@ class DatasetsModelBase(Model):
     created_at = UTCDateTimeAttribute(default_for_new=now)
     updated_at = UTCDateTimeAttribute(default=now)
     current_dataset_version = UnicodeAttribute(null=True)
+    # Not using `default_for_new`, so that saving a dataset created before the listing index existed
+    # adds it to the index
+    record_type = UnicodeAttribute(default=DATASET_RECORD_TYPE)
 
     datasets_title_idx: DatasetsTitleIdx
+    datasets_list_idx: DatasetsListIdx
 
     def as_dict(self) -> Dict[str, Any]:
-        serialized = self.serialize()
+        """Items queried with a subset of the attributes only include those attributes."""
+        serialized = self.serialize(null_check=False)
+        serialized.pop(DatasetsModelBase.record_type.attr_name, None)
         result: Dict[str, Any] = {key: value["S"] for key, value in serialized.items()}
-        result["id"] = self.dataset_id
+        if self.id is not None:
+            result["id"] = self.dataset_id
         return result
 
     @property
@@ -95,5 +120,6 @@ class DatasetsModelMeta(MetaModel):
 def datasets_model_with_meta() -> Type[DatasetsModelBase]:
     class DatasetModel(DatasetsModelBase, metaclass=DatasetsModelMeta):
         datasets_title_idx = DatasetsTitleIdx()
+        datasets_list_idx = DatasetsListIdx()
 
     return DatasetModel
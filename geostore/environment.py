@@ -2,6 +2,14 @@ from os import environ
 
 ENV_NAME_VARIABLE_NAME = "GEOSTORE_ENV_NAME"
 PRODUCTION_ENVIRONMENT_NAME = "prod"
+VERIFY_CHECKSUMS_ON_IMPORT_VARIABLE_NAME = "GEOSTORE_VERIFY_CHECKSUMS_ON_IMPORT"
+INCREMENTAL_VERSIONS_VARIABLE_NAME = "GEOSTORE_INCREMENTAL_VERSIONS"
+CHECKSUM_SLICES_CONCURRENCY_VARIABLE_NAME = "GEOSTORE_CHECKSUM_SLICES_CONCURRENCY"
+DEFAULT_CHECKSUM_SLICES_CONCURRENCY = 4
+DIRECT_IMPORT_MAX_OBJECTS_VARIABLE_NAME = "GEOSTORE_DIRECT_IMPORT_MAX_OBJECTS"
+DEFAULT_DIRECT_IMPORT_MAX_OBJECTS = 100
+DIRECT_IMPORT_MAX_BYTES_VARIABLE_NAME = "GEOSTORE_DIRECT_IMPORT_MAX_BYTES"
+DEFAULT_DIRECT_IMPORT_MAX_BYTES = 1024**3
 
 
 def environment_name() -> str:
@@ -10,3 +18,31 @@ def environment_name() -> str:
 
 def is_production() -> bool:
     return environment_name() == PRODUCTION_ENVIRONMENT_NAME
+
+
+def verify_checksums_on_import() -> bool:
+    return environ.get(VERIFY_CHECKSUMS_ON_IMPORT_VARIABLE_NAME, "false").lower() == "true"
+
+
+def incremental_versions() -> bool:
+    return environ.get(INCREMENTAL_VERSIONS_VARIABLE_NAME, "false").lower() == "true"
+
+
+def checksum_slices_concurrency() -> int:
+    return int(
+        environ.get(
+            CHECKSUM_SLICES_CONCURRENCY_VARIABLE_NAME, str(DEFAULT_CHECKSUM_SLICES_CONCURRENCY)
+        )
+    )
+
+
+def direct_import_max_objects() -> int:
+    return int(
+        environ.get(DIRECT_IMPORT_MAX_OBJECTS_VARIABLE_NAME, str(DEFAULT_DIRECT_IMPORT_MAX_OBJECTS))
+    )
+
+
+def direct_import_max_bytes() -> int:
+    return int(
+        environ.get(DIRECT_IMPORT_MAX_BYTES_VARIABLE_NAME, str(DEFAULT_DIRECT_IMPORT_MAX_BYTES))
+    )
@@ -1,32 +1,197 @@
-from typing import TYPE_CHECKING
+from concurrent.futures import Future, ThreadPoolExecutor
+from math import ceil
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
 
-import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+from multihash import FUNCS, decode
 
-from ..boto3_config import CONFIG
+from ..aws_response import AWS_CODE_ACCESS_DENIED
+from ..boto3_clients import lazy_client
 from ..import_dataset_file import get_import_result
+from ..parameter_store import ParameterName, preload_params
 from ..types import JsonObject
 
 if TYPE_CHECKING:
     # When type checking we want to use the third party package's stub
     from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import CompletedPartTypeDef
 else:
     # In production we want to avoid depending on a package which has no runtime impact
-    S3Client = object  # pragma: no mutate
+    S3Client = CompletedPartTypeDef = object  # pragma: no mutate
 
-TARGET_S3_CLIENT: S3Client = boto3.client("s3", config=CONFIG)
+if TYPE_CHECKING:
+    from hashlib import _Hash
+
+TARGET_S3_CLIENT: S3Client = lazy_client("s3")
+
+# https://docs.aws.amazon.com/AmazonS3/latest/userguide/copy-object.html
+MAX_COPY_OBJECT_SIZE = 5 * 1024**3
+COPY_PART_SIZE = 256 * 1024**2
+SERVER_SIDE_COPY_CONFIG = TransferConfig(
+    multipart_threshold=MAX_COPY_OBJECT_SIZE, multipart_chunksize=COPY_PART_SIZE
+)
+
+# https://docs.aws.amazon.com/AmazonS3/latest/userguide/qfacts.html
+MAX_UPLOAD_PARTS = 10_000
+UPLOAD_CONFIG = TransferConfig()
+
+# (source role, source bucket, target bucket) combinations which can't copy server-side
+SERVER_SIDE_COPY_DENIED_BUCKETS: Set[Tuple[str, str, str]] = set()
+
+preload_params(ParameterName.GIT_COMMIT)
 
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     return get_import_result(event, importer)
 
 
-def importer(
+class ChecksumMismatchError(Exception):
+    pass
+
+
+def importer(  # pylint:disable=too-many-arguments,too-many-locals
     source_bucket_name: str,
     original_key: str,
     target_bucket_name: str,
     new_key: str,
     source_s3_client: S3Client,
+    source_s3_role_arn: str,
+    expected_multihash: Optional[str] = None,
 ) -> None:
+    # Server-side copies never pass the bytes through this function, so they can't be hashed
+    if expected_multihash is None and copy_server_side(
+        source_bucket_name,
+        original_key,
+        target_bucket_name,
+        new_key,
+        source_s3_client,
+        source_s3_role_arn,
+    ):
+        return
+
     source_response = source_s3_client.get_object(Bucket=source_bucket_name, Key=original_key)
 
-    TARGET_S3_CLIENT.upload_fileobj(source_response["Body"], Bucket=target_bucket_name, Key=new_key)
+    if expected_multihash is None:
+        TARGET_S3_CLIENT.upload_fileobj(
+            source_response["Body"], Bucket=target_bucket_name, Key=new_key
+        )
+        return
+
+    multihash_bytes = bytes.fromhex(expected_multihash)
+    expected_hash = decode(multihash_bytes)
+    hash_object: "_Hash" = FUNCS[ord(multihash_bytes[:1])]()
+    body = source_response["Body"]
+    size = source_response["ContentLength"]
+
+    # The checksum is verified before the upload is committed, so a mismatching asset never
+    # creates a version in the storage bucket
+    if size < UPLOAD_CONFIG.multipart_threshold:
+        contents = body.read()
+        hash_object.update(contents)
+        verify_hash(hash_object, expected_hash)
+        TARGET_S3_CLIENT.put_object(Bucket=target_bucket_name, Key=new_key, Body=contents)
+        return
+
+    upload_id = TARGET_S3_CLIENT.create_multipart_upload(Bucket=target_bucket_name, Key=new_key)[
+        "UploadId"
+    ]
+    try:
+        parts = upload_parts(
+            body,
+            hash_object,
+            max(UPLOAD_CONFIG.multipart_chunksize, ceil(size / MAX_UPLOAD_PARTS)),
+            target_bucket_name,
+            new_key,
+            upload_id,
+        )
+        verify_hash(hash_object, expected_hash)
+    except Exception:
+        TARGET_S3_CLIENT.abort_multipart_upload(
+            Bucket=target_bucket_name, Key=new_key, UploadId=upload_id
+        )
+        raise
+
+    TARGET_S3_CLIENT.complete_multipart_upload(
+        Bucket=target_bucket_name,
+        Key=new_key,
+        UploadId=upload_id,
+        MultipartUpload={"Parts": parts},
+    )
+
+
+def upload_parts(  # pylint:disable=too-many-arguments
+    body: StreamingBody,
+    hash_object: "_Hash",
+    part_size: int,
+    bucket_name: str,
+    key: str,
+    upload_id: str,
+) -> List[CompletedPartTypeDef]:
+    """Hash the parts in order while uploading up to `max_request_concurrency` of them at once."""
+    max_concurrency = UPLOAD_CONFIG.max_request_concurrency
+    futures: List["Future[CompletedPartTypeDef]"] = []
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        while part := body.read(part_size):
+            if len(futures) >= max_concurrency:
+                # Limit the number of parts held in memory
+                futures[-max_concurrency].result()
+
+            hash_object.update(part)
+            futures.append(
+                executor.submit(upload_part, part, len(futures) + 1, bucket_name, key, upload_id)
+            )
+
+    return [future.result() for future in futures]
+
+
+def upload_part(
+    part: bytes, part_number: int, bucket_name: str, key: str, upload_id: str
+) -> CompletedPartTypeDef:
+    response = TARGET_S3_CLIENT.upload_part(
+        Body=part, Bucket=bucket_name, Key=key, PartNumber=part_number, UploadId=upload_id
+    )
+    return {"ETag": response["ETag"], "PartNumber": part_number}
+
+
+def verify_hash(hash_object: "_Hash", expected_hash: bytes) -> None:
+    actual_hash = hash_object.digest()
+    if actual_hash != expected_hash:
+        raise ChecksumMismatchError(
+            f"Checksum mismatch: expected {expected_hash.hex()}, got {actual_hash.hex()}"
+        )
+
+
+def copy_server_side(  # pylint:disable=too-many-arguments
+    source_bucket_name: str,
+    original_key: str,
+    target_bucket_name: str,
+    new_key: str,
+    source_s3_client: S3Client,
+    source_s3_role_arn: str,
+) -> bool:
+    """
+    Copy the object within S3 using `CopyObject`, or parallel `UploadPartCopy` requests for objects
+    larger than `MAX_COPY_OBJECT_SIZE`. Returns `False` if the source role isn't allowed to write
+    to the target bucket, so that the caller can fall back to streaming the object.
+    """
+    denial_key = (source_s3_role_arn, source_bucket_name, target_bucket_name)
+    if denial_key in SERVER_SIDE_COPY_DENIED_BUCKETS:
+        return False
+
+    try:
+        source_s3_client.copy(
+            CopySource={"Bucket": source_bucket_name, "Key": original_key},
+            Bucket=target_bucket_name,
+            Key=new_key,
+            Config=SERVER_SIDE_COPY_CONFIG,
+        )
+    except ClientError as error:
+        if error.response["Error"]["Code"] != AWS_CODE_ACCESS_DENIED:
+            raise
+        SERVER_SIDE_COPY_DENIED_BUCKETS.add(denial_key)
+        return False
+
+    return True
@@ -1,42 +1,83 @@
-from json import dumps
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from json import dumps, loads
 from logging import Logger
 from os.path import basename
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import quote, urlparse
 from uuid import uuid4
 
-import boto3
 import smart_open
+from botocore.exceptions import ClientError
 from jsonschema import ValidationError, validate
 from linz_logger import get_log
 
-from ..boto3_config import CONFIG
+from ..boto3_clients import lazy_client
+from ..environment import (
+    direct_import_max_bytes,
+    direct_import_max_objects,
+    verify_checksums_on_import,
+)
 from ..error_response_keys import ERROR_MESSAGE_KEY
-from ..import_dataset_keys import NEW_KEY_KEY, ORIGINAL_KEY_KEY, TARGET_BUCKET_NAME_KEY
+from ..import_dataset_file import (
+    EXCEPTION_PREFIX,
+    INVOCATION_ID_KEY,
+    INVOCATION_SCHEMA_VERSION_KEY,
+    RESULTS_KEY,
+    RESULT_CODE_KEY,
+    RESULT_CODE_PERMANENT_FAILURE,
+    RESULT_CODE_SUCCEEDED,
+    RESULT_CODE_TEMPORARY_FAILURE,
+    RESULT_STRING_KEY,
+    S3_BUCKET_ARN_KEY,
+    S3_KEY_KEY,
+    TASKS_KEY,
+    TASK_ID_KEY,
+)
+from ..import_dataset_keys import (
+    EXPECTED_MULTIHASH_KEY,
+    NEW_KEY_KEY,
+    ORIGINAL_KEY_KEY,
+    TARGET_BUCKET_NAME_KEY,
+)
 from ..import_file_batch_job_id_keys import ASSET_JOB_ID_KEY, METADATA_JOB_ID_KEY
 from ..logging_keys import (
     GIT_COMMIT,
+    LOG_MESSAGE_DIRECT_IMPORT_RESULT,
     LOG_MESSAGE_LAMBDA_FAILURE,
     LOG_MESSAGE_LAMBDA_START,
     LOG_MESSAGE_S3_BATCH_RESPONSE,
 )
 from ..models import DATASET_ID_PREFIX, DB_KEY_SEPARATOR, VERSION_ID_PREFIX
-from ..parameter_store import ParameterName, get_param
-from ..processing_assets_model import ProcessingAssetType, processing_assets_model_with_meta
+from ..parameter_store import ParameterName, get_param, preload_params
+from ..processing_assets_model import (
+    ProcessingAssetType,
+    ProcessingAssetsModelBase,
+    processing_assets_model_with_meta,
+)
 from ..resources import Resource
-from ..s3 import S3_URL_PREFIX
+from ..s3 import S3_URL_PREFIX, get_s3_client_for_role
 from ..s3_utils import get_bucket_and_key_from_url
 from ..step_function_keys import (
+    ASSET_UPLOAD_KEY,
     DATASET_ID_KEY,
     DATASET_TITLE_KEY,
+    ERRORS_KEY,
+    FAILED_TASKS_KEY,
+    FAILURE_REASONS_KEY,
+    METADATA_UPLOAD_KEY,
     METADATA_URL_KEY,
     NEW_VERSION_ID_KEY,
+    S3_BATCH_STATUS_COMPLETE,
+    S3_BATCH_STATUS_FAILED,
     S3_ROLE_ARN_KEY,
+    STATUS_KEY,
 )
 from ..sts import get_account_number
 from ..types import JsonObject
 
 if TYPE_CHECKING:
+    from mypy_boto3_lambda import LambdaClient
     from mypy_boto3_s3 import S3Client
     from mypy_boto3_s3control import S3ControlClient
     from mypy_boto3_s3control.literals import (
@@ -64,12 +105,21 @@ else:
     JobManifestFieldNameType = (
         JobManifestFormatType
     ) = JobReportFormatType = JobReportScopeType = str  # pragma: no mutate
-    S3Client = S3ControlClient = object  # pragma: no mutate
+    LambdaClient = S3Client = S3ControlClient = object  # pragma: no mutate
 
 LOGGER: Logger = get_log()
 
-S3_CLIENT: S3Client = boto3.client("s3", config=CONFIG)
-S3CONTROL_CLIENT: S3ControlClient = boto3.client("s3control", config=CONFIG)
+preload_params(
+    ParameterName.GIT_COMMIT,
+    ParameterName.PROCESSING_ASSETS_TABLE_NAME,
+    ParameterName.PROCESSING_IMPORT_ASSET_FILE_FUNCTION_TASK_ARN,
+    ParameterName.PROCESSING_IMPORT_DATASET_ROLE_ARN,
+    ParameterName.PROCESSING_IMPORT_METADATA_FILE_FUNCTION_TASK_ARN,
+)
+
+S3_CLIENT: S3Client = lazy_client("s3")
+S3CONTROL_CLIENT: S3ControlClient = lazy_client("s3control")
+LAMBDA_CLIENT: LambdaClient = lazy_client("lambda")
 
 IMPORT_ASSET_FILE_TASK_ARN = get_param(ParameterName.PROCESSING_IMPORT_ASSET_FILE_FUNCTION_TASK_ARN)
 IMPORT_METADATA_FILE_TASK_ARN = get_param(
@@ -85,6 +135,18 @@ JOB_MANIFEST_FIELD_NAMES: List[JobManifestFieldNameType] = ["Bucket", "Key"]
 JOB_REPORT_FORMAT: JobReportFormatType = "Report_CSV_20180820"
 JOB_REPORT_SCOPE: JobReportScopeType = "AllTasks"
 
+# Matches the default botocore connection pool size
+MAX_CONCURRENT_DIRECT_IMPORTS = 10
+MAX_DIRECT_IMPORT_ATTEMPTS = 3
+MAX_DIRECT_IMPORT_FAILURE_REASONS = 100
+DIRECT_IMPORT_INVOCATION_SCHEMA_VERSION = "1.0"
+
+FAILURE_CODE_KEY = "FailureCode"
+FAILURE_REASON_KEY = "FailureReason"
+LAMBDA_ERROR_MESSAGE_KEY = "errorMessage"
+
+DirectImportItem = Tuple[ProcessingAssetType, ProcessingAssetsModelBase]
+
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     """Main Lambda entry point."""
@@ -122,88 +184,256 @@ def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
         )
         return {ERROR_MESSAGE_KEY: error.message}
 
+    direct_import_items = get_direct_import_items(event)
+    if direct_import_items is not None:
+        return import_directly(event, direct_import_items)
+
+    asset_job_id = create_import_job(event, IMPORT_ASSET_FILE_TASK_ARN, ProcessingAssetType.DATA)
+    metadata_job_id = create_import_job(
+        event, IMPORT_METADATA_FILE_TASK_ARN, ProcessingAssetType.METADATA
+    )
+
+    return {ASSET_JOB_ID_KEY: asset_job_id, METADATA_JOB_ID_KEY: metadata_job_id}
+
+
+def get_import_items(
+    event: JsonObject, processing_asset_type: ProcessingAssetType
+) -> Iterator[ProcessingAssetsModelBase]:
+    processing_assets_model = processing_assets_model_with_meta()
+    return processing_assets_model.query(
+        (
+            f"{DATASET_ID_PREFIX}{event[DATASET_ID_KEY]}"
+            f"{DB_KEY_SEPARATOR}{VERSION_ID_PREFIX}{event[NEW_VERSION_ID_KEY]}"
+        ),
+        range_key_condition=processing_assets_model.sk.startswith(
+            f"{processing_asset_type.value}{DB_KEY_SEPARATOR}"
+        ),
+        filter_condition=(
+            processing_assets_model.exists_in_staging == True  # pylint: disable=C0121
+        ),
+        consistent_read=True,
+    )
+
+
+def get_task_parameters(event: JsonObject, item: ProcessingAssetsModelBase) -> JsonObject:
+    _, key = get_bucket_and_key_from_url(item.url)
+    task_parameters = {
+        TARGET_BUCKET_NAME_KEY: Resource.STORAGE_BUCKET_NAME.resource_name,
+        ORIGINAL_KEY_KEY: key,
+        NEW_KEY_KEY: f"{event[DATASET_TITLE_KEY]}/{basename(key)}",
+        S3_ROLE_ARN_KEY: event[S3_ROLE_ARN_KEY],
+    }
+    if verify_checksums_on_import() and item.multihash is not None:
+        task_parameters[EXPECTED_MULTIHASH_KEY] = item.multihash
+    return task_parameters
+
+
+def create_import_job(
+    event: JsonObject, task_arn: str, processing_asset_type: ProcessingAssetType
+) -> str:
     source_bucket_name = urlparse(event[METADATA_URL_KEY]).netloc
+    manifest_key = f"manifests/{event[NEW_VERSION_ID_KEY]}_{processing_asset_type.value}.csv"
+    with smart_open.open(
+        f"{S3_URL_PREFIX}{Resource.STORAGE_BUCKET_NAME.resource_name}/{manifest_key}", "w"
+    ) as s3_manifest:
+        for item in get_import_items(event, processing_asset_type):
+            LOGGER.debug(
+                f"Adding {item.url} to manifest",
+                extra={GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+            )
 
-    def run(task_arn: str, processing_asset_type: ProcessingAssetType) -> str:
-        manifest_key = f"manifests/{event[NEW_VERSION_ID_KEY]}_{processing_asset_type.value}.csv"
-        with smart_open.open(
-            f"{S3_URL_PREFIX}{Resource.STORAGE_BUCKET_NAME.resource_name}/{manifest_key}", "w"
-        ) as s3_manifest:
-            processing_assets_model = processing_assets_model_with_meta()
-
-            for item in processing_assets_model.query(
-                (
-                    f"{DATASET_ID_PREFIX}{event[DATASET_ID_KEY]}"
-                    f"{DB_KEY_SEPARATOR}{VERSION_ID_PREFIX}{event[NEW_VERSION_ID_KEY]}"
-                ),
-                range_key_condition=processing_assets_model.sk.startswith(
-                    f"{processing_asset_type.value}{DB_KEY_SEPARATOR}"
-                ),
-                filter_condition=(
-                    processing_assets_model.exists_in_staging == True  # pylint: disable=C0121
-                ),
-                consistent_read=True,
-            ):
-                LOGGER.debug(
-                    f"Adding {item.url} to manifest",
-                    extra={GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
-                )
+            task_parameters = get_task_parameters(event, item)
+            row = ",".join([source_bucket_name, quote(dumps(task_parameters))])
+            s3_manifest.write(f"{row}\n")
 
-                _, key = get_bucket_and_key_from_url(item.url)
-                task_parameters = {
-                    TARGET_BUCKET_NAME_KEY: Resource.STORAGE_BUCKET_NAME.resource_name,
-                    ORIGINAL_KEY_KEY: key,
-                    NEW_KEY_KEY: f"{event[DATASET_TITLE_KEY]}/{basename(key)}",
-                    S3_ROLE_ARN_KEY: event[S3_ROLE_ARN_KEY],
-                }
-                row = ",".join([source_bucket_name, quote(dumps(task_parameters))])
-                s3_manifest.write(f"{row}\n")
-
-        manifest_s3_object = S3_CLIENT.head_object(
-            Bucket=Resource.STORAGE_BUCKET_NAME.resource_name, Key=manifest_key
-        )
-        assert "ETag" in manifest_s3_object, manifest_s3_object
-        manifest_location_spec = JobManifestLocationTypeDef(
-            ObjectArn=f"{STORAGE_BUCKET_ARN}/{manifest_key}", ETag=manifest_s3_object["ETag"]
-        )
+    manifest_s3_object = S3_CLIENT.head_object(
+        Bucket=Resource.STORAGE_BUCKET_NAME.resource_name, Key=manifest_key
+    )
+    assert "ETag" in manifest_s3_object, manifest_s3_object
+    manifest_location_spec = JobManifestLocationTypeDef(
+        ObjectArn=f"{STORAGE_BUCKET_ARN}/{manifest_key}", ETag=manifest_s3_object["ETag"]
+    )
 
-        account_number = get_account_number()
+    account_number = get_account_number()
 
-        # trigger s3 batch copy operation
-        response = S3CONTROL_CLIENT.create_job(
-            AccountId=account_number,
-            ConfirmationRequired=False,
-            Operation=JobOperationTypeDef(
-                LambdaInvoke=LambdaInvokeOperationTypeDef(FunctionArn=task_arn)
+    # trigger s3 batch copy operation
+    response = S3CONTROL_CLIENT.create_job(
+        AccountId=account_number,
+        ConfirmationRequired=False,
+        Operation=JobOperationTypeDef(
+            LambdaInvoke=LambdaInvokeOperationTypeDef(FunctionArn=task_arn)
+        ),
+        Manifest=JobManifestTypeDef(
+            Spec=JobManifestSpecTypeDef(
+                Format=JOB_MANIFEST_FORMAT, Fields=JOB_MANIFEST_FIELD_NAMES
             ),
-            Manifest=JobManifestTypeDef(
-                Spec=JobManifestSpecTypeDef(
-                    Format=JOB_MANIFEST_FORMAT, Fields=JOB_MANIFEST_FIELD_NAMES
+            Location=manifest_location_spec,
+        ),
+        Report=JobReportTypeDef(
+            Enabled=True,
+            Bucket=STORAGE_BUCKET_ARN,
+            Format=JOB_REPORT_FORMAT,
+            Prefix=f"reports/{event[NEW_VERSION_ID_KEY]}",
+            ReportScope=JOB_REPORT_SCOPE,
+        ),
+        Priority=1,
+        RoleArn=S3_BATCH_COPY_ROLE_ARN,
+        ClientRequestToken=uuid4().hex,
+    )
+    LOGGER.debug(
+        LOG_MESSAGE_S3_BATCH_RESPONSE,
+        extra={
+            "s3_batch_response": response,
+            GIT_COMMIT: get_param(ParameterName.GIT_COMMIT),
+        },
+    )
+
+    return response["JobId"]
+
+
+def get_all_import_items(event: JsonObject) -> Iterator[DirectImportItem]:
+    for processing_asset_type in ProcessingAssetType:
+        for item in get_import_items(event, processing_asset_type):
+            yield processing_asset_type, item
+
+
+def get_direct_import_items(event: JsonObject) -> Optional[List[DirectImportItem]]:
+    """
+    The files to import, or None if there are too many, they are too big, or some can't be read,
+    so that they are imported with S3 Batch Operations jobs instead. The jobs report unreadable
+    files as failed tasks.
+    """
+    max_objects = direct_import_max_objects()
+    items = list(islice(get_all_import_items(event), max_objects + 1))
+    if len(items) > max_objects:
+        return None
+
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DIRECT_IMPORTS) as executor:
+            total_size = sum(
+                executor.map(
+                    lambda url: get_object_size(event[S3_ROLE_ARN_KEY], url),
+                    [item.url for _, item in items],
+                )
+            )
+    except ClientError:
+        return None
+
+    if total_size > direct_import_max_bytes():
+        return None
+
+    return items
+
+
+def get_object_size(s3_role_arn: str, url: str) -> int:
+    bucket, key = get_bucket_and_key_from_url(url)
+    source_s3_client = get_s3_client_for_role(s3_role_arn)
+    return source_s3_client.head_object(Bucket=bucket, Key=key)["ContentLength"]
+
+
+def import_directly(event: JsonObject, items: List[DirectImportItem]) -> JsonObject:
+    """
+    Invoke the import functions the S3 Batch Operations jobs would use for each file, and report
+    the outcome the same way as a finished job.
+    """
+    source_bucket_name = urlparse(event[METADATA_URL_KEY]).netloc
+    task_arns = {
+        ProcessingAssetType.DATA: IMPORT_ASSET_FILE_TASK_ARN,
+        ProcessingAssetType.METADATA: IMPORT_METADATA_FILE_TASK_ARN,
+    }
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DIRECT_IMPORTS) as executor:
+        futures = [
+            (
+                processing_asset_type,
+                executor.submit(
+                    import_file,
+                    task_arns[processing_asset_type],
+                    source_bucket_name,
+                    get_task_parameters(event, item),
                 ),
-                Location=manifest_location_spec,
-            ),
-            Report=JobReportTypeDef(
-                Enabled=True,
-                Bucket=STORAGE_BUCKET_ARN,
-                Format=JOB_REPORT_FORMAT,
-                Prefix=f"reports/{event[NEW_VERSION_ID_KEY]}",
-                ReportScope=JOB_REPORT_SCOPE,
-            ),
-            Priority=1,
-            RoleArn=S3_BATCH_COPY_ROLE_ARN,
-            ClientRequestToken=uuid4().hex,
-        )
-        LOGGER.debug(
-            LOG_MESSAGE_S3_BATCH_RESPONSE,
-            extra={
-                "s3_batch_response": response,
-                GIT_COMMIT: get_param(ParameterName.GIT_COMMIT),
-            },
-        )
+            )
+            for processing_asset_type, item in items
+        ]
 
-        return response["JobId"]
+    failure_reasons: Dict[ProcessingAssetType, List[JsonObject]] = {
+        processing_asset_type: [] for processing_asset_type in ProcessingAssetType
+    }
+    for processing_asset_type, future in futures:
+        if (failure_reason := future.result()) is not None:
+            failure_reasons[processing_asset_type].append(failure_reason)
 
-    asset_job_id = run(IMPORT_ASSET_FILE_TASK_ARN, ProcessingAssetType.DATA)
-    metadata_job_id = run(IMPORT_METADATA_FILE_TASK_ARN, ProcessingAssetType.METADATA)
+    result = {
+        ASSET_UPLOAD_KEY: get_direct_import_status(failure_reasons[ProcessingAssetType.DATA]),
+        METADATA_UPLOAD_KEY: get_direct_import_status(
+            failure_reasons[ProcessingAssetType.METADATA]
+        ),
+    }
+    LOGGER.debug(
+        LOG_MESSAGE_DIRECT_IMPORT_RESULT,
+        extra={"result": result, GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+    )
+    return result
 
-    return {ASSET_JOB_ID_KEY: asset_job_id, METADATA_JOB_ID_KEY: metadata_job_id}
+
+def import_file(
+    function_arn: str, source_bucket_name: str, task_parameters: JsonObject
+) -> Optional[JsonObject]:
+    """Returns the failure reason if the file could not be imported."""
+    event = {
+        INVOCATION_SCHEMA_VERSION_KEY: DIRECT_IMPORT_INVOCATION_SCHEMA_VERSION,
+        INVOCATION_ID_KEY: uuid4().hex,
+        TASKS_KEY: [
+            {
+                TASK_ID_KEY: uuid4().hex,
+                S3_BUCKET_ARN_KEY: f"arn:aws:s3:::{source_bucket_name}",
+                S3_KEY_KEY: quote(dumps(task_parameters)),
+            }
+        ],
+    }
+
+    for _ in range(MAX_DIRECT_IMPORT_ATTEMPTS):
+        result = invoke_import_function(function_arn, event)
+        if result[RESULT_CODE_KEY] == RESULT_CODE_SUCCEEDED:
+            return None
+        if result[RESULT_CODE_KEY] != RESULT_CODE_TEMPORARY_FAILURE:
+            break
+
+    return {
+        FAILURE_CODE_KEY: result[RESULT_CODE_KEY],
+        FAILURE_REASON_KEY: result[RESULT_STRING_KEY],
+    }
+
+
+def invoke_import_function(function_arn: str, event: JsonObject) -> JsonObject:
+    try:
+        response = LAMBDA_CLIENT.invoke(FunctionName=function_arn, Payload=dumps(event).encode())
+    except ClientError as error:
+        error_code = error.response["Error"]["Code"]
+        error_message = error.response["Error"]["Message"]
+        return {
+            RESULT_CODE_KEY: RESULT_CODE_TEMPORARY_FAILURE,
+            RESULT_STRING_KEY: f"{error_code} when calling {error.operation_name}: {error_message}",
+        }
+
+    payload = loads(response["Payload"].read())
+
+    if "FunctionError" in response:
+        return {
+            RESULT_CODE_KEY: RESULT_CODE_PERMANENT_FAILURE,
+            RESULT_STRING_KEY: f"{EXCEPTION_PREFIX}: {payload.get(LAMBDA_ERROR_MESSAGE_KEY)}",
+        }
+
+    result: JsonObject = payload[RESULTS_KEY][0]
+    return result
+
+
+def get_direct_import_status(failure_reasons: List[JsonObject]) -> JsonObject:
+    status = S3_BATCH_STATUS_FAILED if failure_reasons else S3_BATCH_STATUS_COMPLETE
+    return {
+        STATUS_KEY: status,
+        ERRORS_KEY: {
+            FAILED_TASKS_KEY: len(failure_reasons),
+            FAILURE_REASONS_KEY: failure_reasons[:MAX_DIRECT_IMPORT_FAILURE_REASONS],
+        },
+    }
@@ -7,7 +7,12 @@ from botocore.exceptions import ClientError
 from linz_logger import get_log
 
 from .aws_response import AWS_CODE_REQUEST_TIMEOUT
-from .import_dataset_keys import NEW_KEY_KEY, ORIGINAL_KEY_KEY, TARGET_BUCKET_NAME_KEY
+from .import_dataset_keys import (
+    EXPECTED_MULTIHASH_KEY,
+    NEW_KEY_KEY,
+    ORIGINAL_KEY_KEY,
+    TARGET_BUCKET_NAME_KEY,
+)
 from .logging_keys import GIT_COMMIT, LOG_MESSAGE_LAMBDA_START
 from .parameter_store import ParameterName, get_param
 from .s3 import get_s3_client_for_role
@@ -45,7 +50,9 @@ LOG_MESSAGE_S3_BATCH_COPY_RESULT = "S3 Batch Result"
 
 def get_import_result(
     event: JsonObject,
-    importer: Callable[[str, str, str, str, S3Client], Optional[PutObjectOutputTypeDef]],
+    importer: Callable[
+        [str, str, str, str, S3Client, str, Optional[str]], Optional[PutObjectOutputTypeDef]
+    ],
 ) -> JsonObject:
     LOGGER.debug(
         LOG_MESSAGE_LAMBDA_START,
@@ -55,7 +62,8 @@ def get_import_result(
     task = event[TASKS_KEY][0]
     source_bucket_name = task[S3_BUCKET_ARN_KEY].split(":::", maxsplit=1)[-1]
     parameters = loads(unquote_plus(task[S3_KEY_KEY]))
-    source_s3_client = get_s3_client_for_role(parameters[S3_ROLE_ARN_KEY])
+    source_s3_role_arn = parameters[S3_ROLE_ARN_KEY]
+    source_s3_client = get_s3_client_for_role(source_s3_role_arn)
 
     try:
         response = importer(
@@ -64,6 +72,8 @@ def get_import_result(
             parameters[TARGET_BUCKET_NAME_KEY],
             parameters[NEW_KEY_KEY],
             source_s3_client,
+            source_s3_role_arn,
+            parameters.get(EXPECTED_MULTIHASH_KEY),
         )
         result_code = RESULT_CODE_SUCCEEDED
         result_string = str(response)
@@ -1,3 +1,4 @@
 ORIGINAL_KEY_KEY = "original_key"
 NEW_KEY_KEY = "new_key"
 TARGET_BUCKET_NAME_KEY = "target_bucket_name"
+EXPECTED_MULTIHASH_KEY = "expected_multihash"
@@ -1,11 +1,10 @@
 from json import dumps, load
 from os.path import basename
-from typing import TYPE_CHECKING, Dict, Iterable, List
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
 
-import boto3
-
-from ..boto3_config import CONFIG
+from ..boto3_clients import lazy_client
 from ..import_dataset_file import get_import_result
+from ..parameter_store import ParameterName, preload_params
 from ..stac_format import (
     STAC_ASSETS_KEY,
     STAC_HREF_KEY,
@@ -24,7 +23,9 @@ else:
     PutObjectOutputTypeDef = JsonObject  # pragma: no mutate
     S3Client = object  # pragma: no mutate
 
-TARGET_S3_CLIENT: S3Client = boto3.client("s3", config=CONFIG)
+TARGET_S3_CLIENT: S3Client = lazy_client("s3")
+
+preload_params(ParameterName.GIT_COMMIT)
 
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
@@ -37,6 +38,8 @@ def importer(
     target_bucket_name: str,
     new_key: str,
     source_s3_client: S3Client,
+    _source_s3_role_arn: str,
+    _expected_multihash: Optional[str] = None,
 ) -> PutObjectOutputTypeDef:
     get_object_response = source_s3_client.get_object(Bucket=source_bucket_name, Key=original_key)
     assert S3_BODY_KEY in get_object_response, get_object_response
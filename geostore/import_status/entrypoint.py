@@ -4,6 +4,7 @@ Dataset-versions endpoint Lambda function.
 from typing import Callable, Mapping
 
 from ..api_responses import handle_request
+from ..parameter_store import ParameterName, preload_params
 from ..types import JsonObject
 from .get import get_import_status
 
@@ -11,6 +12,12 @@ REQUEST_HANDLERS: Mapping[str, Callable[[JsonObject], JsonObject]] = {
     "GET": get_import_status,
 }
 
+preload_params(
+    ParameterName.GIT_COMMIT,
+    ParameterName.STORAGE_IMPORT_STATUSES_TABLE_NAME,
+    ParameterName.STORAGE_VALIDATION_RESULTS_TABLE_NAME,
+)
+
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     return handle_request(event, REQUEST_HANDLERS)
@@ -5,10 +5,16 @@ from logging import Logger
 from jsonschema import ValidationError, validate
 from linz_logger import get_log
 
+from ..api_keys import CURSOR_KEY, PAGE_SIZE_KEY
 from ..api_responses import error_response, success_response
 from ..logging_keys import GIT_COMMIT, LOG_MESSAGE_LAMBDA_FAILURE, LOG_MESSAGE_LAMBDA_START
+from ..pagination import (
+    DEFAULT_VALIDATION_ERRORS_PAGE_SIZE,
+    MAX_VALIDATION_ERRORS_PAGE_SIZE,
+    decode_cursor,
+)
 from ..parameter_store import ParameterName, get_param
-from ..step_function import get_import_status_given_arn
+from ..step_function import ValidationErrorsPage, get_import_status_given_arn
 from ..step_function_keys import EXECUTION_ARN_KEY
 from ..types import JsonObject
 
@@ -26,17 +32,35 @@ def get_import_status(body: JsonObject) -> JsonObject:
             body,
             {
                 "type": "object",
-                "properties": {EXECUTION_ARN_KEY: {"type": "string"}},
+                "properties": {
+                    EXECUTION_ARN_KEY: {"type": "string"},
+                    PAGE_SIZE_KEY: {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": MAX_VALIDATION_ERRORS_PAGE_SIZE,
+                    },
+                    CURSOR_KEY: {"type": "string"},
+                },
                 "required": [EXECUTION_ARN_KEY],
             },
         )
+        validation_errors_page = ValidationErrorsPage(
+            body.get(PAGE_SIZE_KEY, DEFAULT_VALIDATION_ERRORS_PAGE_SIZE),
+            decode_cursor(body.get(CURSOR_KEY)),
+        )
     except ValidationError as err:
         LOGGER.warning(
             LOG_MESSAGE_LAMBDA_FAILURE,
             extra={"error": err.message, GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
         )
         return error_response(HTTPStatus.BAD_REQUEST, err.message)
+    except ValueError as err:
+        LOGGER.warning(
+            LOG_MESSAGE_LAMBDA_FAILURE,
+            extra={"error": str(err), GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+        )
+        return error_response(HTTPStatus.BAD_REQUEST, f"Invalid {CURSOR_KEY}")
 
-    response_body = get_import_status_given_arn(body[EXECUTION_ARN_KEY])
+    response_body = get_import_status_given_arn(body[EXECUTION_ARN_KEY], validation_errors_page)
 
     return success_response(HTTPStatus.OK, response_body)
@@ -0,0 +1,51 @@
+from datetime import timedelta
+from os import environ
+from typing import Any, Dict, Optional, Tuple, Type
+
+from pynamodb.attributes import TTLAttribute, UTCDateTimeAttribute, UnicodeAttribute
+from pynamodb.models import MetaModel, Model
+
+from .aws_keys import AWS_DEFAULT_REGION_KEY
+from .clock import now
+from .parameter_store import ParameterName, get_param
+
+# Statuses are only stored to speed up polling, which rarely goes on for this long
+IMPORT_STATUS_LIFETIME = timedelta(days=30)
+
+
+class ImportStatusesModelBase(Model):
+    """Final import status of a finished dataset version creation, keyed by execution ARN."""
+
+    execution_arn = UnicodeAttribute(hash_key=True, attr_name="pk")
+    import_status = UnicodeAttribute()
+    created_at = UTCDateTimeAttribute(default_for_new=now)
+    expires_at = TTLAttribute(default_for_new=IMPORT_STATUS_LIFETIME)
+
+
+class ImportStatusesModelMeta(MetaModel):
+    def __new__(
+        cls,
+        name: str,
+        bases: Tuple[Type[object], ...],
+        namespace: Dict[str, Any],
+        discriminator: Optional[Any] = None,
+    ) -> "ImportStatusesModelMeta":
+        namespace["Meta"] = type(
+            "Meta",
+            (),
+            {
+                "table_name": get_param(ParameterName.STORAGE_IMPORT_STATUSES_TABLE_NAME),
+                "region": environ[AWS_DEFAULT_REGION_KEY],
+            },
+        )
+        klass: "ImportStatusesModelMeta" = MetaModel.__new__(  # type: ignore[no-untyped-call]
+            cls, name, bases, namespace, discriminator=discriminator
+        )
+        return klass
+
+
+def import_statuses_model_with_meta() -> Type[ImportStatusesModelBase]:
+    class ImportStatusesModel(ImportStatusesModelBase, metaclass=ImportStatusesModelMeta):
+        pass
+
+    return ImportStatusesModel
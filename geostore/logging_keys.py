@@ -1,6 +1,9 @@
+LOG_MESSAGE_DATASET_RECORD_TYPES_BACKFILLED = "Dataset Record Types Backfilled"
+LOG_MESSAGE_DIRECT_IMPORT_RESULT = "Direct Import Result"
 LOG_MESSAGE_LAMBDA_START = "Lambda Start"
 LOG_MESSAGE_LAMBDA_FAILURE = "Lambda Failure"
 LOG_MESSAGE_S3_BATCH_RESPONSE = "S3 Batch Response"
+LOG_MESSAGE_S3_DELETION_FAILURES = "S3 Deletion Failures"
 LOG_MESSAGE_S3_DELETION_RESPONSE = "S3 Deletion Response"
 LOG_MESSAGE_STEP_FUNCTION_RESPONSE = "Step Function Response"
 LOG_MESSAGE_VALIDATION_COMPLETE = "Validation Complete"
@@ -5,16 +5,15 @@ from logging import Logger
 from os import environ
 from typing import TYPE_CHECKING
 
-import boto3
 from linz_logger import get_log
 from slack_sdk.models.blocks import blocks
 from slack_sdk.webhook.client import WebhookClient
 
 from ..api_responses import success_response
 from ..aws_message_attributes import DATA_TYPE_STRING
-from ..boto3_config import CONFIG
+from ..boto3_clients import lazy_client
 from ..logging_keys import GIT_COMMIT, LOG_MESSAGE_LAMBDA_START
-from ..parameter_store import ParameterName, get_param
+from ..parameter_store import ParameterName, get_param, preload_params
 from ..step_function import get_import_status_given_arn
 from ..step_function_keys import (
     ASSET_UPLOAD_KEY,
@@ -54,11 +53,18 @@ STEP_FUNCTION_STOPDATE_KEY = "stopDate"
 WEBHOOK_MESSAGE_BLOCKS_KEY = "blocks"
 WEBHOOK_MESSAGE_CHANNEL_KEY = "channel"
 
-SNS_CLIENT: SNSClient = boto3.client("sns", config=CONFIG)
+SNS_CLIENT: SNSClient = lazy_client("sns")
 LOGGER: Logger = get_log()
 
 BLOCK_MAX_CHAR_LIMIT = 3000  # https://api.slack.com/reference/block-kit/blocks#section
 
+preload_params(
+    ParameterName.GIT_COMMIT,
+    ParameterName.STATUS_SNS_TOPIC_ARN,
+    ParameterName.STORAGE_IMPORT_STATUSES_TABLE_NAME,
+    ParameterName.STORAGE_VALIDATION_RESULTS_TABLE_NAME,
+)
+
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     LOGGER.debug(
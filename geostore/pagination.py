@@ -0,0 +1,29 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from json import dumps, loads
+from typing import Any, Dict, Optional
+
+DEFAULT_DATASETS_PAGE_SIZE = 100
+MAX_DATASETS_PAGE_SIZE = 1_000
+
+DEFAULT_VALIDATION_ERRORS_PAGE_SIZE = 100
+MAX_VALIDATION_ERRORS_PAGE_SIZE = 1_000
+
+LastEvaluatedKey = Dict[str, Dict[str, Any]]
+
+
+def encode_cursor(last_evaluated_key: Optional[LastEvaluatedKey]) -> Optional[str]:
+    """Opaque API cursor for resuming a DynamoDB query after the last item returned."""
+    if last_evaluated_key is None:
+        return None
+    return urlsafe_b64encode(dumps(last_evaluated_key).encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[LastEvaluatedKey]:
+    """Raises ValueError if the cursor was not created by `encode_cursor`."""
+    if cursor is None:
+        return None
+
+    last_evaluated_key = loads(urlsafe_b64decode(cursor.encode()))
+    if not isinstance(last_evaluated_key, dict):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return last_evaluated_key
@@ -1,12 +1,16 @@
 from enum import Enum, auto
 from functools import lru_cache
+from json import load
 from logging import Logger
-from typing import TYPE_CHECKING, Sequence
+from os import environ
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple
 
-import boto3
+from botocore.exceptions import BotoCoreError, ClientError
 from linz_logger import get_log
 
-from .boto3_config import CONFIG
+from .boto3_clients import lazy_client
 from .environment import environment_name
 
 if TYPE_CHECKING:
@@ -17,8 +21,16 @@ else:
     SSMClient = object  # pragma: no mutate
 
 LOGGER: Logger = get_log()
-SSM_CLIENT: SSMClient = boto3.client("ssm", config=CONFIG)
+SSM_CLIENT: SSMClient = lazy_client("ssm")
 LOG_MESSAGE_PARAMETER_NOT_FOUND = "Parameter:DoesNotExist"
+LOG_MESSAGE_PARAMETERS_PRELOAD_FAILED = "Parameters:PreloadFailed"
+
+PARAMETER_OVERRIDE_VARIABLE_NAME_PREFIX = "GEOSTORE_PARAMETER_"
+PARAMETERS_FILE_VARIABLE_NAME = "GEOSTORE_PARAMETERS_FILE"
+PARAMETERS_TTL_VARIABLE_NAME = "GEOSTORE_PARAMETERS_TTL_SECONDS"
+
+# https://docs.aws.amazon.com/systems-manager/latest/APIReference/API_GetParameters.html
+GET_PARAMETERS_NAME_LIMIT = 10
 
 
 class ParameterName(Enum):
@@ -35,17 +47,99 @@ class ParameterName(Enum):
     PROCESSING_IMPORT_ASSET_FILE_FUNCTION_TASK_ARN = auto()
     PROCESSING_IMPORT_DATASET_ROLE_ARN = auto()
     PROCESSING_IMPORT_METADATA_FILE_FUNCTION_TASK_ARN = auto()
+    PROCESSING_UPLOAD_TASK_TOKENS_TABLE_NAME = auto()
     UPDATE_CATALOG_MESSAGE_QUEUE_NAME = auto()
     S3_USERS_ROLE_ARN = auto()
     STATUS_SNS_TOPIC_ARN = auto()
     STORAGE_DATASETS_TABLE_NAME = auto()
+    STORAGE_IMPORT_STATUSES_TABLE_NAME = auto()
     STORAGE_VALIDATION_RESULTS_TABLE_NAME = auto()
 
 
-@lru_cache
+PARAMETER_VALUES: Dict["ParameterName", Tuple[str, float]] = {}
+PARAMETER_VALUES_LOCK = Lock()
+
+
 def get_param(parameter: ParameterName) -> str:
+    """
+    Values are taken from, in order: the `GEOSTORE_PARAMETER_<NAME>` environment variable, the JSON
+    file named by `GEOSTORE_PARAMETERS_FILE`, the cache and finally SSM.
+    """
+    override = get_param_override(parameter)
+    if override is not None:
+        return override
+
+    cached_value = get_cached_param(parameter)
+    if cached_value is not None:
+        return cached_value
+
     try:
-        return SSM_CLIENT.get_parameter(Name=parameter.value)["Parameter"]["Value"]
+        value = SSM_CLIENT.get_parameter(Name=parameter.value)["Parameter"]["Value"]
     except SSM_CLIENT.exceptions.ParameterNotFound:
         LOGGER.error(LOG_MESSAGE_PARAMETER_NOT_FOUND, extra={"parameter_value": parameter.value})
         raise
+
+    with PARAMETER_VALUES_LOCK:
+        PARAMETER_VALUES[parameter] = (value, monotonic())
+    return value
+
+
+def preload_params(*parameters: ParameterName) -> None:
+    """
+    Fetch parameters with as few SSM requests as possible, so that a cold start doesn't make one
+    request per parameter. Failures are only logged, leaving `get_param` to fetch the parameters
+    one by one.
+    """
+    names = [
+        parameter.value
+        for parameter in parameters
+        if get_param_override(parameter) is None and get_cached_param(parameter) is None
+    ]
+
+    for index in range(0, len(names), GET_PARAMETERS_NAME_LIMIT):
+        try:
+            response = SSM_CLIENT.get_parameters(
+                Names=names[index : index + GET_PARAMETERS_NAME_LIMIT]
+            )
+        except (BotoCoreError, ClientError) as error:
+            LOGGER.warning(LOG_MESSAGE_PARAMETERS_PRELOAD_FAILED, extra={"error": str(error)})
+            return
+
+        with PARAMETER_VALUES_LOCK:
+            for parameter in response["Parameters"]:
+                PARAMETER_VALUES[ParameterName(parameter["Name"])] = (
+                    parameter["Value"],
+                    monotonic(),
+                )
+
+
+def get_cached_param(parameter: ParameterName) -> Optional[str]:
+    with PARAMETER_VALUES_LOCK:
+        if parameter not in PARAMETER_VALUES:
+            return None
+        value, fetched = PARAMETER_VALUES[parameter]
+
+    ttl_seconds = environ.get(PARAMETERS_TTL_VARIABLE_NAME)
+    if ttl_seconds is not None and monotonic() - fetched > float(ttl_seconds):
+        return None
+
+    return value
+
+
+def get_param_override(parameter: ParameterName) -> Optional[str]:
+    override = environ.get(f"{PARAMETER_OVERRIDE_VARIABLE_NAME_PREFIX}{parameter.name}")
+    if override is not None:
+        return override
+
+    parameters_file = environ.get(PARAMETERS_FILE_VARIABLE_NAME)
+    if parameters_file is None:
+        return None
+
+    return get_parameters_file_values(parameters_file).get(parameter.name)
+
+
+@lru_cache
+def get_parameters_file_values(path: str) -> Dict[str, str]:
+    with open(path, encoding="utf-8") as parameters_file:
+        values: Dict[str, str] = load(parameters_file)
+    return values
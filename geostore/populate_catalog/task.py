@@ -1,8 +1,7 @@
 from json import dumps
 from logging import Logger
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List, Union
 
-import boto3
 from linz_logger import get_log
 from pystac import read_file
 from pystac.catalog import Catalog, CatalogType
@@ -13,10 +12,10 @@ from pystac.stac_io import StacIO
 
 from ..api_keys import EVENT_KEY
 from ..aws_keys import BODY_KEY
-from ..boto3_config import CONFIG
+from ..boto3_clients import lazy_client
 from ..logging_keys import GIT_COMMIT, LOG_MESSAGE_LAMBDA_FAILURE
-from ..parameter_store import ParameterName, get_param
-from ..pystac_io_methods import S3StacIO
+from ..parameter_store import ParameterName, get_param, preload_params
+from ..pystac_io_methods import S3StacIO, concurrent_writes
 from ..resources import Resource
 from ..s3 import S3_URL_PREFIX
 from ..types import JsonObject
@@ -28,7 +27,7 @@ else:
     # In production we want to avoid depending on a package which has no runtime impact
     S3Client = object  # pragma: no mutate
 
-S3_CLIENT: S3Client = boto3.client("s3", config=CONFIG)
+S3_CLIENT: S3Client = lazy_client("s3")
 
 ROOT_CATALOG_ID = "root_catalog"
 ROOT_CATALOG_TITLE = "Toitū Te Whenua Land Information New Zealand Geostore"
@@ -40,21 +39,31 @@ ROOT_CATALOG_DESCRIPTION = (
 CATALOG_FILENAME = "catalog.json"
 CONTENTS_KEY = "Contents"
 RECORDS_KEY = "Records"
+MESSAGE_ID_KEY = "messageId"
+BATCH_ITEM_FAILURES_KEY = "batchItemFailures"
+ITEM_IDENTIFIER_KEY = "itemIdentifier"
 
 LOGGER: Logger = get_log()
 
 StacIO.set_default(S3StacIO)
 
+preload_params(ParameterName.GIT_COMMIT, ParameterName.S3_USERS_ROLE_ARN)
+
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     """Main Lambda entry point."""
 
     LOGGER.debug(dumps({EVENT_KEY: event, GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)}))
 
-    for message in event[RECORDS_KEY]:
-        handle_message(message[BODY_KEY])
+    failed_message_ids = handle_messages(
+        {message[MESSAGE_ID_KEY]: message[BODY_KEY] for message in event[RECORDS_KEY]}
+    )
 
-    return {}
+    return {
+        BATCH_ITEM_FAILURES_KEY: [
+            {ITEM_IDENTIFIER_KEY: message_id} for message_id in failed_message_ids
+        ]
+    }
 
 
 class GeostoreSTACLayoutStrategy(HrefLayoutStrategy):
@@ -69,19 +78,50 @@ class GeostoreSTACLayoutStrategy(HrefLayoutStrategy):
         raise NotImplementedError()
 
 
-def handle_message(metadata_key: str) -> None:
-    """Handle writing a new dataset to the root catalog"""
+def handle_messages(metadata_keys: Dict[str, str]) -> List[str]:
+    """
+    Add the datasets of all the messages to the root catalog with a single read and write.
+
+    The queue is FIFO, so processing stops at the first dataset which can't be read. Returns the
+    IDs of that message and every later one, so that they are retried in order.
+    """
+    datasets = []
+    message_ids = list(metadata_keys)
+
+    for index, message_id in enumerate(message_ids):
+        try:
+            datasets.append(read_dataset_metadata(metadata_keys[message_id]))
+        except Exception:  # pylint:disable=broad-except
+            failed_message_ids = message_ids[index:]
+            break
+    else:
+        failed_message_ids = []
+
+    if datasets:
+        add_to_root_catalog(datasets)
+
+    return failed_message_ids
+
+
+def read_dataset_metadata(metadata_key: str) -> Union[Catalog, Collection]:
+    try:
+        dataset_metadata = read_file(f"{get_storage_bucket_path()}/{metadata_key}")
+        assert isinstance(dataset_metadata, (Catalog, Collection))
+        return dataset_metadata
+
+    except Exception as error:
+        log_failure(error)
+        raise
+
 
-    storage_bucket_path = f"{S3_URL_PREFIX}{Resource.STORAGE_BUCKET_NAME.resource_name}"
+def add_to_root_catalog(datasets: List[Union[Catalog, Collection]]) -> None:
+    storage_bucket_path = get_storage_bucket_path()
 
     # there could be a myriad of problems preventing catalog from being populated
     # hence a rather broad try except exception clause is used
     # an exception thrown here indicates stuck message(s) in the sqs queue
     # logging is monitored by elasticsearch and alerting is set up to notify the team of a problem
     try:
-        dataset_metadata = read_file(f"{storage_bucket_path}/{metadata_key}")
-        assert isinstance(dataset_metadata, (Catalog, Collection))
-
         results = S3_CLIENT.list_objects(
             Bucket=Resource.STORAGE_BUCKET_NAME.resource_name, Prefix=CATALOG_FILENAME
         )
@@ -99,14 +139,26 @@ def handle_message(metadata_key: str) -> None:
             )
             root_catalog.set_self_href(f"{storage_bucket_path}/{CATALOG_FILENAME}")
 
-        if root_catalog.get_child(dataset_metadata.id) is None:
-            root_catalog.add_child(child=dataset_metadata, strategy=GeostoreSTACLayoutStrategy())
+        for dataset_metadata in datasets:
+            if root_catalog.get_child(dataset_metadata.id) is None:
+                root_catalog.add_child(
+                    child=dataset_metadata, strategy=GeostoreSTACLayoutStrategy()
+                )
 
-        root_catalog.save(catalog_type=CatalogType.SELF_CONTAINED)
+        with concurrent_writes():
+            root_catalog.save(catalog_type=CatalogType.SELF_CONTAINED)
 
     except Exception as error:
-        LOGGER.warning(
-            f"{LOG_MESSAGE_LAMBDA_FAILURE}: Unable to populate catalog due to “{error}”",
-            extra={GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
-        )
+        log_failure(error)
         raise
+
+
+def get_storage_bucket_path() -> str:
+    return f"{S3_URL_PREFIX}{Resource.STORAGE_BUCKET_NAME.resource_name}"
+
+
+def log_failure(error: Exception) -> None:
+    LOGGER.warning(
+        f"{LOG_MESSAGE_LAMBDA_FAILURE}: Unable to populate catalog due to “{error}”",
+        extra={GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+    )
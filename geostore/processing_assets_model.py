@@ -5,6 +5,7 @@ from os import environ
 from typing import Optional, Type
 
 from pynamodb.attributes import BooleanAttribute, UnicodeAttribute
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
 from pynamodb.models import Model
 
 from .aws_keys import AWS_DEFAULT_REGION_KEY
@@ -16,6 +17,20 @@ class ProcessingAssetType(Enum):
     METADATA = "METADATA_ITEM_INDEX"
 
 
+class ProcessingAssetsFilenameIdx(  # type: ignore[no-untyped-call]
+    GlobalSecondaryIndex["ProcessingAssetsModelBase"]
+):
+    @dataclass
+    class Meta:
+        index_name = "processing_assets_filename"
+        read_capacity_units = 1
+        write_capacity_units = 1
+        projection = AllProjection()
+
+    pk = UnicodeAttribute(hash_key=True, attr_name="pk")
+    filename = UnicodeAttribute(range_key=True, attr_name="filename")
+
+
 class ProcessingAssetsModelBase(Model):
     pk = UnicodeAttribute(hash_key=True)
     sk = UnicodeAttribute(range_key=True)
@@ -23,7 +38,16 @@ class ProcessingAssetsModelBase(Model):
     filename = UnicodeAttribute()
     multihash = UnicodeAttribute(null=True)
     exists_in_staging = BooleanAttribute(null=True)
+    # ID of the dataset version which replaces the asset. Marks left by versions which were never
+    # completed don't match any later version, so they never have to be reset.
+    replaced_in_version = UnicodeAttribute(null=True)
+    # Mark set by releases before `replaced_in_version` existed. Still honoured, so that versions
+    # started before the upgrade don't delete the assets they replaced. See "Remove legacy asset
+    # replacement marks" in the README.
     replaced_in_new_version = BooleanAttribute(null=True)
+    unchanged = BooleanAttribute(null=True)
+
+    filename_index: ProcessingAssetsFilenameIdx
 
 
 def processing_assets_model_with_meta(
@@ -38,4 +62,6 @@ def processing_assets_model_with_meta(
             table_name = assets_table_name
             region = environ[AWS_DEFAULT_REGION_KEY]
 
+        filename_index = ProcessingAssetsFilenameIdx()
+
     return ProcessingAssetsModel
@@ -1,13 +1,16 @@
-from logging import Logger
-from typing import TYPE_CHECKING, Any, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from hashlib import md5
+from threading import Lock, local
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Union
 
-import boto3
-from linz_logger import get_log
+from botocore.exceptions import ClientError
 from pystac.link import Link
 from pystac.stac_io import StacIO
 
-from .boto3_config import CONFIG
-from .s3_utils import calculate_s3_etag, get_bucket_and_key_from_url, get_s3_etag
+from .boto3_clients import lazy_client
+from .s3_utils import get_bucket_and_key_from_url
 
 if TYPE_CHECKING:
     # When type checking we want to use the third party package's stub
@@ -16,8 +19,26 @@ else:
     # In production we want to avoid depending on a package which has no runtime impact
     S3Client = object  # pragma: no mutate
 
-S3_CLIENT: S3Client = boto3.client("s3", config=CONFIG)
-LOGGER: Logger = get_log()
+S3_CLIENT: S3Client = lazy_client("s3")
+
+AWS_CODE_NOT_MODIFIED = "304"
+
+# Matches the default botocore connection pool size
+MAX_CONCURRENT_WRITES = 10
+
+
+@dataclass
+class CachedObject:
+    etag: str
+    text: str
+
+
+# Objects read or written by this process, so unchanged files are neither downloaded nor uploaded
+# again
+OBJECT_CACHE: Dict[str, CachedObject] = {}
+OBJECT_CACHE_LOCK = Lock()
+
+WRITE_CONTEXT = local()
 
 
 class S3StacIO(StacIO):
@@ -26,8 +47,20 @@ class S3StacIO(StacIO):
     ) -> str:
         url = source.href if isinstance(source, Link) else source
         bucket, key = get_bucket_and_key_from_url(url)
-        obj = S3_CLIENT.get_object(Bucket=bucket, Key=key)
+
+        cached_object = get_cached_object(url)
+        try:
+            if cached_object is None:
+                obj = S3_CLIENT.get_object(Bucket=bucket, Key=key)
+            else:
+                obj = S3_CLIENT.get_object(Bucket=bucket, Key=key, IfNoneMatch=cached_object.etag)
+        except ClientError as error:
+            if cached_object is None or error.response["Error"]["Code"] != AWS_CODE_NOT_MODIFIED:
+                raise
+            return cached_object.text
+
         result: str = obj["Body"].read().decode("utf-8")
+        set_cached_object(url, CachedObject(obj["ETag"], result))
 
         return result
 
@@ -35,10 +68,67 @@ class S3StacIO(StacIO):
         self, dest: Union[str, Link], txt: str, *_args: Any, **_kwargs: Any
     ) -> None:
         url = dest.href if isinstance(dest, Link) else dest
-        bucket, key = get_bucket_and_key_from_url(url)
 
-        s3_etag = get_s3_etag(bucket, key, LOGGER)
-        local_etag = calculate_s3_etag(txt.encode())
+        executor: Optional[ThreadPoolExecutor] = getattr(WRITE_CONTEXT, "executor", None)
+        if executor is None:
+            write_object(url, txt)
+        else:
+            WRITE_CONTEXT.futures.append(executor.submit(write_object, url, txt))
+
+
+@contextmanager
+def concurrent_writes(max_concurrent_writes: int = MAX_CONCURRENT_WRITES) -> Iterator[None]:
+    """
+    Write the files saved by S3StacIO in the current thread concurrently, for example while saving a
+    whole catalog tree. All the writes have finished when the context exits.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_concurrent_writes)
+    futures: List["Future[None]"] = []
+    WRITE_CONTEXT.executor = executor
+    WRITE_CONTEXT.futures = futures
+    try:
+        yield
+    finally:
+        WRITE_CONTEXT.executor = None
+        executor.shutdown(wait=True)
+
+    for future in futures:
+        future.result()
+
+
+def write_object(url: str, txt: str) -> None:
+    bucket, key = get_bucket_and_key_from_url(url)
+    body = txt.encode()
+
+    cached_object = get_cached_object(url)
+    if cached_object is not None and cached_object.text == txt:
+        return
+
+    if cached_object is None:
+        local_etag = f'"{md5(body, usedforsecurity=False).hexdigest()}"'
+        if is_stored(bucket, key, local_etag):
+            set_cached_object(url, CachedObject(local_etag, txt))
+            return
+
+    response = S3_CLIENT.put_object(Bucket=bucket, Key=key, Body=body)
+    set_cached_object(url, CachedObject(response["ETag"], txt))
+
+
+def is_stored(bucket: str, key: str, etag: str) -> bool:
+    try:
+        S3_CLIENT.head_object(Bucket=bucket, Key=key, IfNoneMatch=etag)
+    except ClientError as error:
+        # Any other error means the object has to be written
+        return error.response["Error"]["Code"] == AWS_CODE_NOT_MODIFIED
+
+    return False
+
+
+def get_cached_object(url: str) -> Optional[CachedObject]:
+    with OBJECT_CACHE_LOCK:
+        return OBJECT_CACHE.get(url)
+
 
-        if s3_etag != local_etag:
-            S3_CLIENT.put_object(Bucket=bucket, Key=key, Body=txt.encode())
+def set_cached_object(url: str, cached_object: CachedObject) -> None:
+    with OBJECT_CACHE_LOCK:
+        OBJECT_CACHE[url] = cached_object
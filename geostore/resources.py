@@ -19,6 +19,7 @@ class Resource(Enum):
     CLOUDWATCH_RULE_NAME = "geostore-cloudwatch-rule"
     DATASETS_ENDPOINT_FUNCTION_NAME = "datasets"
     DATASET_VERSIONS_ENDPOINT_FUNCTION_NAME = "dataset-versions"
+    IMPORT_DATASET_FUNCTION_NAME = "import-dataset"
     IMPORT_STATUS_ENDPOINT_FUNCTION_NAME = "import-status"
     S3_USERS_ROLE_NAME = "s3-users"
     STAGING_USERS_ROLE_NAME = "staging-users"
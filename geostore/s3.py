@@ -1,8 +1,11 @@
-from typing import TYPE_CHECKING
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import TYPE_CHECKING, Dict, Tuple
 from uuid import uuid4
 
 import boto3
 
+from .boto3_clients import lazy_client
 from .boto3_config import CONFIG
 from .environment import environment_name
 
@@ -16,21 +19,41 @@ else:
 S3_SCHEMA = "s3"
 S3_URL_PREFIX = f"{S3_SCHEMA}://"
 
-CHUNK_SIZE = 1024
+# Longer than the 15 minute maximum Lambda function timeout, so that a client returned during an
+# invocation is valid until the invocation ends
+CREDENTIALS_EXPIRY_MARGIN = timedelta(minutes=20)
 
-STS_CLIENT: STSClient = boto3.client("sts", config=CONFIG)
+STS_CLIENT: STSClient = lazy_client("sts")
+
+ROLE_S3_CLIENTS: Dict[str, Tuple[S3Client, datetime]] = {}
+ROLE_S3_CLIENTS_LOCK = Lock()
 
 
 def get_s3_client_for_role(role_arn: str) -> S3Client:
+    """
+    Clients are shared between calls and threads until their credentials are about to expire.
+    """
+    with ROLE_S3_CLIENTS_LOCK:
+        cached_client = ROLE_S3_CLIENTS.get(role_arn)
+    if cached_client is not None:
+        client, expiration = cached_client
+        if datetime.now(tz=timezone.utc) < expiration - CREDENTIALS_EXPIRY_MARGIN:
+            return client
+
+    # Other threads can keep using cached clients while the role is assumed
     assume_role_response = STS_CLIENT.assume_role(
         RoleArn=role_arn, RoleSessionName=f"{environment_name()}_Geostore_{uuid4()}"
     )
     credentials = assume_role_response["Credentials"]
-    client: S3Client = boto3.client(
-        "s3",
-        config=CONFIG,
-        aws_access_key_id=credentials["AccessKeyId"],
-        aws_secret_access_key=credentials["SecretAccessKey"],
-        aws_session_token=credentials["SessionToken"],
-    )
+
+    # Creating clients with the default boto3 session is not thread safe
+    with ROLE_S3_CLIENTS_LOCK:
+        client = boto3.client(
+            "s3",
+            config=CONFIG,
+            aws_access_key_id=credentials["AccessKeyId"],
+            aws_secret_access_key=credentials["SecretAccessKey"],
+            aws_session_token=credentials["SessionToken"],
+        )
+        ROLE_S3_CLIENTS[role_arn] = (client, credentials["Expiration"])
     return client
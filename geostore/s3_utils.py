@@ -1,8 +1,10 @@
-import hashlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from io import RawIOBase
 from logging import Logger
 from os.path import basename
-from typing import Callable, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Deque, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 from botocore.exceptions import ClientError
@@ -13,7 +15,15 @@ from .parameter_store import ParameterName, get_param
 from .resources import Resource
 from .s3 import get_s3_client_for_role
 
-KNOWN_ETAG_OF_EMPTY_FILE = '"d41d8cd98f00b204e9800998ecf8427e"'
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import GetObjectOutputTypeDef
+else:
+    S3Client = GetObjectOutputTypeDef = object  # pragma: no mutate
+
+RANGED_GET_PART_SIZE = 8 * 1024 * 1024
+MAX_CONCURRENT_RANGED_GETS = 4
+RANGED_GET_MIN_OBJECT_SIZE = RANGED_GET_PART_SIZE * MAX_CONCURRENT_RANGED_GETS
 
 
 def get_bucket_and_key_from_url(url: str) -> Tuple[str, str]:
@@ -21,12 +31,131 @@ def get_bucket_and_key_from_url(url: str) -> Tuple[str, str]:
     return parsed.netloc, parsed.path[1:]
 
 
+class S3RangedReader(RawIOBase):
+    """
+    Reads an S3 object using concurrent ranged GET requests. At most `max_concurrent_gets` parts
+    are buffered at a time, and they are returned in order. If given, the first part is read from
+    `first_part_body`, the body of an existing GET response for the whole object, and the rest of
+    that body is discarded.
+    """
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        s3_client: S3Client,
+        bucket_name: str,
+        key: str,
+        content_length: int,
+        etag: str,
+        *,
+        first_part_body: Optional[StreamingBody] = None,
+        part_size: int = RANGED_GET_PART_SIZE,
+        max_concurrent_gets: int = MAX_CONCURRENT_RANGED_GETS,
+    ):
+        super().__init__()
+        self.s3_client = s3_client
+        self.get_object_arguments = {"Bucket": bucket_name, "Key": key, "IfMatch": etag}
+
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent_gets)
+        self.pending_parts: Deque["Future[bytes]"] = deque()
+        self.current_part = memoryview(b"")
+
+        ranged_get_start = 0
+        if first_part_body is not None:
+            self.pending_parts.append(
+                self.executor.submit(read_first_part, first_part_body, part_size)
+            )
+            ranged_get_start = part_size
+
+        self.part_ranges = (
+            (start, min(start + part_size, content_length) - 1)
+            for start in range(ranged_get_start, content_length, part_size)
+        )
+        for _ in range(max_concurrent_gets - len(self.pending_parts)):
+            self.request_next_part()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: "memoryview") -> int:  # type: ignore[override]
+        if not self.current_part:
+            if not self.pending_parts:
+                return 0
+            self.current_part = memoryview(self.pending_parts.popleft().result())
+            self.request_next_part()
+
+        size = min(len(buffer), len(self.current_part))
+        buffer[:size] = self.current_part[:size]
+        self.current_part = self.current_part[size:]
+        return size
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+        super().close()
+
+    def read(self, size: int = -1) -> bytes:
+        # Only non-blocking streams return `None`
+        return super().read(size) or b""
+
+    def request_next_part(self) -> None:
+        part_range = next(self.part_ranges, None)
+        if part_range is not None:
+            self.pending_parts.append(self.executor.submit(self.get_part, *part_range))
+
+    def get_part(self, start: int, end: int) -> bytes:
+        # `IfMatch` fails the read rather than mixing parts of different versions of the object
+        response = self.s3_client.get_object(
+            **self.get_object_arguments, Range=f"bytes={start}-{end}"
+        )
+        return response["Body"].read()
+
+
+def read_first_part(body: StreamingBody, size: int) -> bytes:
+    try:
+        return body.read(size)
+    finally:
+        body.close()
+
+
 @dataclass
 class GeostoreS3Response:
-    response: StreamingBody
+    response: Union[StreamingBody, S3RangedReader]
     file_in_staging: bool
 
 
+def get_s3_object_body(
+    s3_client: S3Client, bucket_name: str, key: str, response: GetObjectOutputTypeDef
+) -> Union[StreamingBody, S3RangedReader]:
+    if response["ContentLength"] < RANGED_GET_MIN_OBJECT_SIZE:
+        return response["Body"]
+
+    return S3RangedReader(
+        s3_client,
+        bucket_name,
+        key,
+        response["ContentLength"],
+        response["ETag"],
+        first_part_body=response["Body"],
+    )
+
+
+def get_s3_staging_file_checker(s3_role_arn: str) -> Callable[[str], bool]:
+    def is_in_staging(staging_url: str) -> bool:
+        bucket_name, key = get_bucket_and_key_from_url(staging_url)
+
+        try:
+            staging_s3_client.head_object(Bucket=bucket_name, Key=key)
+        except ClientError as error:
+            # HEAD responses have no body, so the error code is the HTTP status code
+            if error.response["Error"]["Code"] != "404":
+                raise error
+            return False
+
+        return True
+
+    staging_s3_client = get_s3_client_for_role(s3_role_arn)
+    return is_in_staging
+
+
 def get_s3_url_reader(
     s3_role_arn: str, dataset_title: str, logger: Logger
 ) -> Callable[[str], GeostoreS3Response]:
@@ -35,7 +164,9 @@ def get_s3_url_reader(
 
         try:
             staging_object = staging_s3_client.get_object(Bucket=bucket_name, Key=key)
-            return GeostoreS3Response(staging_object["Body"], True)
+            return GeostoreS3Response(
+                get_s3_object_body(staging_s3_client, bucket_name, key, staging_object), True
+            )
         except ClientError as error:
             if error.response["Error"]["Code"] != "NoSuchKey":
                 raise error
@@ -50,53 +181,16 @@ def get_s3_url_reader(
             geostore_object = geostore_s3_client.get_object(
                 Bucket=Resource.STORAGE_BUCKET_NAME.resource_name, Key=geostore_key
             )
-            return GeostoreS3Response(geostore_object["Body"], False)
+            return GeostoreS3Response(
+                get_s3_object_body(
+                    geostore_s3_client,
+                    Resource.STORAGE_BUCKET_NAME.resource_name,
+                    geostore_key,
+                    geostore_object,
+                ),
+                False,
+            )
 
     staging_s3_client = get_s3_client_for_role(s3_role_arn)
     geostore_s3_client = get_s3_client_for_role(get_param(ParameterName.S3_USERS_ROLE_ARN))
     return s3_url_reader
-
-
-def get_s3_etag(s3_bucket: str, s3_object_key: str, logger: Logger) -> Optional[str]:
-    geostore_s3_client = get_s3_client_for_role(get_param(ParameterName.S3_USERS_ROLE_ARN))
-
-    try:
-        s3_response = geostore_s3_client.head_object(Bucket=s3_bucket, Key=s3_object_key)
-        return s3_response["ETag"]
-    except ClientError as error:
-        if error.response["Error"]["Code"] != "404":
-            logger.debug(
-                f"Unable to fetch eTag for “{s3_object_key}” in s3://{s3_bucket} due to “{error}”",
-                extra={GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
-            )
-        # rather than raise, we return an empty string, indicating that the etag is different
-        # thus allowing the next step to continue rather than stalling the entire process
-        return None
-
-
-def calculate_s3_etag(body: bytes) -> str:
-    # https://awscli.amazonaws.com/v2/documentation/api/latest/topic/s3-config.html#multipart-chunksize
-    s3_default_chunk_size = 8_388_608  # Default value is 8 * 1024 * 1024
-
-    if body == b"":
-        return KNOWN_ETAG_OF_EMPTY_FILE
-
-    chunk_hashes = []
-
-    for chunk_start in range(0, len(body), s3_default_chunk_size):
-        chunk = body[chunk_start : chunk_start + s3_default_chunk_size]
-        chunk_hashes.append(hashlib.md5(chunk, usedforsecurity=False))
-
-    # file smaller than s3_default_chunk_size has one chunk
-    if len(chunk_hashes) == 1:
-        # file at exactly s3_default_chunk_size is still one chunk
-        # but etag is calculated as multi chunk file (e.g. "656dadd6d61e0ebfd29264e34d742df3-1")
-        # where -1 suffix signifies 1 chunk
-        if len(body) < s3_default_chunk_size:
-            return f'"{chunk_hashes[0].hexdigest()}"'
-
-    hash_object = hashlib.md5(usedforsecurity=False)
-    for chunk_hash in chunk_hashes:
-        hash_object.update(chunk_hash.digest())
-
-    return f'"{hash_object.hexdigest()}-{len(chunk_hashes)}"'
@@ -1,36 +1,49 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from enum import Enum
-from json import loads
+from json import dumps, loads
 from logging import Logger
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Type
 
-import boto3
 from linz_logger import get_log
+from pynamodb.exceptions import DoesNotExist
 
-from .api_keys import SUCCESS_KEY
-from .boto3_config import CONFIG
+from .api_keys import NEXT_CURSOR_KEY, SUCCESS_KEY
+from .batch_writer import BatchWriter
+from .boto3_clients import lazy_client
 from .import_file_batch_job_id_keys import ASSET_JOB_ID_KEY, METADATA_JOB_ID_KEY
+from .import_statuses_model import import_statuses_model_with_meta
 from .logging_keys import (
     GIT_COMMIT,
     LOG_MESSAGE_S3_BATCH_RESPONSE,
     LOG_MESSAGE_STEP_FUNCTION_RESPONSE,
 )
 from .models import DATASET_ID_PREFIX, DB_KEY_SEPARATOR, VERSION_ID_PREFIX
+from .pagination import DEFAULT_VALIDATION_ERRORS_PAGE_SIZE, LastEvaluatedKey, encode_cursor
 from .parameter_store import ParameterName, get_param
-from .processing_assets_model import ProcessingAssetType, processing_assets_model_with_meta
+from .processing_assets_model import (
+    ProcessingAssetType,
+    ProcessingAssetsModelBase,
+    processing_assets_model_with_meta,
+)
 from .step_function_keys import (
     ASSET_UPLOAD_KEY,
     CURRENT_VERSION_EMPTY_VALUE,
     DATASET_ID_KEY,
     ERRORS_KEY,
     ERROR_CHECK_KEY,
+    ERROR_COUNTS_KEY,
     ERROR_DETAILS_KEY,
     ERROR_RESULT_KEY,
     ERROR_URL_KEY,
     FAILED_TASKS_KEY,
     FAILURE_REASONS_KEY,
     IMPORT_DATASET_KEY,
+    JOB_STATUS_ABORTED,
     JOB_STATUS_RUNNING,
     JOB_STATUS_SUCCEEDED,
+    JOB_STATUS_TIMED_OUT,
     METADATA_UPLOAD_KEY,
     NEW_VERSION_ID_KEY,
     S3_BATCH_STATUS_FAILED,
@@ -40,7 +53,12 @@ from .step_function_keys import (
 )
 from .sts import get_account_number
 from .types import JsonList, JsonObject
-from .validation_results_model import ValidationResult, validation_results_model_with_meta
+from .upload_callback import S3_BATCH_FINAL_STATUSES
+from .validation_results_model import (
+    ValidationResult,
+    ValidationResultsModelBase,
+    validation_results_model_with_meta,
+)
 
 if TYPE_CHECKING:
     # When type checking we want to use the third party package's stub
@@ -64,25 +82,62 @@ SUCCESS_TO_VALIDATION_OUTCOME_MAPPING = {
     None: Outcome.PENDING,
 }
 
-STEP_FUNCTIONS_CLIENT: SFNClient = boto3.client("stepfunctions", config=CONFIG)
-S3CONTROL_CLIENT: S3ControlClient = boto3.client("s3control", config=CONFIG)
+# Failed, aborted and timed out executions can be redriven, so their import status can change.
+# Aborted and timed out executions whose uploads have finished have nothing left to redrive.
+STOPPED_STEP_FUNCTION_STATUSES = [JOB_STATUS_ABORTED.title(), JOB_STATUS_TIMED_OUT.title()]
+
+
+# Small datasets are imported directly, with the final upload statuses instead of the S3 Batch
+# Operations job IDs
+DIRECT_IMPORT_STATUS_KEYS = {
+    ASSET_JOB_ID_KEY: ASSET_UPLOAD_KEY,
+    METADATA_JOB_ID_KEY: METADATA_UPLOAD_KEY,
+}
+
+
+@dataclass(frozen=True)
+class ValidationErrorsPage:
+    size: int = DEFAULT_VALIDATION_ERRORS_PAGE_SIZE
+    start_key: Optional[LastEvaluatedKey] = None
+
+
+FIRST_VALIDATION_ERRORS_PAGE = ValidationErrorsPage()
+
+STEP_FUNCTIONS_CLIENT: SFNClient = lazy_client("stepfunctions")
+S3CONTROL_CLIENT: S3ControlClient = lazy_client("s3control")
 LOGGER: Logger = get_log()
 
 
-def get_tasks_status(
+def get_tasks_status(  # pylint:disable=too-many-arguments
     step_function_status: str,
     dataset_id: str,
     version_id: str,
     validation_success: Optional[bool],
     import_dataset_jobs: JsonObject,
+    validation_errors_page: ValidationErrorsPage = FIRST_VALIDATION_ERRORS_PAGE,
 ) -> JsonObject:
-    validation_errors = get_step_function_validation_results(dataset_id, version_id)
+    with ThreadPoolExecutor() as executor:
+        validation_results_future = executor.submit(
+            get_step_function_validation_results, dataset_id, version_id, validation_errors_page
+        )
+        metadata_upload_status_future = executor.submit(
+            get_import_job_status, import_dataset_jobs, METADATA_JOB_ID_KEY
+        )
+        asset_upload_status_future = executor.submit(
+            get_import_job_status, import_dataset_jobs, ASSET_JOB_ID_KEY
+        )
+
+    validation_results = validation_results_future.result()
+    # Cursors only point past failed validation results
+    has_validation_errors = (
+        bool(validation_results[ERRORS_KEY]) or validation_errors_page.start_key is not None
+    )
     validation_outcome = get_validation_outcome(
-        step_function_status, validation_errors, validation_success
+        step_function_status, has_validation_errors, validation_success
     )
 
-    metadata_upload_status = get_import_job_status(import_dataset_jobs, METADATA_JOB_ID_KEY)
-    asset_upload_status = get_import_job_status(import_dataset_jobs, ASSET_JOB_ID_KEY)
+    metadata_upload_status = metadata_upload_status_future.result()
+    asset_upload_status = asset_upload_status_future.result()
 
     # Failed validation implies uploads will never happen
     if (
@@ -93,13 +148,34 @@ def get_tasks_status(
         metadata_upload_status[STATUS_KEY] = asset_upload_status[STATUS_KEY] = Outcome.SKIPPED.value
 
     return {
-        VALIDATION_KEY: {STATUS_KEY: validation_outcome.value, ERRORS_KEY: validation_errors},
+        VALIDATION_KEY: {STATUS_KEY: validation_outcome.value, **validation_results},
         METADATA_UPLOAD_KEY: metadata_upload_status,
         ASSET_UPLOAD_KEY: asset_upload_status,
     }
 
 
-def get_import_status_given_arn(execution_arn_key: str) -> JsonObject:
+def get_import_status_given_arn(
+    execution_arn_key: str,
+    validation_errors_page: ValidationErrorsPage = FIRST_VALIDATION_ERRORS_PAGE,
+) -> JsonObject:
+    # Only the default first page of validation errors is stored with the final status
+    if validation_errors_page != FIRST_VALIDATION_ERRORS_PAGE:
+        return get_execution_import_status(execution_arn_key, validation_errors_page)
+
+    import_status = get_final_import_status(execution_arn_key)
+    if import_status is not None:
+        return import_status
+
+    import_status = get_execution_import_status(execution_arn_key, validation_errors_page)
+    if is_final_import_status(import_status):
+        save_final_import_status(execution_arn_key, import_status)
+
+    return import_status
+
+
+def get_execution_import_status(
+    execution_arn_key: str, validation_errors_page: ValidationErrorsPage
+) -> JsonObject:
     step_function_resp = STEP_FUNCTIONS_CLIENT.describe_execution(executionArn=execution_arn_key)
     assert "status" in step_function_resp, step_function_resp
     LOGGER.debug(
@@ -117,18 +193,54 @@ def get_import_status_given_arn(execution_arn_key: str) -> JsonObject:
     import_dataset_jobs = step_function_output.get(IMPORT_DATASET_KEY, {})
 
     tasks_status = get_tasks_status(
-        step_function_status, dataset_id, version_id, validation_success, import_dataset_jobs
+        step_function_status,
+        dataset_id,
+        version_id,
+        validation_success,
+        import_dataset_jobs,
+        validation_errors_page,
     )
     return {STEP_FUNCTION_KEY: {"status": step_function_status.title()}, **tasks_status}
 
 
+def get_final_import_status(execution_arn_key: str) -> Optional[JsonObject]:
+    import_statuses_model = import_statuses_model_with_meta()
+    try:
+        item = import_statuses_model.get(execution_arn_key, consistent_read=True)
+    except DoesNotExist:
+        return None
+
+    import_status: JsonObject = loads(item.import_status)
+    return import_status
+
+
+def save_final_import_status(execution_arn_key: str, import_status: JsonObject) -> None:
+    import_statuses_model = import_statuses_model_with_meta()
+    import_statuses_model(
+        execution_arn=execution_arn_key, import_status=dumps(import_status)
+    ).save()
+
+
+def is_final_import_status(import_status: JsonObject) -> bool:
+    step_function_status = import_status[STEP_FUNCTION_KEY][STATUS_KEY]
+    if step_function_status == JOB_STATUS_SUCCEEDED.title():
+        return True
+
+    return step_function_status in STOPPED_STEP_FUNCTION_STATUSES and all(
+        import_status[key][STATUS_KEY] in S3_BATCH_FINAL_STATUSES
+        for key in [METADATA_UPLOAD_KEY, ASSET_UPLOAD_KEY]
+    )
+
+
 def get_validation_outcome(
-    step_function_status: str, validation_errors: JsonList, validation_success: Optional[bool]
+    step_function_status: str,
+    has_validation_errors: bool,
+    validation_success: Optional[bool],
 ) -> Outcome:
     validation_status = SUCCESS_TO_VALIDATION_OUTCOME_MAPPING[validation_success]
     if validation_status == Outcome.PENDING:
         # Some statuses are not reported by the step function
-        if validation_errors:
+        if has_validation_errors:
             validation_status = Outcome.FAILED
         elif step_function_status not in [JOB_STATUS_RUNNING, JOB_STATUS_SUCCEEDED]:
             validation_status = Outcome.SKIPPED
@@ -138,19 +250,32 @@ def get_validation_outcome(
 def get_import_job_status(import_dataset_jobs: JsonObject, job_id_key: str) -> JsonObject:
     if s3_job_id := import_dataset_jobs.get(job_id_key):
         return get_s3_batch_copy_status(s3_job_id)
+    if direct_import_status := import_dataset_jobs.get(DIRECT_IMPORT_STATUS_KEYS[job_id_key]):
+        return direct_import_status  # type: ignore[no-any-return]
     return {STATUS_KEY: Outcome.PENDING.value, ERRORS_KEY: []}
 
 
-def get_step_function_validation_results(dataset_id: str, version_id: str) -> JsonList:
+def get_step_function_validation_results(
+    dataset_id: str, version_id: str, page: ValidationErrorsPage
+) -> JsonObject:
+    """
+    One page of failed validation results. The first page also has the number of failures of each
+    check across all pages. The next cursor is only included if there may be more results.
+    """
     hash_key = get_hash_key(dataset_id, version_id)
 
-    errors = []
     validation_results_model = validation_results_model_with_meta()
-    for validation_item in validation_results_model.validation_outcome_index.query(
+    failed_results = validation_results_model.validation_outcome_index.query(
         hash_key=hash_key,
         range_key_condition=validation_results_model.result == ValidationResult.FAILED.value,
-    ):
-        _, check_type, _, url = validation_item.sk.split("#", maxsplit=4)
+        limit=page.size,
+        page_size=page.size,
+        last_evaluated_key=page.start_key,
+    )
+
+    errors: JsonList = []
+    for validation_item in failed_results:
+        check_type, url = parse_validation_result_sort_key(validation_item.sk)
         errors.append(
             {
                 ERROR_CHECK_KEY: check_type,
@@ -160,7 +285,42 @@ def get_step_function_validation_results(dataset_id: str, version_id: str) -> Js
             }
         )
 
-    return errors
+    next_cursor = encode_cursor(failed_results.last_evaluated_key)
+    validation_results: JsonObject = {ERRORS_KEY: errors}
+
+    # Counting all the failures for every page would make listing them all quadratic
+    if page.start_key is None:
+        if next_cursor is None:
+            # All the failures fit in this page
+            error_counts = dict(Counter(error[ERROR_CHECK_KEY] for error in errors))
+        else:
+            error_counts = get_validation_error_counts(validation_results_model, hash_key)
+        validation_results[ERROR_COUNTS_KEY] = error_counts
+
+    if next_cursor is not None:
+        validation_results[NEXT_CURSOR_KEY] = next_cursor
+    return validation_results
+
+
+def get_validation_error_counts(
+    validation_results_model: Type[ValidationResultsModelBase], hash_key: str
+) -> Dict[str, int]:
+    failed_results = validation_results_model.validation_outcome_index.query(
+        hash_key=hash_key,
+        range_key_condition=validation_results_model.result == ValidationResult.FAILED.value,
+        attributes_to_get=[validation_results_model.sk.attr_name],
+    )
+    return dict(
+        Counter(
+            parse_validation_result_sort_key(validation_item.sk)[0]
+            for validation_item in failed_results
+        )
+    )
+
+
+def parse_validation_result_sort_key(sort_key: str) -> Tuple[str, str]:
+    _, check_type, _, url = sort_key.split(DB_KEY_SEPARATOR, maxsplit=3)
+    return check_type, url
 
 
 def get_s3_batch_copy_status(s3_batch_copy_job_id: str) -> JsonObject:
@@ -194,39 +354,53 @@ def get_hash_key(dataset_id: str, dataset_version_id: str) -> str:
     )
 
 
-class AssetGarbageCollector:
-    # pylint:disable=too-few-public-methods
+class AssetGarbageCollector:  # pylint:disable=too-many-instance-attributes
     def __init__(  # pylint:disable=too-many-arguments
         self,
         dataset_id: str,
         current_version_id: str,
+        new_version_id: str,
         processing_asset_type: ProcessingAssetType,
         logger: Logger,
         processing_assets_table_name: Optional[str] = None,
     ):
         self.dataset_id = dataset_id
         self.current_version_id = current_version_id
+        self.new_version_id = new_version_id
         self.hash_key = get_hash_key(self.dataset_id, self.current_version_id)
         self.processing_asset_type = processing_asset_type
         self.processing_assets_model = processing_assets_model_with_meta(
             assets_table_name=processing_assets_table_name
         )
         self.logger = logger
+        self.replaced_assets_writer = BatchWriter(self.processing_assets_model)
 
-    def mark_asset_as_replaced(self, filename: str) -> None:
+    def get_current_assets(self, filename: str) -> List[ProcessingAssetsModelBase]:
         if self.current_version_id == CURRENT_VERSION_EMPTY_VALUE:
-            return
-
-        for item in self.processing_assets_model.query(
-            self.hash_key,
-            range_key_condition=self.processing_assets_model.sk.startswith(
-                f"{self.processing_asset_type.value}{DB_KEY_SEPARATOR}"
-            ),
-            filter_condition=self.processing_assets_model.filename == filename,
-        ):
+            return []
+
+        return list(
+            self.processing_assets_model.filename_index.query(
+                self.hash_key,
+                range_key_condition=self.processing_assets_model.filename == filename,
+                filter_condition=self.processing_assets_model.sk.startswith(
+                    f"{self.processing_asset_type.value}{DB_KEY_SEPARATOR}"
+                ),
+            )
+        )
+
+    def mark_asset_as_replaced(self, filename: str) -> None:
+        self.mark_assets_as_replaced(self.get_current_assets(filename))
+
+    def mark_assets_as_replaced(self, items: Iterable[ProcessingAssetsModelBase]) -> None:
+        for item in items:
             self.logger.debug(
                 f"Dataset: '{self.dataset_id}' Version: '{self.current_version_id}' "
-                f"Filename: '{filename}' has been marked as replaced",
+                f"Filename: '{item.filename}' has been marked as replaced",
                 extra={GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
             )
-            item.update(actions=[self.processing_assets_model.replaced_in_new_version.set(True)])
+            item.replaced_in_version = self.new_version_id
+            self.replaced_assets_writer.save(item)
+
+    def flush(self) -> None:
+        self.replaced_assets_writer.flush()
@@ -1,21 +1,27 @@
 from typing import Final
 
+JOB_STATUS_ABORTED = "ABORTED"
 JOB_STATUS_FAILED = "FAILED"
 JOB_STATUS_RUNNING = "RUNNING"
 JOB_STATUS_SUCCEEDED = "SUCCEEDED"
+JOB_STATUS_TIMED_OUT = "TIMED_OUT"
 
 S3_BATCH_STATUS_FAILED: Final = "Failed"
 S3_BATCH_STATUS_CANCELLED: Final = "Cancelled"
 S3_BATCH_STATUS_COMPLETE: Final = "Complete"
 
+ASSET_COUNT_KEY = "asset_count"
 ASSET_UPLOAD_KEY = "asset_upload"
+CHECK_STAC_METADATA_KEY = "check_stac_metadata"
 CURRENT_VERSION_ID_KEY = "current_version_id"
 CURRENT_VERSION_EMPTY_VALUE = "None"
 DATASET_ID_KEY = "dataset_id"
 DATASET_ID_SHORT_KEY = "id"
+DATASETS_KEY = "datasets"
 DESCRIPTION_KEY = "description"
 ERRORS_KEY = "errors"
 ERROR_CHECK_KEY = "check"
+ERROR_COUNTS_KEY = "error_counts"
 ERROR_DETAILS_KEY = "details"
 ERROR_RESULT_KEY = "result"
 ERROR_URL_KEY = "url"
@@ -34,6 +40,7 @@ S3_BATCH_RESPONSE_KEY = "s3_batch_response"
 S3_ROLE_ARN_KEY = "s3_role_arn"
 STATUS_KEY = "status"
 STEP_FUNCTION_KEY = "step_function"
+TASK_TOKEN_KEY = "task_token"
 DATASET_TITLE_KEY = "title"
 UPDATE_DATASET_KEY = "update_root_catalog"
 UPLOAD_STATUS_KEY = "upload_status"
@@ -1,16 +1,14 @@
 from functools import lru_cache
 from typing import TYPE_CHECKING
 
-import boto3
-
-from .boto3_config import CONFIG
+from .boto3_clients import lazy_client
 
 if TYPE_CHECKING:
     from mypy_boto3_sts import STSClient
 else:
     STSClient = object  # pragma: no mutate
 
-STS_CLIENT: STSClient = boto3.client("sts", config=CONFIG)
+STS_CLIENT: STSClient = lazy_client("sts")
 
 
 @lru_cache
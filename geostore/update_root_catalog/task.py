@@ -1,24 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from logging import Logger
 from os.path import basename
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, Iterator, List
 from urllib.parse import urlparse
 from uuid import uuid4
 
-import boto3
 from jsonschema import ValidationError, validate
 from linz_logger import get_log
 
-from ..boto3_config import CONFIG
+from ..boto3_clients import lazy_client, lazy_resource
 from ..datasets_model import datasets_model_with_meta
 from ..error_response_keys import ERROR_MESSAGE_KEY
 from ..logging_keys import (
     GIT_COMMIT,
     LOG_MESSAGE_LAMBDA_FAILURE,
     LOG_MESSAGE_LAMBDA_START,
+    LOG_MESSAGE_S3_DELETION_FAILURES,
     LOG_MESSAGE_S3_DELETION_RESPONSE,
 )
 from ..models import DATASET_ID_PREFIX
-from ..parameter_store import ParameterName, get_param
+from ..parameter_store import ParameterName, get_param, preload_params
 from ..processing_assets_model import processing_assets_model_with_meta
 from ..resources import Resource
 from ..s3 import S3_URL_PREFIX
@@ -36,17 +38,30 @@ from ..types import JsonObject
 if TYPE_CHECKING:
     # When type checking we want to use the third party package's stub
     from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import DeleteTypeDef, ErrorTypeDef, ObjectIdentifierTypeDef
     from mypy_boto3_sqs import SQSServiceResource
 else:
     # In production we want to avoid depending on a package which has no runtime impact
+    DeleteTypeDef = ErrorTypeDef = ObjectIdentifierTypeDef = dict  # pragma: no mutate
     S3Client = SQSServiceResource = object  # pragma: no mutate
 
 LOGGER: Logger = get_log()
-SQS_RESOURCE: SQSServiceResource = boto3.resource("sqs")
-S3_CLIENT: S3Client = boto3.client("s3", config=CONFIG)
+SQS_RESOURCE: SQSServiceResource = lazy_resource("sqs")
+S3_CLIENT: S3Client = lazy_client("s3")
 
 SQS_MESSAGE_GROUP_ID = "update_root_catalog_message_group"
 
+DELETE_OBJECTS_MAX_KEYS = 1_000
+# Matches the default botocore connection pool size
+MAX_CONCURRENT_DELETIONS = 10
+
+preload_params(
+    ParameterName.GIT_COMMIT,
+    ParameterName.PROCESSING_ASSETS_TABLE_NAME,
+    ParameterName.STORAGE_DATASETS_TABLE_NAME,
+    ParameterName.UPDATE_CATALOG_MESSAGE_QUEUE_NAME,
+)
+
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     """Main Lambda entry point."""
@@ -98,18 +113,19 @@ def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     )
 
     processing_assets_model = processing_assets_model_with_meta()
-    for item in processing_assets_model.query(
+    unreplaced_items = processing_assets_model.query(
         get_hash_key(event[DATASET_ID_KEY], event[CURRENT_VERSION_ID_KEY]),
-        filter_condition=processing_assets_model.replaced_in_new_version.does_not_exist(),
-    ):
-        s3_response = S3_CLIENT.delete_object(
-            Bucket=Resource.STORAGE_BUCKET_NAME.resource_name,
-            Key=f"{event[DATASET_TITLE_KEY]}/{item.filename}",
-        )
-        LOGGER.debug(
-            LOG_MESSAGE_S3_DELETION_RESPONSE,
-            extra={"response": s3_response, GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+        filter_condition=(
+            processing_assets_model.replaced_in_version.does_not_exist()
+            | (processing_assets_model.replaced_in_version != event[NEW_VERSION_ID_KEY])
         )
+        & processing_assets_model.replaced_in_new_version.does_not_exist(),
+        attributes_to_get=[processing_assets_model.filename.attr_name],
+    )
+    delete_s3_objects(
+        Resource.STORAGE_BUCKET_NAME.resource_name,
+        (f"{event[DATASET_TITLE_KEY]}/{item.filename}" for item in unreplaced_items),
+    )
 
     # Update dataset record with the latest version
     datasets_model = datasets_model_with_meta()
@@ -123,3 +139,48 @@ def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
         f"{Resource.STORAGE_BUCKET_NAME.resource_name}/"
         f"{dataset_key}"
     }
+
+
+class S3DeletionError(Exception):
+    pass
+
+
+def delete_s3_objects(bucket_name: str, keys: Iterable[str]) -> None:
+    """
+    Delete the objects in batches, each sent while the following keys are still being read.
+    Failures of individual keys are logged and raised once every batch has been sent.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DELETIONS) as executor:
+        futures = [
+            executor.submit(delete_s3_object_batch, bucket_name, batch)
+            for batch in batched(keys, DELETE_OBJECTS_MAX_KEYS)
+        ]
+
+    errors = [error for future in futures for error in future.result()]
+    if errors:
+        LOGGER.warning(
+            LOG_MESSAGE_S3_DELETION_FAILURES,
+            extra={"errors": errors, GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+        )
+        raise S3DeletionError(f"Failed to delete {len(errors)} objects from {bucket_name}")
+
+
+def delete_s3_object_batch(bucket_name: str, keys: List[str]) -> List[ErrorTypeDef]:
+    # Quiet mode only reports the keys which could not be deleted
+    s3_response = S3_CLIENT.delete_objects(
+        Bucket=bucket_name,
+        Delete=DeleteTypeDef(
+            Objects=[ObjectIdentifierTypeDef(Key=key) for key in keys], Quiet=True
+        ),
+    )
+    LOGGER.debug(
+        LOG_MESSAGE_S3_DELETION_RESPONSE,
+        extra={"response": s3_response, GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+    )
+    return s3_response.get("Errors", [])
+
+
+def batched(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
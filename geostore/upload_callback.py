@@ -0,0 +1,96 @@
+"""
+Resume dataset version creation executions waiting for the S3 Batch Operations jobs of their
+import, rather than having them poll the job statuses.
+"""
+from json import dumps
+from logging import Logger
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from botocore.exceptions import ClientError
+from linz_logger import get_log
+from pynamodb.exceptions import DoesNotExist
+
+from .boto3_clients import lazy_client
+from .logging_keys import GIT_COMMIT
+from .parameter_store import ParameterName, get_param
+from .step_function_keys import (
+    S3_BATCH_STATUS_CANCELLED,
+    S3_BATCH_STATUS_COMPLETE,
+    S3_BATCH_STATUS_FAILED,
+)
+from .sts import get_account_number
+from .upload_task_tokens_model import UploadTaskTokensModelBase, upload_task_tokens_model_with_meta
+
+if TYPE_CHECKING:
+    # When type checking we want to use the third party package's stub
+    from mypy_boto3_s3control import S3ControlClient
+    from mypy_boto3_stepfunctions import SFNClient
+else:
+    # In production we want to avoid depending on a package which has no runtime impact
+    S3ControlClient = SFNClient = object  # pragma: no mutate
+
+LOGGER: Logger = get_log()
+
+STEP_FUNCTIONS_CLIENT: SFNClient = lazy_client("stepfunctions")
+S3CONTROL_CLIENT: S3ControlClient = lazy_client("s3control")
+
+S3_BATCH_UNSUCCESSFUL_STATUSES = {S3_BATCH_STATUS_CANCELLED, S3_BATCH_STATUS_FAILED}
+S3_BATCH_FINAL_STATUSES = {S3_BATCH_STATUS_COMPLETE, *S3_BATCH_UNSUCCESSFUL_STATUSES}
+
+# The execution has already been resumed, or has stopped waiting
+STALE_TASK_TOKEN_ERROR_CODES = {"InvalidToken", "TaskDoesNotExist", "TaskTimedOut"}
+
+LOG_MESSAGE_UPLOAD_CALLBACK_SENT = "Upload Callback Sent"
+LOG_MESSAGE_STALE_TASK_TOKEN = "Stale Task Token"
+
+
+def save_upload_task_token(task_token: str, job_ids: List[str]) -> None:
+    upload_task_tokens_model = upload_task_tokens_model_with_meta()
+    with upload_task_tokens_model.batch_write() as batch:
+        for job_id in job_ids:
+            batch.save(
+                upload_task_tokens_model(job_id=job_id, task_token=task_token, job_ids=set(job_ids))
+            )
+
+
+def get_upload_task_token(job_id: str) -> Optional[UploadTaskTokensModelBase]:
+    upload_task_tokens_model = upload_task_tokens_model_with_meta()
+    try:
+        return upload_task_tokens_model.get(job_id, consistent_read=True)
+    except DoesNotExist:
+        return None
+
+
+def get_job_status(job_id: str) -> str:
+    response = S3CONTROL_CLIENT.describe_job(AccountId=get_account_number(), JobId=job_id)
+    assert "Job" in response, response
+    return response["Job"]["Status"]
+
+
+def are_uploads_finished(job_statuses: Iterable[str]) -> bool:
+    """The import can go on once every job is complete or as soon as any job is unsuccessful."""
+    statuses = set(job_statuses)
+    return statuses <= {S3_BATCH_STATUS_COMPLETE} or bool(statuses & S3_BATCH_UNSUCCESSFUL_STATUSES)
+
+
+def resume_if_uploads_finished(task_token: str, job_statuses: Dict[str, str]) -> bool:
+    """Returns whether the uploads are finished. Resuming an execution twice is harmless."""
+    if not are_uploads_finished(job_statuses.values()):
+        return False
+
+    try:
+        STEP_FUNCTIONS_CLIENT.send_task_success(taskToken=task_token, output=dumps(job_statuses))
+    except ClientError as error:
+        if error.response["Error"]["Code"] not in STALE_TASK_TOKEN_ERROR_CODES:
+            raise
+        LOGGER.debug(
+            LOG_MESSAGE_STALE_TASK_TOKEN,
+            extra={"job_statuses": job_statuses, GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+        )
+    else:
+        LOGGER.debug(
+            LOG_MESSAGE_UPLOAD_CALLBACK_SENT,
+            extra={"job_statuses": job_statuses, GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+        )
+
+    return True
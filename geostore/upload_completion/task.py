@@ -0,0 +1,79 @@
+from logging import Logger
+
+from jsonschema import validate
+from linz_logger import get_log
+
+from ..logging_keys import GIT_COMMIT, LOG_MESSAGE_LAMBDA_START
+from ..parameter_store import ParameterName, get_param, preload_params
+from ..types import JsonObject
+from ..upload_callback import get_job_status, get_upload_task_token, resume_if_uploads_finished
+
+# S3 Batch Operations job status change events, as delivered by EventBridge from CloudTrail
+EVENT_SOURCE = "aws.s3"
+EVENT_DETAIL_TYPE = "AWS Service Event via CloudTrail"
+JOB_STATUS_CHANGED_EVENT_NAME = "JobStatusChanged"
+DETAIL_KEY = "detail"
+EVENT_NAME_KEY = "eventName"
+SERVICE_EVENT_DETAILS_KEY = "serviceEventDetails"
+JOB_ID_KEY = "jobId"
+JOB_STATUS_KEY = "status"
+
+LOG_MESSAGE_UNKNOWN_JOB = "Unknown Job"
+
+LOGGER: Logger = get_log()
+
+preload_params(ParameterName.GIT_COMMIT, ParameterName.PROCESSING_UPLOAD_TASK_TOKENS_TABLE_NAME)
+
+
+def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
+    """Resume the execution waiting for the job, if its import jobs have all finished."""
+    LOGGER.debug(
+        LOG_MESSAGE_LAMBDA_START,
+        extra={"lambda_input": event, GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+    )
+
+    validate(
+        event,
+        {
+            "type": "object",
+            "properties": {
+                DETAIL_KEY: {
+                    "type": "object",
+                    "properties": {
+                        SERVICE_EVENT_DETAILS_KEY: {
+                            "type": "object",
+                            "properties": {
+                                JOB_ID_KEY: {"type": "string"},
+                                JOB_STATUS_KEY: {"type": "string"},
+                            },
+                            "required": [JOB_ID_KEY, JOB_STATUS_KEY],
+                        },
+                    },
+                    "required": [SERVICE_EVENT_DETAILS_KEY],
+                },
+            },
+            "required": [DETAIL_KEY],
+        },
+    )
+
+    job_details = event[DETAIL_KEY][SERVICE_EVENT_DETAILS_KEY]
+    job_id = job_details[JOB_ID_KEY]
+
+    upload_task_token = get_upload_task_token(job_id)
+    if upload_task_token is None:
+        # Not an import job, or the execution is not waiting yet and will check the job itself
+        LOGGER.debug(
+            LOG_MESSAGE_UNKNOWN_JOB,
+            extra={"job_id": job_id, GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+        )
+        return {}
+
+    job_statuses = {
+        other_job_id: get_job_status(other_job_id)
+        for other_job_id in upload_task_token.job_ids
+        if other_job_id != job_id
+    }
+    job_statuses[job_id] = job_details[JOB_STATUS_KEY]
+    resume_if_uploads_finished(upload_task_token.task_token, job_statuses)
+
+    return {}
@@ -6,7 +6,7 @@ from linz_logger import get_log
 from ..api_keys import SUCCESS_KEY
 from ..import_file_batch_job_id_keys import ASSET_JOB_ID_KEY, METADATA_JOB_ID_KEY
 from ..logging_keys import GIT_COMMIT, LOG_MESSAGE_LAMBDA_START
-from ..parameter_store import ParameterName, get_param
+from ..parameter_store import ParameterName, get_param, preload_params
 from ..step_function import get_tasks_status
 from ..step_function_keys import (
     ASSET_UPLOAD_KEY,
@@ -24,6 +24,8 @@ EXECUTION_ID_KEY = "execution_id"
 
 LOGGER: Logger = get_log()
 
+preload_params(ParameterName.GIT_COMMIT, ParameterName.STORAGE_VALIDATION_RESULTS_TABLE_NAME)
+
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     LOGGER.debug(
@@ -48,8 +50,13 @@ def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
                     "properties": {
                         METADATA_JOB_ID_KEY: {"type": "string"},
                         ASSET_JOB_ID_KEY: {"type": "string"},
+                        METADATA_UPLOAD_KEY: {"type": "object"},
+                        ASSET_UPLOAD_KEY: {"type": "object"},
                     },
-                    "required": [METADATA_JOB_ID_KEY, ASSET_JOB_ID_KEY],
+                    "anyOf": [
+                        {"required": [METADATA_JOB_ID_KEY, ASSET_JOB_ID_KEY]},
+                        {"required": [METADATA_UPLOAD_KEY, ASSET_UPLOAD_KEY]},
+                    ],
                 },
             },
             "required": [DATASET_ID_KEY, NEW_VERSION_ID_KEY, VALIDATION_KEY, IMPORT_DATASET_KEY],
@@ -61,10 +68,7 @@ def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
         event[DATASET_ID_KEY],
         event[NEW_VERSION_ID_KEY],
         event[VALIDATION_KEY][SUCCESS_KEY],
-        {
-            METADATA_JOB_ID_KEY: event[IMPORT_DATASET_KEY][METADATA_JOB_ID_KEY],
-            ASSET_JOB_ID_KEY: event[IMPORT_DATASET_KEY][ASSET_JOB_ID_KEY],
-        },
+        event[IMPORT_DATASET_KEY],
     )
     return {
         key: raw_import_status[key]
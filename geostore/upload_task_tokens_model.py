@@ -0,0 +1,50 @@
+from datetime import timedelta
+from os import environ
+from typing import Any, Dict, Optional, Tuple, Type
+
+from pynamodb.attributes import TTLAttribute, UnicodeAttribute, UnicodeSetAttribute
+from pynamodb.models import MetaModel, Model
+
+from .aws_keys import AWS_DEFAULT_REGION_KEY
+from .parameter_store import ParameterName, get_param
+
+# Executions still waiting after this have fallen back to polling the upload status
+UPLOAD_TASK_TOKEN_LIFETIME = timedelta(days=1)
+
+
+class UploadTaskTokensModelBase(Model):
+    """Task token of an execution waiting for the S3 Batch Operations jobs of its import."""
+
+    job_id = UnicodeAttribute(hash_key=True, attr_name="pk")
+    task_token = UnicodeAttribute()
+    job_ids = UnicodeSetAttribute()
+    expires_at = TTLAttribute(default_for_new=UPLOAD_TASK_TOKEN_LIFETIME)
+
+
+class UploadTaskTokensModelMeta(MetaModel):
+    def __new__(
+        cls,
+        name: str,
+        bases: Tuple[Type[object], ...],
+        namespace: Dict[str, Any],
+        discriminator: Optional[Any] = None,
+    ) -> "UploadTaskTokensModelMeta":
+        namespace["Meta"] = type(
+            "Meta",
+            (),
+            {
+                "table_name": get_param(ParameterName.PROCESSING_UPLOAD_TASK_TOKENS_TABLE_NAME),
+                "region": environ[AWS_DEFAULT_REGION_KEY],
+            },
+        )
+        klass: "UploadTaskTokensModelMeta" = MetaModel.__new__(  # type: ignore[no-untyped-call]
+            cls, name, bases, namespace, discriminator=discriminator
+        )
+        return klass
+
+
+def upload_task_tokens_model_with_meta() -> Type[UploadTaskTokensModelBase]:
+    class UploadTaskTokensModel(UploadTaskTokensModelBase, metaclass=UploadTaskTokensModelMeta):
+        pass
+
+    return UploadTaskTokensModel
@@ -8,6 +8,7 @@ from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
 from pynamodb.models import MetaModel, Model
 
 from .aws_keys import AWS_DEFAULT_REGION_KEY
+from .batch_writer import BatchWriter
 from .check import Check
 from .models import CHECK_ID_PREFIX, DB_KEY_SEPARATOR, URL_ID_PREFIX
 from .parameter_store import ParameterName, get_param
@@ -77,12 +78,13 @@ def validation_results_model_with_meta(
     return ValidationResultsModel
 
 
-class ValidationResultFactory:  # pylint:disable=too-few-public-methods
+class ValidationResultFactory:
     def __init__(self, hash_key: str, results_table_name: str):
         self.hash_key = hash_key
         self.validation_results_model = validation_results_model_with_meta(
             results_table_name=results_table_name
         )
+        self.batch_writer = BatchWriter(self.validation_results_model)
 
     def save(
         self,
@@ -92,9 +94,14 @@ class ValidationResultFactory:  # pylint:disable=too-few-public-methods
         *,
         details: Optional[JsonObject] = None,
     ) -> None:
-        self.validation_results_model(
-            pk=self.hash_key,
-            sk=f"{CHECK_ID_PREFIX}{check.value}{DB_KEY_SEPARATOR}{URL_ID_PREFIX}{url}",
-            result=result.value,
-            details=details,
-        ).save()
+        self.batch_writer.save(
+            self.validation_results_model(
+                pk=self.hash_key,
+                sk=f"{CHECK_ID_PREFIX}{check.value}{DB_KEY_SEPARATOR}{URL_ID_PREFIX}{url}",
+                result=result.value,
+                details=details,
+            )
+        )
+
+    def flush(self) -> None:
+        self.batch_writer.flush()
@@ -7,7 +7,7 @@ from ..api_keys import SUCCESS_KEY
 from ..error_response_keys import ERROR_MESSAGE_KEY
 from ..logging_keys import GIT_COMMIT, LOG_MESSAGE_LAMBDA_START, LOG_MESSAGE_VALIDATION_COMPLETE
 from ..models import DATASET_ID_PREFIX, DB_KEY_SEPARATOR, VERSION_ID_PREFIX
-from ..parameter_store import ParameterName, get_param
+from ..parameter_store import ParameterName, get_param, preload_params
 from ..step_function import Outcome
 from ..step_function_keys import DATASET_ID_KEY, NEW_VERSION_ID_KEY
 from ..types import JsonObject
@@ -15,6 +15,8 @@ from ..validation_results_model import ValidationResult, validation_results_mode
 
 LOGGER: Logger = get_log()
 
+preload_params(ParameterName.GIT_COMMIT, ParameterName.STORAGE_VALIDATION_RESULTS_TABLE_NAME)
+
 
 def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
     LOGGER.debug(
@@ -0,0 +1,57 @@
+from logging import Logger
+
+from jsonschema import validate
+from linz_logger import get_log
+
+from ..import_file_batch_job_id_keys import ASSET_JOB_ID_KEY, METADATA_JOB_ID_KEY
+from ..logging_keys import GIT_COMMIT, LOG_MESSAGE_LAMBDA_START
+from ..parameter_store import ParameterName, get_param, preload_params
+from ..step_function_keys import IMPORT_DATASET_KEY, TASK_TOKEN_KEY
+from ..types import JsonObject
+from ..upload_callback import get_job_status, resume_if_uploads_finished, save_upload_task_token
+
+LOGGER: Logger = get_log()
+
+preload_params(ParameterName.GIT_COMMIT, ParameterName.PROCESSING_UPLOAD_TASK_TOKENS_TABLE_NAME)
+
+
+def lambda_handler(event: JsonObject, _context: bytes) -> JsonObject:
+    """
+    Store the task token of the execution so that it is resumed when the import jobs finish. The
+    execution waits for the callback rather than for the result of this function.
+    """
+    LOGGER.debug(
+        LOG_MESSAGE_LAMBDA_START,
+        extra={"lambda_input": event, GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)},
+    )
+
+    validate(
+        event,
+        {
+            "type": "object",
+            "properties": {
+                TASK_TOKEN_KEY: {"type": "string"},
+                IMPORT_DATASET_KEY: {
+                    "type": "object",
+                    "properties": {
+                        METADATA_JOB_ID_KEY: {"type": "string"},
+                        ASSET_JOB_ID_KEY: {"type": "string"},
+                    },
+                    "required": [METADATA_JOB_ID_KEY, ASSET_JOB_ID_KEY],
+                },
+            },
+            "required": [TASK_TOKEN_KEY, IMPORT_DATASET_KEY],
+        },
+    )
+
+    task_token = event[TASK_TOKEN_KEY]
+    job_ids = [
+        event[IMPORT_DATASET_KEY][METADATA_JOB_ID_KEY],
+        event[IMPORT_DATASET_KEY][ASSET_JOB_ID_KEY],
+    ]
+    save_upload_task_token(task_token, job_ids)
+
+    # Jobs which finished before the token was stored will not resume the execution
+    resume_if_uploads_finished(task_token, {job_id: get_job_status(job_id) for job_id in job_ids})
+
+    return {}
@@ -79,6 +79,7 @@ class Application(Stack):
             botocore_lambda_layer=lambda_layers.botocore,
             datasets_table=storage.datasets_table,
             env_name=env_name,
+            import_statuses_table=storage.import_statuses_table,
             processing_assets_table=processing.processing_assets_table,
             state_machine=processing.state_machine,
             state_machine_parameter=processing.state_machine_parameter,
@@ -94,6 +95,7 @@ class Application(Stack):
             "notify",
             botocore_lambda_layer=lambda_layers.botocore,
             env_name=env_name,
+            import_statuses_table=storage.import_statuses_table,
             state_machine=processing.state_machine,
             validation_results_table=storage.validation_results_table,
             git_commit_parameter=storage.git_commit_parameter,
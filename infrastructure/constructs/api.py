@@ -6,11 +6,14 @@ from aws_cdk import (
     aws_sqs,
     aws_ssm,
     aws_stepfunctions,
+    triggers,
 )
 from constructs import Construct
 
+from geostore.environment import ENV_NAME_VARIABLE_NAME
 from geostore.resources import Resource
 
+from .bundled_lambda_function import BundledLambdaFunction
 from .common import grant_parameter_read_access
 from .lambda_endpoint import LambdaEndpoint
 from .roles import LINZ_ORGANIZATION_ID, MAX_SESSION_DURATION
@@ -27,6 +30,7 @@ class API(Construct):
         botocore_lambda_layer: aws_lambda_python_alpha.PythonLayerVersion,
         datasets_table: Table,
         env_name: str,
+        import_statuses_table: Table,
         processing_assets_table: Table,
         state_machine: aws_stepfunctions.StateMachine,
         state_machine_parameter: aws_ssm.StringParameter,
@@ -76,7 +80,26 @@ class API(Construct):
 
         sqs_queue.grant_send_messages(datasets_endpoint_lambda)
 
-        for function in [datasets_endpoint_lambda, dataset_versions_endpoint_lambda]:
+        # Datasets created before the listing index existed aren't listed until this has run
+        backfill_dataset_record_types_function = BundledLambdaFunction(
+            self,
+            "BackfillDatasetRecordTypesFunction",
+            lambda_directory="backfill_dataset_record_types",
+            extra_environment={ENV_NAME_VARIABLE_NAME: env_name},
+            botocore_lambda_layer=botocore_lambda_layer,
+        )
+        triggers.Trigger(
+            self,
+            "BackfillDatasetRecordTypes",
+            handler=backfill_dataset_record_types_function,
+            execute_after=[datasets_table],
+        )
+
+        for function in [
+            datasets_endpoint_lambda,
+            dataset_versions_endpoint_lambda,
+            backfill_dataset_record_types_function,
+        ]:
             datasets_table.grant_read_write_data(function)
             datasets_table.grant(function, "dynamodb:DescribeTable")  # required by pynamodb
 
@@ -89,6 +112,10 @@ class API(Construct):
             botocore_lambda_layer=botocore_lambda_layer,
         )
 
+        import_statuses_table.grant_read_write_data(import_status_endpoint_lambda)
+        import_statuses_table.grant(
+            import_status_endpoint_lambda, "dynamodb:DescribeTable"
+        )  # required by pynamodb
         validation_results_table.grant_read_data(import_status_endpoint_lambda)
         validation_results_table.grant(
             import_status_endpoint_lambda, "dynamodb:DescribeTable"
@@ -102,12 +129,15 @@ class API(Construct):
                 datasets_table.name_parameter: [
                     datasets_endpoint_lambda,
                     dataset_versions_endpoint_lambda,
+                    backfill_dataset_record_types_function,
                 ],
+                import_statuses_table.name_parameter: [import_status_endpoint_lambda],
                 processing_assets_table.name_parameter: [dataset_versions_endpoint_lambda],
                 validation_results_table.name_parameter: [import_status_endpoint_lambda],
                 state_machine_parameter: [dataset_versions_endpoint_lambda],
                 sqs_queue_parameter: [datasets_endpoint_lambda],
                 git_commit_parameter: [
+                    backfill_dataset_record_types_function,
                     datasets_endpoint_lambda,
                     dataset_versions_endpoint_lambda,
                     import_status_endpoint_lambda,
@@ -1,5 +1,6 @@
 import tempfile
 from dataclasses import dataclass
+from os import makedirs
 from re import sub
 from subprocess import check_call, check_output
 from sys import executable
@@ -7,9 +8,13 @@ from typing import List
 
 from aws_cdk import BundlingOptions, aws_lambda
 
+from geostore.check_stac_metadata.stac_validators import SCHEMAS_SNAPSHOT_FILE_NAME
+
 from .backend import BACKEND_DIRECTORY
 from .lambda_config import PYTHON_RUNTIME
 
+CHECK_STAC_METADATA_LAMBDA_DIRECTORY = "check_stac_metadata"
+
 
 def poetry_export_extras(lambda_directory: str) -> List[str]:
     # There isn't an elegant way of getting poetry to install package dependencies in a bespoke
@@ -45,6 +50,22 @@ def pip_install_requirements(lambda_directory: str, export_extras: List[str]) ->
     )
 
 
+def write_stac_schemas_snapshot(lambda_directory: str) -> None:
+    # Compile the STAC schemas once at build time rather than at every cold start
+    package_directory = (
+        f"{LambdaPackaging.directory}/{lambda_directory}/geostore/{lambda_directory}"
+    )
+    makedirs(package_directory, exist_ok=True)
+    check_call(
+        [
+            executable,
+            "-m",
+            "geostore.check_stac_metadata.stac_validators",
+            f"{package_directory}/{SCHEMAS_SNAPSHOT_FILE_NAME}",
+        ]
+    )
+
+
 @dataclass
 class LambdaPackaging:
     directory = tempfile.mkdtemp(dir=BACKEND_DIRECTORY, prefix=".lambda_out_")
@@ -53,6 +74,8 @@ class LambdaPackaging:
 def bundled_code(lambda_directory: str) -> aws_lambda.Code:
     export_extras = poetry_export_extras(lambda_directory)
     pip_install_requirements(lambda_directory, export_extras)
+    if lambda_directory == CHECK_STAC_METADATA_LAMBDA_DIRECTORY:
+        write_stac_schemas_snapshot(lambda_directory)
     bundling_options = BundlingOptions(
         image=PYTHON_RUNTIME.bundling_image,  # pylint:disable=no-member
         command=[
@@ -24,6 +24,7 @@ class BundledLambdaFunction(aws_lambda.Function):
         botocore_lambda_layer: aws_lambda_python_alpha.PythonLayerVersion,
         timeout: Duration = DEFAULT_LAMBDA_TIMEOUT,
         reserved_concurrent_executions: Optional[int] = None,
+        function_name: Optional[str] = None,
     ):
         environment = {"LOGLEVEL": LOG_LEVEL}
         if extra_environment is not None:
@@ -40,4 +41,5 @@ class BundledLambdaFunction(aws_lambda.Function):
             timeout=timeout,
             memory_size=DEFAULT_LAMBDA_MAX_MEMORY_MEBIBYTES,
             reserved_concurrent_executions=reserved_concurrent_executions,
+            function_name=function_name,
         )
@@ -1,10 +1,11 @@
 from typing import Mapping, Optional
 
-from aws_cdk import aws_lambda_python_alpha, aws_stepfunctions_tasks
+from aws_cdk import Duration, aws_lambda_python_alpha, aws_stepfunctions_tasks
 from aws_cdk.aws_stepfunctions import JsonPath
 from constructs import Construct
 
 from .bundled_lambda_function import BundledLambdaFunction
+from .lambda_config import DEFAULT_LAMBDA_TIMEOUT
 
 
 class LambdaTask(aws_stepfunctions_tasks.LambdaInvoke):
@@ -17,6 +18,8 @@ class LambdaTask(aws_stepfunctions_tasks.LambdaInvoke):
         botocore_lambda_layer: aws_lambda_python_alpha.PythonLayerVersion,
         result_path: Optional[str] = JsonPath.DISCARD,
         extra_environment: Optional[Mapping[str, str]] = None,
+        timeout: Duration = DEFAULT_LAMBDA_TIMEOUT,
+        function_name: Optional[str] = None,
     ):
         self.lambda_function = BundledLambdaFunction(
             scope,
@@ -24,6 +27,8 @@ class LambdaTask(aws_stepfunctions_tasks.LambdaInvoke):
             lambda_directory=lambda_directory,
             extra_environment=extra_environment,
             botocore_lambda_layer=botocore_lambda_layer,
+            timeout=timeout,
+            function_name=function_name,
         )
 
         super().__init__(
@@ -30,6 +30,7 @@ class Notify(Construct):
         *,
         botocore_lambda_layer: aws_lambda_python_alpha.PythonLayerVersion,
         env_name: str,
+        import_statuses_table: Table,
         state_machine: aws_stepfunctions.StateMachine,
         validation_results_table: Table,
         git_commit_parameter: aws_ssm.StringParameter,
@@ -51,6 +52,8 @@ class Notify(Construct):
                 environ[SLACK_URL_ENV_NAME],
             )
 
+        import_statuses_table.grant_read_write_data(slack_notify_function)
+        import_statuses_table.grant(slack_notify_function, "dynamodb:DescribeTable")
         validation_results_table.grant_read_data(slack_notify_function)
         validation_results_table.grant(slack_notify_function, "dynamodb:DescribeTable")
         state_machine.grant_read(slack_notify_function)
@@ -75,6 +78,7 @@ class Notify(Construct):
         grant_parameter_read_access(
             {
                 sns_topic_arn_parameter: [slack_notify_function],
+                import_statuses_table.name_parameter: [slack_notify_function],
                 validation_results_table.name_parameter: [
                     slack_notify_function,
                 ],
@@ -1,3 +1,5 @@
+from typing import List
+
 from aws_cdk import (
     Duration,
     Tags,
@@ -10,33 +12,52 @@ from aws_cdk import (
     aws_stepfunctions,
 )
 from aws_cdk.aws_lambda_event_sources import SqsEventSource
-from aws_cdk.aws_stepfunctions import Errors, Wait, WaitTime
+from aws_cdk.aws_stepfunctions import Errors, JsonPath, Wait, WaitTime
 from constructs import Construct
 
 from geostore.api_keys import SUCCESS_KEY
 from geostore.check_files_checksums.task import (
     ASSETS_TABLE_NAME_ARGUMENT,
+    BATCH_SIZE_ARGUMENT,
     CURRENT_VERSION_ID_ARGUMENT,
     DATASET_ID_ARGUMENT,
     DATASET_TITLE_ARGUMENT,
     FIRST_ITEM_ARGUMENT,
+    ITERATION_SIZE_ARGUMENT,
     NEW_VERSION_ID_ARGUMENT,
     RESULTS_TABLE_NAME_ARGUMENT,
     S3_ROLE_ARN_ARGUMENT,
+    VERIFY_CHECKSUMS_ON_IMPORT_ARGUMENT,
 )
 from geostore.content_iterator.task import (
+    ARRAY_SIZE_KEY,
     ASSETS_TABLE_NAME_KEY,
+    BATCH_SIZE_KEY,
     CONTENT_KEY,
     FIRST_ITEM_KEY,
     ITERATION_SIZE_KEY,
     NEXT_ITEM_KEY,
     RESULTS_TABLE_NAME_KEY,
+    SLICES_KEY,
+)
+from geostore.environment import (
+    DIRECT_IMPORT_MAX_BYTES_VARIABLE_NAME,
+    DIRECT_IMPORT_MAX_OBJECTS_VARIABLE_NAME,
+    ENV_NAME_VARIABLE_NAME,
+    INCREMENTAL_VERSIONS_VARIABLE_NAME,
+    VERIFY_CHECKSUMS_ON_IMPORT_VARIABLE_NAME,
+    checksum_slices_concurrency,
+    direct_import_max_bytes,
+    direct_import_max_objects,
+    incremental_versions,
+    verify_checksums_on_import,
 )
-from geostore.environment import ENV_NAME_VARIABLE_NAME
 from geostore.parameter_store import ParameterName
+from geostore.processing_assets_model import ProcessingAssetsFilenameIdx
 from geostore.resources import Resource
 from geostore.step_function_keys import (
     ASSET_UPLOAD_KEY,
+    CHECK_STAC_METADATA_KEY,
     CURRENT_VERSION_ID_KEY,
     DATASET_ID_KEY,
     DATASET_TITLE_KEY,
@@ -63,6 +84,14 @@ from .roles import MAX_SESSION_DURATION
 from .s3_policy import ALLOW_DESCRIBE_ANY_S3_JOB
 from .sts_policy import ALLOW_ASSUME_ANY_ROLE
 from .table import Table
+from .upload_callback import UploadCallback
+
+# Maximum batch size of FIFO queue event sources
+POPULATE_CATALOG_BATCH_SIZE = 10
+
+CHECK_FILES_CHECKSUMS_EXTRA_ARGUMENTS: List[str] = (
+    [VERIFY_CHECKSUMS_ON_IMPORT_ARGUMENT] if verify_checksums_on_import() else []
+)
 
 
 class Processing(Construct):
@@ -94,6 +123,18 @@ class Processing(Construct):
             sort_key=aws_dynamodb.Attribute(name="sk", type=aws_dynamodb.AttributeType.STRING),
         )
 
+        self.processing_assets_table.add_global_secondary_index(
+            index_name=ProcessingAssetsFilenameIdx.Meta.index_name,
+            partition_key=aws_dynamodb.Attribute(
+                name=ProcessingAssetsFilenameIdx.pk.attr_name,
+                type=aws_dynamodb.AttributeType.STRING,
+            ),
+            sort_key=aws_dynamodb.Attribute(
+                name=ProcessingAssetsFilenameIdx.filename.attr_name,
+                type=aws_dynamodb.AttributeType.STRING,
+            ),
+        )
+
         ############################################################################################
         # BATCH JOB DEPENDENCIES
         batch_job_queue = BatchJobQueue(
@@ -137,7 +178,14 @@ class Processing(Construct):
         )
 
         self.message_queue.grant_consume_messages(populate_catalog_lambda)
-        populate_catalog_lambda.add_event_source(SqsEventSource(self.message_queue, batch_size=1))
+        # FIFO queues don't support a batching window, so batches are whatever is already queued
+        populate_catalog_lambda.add_event_source(
+            SqsEventSource(
+                self.message_queue,
+                batch_size=POPULATE_CATALOG_BATCH_SIZE,
+                report_batch_item_failures=True,
+            )
+        )
 
         ############################################################################################
         # STATE MACHINE TASKS
@@ -147,7 +195,11 @@ class Processing(Construct):
             "CheckStacMetadata",
             lambda_directory="check_stac_metadata",
             botocore_lambda_layer=botocore_lambda_layer,
-            extra_environment={ENV_NAME_VARIABLE_NAME: env_name},
+            result_path=f"$.{CHECK_STAC_METADATA_KEY}",
+            extra_environment={
+                ENV_NAME_VARIABLE_NAME: env_name,
+                INCREMENTAL_VERSIONS_VARIABLE_NAME: str(incremental_versions()).lower(),
+            },
         )
         assert check_stac_metadata_task.lambda_function.role
         check_stac_metadata_task.lambda_function.role.add_managed_policy(
@@ -180,6 +232,10 @@ class Processing(Construct):
             f"{METADATA_URL_KEY}.$": f"$.{METADATA_URL_KEY}",
             f"{S3_ROLE_ARN_KEY}.$": f"$.{S3_ROLE_ARN_KEY}",
             f"{FIRST_ITEM_KEY}.$": f"$.{CONTENT_KEY}.{FIRST_ITEM_KEY}",
+            ITERATION_SIZE_KEY: aws_stepfunctions.JsonPath.format(
+                "{}", aws_stepfunctions.JsonPath.string_at(f"$.{CONTENT_KEY}.{ITERATION_SIZE_KEY}")
+            ),
+            f"{BATCH_SIZE_KEY}.$": f"$.{CONTENT_KEY}.{BATCH_SIZE_KEY}",
             f"{ASSETS_TABLE_NAME_KEY}.$": f"$.{CONTENT_KEY}.{ASSETS_TABLE_NAME_KEY}",
             f"{RESULTS_TABLE_NAME_KEY}.$": f"$.{CONTENT_KEY}.{RESULTS_TABLE_NAME_KEY}",
         }
@@ -202,17 +258,20 @@ class Processing(Construct):
                 f"Ref::{DATASET_TITLE_KEY}",
                 FIRST_ITEM_ARGUMENT,
                 f"Ref::{FIRST_ITEM_KEY}",
+                ITERATION_SIZE_ARGUMENT,
+                f"Ref::{ITERATION_SIZE_KEY}",
+                BATCH_SIZE_ARGUMENT,
+                f"Ref::{BATCH_SIZE_KEY}",
                 ASSETS_TABLE_NAME_ARGUMENT,
                 f"Ref::{ASSETS_TABLE_NAME_KEY}",
                 RESULTS_TABLE_NAME_ARGUMENT,
                 f"Ref::{RESULTS_TABLE_NAME_KEY}",
                 S3_ROLE_ARN_ARGUMENT,
                 f"Ref::{S3_ROLE_ARN_KEY}",
+                *CHECK_FILES_CHECKSUMS_EXTRA_ARGUMENTS,
             ],
         )
-        array_size = int(
-            aws_stepfunctions.JsonPath.number_at(f"$.{CONTENT_KEY}.{ITERATION_SIZE_KEY}")
-        )
+        array_size = int(aws_stepfunctions.JsonPath.number_at(f"$.{CONTENT_KEY}.{ARRAY_SIZE_KEY}"))
         check_files_checksums_array_task = BatchSubmitJobTask(
             self,
             "check-files-checksums-array-task",
@@ -232,12 +291,17 @@ class Processing(Construct):
                 f"Ref::{DATASET_TITLE_KEY}",
                 FIRST_ITEM_ARGUMENT,
                 f"Ref::{FIRST_ITEM_KEY}",
+                ITERATION_SIZE_ARGUMENT,
+                f"Ref::{ITERATION_SIZE_KEY}",
+                BATCH_SIZE_ARGUMENT,
+                f"Ref::{BATCH_SIZE_KEY}",
                 ASSETS_TABLE_NAME_ARGUMENT,
                 f"Ref::{ASSETS_TABLE_NAME_KEY}",
                 RESULTS_TABLE_NAME_ARGUMENT,
                 f"Ref::{RESULTS_TABLE_NAME_KEY}",
                 S3_ROLE_ARN_ARGUMENT,
                 f"Ref::{S3_ROLE_ARN_KEY}",
+                *CHECK_FILES_CHECKSUMS_EXTRA_ARGUMENTS,
             ],
             array_size=array_size,
         )
@@ -252,6 +316,24 @@ class Processing(Construct):
             self.processing_assets_table.grant(check_files_checksums_task, "dynamodb:DescribeTable")
             check_files_checksums_task.add_to_policy(ALLOW_ASSUME_ANY_ROLE)
 
+        # Each slice of the content iteration gets the dataset properties and its own content
+        check_files_checksums_slices = aws_stepfunctions.Map(
+            self,
+            "check_files_checksums_slices",
+            items_path=f"$.{CONTENT_KEY}.{SLICES_KEY}",
+            max_concurrency=checksum_slices_concurrency(),
+            parameters={
+                f"{DATASET_ID_KEY}.$": f"$.{DATASET_ID_KEY}",
+                f"{NEW_VERSION_ID_KEY}.$": f"$.{NEW_VERSION_ID_KEY}",
+                f"{CURRENT_VERSION_ID_KEY}.$": f"$.{CURRENT_VERSION_ID_KEY}",
+                f"{DATASET_TITLE_KEY}.$": f"$.{DATASET_TITLE_KEY}",
+                f"{METADATA_URL_KEY}.$": f"$.{METADATA_URL_KEY}",
+                f"{S3_ROLE_ARN_KEY}.$": f"$.{S3_ROLE_ARN_KEY}",
+                f"{CONTENT_KEY}.$": "$$.Map.Item.Value",
+            },
+            result_path=aws_stepfunctions.JsonPath.DISCARD,
+        )
+
         validation_summary_task = LambdaTask(
             self,
             "GetValidationSummary",
@@ -289,7 +371,14 @@ class Processing(Construct):
             lambda_directory="import_dataset",
             botocore_lambda_layer=botocore_lambda_layer,
             result_path=f"$.{IMPORT_DATASET_KEY}",
-            extra_environment={ENV_NAME_VARIABLE_NAME: env_name},
+            extra_environment={
+                ENV_NAME_VARIABLE_NAME: env_name,
+                VERIFY_CHECKSUMS_ON_IMPORT_VARIABLE_NAME: str(verify_checksums_on_import()).lower(),
+                DIRECT_IMPORT_MAX_OBJECTS_VARIABLE_NAME: str(direct_import_max_objects()),
+                DIRECT_IMPORT_MAX_BYTES_VARIABLE_NAME: str(direct_import_max_bytes()),
+            },
+            timeout=Duration.minutes(15),
+            function_name=Resource.IMPORT_DATASET_FUNCTION_NAME.resource_name,
         )
 
         import_dataset_task.lambda_function.add_to_role_policy(
@@ -302,6 +391,11 @@ class Processing(Construct):
             aws_iam.PolicyStatement(resources=["*"], actions=["s3:CreateJob"])
         )
 
+        # Small datasets are imported by invoking the import functions directly
+        import_asset_file_function.grant_invoke(import_dataset_task.lambda_function)
+        import_metadata_file_function.grant_invoke(import_dataset_task.lambda_function)
+        import_dataset_task.lambda_function.add_to_role_policy(ALLOW_ASSUME_ANY_ROLE)
+
         # Import status check
         wait_before_upload_status_check = Wait(
             self,
@@ -317,8 +411,24 @@ class Processing(Construct):
             extra_environment={ENV_NAME_VARIABLE_NAME: env_name},
         )
 
+        wait_before_upload_status_check.next(upload_status_task)
+
         upload_status_task.lambda_function.add_to_role_policy(ALLOW_DESCRIBE_ANY_S3_JOB)
 
+        # Import completion callback, falling back to polling if it does not arrive in time
+        upload_callback = UploadCallback(
+            self,
+            "upload-callback",
+            botocore_lambda_layer=botocore_lambda_layer,
+            env_name=env_name,
+            git_commit_parameter=git_commit_parameter,
+        )
+        upload_callback.wait_for_upload_task.add_catch(
+            errors=[Errors.ALL],
+            handler=wait_before_upload_status_check,
+            result_path=JsonPath.DISCARD,
+        )
+
         # Parameters
         import_asset_file_function_arn_parameter = aws_ssm.StringParameter(
             self,
@@ -449,15 +559,16 @@ class Processing(Construct):
             )
             .next(content_iterator_task)
             .next(
-                aws_stepfunctions.Choice(self, "check_files_checksums_maybe_array")
-                .when(
-                    aws_stepfunctions.Condition.number_equals(
-                        f"$.{CONTENT_KEY}.{ITERATION_SIZE_KEY}", 1
-                    ),
-                    check_files_checksums_single_task.batch_submit_job,
+                check_files_checksums_slices.iterator(
+                    aws_stepfunctions.Choice(self, "check_files_checksums_maybe_array")
+                    .when(
+                        aws_stepfunctions.Condition.number_equals(
+                            f"$.{CONTENT_KEY}.{ARRAY_SIZE_KEY}", 1
+                        ),
+                        check_files_checksums_single_task.batch_submit_job,
+                    )
+                    .otherwise(check_files_checksums_array_task.batch_submit_job)
                 )
-                .otherwise(check_files_checksums_array_task.batch_submit_job)
-                .afterwards()
             )
             .next(
                 aws_stepfunctions.Choice(self, "content_iteration_finished")
@@ -471,45 +582,54 @@ class Processing(Construct):
                             aws_stepfunctions.Condition.boolean_equals(
                                 f"$.{VALIDATION_KEY}.{SUCCESS_KEY}", True
                             ),
-                            import_dataset_task.next(wait_before_upload_status_check)
-                            .next(upload_status_task)
-                            .next(
-                                aws_stepfunctions.Choice(self, "import_completed")
+                            import_dataset_task.next(
+                                aws_stepfunctions.Choice(self, "imported_directly")
                                 .when(
-                                    aws_stepfunctions.Condition.and_(
-                                        aws_stepfunctions.Condition.string_equals(
-                                            f"$.upload_status.{ASSET_UPLOAD_KEY}.status",
-                                            S3_BATCH_STATUS_COMPLETE,
-                                        ),
-                                        aws_stepfunctions.Condition.string_equals(
-                                            f"$.upload_status.{METADATA_UPLOAD_KEY}.status",
-                                            S3_BATCH_STATUS_COMPLETE,
-                                        ),
+                                    aws_stepfunctions.Condition.is_present(
+                                        f"$.{IMPORT_DATASET_KEY}.{ASSET_UPLOAD_KEY}"
                                     ),
-                                    update_root_catalog.next(success_task),
-                                )
-                                .when(
-                                    aws_stepfunctions.Condition.or_(
-                                        aws_stepfunctions.Condition.string_equals(
-                                            f"$.upload_status.{ASSET_UPLOAD_KEY}.status",
-                                            S3_BATCH_STATUS_CANCELLED,
-                                        ),
-                                        aws_stepfunctions.Condition.string_equals(
-                                            f"$.upload_status.{ASSET_UPLOAD_KEY}.status",
-                                            S3_BATCH_STATUS_FAILED,
-                                        ),
-                                        aws_stepfunctions.Condition.string_equals(
-                                            f"$.upload_status.{METADATA_UPLOAD_KEY}.status",
-                                            S3_BATCH_STATUS_CANCELLED,
-                                        ),
-                                        aws_stepfunctions.Condition.string_equals(
-                                            f"$.upload_status.{METADATA_UPLOAD_KEY}.status",
-                                            S3_BATCH_STATUS_FAILED,
-                                        ),
+                                    upload_status_task.next(
+                                        aws_stepfunctions.Choice(self, "import_completed")
+                                        .when(
+                                            aws_stepfunctions.Condition.and_(
+                                                aws_stepfunctions.Condition.string_equals(
+                                                    f"$.upload_status.{ASSET_UPLOAD_KEY}.status",
+                                                    S3_BATCH_STATUS_COMPLETE,
+                                                ),
+                                                aws_stepfunctions.Condition.string_equals(
+                                                    f"$.upload_status.{METADATA_UPLOAD_KEY}.status",
+                                                    S3_BATCH_STATUS_COMPLETE,
+                                                ),
+                                            ),
+                                            update_root_catalog.next(success_task),
+                                        )
+                                        .when(
+                                            aws_stepfunctions.Condition.or_(
+                                                aws_stepfunctions.Condition.string_equals(
+                                                    f"$.upload_status.{ASSET_UPLOAD_KEY}.status",
+                                                    S3_BATCH_STATUS_CANCELLED,
+                                                ),
+                                                aws_stepfunctions.Condition.string_equals(
+                                                    f"$.upload_status.{ASSET_UPLOAD_KEY}.status",
+                                                    S3_BATCH_STATUS_FAILED,
+                                                ),
+                                                aws_stepfunctions.Condition.string_equals(
+                                                    f"$.upload_status.{METADATA_UPLOAD_KEY}.status",
+                                                    S3_BATCH_STATUS_CANCELLED,
+                                                ),
+                                                aws_stepfunctions.Condition.string_equals(
+                                                    f"$.upload_status.{METADATA_UPLOAD_KEY}.status",
+                                                    S3_BATCH_STATUS_FAILED,
+                                                ),
+                                            ),
+                                            upload_failure,
+                                        )
+                                        .otherwise(wait_before_upload_status_check)
                                     ),
-                                    upload_failure,
                                 )
-                                .otherwise(wait_before_upload_status_check)
+                                .otherwise(
+                                    upload_callback.wait_for_upload_task.next(upload_status_task)
+                                )
                             ),
                         )
                         .otherwise(validation_failure)
@@ -4,7 +4,8 @@ Geostore AWS resources definitions.
 from aws_cdk import Tags, aws_dynamodb, aws_iam, aws_s3, aws_ssm
 from constructs import Construct
 
-from geostore.datasets_model import DatasetsTitleIdx
+from geostore.datasets_model import DatasetsListIdx, DatasetsTitleIdx
+from geostore.import_statuses_model import ImportStatusesModelBase
 from geostore.parameter_store import ParameterName
 from geostore.resources import Resource
 from geostore.validation_results_model import ValidationOutcomeIdx
@@ -55,6 +56,8 @@ class Storage(Construct):
             "storage-bucket",
             bucket_name=Resource.STORAGE_BUCKET_NAME.resource_name,
             access_control=aws_s3.BucketAccessControl.PRIVATE,
+            # Server-side copies by dataset roles in other accounts are owned by this account
+            object_ownership=aws_s3.ObjectOwnership.BUCKET_OWNER_ENFORCED,
             block_public_access=aws_s3.BlockPublicAccess.BLOCK_ALL,
             versioned=True,
             removal_policy=REMOVAL_POLICY,
@@ -94,6 +97,24 @@ class Storage(Construct):
             ),
         )
 
+        self.datasets_table.add_global_secondary_index(
+            index_name=DatasetsListIdx.Meta.index_name,
+            partition_key=aws_dynamodb.Attribute(
+                name=DatasetsListIdx.record_type.attr_name, type=aws_dynamodb.AttributeType.STRING
+            ),
+            sort_key=aws_dynamodb.Attribute(
+                name=DatasetsListIdx.title.attr_name, type=aws_dynamodb.AttributeType.STRING
+            ),
+        )
+
+        self.import_statuses_table = Table(
+            self,
+            f"{env_name}-import-statuses",
+            env_name=env_name,
+            parameter_name=ParameterName.STORAGE_IMPORT_STATUSES_TABLE_NAME,
+            time_to_live_attribute=ImportStatusesModelBase.expires_at.attr_name,
+        )
+
         self.validation_results_table = Table(
             self,
             f"{env_name}-validation-results",
@@ -17,6 +17,7 @@ class Table(aws_dynamodb.Table):
         env_name: str,
         parameter_name: ParameterName,
         sort_key: Optional[aws_dynamodb.Attribute] = None,
+        time_to_live_attribute: Optional[str] = None,
     ):
         super().__init__(
             scope,
@@ -26,6 +27,7 @@ class Table(aws_dynamodb.Table):
             point_in_time_recovery=True,
             removal_policy=REMOVAL_POLICY,
             billing_mode=aws_dynamodb.BillingMode.PAY_PER_REQUEST,
+            time_to_live_attribute=time_to_live_attribute,
         )
 
         self.name_parameter = aws_ssm.StringParameter(
@@ -0,0 +1,122 @@
+from aws_cdk import (
+    Duration,
+    aws_events,
+    aws_events_targets,
+    aws_iam,
+    aws_lambda_python_alpha,
+    aws_ssm,
+    aws_stepfunctions,
+    aws_stepfunctions_tasks,
+)
+from aws_cdk.aws_stepfunctions import JsonPath
+from constructs import Construct
+
+from geostore.environment import ENV_NAME_VARIABLE_NAME
+from geostore.parameter_store import ParameterName
+from geostore.step_function_keys import IMPORT_DATASET_KEY, TASK_TOKEN_KEY
+from geostore.upload_callback import S3_BATCH_FINAL_STATUSES
+from geostore.upload_completion.task import (
+    EVENT_DETAIL_TYPE,
+    EVENT_NAME_KEY,
+    EVENT_SOURCE,
+    JOB_STATUS_CHANGED_EVENT_NAME,
+    JOB_STATUS_KEY,
+    SERVICE_EVENT_DETAILS_KEY,
+)
+from geostore.upload_task_tokens_model import UploadTaskTokensModelBase
+
+from .bundled_lambda_function import BundledLambdaFunction
+from .common import grant_parameter_read_access
+from .s3_policy import ALLOW_DESCRIBE_ANY_S3_JOB
+from .table import Table
+
+# Executions which have not been resumed by then fall back to polling the upload status
+UPLOAD_CALLBACK_TIMEOUT = Duration.hours(1)
+
+
+class UploadCallback(Construct):
+    """
+    Step which waits until the S3 Batch Operations jobs of the import have finished. The execution
+    is resumed by the job status change events, or by the step itself if the jobs have already
+    finished.
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        construct_id: str,
+        *,
+        botocore_lambda_layer: aws_lambda_python_alpha.PythonLayerVersion,
+        env_name: str,
+        git_commit_parameter: aws_ssm.StringParameter,
+    ):
+        super().__init__(scope, construct_id)
+
+        upload_task_tokens_table = Table(
+            self,
+            f"{env_name}-upload-task-tokens",
+            env_name=env_name,
+            parameter_name=ParameterName.PROCESSING_UPLOAD_TASK_TOKENS_TABLE_NAME,
+            time_to_live_attribute=UploadTaskTokensModelBase.expires_at.attr_name,
+        )
+
+        wait_for_upload_function = BundledLambdaFunction(
+            self,
+            "WaitForUploadFunction",
+            lambda_directory="wait_for_upload",
+            extra_environment={ENV_NAME_VARIABLE_NAME: env_name},
+            botocore_lambda_layer=botocore_lambda_layer,
+        )
+        self.wait_for_upload_task = aws_stepfunctions_tasks.LambdaInvoke(
+            scope,
+            "WaitForUpload",
+            lambda_function=wait_for_upload_function,
+            integration_pattern=aws_stepfunctions.IntegrationPattern.WAIT_FOR_TASK_TOKEN,
+            payload=aws_stepfunctions.TaskInput.from_object(
+                {
+                    TASK_TOKEN_KEY: JsonPath.task_token,
+                    IMPORT_DATASET_KEY: JsonPath.object_at(f"$.{IMPORT_DATASET_KEY}"),
+                }
+            ),
+            result_path=JsonPath.DISCARD,
+            timeout=UPLOAD_CALLBACK_TIMEOUT,
+        )
+
+        upload_completion_function = BundledLambdaFunction(
+            self,
+            "UploadCompletionFunction",
+            lambda_directory="upload_completion",
+            extra_environment={ENV_NAME_VARIABLE_NAME: env_name},
+            botocore_lambda_layer=botocore_lambda_layer,
+        )
+        aws_events.Rule(
+            self,
+            "s3 batch job status change rule",
+            description="Resume dataset version creation when its import jobs have finished",
+            event_pattern=aws_events.EventPattern(
+                source=[EVENT_SOURCE],
+                detail_type=[EVENT_DETAIL_TYPE],
+                detail={
+                    EVENT_NAME_KEY: [JOB_STATUS_CHANGED_EVENT_NAME],
+                    SERVICE_EVENT_DETAILS_KEY: {JOB_STATUS_KEY: sorted(S3_BATCH_FINAL_STATUSES)},
+                },
+            ),
+            targets=[aws_events_targets.LambdaFunction(upload_completion_function)],
+        )
+
+        upload_callback_functions = [wait_for_upload_function, upload_completion_function]
+        for upload_callback_function in upload_callback_functions:
+            upload_task_tokens_table.grant_read_write_data(upload_callback_function)
+            upload_task_tokens_table.grant(upload_callback_function, "dynamodb:DescribeTable")
+            upload_callback_function.add_to_role_policy(ALLOW_DESCRIBE_ANY_S3_JOB)
+            # Task token callbacks can't be limited to a state machine
+            upload_callback_function.add_to_role_policy(
+                aws_iam.PolicyStatement(resources=["*"], actions=["states:SendTaskSuccess"])
+            )
+
+        grant_parameter_read_access(
+            {
+                upload_task_tokens_table.name_parameter: upload_callback_functions,
+                git_commit_parameter: upload_callback_functions,
+            }
+        )
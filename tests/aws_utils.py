@@ -14,6 +14,7 @@ from uuid import uuid4
 
 import boto3
 from botocore.response import StreamingBody
+from mypy_boto3_lambda import LambdaClient
 from mypy_boto3_s3 import S3Client
 from mypy_boto3_s3.type_defs import DeleteTypeDef, ObjectIdentifierTypeDef
 from mypy_boto3_s3control import S3ControlClient
@@ -39,8 +40,24 @@ from geostore.processing_assets_model import (
 )
 from geostore.resources import Resource
 from geostore.s3 import S3_URL_PREFIX
+from geostore.step_function_keys import (
+    ASSET_UPLOAD_KEY,
+    METADATA_UPLOAD_KEY,
+    S3_BATCH_STATUS_COMPLETE,
+    STATUS_KEY,
+)
 from geostore.sts import get_account_number
 from geostore.types import JsonObject
+from geostore.upload_completion.task import (
+    DETAIL_KEY,
+    EVENT_DETAIL_TYPE,
+    EVENT_NAME_KEY,
+    EVENT_SOURCE,
+    JOB_ID_KEY,
+    JOB_STATUS_CHANGED_EVENT_NAME,
+    JOB_STATUS_KEY,
+    SERVICE_EVENT_DETAILS_KEY,
+)
 from geostore.validation_results_model import (
     ValidationResult,
     ValidationResultsModelBase,
@@ -166,6 +183,45 @@ def any_operation_name() -> str:
     return random_string(10)
 
 
+def any_sqs_message_id() -> str:
+    return str(uuid4())
+
+
+def s3_batch_job_status_changed_event(job_id: str, status: str) -> JsonObject:
+    """Stand-in for the EventBridge event of an S3 Batch Operations job status change"""
+    return {
+        "version": "0",
+        "id": str(uuid4()),
+        "detail-type": EVENT_DETAIL_TYPE,
+        "source": EVENT_SOURCE,
+        "account": str(any_account_id()),
+        "time": any_past_datetime().isoformat(),
+        "region": "ap-southeast-2",
+        "resources": [],
+        DETAIL_KEY: {
+            "eventVersion": "1.05",
+            "eventSource": "s3.amazonaws.com",
+            EVENT_NAME_KEY: JOB_STATUS_CHANGED_EVENT_NAME,
+            SERVICE_EVENT_DETAILS_KEY: {
+                JOB_ID_KEY: job_id,
+                "jobArn": f"arn:aws:s3:ap-southeast-2:{any_account_id()}:job/{job_id}",
+                JOB_STATUS_KEY: status,
+                "jobEventId": uuid4().hex,
+                "failureCodes": [],
+                "statusChangeReason": [],
+            },
+        },
+    }
+
+
+# Step Functions
+
+
+def any_task_token() -> str:
+    """Arbitrary-length string"""
+    return random_string(50)
+
+
 # Context managers
 
 
@@ -209,6 +265,7 @@ class ProcessingAsset:
         index: Optional[int] = 0,
         multihash: Optional[str] = None,
         exists_in_staging: Optional[bool] = None,
+        replaced_in_version: Optional[str] = None,
         replaced_in_new_version: Optional[bool] = None,
     ):
         prefix = "METADATA" if multihash is None else "DATA"
@@ -221,6 +278,7 @@ class ProcessingAsset:
             filename=basename(url),
             multihash=multihash,
             exists_in_staging=exists_in_staging,
+            replaced_in_version=replaced_in_version,
             replaced_in_new_version=replaced_in_new_version,
         )
 
@@ -339,6 +397,38 @@ class S3Object(AbstractContextManager):  # type: ignore[type-arg]
         delete_s3_key(self.bucket_name, self.key, self._s3_client)
 
 
+class LambdaEnvironment(AbstractContextManager):  # type: ignore[type-arg]
+    def __init__(self, /, function_name: str, variables: Dict[str, str]):
+        super().__init__()
+
+        self.function_name = function_name
+        self.variables = variables
+        self._lambda_client: LambdaClient = boto3.client("lambda", config=CONFIG)
+        self._original_variables: Dict[str, str] = {}
+
+    def __enter__(self) -> "LambdaEnvironment":
+        configuration = self._lambda_client.get_function_configuration(
+            FunctionName=self.function_name
+        )
+        self._original_variables = configuration["Environment"]["Variables"]
+        self._update_variables({**self._original_variables, **self.variables})
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self._update_variables(self._original_variables)
+
+    def _update_variables(self, variables: Dict[str, str]) -> None:
+        self._lambda_client.update_function_configuration(
+            FunctionName=self.function_name, Environment={"Variables": variables}
+        )
+        self._lambda_client.get_waiter("function_updated").wait(FunctionName=self.function_name)
+
+
 # Special-purpose mocks
 
 
@@ -474,6 +564,14 @@ def wait_for_copy_jobs(
     return metadata_copy_job_result, asset_copy_job_result
 
 
+def assert_imported_directly(import_dataset_response: JsonObject, subtests: SubTests) -> None:
+    for upload_key in [METADATA_UPLOAD_KEY, ASSET_UPLOAD_KEY]:
+        with subtests.test(msg=f"Should complete {upload_key} successfully"):
+            assert (
+                import_dataset_response[upload_key][STATUS_KEY] == S3_BATCH_STATUS_COMPLETE
+            ), import_dataset_response
+
+
 def wait_for_s3_batch_job_completion(
     s3_batch_job_arn: str,
     account_id: str,
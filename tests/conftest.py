@@ -2,6 +2,7 @@
 Pytest configuration file.
 """
 from logging import INFO, basicConfig
+from typing import List
 
 import boto3
 import pytest
@@ -17,6 +18,22 @@ from geostore.boto3_config import CONFIG
 
 basicConfig(level=INFO)
 
+RUN_BENCHMARKS_OPTION = "--run-benchmarks"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(RUN_BENCHMARKS_OPTION, action="store_true", help="Run the benchmark tests")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item]) -> None:
+    if config.getoption(RUN_BENCHMARKS_OPTION):
+        return  # pragma: no cover
+
+    skip_benchmark = pytest.mark.skip(reason=f"Benchmarks only run with {RUN_BENCHMARKS_OPTION}")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
 
 @pytest.fixture()
 def lambda_client() -> LambdaClient:
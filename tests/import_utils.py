@@ -0,0 +1,52 @@
+import sys
+from json import loads
+from os import environ
+from pathlib import Path
+from subprocess import run
+from typing import List
+
+import geostore
+from geostore.parameter_store import PARAMETER_OVERRIDE_VARIABLE_NAME_PREFIX, ParameterName
+from geostore.types import JsonObject
+
+from .general_generators import any_name
+
+IMPORT_SCRIPT = """
+from json import dumps
+from importlib import import_module
+from time import perf_counter
+
+start = perf_counter()
+import_module("{module_name}")
+seconds = perf_counter() - start
+
+from geostore.boto3_clients import CLIENTS, RESOURCES
+print(dumps({{"seconds": seconds, "boto3_objects": [*CLIENTS, *RESOURCES]}}))
+"""
+
+
+def get_lambda_handler_module_names() -> List[str]:
+    package_directory = Path(geostore.__file__).parent
+    return sorted(
+        ".".join(path.relative_to(package_directory.parent).with_suffix("").parts)
+        for path in package_directory.glob("**/*.py")
+        if "def lambda_handler(" in path.read_text(encoding="utf-8")
+    )
+
+
+def import_module_in_new_process(module_name: str) -> JsonObject:
+    """Return the import time in seconds and the names of the boto3 objects created."""
+    # Parameter overrides keep imports from reading parameters from SSM
+    parameter_overrides = {
+        f"{PARAMETER_OVERRIDE_VARIABLE_NAME_PREFIX}{parameter.name}": any_name()
+        for parameter in ParameterName
+    }
+    process = run(
+        [sys.executable, "-c", IMPORT_SCRIPT.format(module_name=module_name)],
+        capture_output=True,
+        check=True,
+        env={**environ, **parameter_overrides},
+        text=True,
+    )
+    result: JsonObject = loads(process.stdout.splitlines()[-1])
+    return result
@@ -1,5 +1,7 @@
 from hashlib import sha256
+from os.path import dirname
 from random import choice, randrange
+from typing import Dict
 from uuid import uuid4
 
 from multihash import SHA2_256
@@ -8,8 +10,18 @@ from geostore.dataset_properties import TITLE_CHARACTERS
 from geostore.stac_format import (
     LINZ_STAC_CREATED_KEY,
     LINZ_STAC_UPDATED_KEY,
+    STAC_ASSETS_KEY,
+    STAC_FILE_CHECKSUM_KEY,
+    STAC_HREF_KEY,
+    STAC_LINKS_KEY,
     STAC_MAXIMUM_KEY,
     STAC_MINIMUM_KEY,
+    STAC_REL_ITEM,
+    STAC_REL_KEY,
+    STAC_REL_PARENT,
+    STAC_TYPE_COLLECTION,
+    STAC_TYPE_ITEM,
+    STAC_TYPE_KEY,
 )
 from geostore.types import JsonObject
 
@@ -152,3 +164,35 @@ def any_epsg() -> int:
 
 def any_version_version() -> str:
     return f"{randrange(1_000)}.{randrange(1_000)}.{randrange(1_000)}"
+
+
+def any_synthetic_stac_collection(collection_url: str, item_count: int) -> Dict[str, JsonObject]:
+    """
+    Collection linking to `item_count` items with one asset each, keyed by URL.
+
+    Only contains the properties needed to walk the tree, so it's not valid according to the STAC
+    schemas.
+    """
+    base_url = dirname(collection_url)
+    item_filenames = [f"item-{index}.json" for index in range(item_count)]
+    objects: Dict[str, JsonObject] = {
+        collection_url: {
+            STAC_TYPE_KEY: STAC_TYPE_COLLECTION,
+            STAC_LINKS_KEY: [
+                {STAC_HREF_KEY: f"./{item_filename}", STAC_REL_KEY: STAC_REL_ITEM}
+                for item_filename in item_filenames
+            ],
+        }
+    }
+    for index, item_filename in enumerate(item_filenames):
+        objects[f"{base_url}/{item_filename}"] = {
+            STAC_TYPE_KEY: STAC_TYPE_ITEM,
+            STAC_ASSETS_KEY: {
+                any_asset_name(): {
+                    STAC_HREF_KEY: f"./item-{index}.tiff",
+                    STAC_FILE_CHECKSUM_KEY: any_hex_multihash(),
+                }
+            },
+            STAC_LINKS_KEY: [{STAC_HREF_KEY: collection_url, STAC_REL_KEY: STAC_REL_PARENT}],
+        }
+    return objects
@@ -0,0 +1,29 @@
+from unittest.mock import MagicMock, patch
+
+from geostore.backfill_dataset_record_types.task import lambda_handler
+from geostore.datasets_model import DATASET_RECORD_TYPE
+
+from .aws_utils import any_lambda_context
+
+
+@patch("geostore.backfill_dataset_record_types.task.datasets_model_with_meta")
+def should_add_record_type_to_datasets_without_one(datasets_model_mock: MagicMock) -> None:
+    # Given
+    datasets_model_class = datasets_model_mock.return_value
+    datasets = [MagicMock(), MagicMock()]
+    datasets_model_class.scan.return_value = iter(datasets)
+
+    # When
+    lambda_handler({}, any_lambda_context())
+
+    # Then
+    datasets_model_class.scan.assert_called_once_with(
+        filter_condition=datasets_model_class.record_type.does_not_exist.return_value,
+        attributes_to_get=[datasets_model_class.id.attr_name],
+    )
+    datasets_model_class.record_type.set.assert_called_with(DATASET_RECORD_TYPE)
+    for dataset in datasets:
+        dataset.update.assert_called_once_with(
+            actions=[datasets_model_class.record_type.set.return_value],
+            condition=datasets_model_class.id.exists.return_value,
+        )
@@ -0,0 +1,54 @@
+from unittest.mock import MagicMock, call, patch
+
+from geostore.batch_writer import BATCH_WRITE_ITEM_LIMIT, BatchWriter
+from geostore.validation_results_model import ValidationResultsModelBase
+
+from .dynamodb_generators import any_hash_key
+from .general_generators import any_safe_filename
+
+
+@patch("geostore.batch_writer.get_param")
+def should_write_items_in_batches_of_the_maximum_size(_get_param_mock: MagicMock) -> None:
+    model_class_mock = MagicMock()
+    batch_mock = model_class_mock.batch_write.return_value.__enter__.return_value
+    hash_key = any_hash_key()
+    items = [
+        ValidationResultsModelBase(pk=hash_key, sk=f"{index}{any_safe_filename()}", result="")
+        for index in range(BATCH_WRITE_ITEM_LIMIT * 2 + 1)
+    ]
+    writer: BatchWriter[ValidationResultsModelBase] = BatchWriter(model_class_mock)
+
+    for item in items:
+        writer.save(item)
+    assert model_class_mock.batch_write.call_count == 2
+
+    writer.flush()
+
+    assert model_class_mock.batch_write.call_count == 3
+    assert batch_mock.save.mock_calls == [call(item) for item in items]
+
+
+@patch("geostore.batch_writer.get_param")
+def should_write_only_the_last_item_with_the_same_key(_get_param_mock: MagicMock) -> None:
+    model_class_mock = MagicMock()
+    batch_mock = model_class_mock.batch_write.return_value.__enter__.return_value
+    hash_key = any_hash_key()
+    range_key = any_safe_filename()
+    first_item = ValidationResultsModelBase(pk=hash_key, sk=range_key, result="Failed")
+    last_item = ValidationResultsModelBase(pk=hash_key, sk=range_key, result="Passed")
+    writer: BatchWriter[ValidationResultsModelBase] = BatchWriter(model_class_mock)
+
+    writer.save(first_item)
+    writer.save(last_item)
+    writer.flush()
+
+    assert batch_mock.save.mock_calls == [call(last_item)]
+
+
+@patch("geostore.batch_writer.get_param")
+def should_not_write_when_there_are_no_pending_items(_get_param_mock: MagicMock) -> None:
+    model_class_mock = MagicMock()
+
+    BatchWriter(model_class_mock).flush()
+
+    model_class_mock.batch_write.assert_not_called()
@@ -0,0 +1,11 @@
+from pytest_subtests import SubTests
+
+from .import_utils import get_lambda_handler_module_names, import_module_in_new_process
+
+
+def should_not_create_boto3_clients_when_importing_lambda_handler_modules(
+    subtests: SubTests,
+) -> None:
+    for module_name in get_lambda_handler_module_names():
+        with subtests.test(msg=module_name):
+            assert import_module_in_new_process(module_name)["boto3_objects"] == []
@@ -16,10 +16,12 @@ from geostore.api_keys import MESSAGE_KEY
 from geostore.check import Check
 from geostore.check_files_checksums.task import (
     ASSETS_TABLE_NAME_ARGUMENT,
+    BATCH_SIZE_ARGUMENT,
     CURRENT_VERSION_ID_ARGUMENT,
     DATASET_ID_ARGUMENT,
     DATASET_TITLE_ARGUMENT,
     FIRST_ITEM_ARGUMENT,
+    ITERATION_SIZE_ARGUMENT,
     NEW_VERSION_ID_ARGUMENT,
     RESULTS_TABLE_NAME_ARGUMENT,
     S3_ROLE_ARN_ARGUMENT,
@@ -27,8 +29,10 @@ from geostore.check_files_checksums.task import (
 )
 from geostore.check_files_checksums.utils import (
     ARRAY_INDEX_VARIABLE_NAME,
+    MIN_CHUNK_SIZE,
     ChecksumUtils,
     get_job_offset,
+    get_multihash_digest,
 )
 from geostore.logging_keys import GIT_COMMIT, LOG_MESSAGE_VALIDATION_COMPLETE
 from geostore.models import CHECK_ID_PREFIX, DB_KEY_SEPARATOR, URL_ID_PREFIX
@@ -39,7 +43,8 @@ from geostore.processing_assets_model import (
     processing_assets_model_with_meta,
 )
 from geostore.resources import Resource
-from geostore.s3 import CHUNK_SIZE, S3_URL_PREFIX
+from geostore.s3 import S3_URL_PREFIX
+from geostore.s3_utils import get_s3_staging_file_checker, get_s3_url_reader
 from geostore.step_function import Outcome, get_hash_key
 from geostore.step_function_keys import CURRENT_VERSION_EMPTY_VALUE
 from geostore.validation_results_model import ValidationResult, validation_results_model_with_meta
@@ -96,6 +101,20 @@ def should_return_default_offset_to_zero() -> None:
     assert get_job_offset() == 0
 
 
+def should_return_same_digest_regardless_of_chunk_size(subtests: SubTests) -> None:
+    file_contents = any_file_contents(byte_count=MIN_CHUNK_SIZE * 5 + 1)
+    expected_digest = sha256(file_contents).digest()
+
+    for max_chunk_size in [1, MIN_CHUNK_SIZE - 1, MIN_CHUNK_SIZE, MIN_CHUNK_SIZE * 2 + 1]:
+        with subtests.test(msg=f"readinto, max chunk size {max_chunk_size}"):
+            body = BytesIO(initial_bytes=file_contents)
+            assert get_multihash_digest(SHA2_256, body, max_chunk_size) == expected_digest
+
+        with subtests.test(msg=f"read, max chunk size {max_chunk_size}"):
+            streaming_body = StreamingBody(BytesIO(initial_bytes=file_contents), len(file_contents))
+            assert get_multihash_digest(SHA2_256, streaming_body, max_chunk_size) == expected_digest
+
+
 @patch("geostore.check_files_checksums.utils.processing_assets_model_with_meta")
 @patch("geostore.check_files_checksums.utils.ChecksumUtils.get_s3_object")
 @patch("geostore.check_files_checksums.task.ValidationResultFactory")
@@ -133,6 +152,7 @@ def should_validate_given_index(
     expected_calls = [
         call(hash_key_, validation_results_table_name),
         call().save(url, Check.CHECKSUM, ValidationResult.PASSED),
+        call().flush(),
     ]
 
     # When
@@ -166,6 +186,77 @@ def should_validate_given_index(
         assert validation_results_factory_mock.mock_calls == expected_calls
 
 
+@patch("geostore.check_files_checksums.utils.processing_assets_model_with_meta")
+@patch("geostore.check_files_checksums.utils.ChecksumUtils.get_s3_object")
+@patch("geostore.check_files_checksums.task.ValidationResultFactory")
+def should_validate_batch_of_items_up_to_end_of_iteration(
+    validation_results_factory_mock: MagicMock,
+    get_s3_object_mock: MagicMock,
+    processing_assets_model_mock: MagicMock,
+    subtests: SubTests,
+) -> None:
+    # Given a second batch of three items, which is cut short by the iteration size
+    dataset_id = any_dataset_id()
+    version_id = any_dataset_version_id()
+    hash_key = get_hash_key(dataset_id, version_id)
+    range_keys = [f"{ProcessingAssetType.DATA.value}{DB_KEY_SEPARATOR}{index}" for index in [3, 4]]
+
+    url_to_content = {any_s3_url(): any_file_contents() for _ in range_keys}
+    processing_assets_model_mock.return_value.batch_get.return_value = [
+        ProcessingAssetsModelBase(
+            hash_key=hash_key,
+            range_key=range_key,
+            url=url,
+            filename=any_safe_filename(),
+            multihash=sha256_hex_digest_to_multihash(sha256(content).hexdigest()),
+        )
+        for range_key, (url, content) in zip(range_keys, url_to_content.items())
+    ]
+    get_s3_object_mock.side_effect = lambda url: MockGeostoreS3Response(
+        StreamingBody(BytesIO(initial_bytes=url_to_content[url]), len(url_to_content[url])),
+        file_in_staging=True,
+    )
+
+    sys.argv = [
+        any_program_name(),
+        f"{DATASET_ID_ARGUMENT}={dataset_id}",
+        f"{NEW_VERSION_ID_ARGUMENT}={version_id}",
+        f"{CURRENT_VERSION_ID_ARGUMENT}={CURRENT_VERSION_EMPTY_VALUE}",
+        f"{DATASET_TITLE_ARGUMENT}={any_dataset_title()}",
+        f"{FIRST_ITEM_ARGUMENT}=0",
+        f"{ITERATION_SIZE_ARGUMENT}=5",
+        f"{BATCH_SIZE_ARGUMENT}=3",
+        f"{ASSETS_TABLE_NAME_ARGUMENT}={any_table_name()}",
+        f"{RESULTS_TABLE_NAME_ARGUMENT}={any_table_name()}",
+        f"{S3_ROLE_ARN_ARGUMENT}={any_role_arn()}",
+    ]
+
+    # When
+    with patch.dict(environ, {ARRAY_INDEX_VARIABLE_NAME: "1"}), patch(
+        "geostore.check_files_checksums.task.get_s3_url_reader"
+    ):
+        main()
+
+    # Then
+    with subtests.test(msg="Items fetched"):
+        processing_assets_model_mock.return_value.batch_get.assert_called_once_with(
+            [(hash_key, range_key) for range_key in range_keys]
+        )
+
+    with subtests.test(msg="Validation results"):
+        validation_results_factory_mock.return_value.save.assert_has_calls(
+            [call(url, Check.CHECKSUM, ValidationResult.PASSED) for url in url_to_content],
+            any_order=True,
+        )
+        validation_results_factory_mock.return_value.flush.assert_called_once_with()
+
+    with subtests.test(msg="Items saved"):
+        batch_write_mock = processing_assets_model_mock.return_value.batch_write
+        batch_mock = batch_write_mock.return_value.__enter__.return_value
+        assert {item.sk for (item,), _ in batch_mock.save.call_args_list} == set(range_keys)
+        assert all(item.exists_in_staging for (item,), _ in batch_mock.save.call_args_list)
+
+
 @patch("geostore.check_files_checksums.utils.processing_assets_model_with_meta")
 @patch("geostore.check_files_checksums.utils.ChecksumUtils.get_s3_object")
 @patch("geostore.check_files_checksums.task.ValidationResultFactory")
@@ -241,6 +332,7 @@ def should_log_error_when_validation_fails(
         assert validation_results_factory_mock.mock_calls == [
             call(hash_key, validation_results_table_name),
             call().save(url, Check.CHECKSUM, ValidationResult.FAILED, details=expected_details),
+            call().flush(),
         ]
 
 
@@ -356,7 +448,7 @@ def should_mark_asset_as_replaced_in_new_version() -> None:
             filename=storage_asset_filename,
             exists_in_staging=True,
             multihash=storage_asset_multihash,
-            replaced_in_new_version=True,
+            replaced_in_version=dataset_version_id,
         )
 
         with ProcessingAsset(
@@ -510,7 +602,7 @@ def should_log_arbitrary_client_errors() -> None:
 
 
 def should_return_when_file_checksum_matches() -> None:
-    file_contents = b"x" * (CHUNK_SIZE + 1)
+    file_contents = b"x" * (MIN_CHUNK_SIZE + 1)
     url = any_s3_url()
     s3_response = MockGeostoreS3Response(
         StreamingBody(BytesIO(initial_bytes=file_contents), len(file_contents)), True
@@ -519,7 +611,7 @@ def should_return_when_file_checksum_matches() -> None:
     s3_url_reader = MockJSONURLReader({url: s3_response})
     multihash = (
         f"{SHA2_256:x}{SHA256_CHECKSUM_BYTE_COUNT:x}"
-        "c6d8e9905300876046729949cc95c2385221270d389176f7234fe7ac00c4e430"
+        "1abe08ebecf1c18cab71f6fe28aaddf20268f85bad78bb9a72f88ca47c874662"
     )
 
     with patch("geostore.check_files_checksums.utils.processing_assets_model_with_meta"):
@@ -570,3 +662,123 @@ def should_report_multihash_decode_errors(decode_mock: MagicMock) -> None:
             )
         ]
     )
+
+
+def should_leave_staged_file_checksum_to_import_when_verifying_on_import() -> None:
+    # Given a staged file with a wrong checksum
+    validation_results_factory_mock = MockValidationResultFactory()
+    processing_item = ProcessingAssetsModelBase(
+        hash_key=get_hash_key(any_dataset_id(), any_dataset_version_id()),
+        range_key=f"{ProcessingAssetType.DATA.value}{DB_KEY_SEPARATOR}0",
+        url=any_s3_url(),
+        filename=any_safe_filename(),
+        multihash=any_hex_multihash(),
+    )
+
+    # When
+    with patch("geostore.check_files_checksums.utils.processing_assets_model_with_meta"):
+        ChecksumUtils(
+            any_table_name(),
+            validation_results_factory_mock,
+            MockJSONURLReader({}),
+            MockAssetGarbageCollector(),
+            MagicMock(),
+            staging_file_checker=lambda url: True,
+        ).validate_processing_item(processing_item)
+
+    # Then
+    validation_results_factory_mock.save.assert_not_called()
+    assert processing_item.exists_in_staging
+
+
+@patch("geostore.s3_utils.get_param", MagicMock())
+@patch("geostore.s3_utils.get_s3_client_for_role")
+def should_not_download_staged_file_when_verifying_on_import(
+    get_s3_client_for_role_mock: MagicMock,
+) -> None:
+    # Given a staged file
+    processing_item = ProcessingAssetsModelBase(
+        hash_key=get_hash_key(any_dataset_id(), any_dataset_version_id()),
+        range_key=f"{ProcessingAssetType.DATA.value}{DB_KEY_SEPARATOR}0",
+        url=any_s3_url(),
+        filename=any_safe_filename(),
+        multihash=any_hex_multihash(),
+    )
+    s3_role_arn = any_role_arn()
+
+    # When
+    with patch("geostore.check_files_checksums.utils.processing_assets_model_with_meta"):
+        ChecksumUtils(
+            any_table_name(),
+            MockValidationResultFactory(),
+            get_s3_url_reader(s3_role_arn, any_dataset_title(), MagicMock()),
+            MockAssetGarbageCollector(),
+            MagicMock(),
+            staging_file_checker=get_s3_staging_file_checker(s3_role_arn),
+        ).validate_processing_item(processing_item)
+
+    # Then
+    get_s3_client_for_role_mock.return_value.get_object.assert_not_called()
+    assert processing_item.exists_in_staging
+
+
+def should_validate_checksum_of_file_missing_from_staging_when_verifying_on_import() -> None:
+    # Given a file which is only in the Geostore, with a wrong checksum
+    validation_results_factory_mock = MockValidationResultFactory()
+    file_contents = any_file_contents()
+    s3_response = MockGeostoreS3Response(
+        StreamingBody(BytesIO(initial_bytes=file_contents), len(file_contents)),
+        file_in_staging=False,
+    )
+    processing_item = ProcessingAssetsModelBase(
+        hash_key=get_hash_key(any_dataset_id(), any_dataset_version_id()),
+        range_key=f"{ProcessingAssetType.DATA.value}{DB_KEY_SEPARATOR}0",
+        url=any_s3_url(),
+        filename=any_safe_filename(),
+        multihash=sha256_hex_digest_to_multihash(sha256(any_file_contents()).hexdigest()),
+    )
+
+    # When
+    with patch("geostore.check_files_checksums.utils.processing_assets_model_with_meta"):
+        ChecksumUtils(
+            any_table_name(),
+            validation_results_factory_mock,
+            MockJSONURLReader({processing_item.url: s3_response}),
+            MockAssetGarbageCollector(),
+            MagicMock(),
+            staging_file_checker=lambda url: False,
+        ).validate_processing_item(processing_item)
+
+    # Then
+    validation_results_factory_mock.save.assert_called_once()
+    assert validation_results_factory_mock.save.call_args.args[1] == Check.CHECKSUM
+    assert not processing_item.exists_in_staging
+
+
+def should_close_object_after_validating_checksum() -> None:
+    # Given
+    file_contents = any_file_contents()
+    file_object = BytesIO(initial_bytes=file_contents)
+    processing_item = ProcessingAssetsModelBase(
+        hash_key=get_hash_key(any_dataset_id(), any_dataset_version_id()),
+        range_key=f"{ProcessingAssetType.DATA.value}{DB_KEY_SEPARATOR}0",
+        url=any_s3_url(),
+        filename=any_safe_filename(),
+        multihash=sha256_hex_digest_to_multihash(sha256(file_contents).hexdigest()),
+    )
+    s3_response = MockGeostoreS3Response(
+        StreamingBody(file_object, len(file_contents)), file_in_staging=True
+    )
+
+    # When
+    with patch("geostore.check_files_checksums.utils.processing_assets_model_with_meta"):
+        ChecksumUtils(
+            any_table_name(),
+            MockValidationResultFactory(),
+            MockJSONURLReader({processing_item.url: s3_response}),
+            MockAssetGarbageCollector(),
+            MagicMock(),
+        ).validate_processing_item(processing_item)
+
+    # Then
+    assert file_object.closed
@@ -0,0 +1,41 @@
+from hashlib import new
+from io import BytesIO
+from time import perf_counter
+from typing import Callable
+
+from botocore.response import StreamingBody
+from multihash import FUNCS
+from pytest import mark
+from pytest_subtests import SubTests
+
+from geostore.check_files_checksums.utils import DEFAULT_MAX_CHUNK_SIZE, get_multihash_digest
+
+from .general_generators import any_file_contents
+
+BYTE_COUNT = 64 * 1024 * 1024
+BYTES_PER_MEGABYTE = 1_000_000
+PREVIOUS_CHUNK_SIZE = 1024
+
+
+@mark.benchmark
+def should_report_multihash_throughput(
+    record_property: Callable[[str, object], None], subtests: SubTests
+) -> None:
+    file_contents = any_file_contents(byte_count=BYTE_COUNT)
+
+    for digest_algorithm_code, hash_function in FUNCS.items():
+        expected_digest = hash_function(file_contents).digest()
+        algorithm_name = new(hash_function().name).name
+
+        for max_chunk_size in [PREVIOUS_CHUNK_SIZE, DEFAULT_MAX_CHUNK_SIZE]:
+            body = StreamingBody(BytesIO(initial_bytes=file_contents), BYTE_COUNT)
+            label = f"{algorithm_name}, {max_chunk_size:,} byte chunks"
+
+            start = perf_counter()
+            digest = get_multihash_digest(digest_algorithm_code, body, max_chunk_size)
+            record_property(
+                f"{label} MB/s", BYTE_COUNT / BYTES_PER_MEGABYTE / (perf_counter() - start)
+            )
+
+            with subtests.test(msg=label):
+                assert digest == expected_digest
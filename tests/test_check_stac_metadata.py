@@ -13,25 +13,30 @@ from unittest.mock import MagicMock, call, patch
 from botocore.exceptions import ClientError
 from botocore.response import StreamingBody
 from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
 from pytest import mark, raises
 from pytest_subtests import SubTests
 
 from geostore.api_keys import MESSAGE_KEY, SUCCESS_KEY
 from geostore.check import Check
 from geostore.check_stac_metadata.stac_validators import (
+    LINZ_SCHEMA,
     LINZ_SCHEMA_URL_DIRECTORY,
     STACCatalogSchemaValidator,
     STACCollectionSchemaValidator,
     STACItemSchemaValidator,
+    get_validator,
 )
 from geostore.check_stac_metadata.task import lambda_handler
 from geostore.check_stac_metadata.utils import (
     PROCESSING_ASSET_FILE_IN_STAGING_KEY,
     PROCESSING_ASSET_MULTIHASH_KEY,
     PROCESSING_ASSET_URL_KEY,
+    STAC_TYPE_VALIDATION_MAP,
     InvalidSTACRootTypeError,
     InvalidSecurityClassificationError,
     STACDatasetValidator,
+    UnchangedAssetFinder,
 )
 from geostore.logging_keys import GIT_COMMIT, LOG_MESSAGE_VALIDATION_COMPLETE
 from geostore.models import CHECK_ID_PREFIX, DB_KEY_SEPARATOR, URL_ID_PREFIX
@@ -60,6 +65,7 @@ from geostore.stac_format import (
 )
 from geostore.step_function import Outcome, get_hash_key
 from geostore.step_function_keys import (
+    ASSET_COUNT_KEY,
     CURRENT_VERSION_EMPTY_VALUE,
     CURRENT_VERSION_ID_KEY,
     DATASET_ID_KEY,
@@ -98,6 +104,7 @@ from .stac_generators import (
     any_dataset_title,
     any_dataset_version_id,
     any_hex_multihash,
+    any_synthetic_stac_collection,
 )
 from .stac_objects import (
     MINIMAL_VALID_STAC_CATALOG_OBJECT,
@@ -179,6 +186,7 @@ def should_save_non_s3_url_validation_results(
             ValidationResult.FAILED,
             details={MESSAGE_KEY: f"URL doesn't start with “{S3_URL_PREFIX}”: “{non_s3_url}”"},
         ),
+        call().flush(),
     ]
 
 
@@ -291,6 +299,32 @@ def should_report_duplicate_asset_names(validation_results_factory_mock: MagicMo
     )
 
 
+@patch("geostore.check_stac_metadata.utils.get_param", MagicMock())
+@patch("geostore.check_stac_metadata.utils.processing_assets_model_with_meta", MagicMock())
+@patch.dict(STAC_TYPE_VALIDATION_MAP, {key: MagicMock() for key in STAC_TYPE_VALIDATION_MAP})
+def should_traverse_every_linked_item() -> None:
+    # Given
+    item_count = 3
+    collection_url = f"{any_s3_url()}/{any_safe_filename()}"
+    url_reader = MockJSONURLReader(
+        {
+            url: MockGeostoreS3Response(stac_object, file_in_staging=True)
+            for url, stac_object in any_synthetic_stac_collection(
+                collection_url, item_count
+            ).items()
+        }
+    )
+    validator = STACDatasetValidator(
+        any_hash_key(), url_reader, MockAssetGarbageCollector(), MockValidationResultFactory()
+    )
+
+    # When
+    validator.validate(collection_url)
+
+    # Then
+    assert len(validator.traversed_urls) == item_count + 1
+
+
 @mark.infrastructure
 @patch("geostore.check_stac_metadata.task.get_s3_url_reader")
 @patch("geostore.check_stac_metadata.task.ValidationResultFactory")
@@ -329,6 +363,7 @@ def should_save_staging_access_validation_results(
             ValidationResult.FAILED,
             details={MESSAGE_KEY: str(expected_error)},
         ),
+        call().flush(),
     ]
 
 
@@ -378,6 +413,7 @@ def should_save_file_not_found_validation_results(
                 f"in staging bucket or in the Geostore."
             },
         ),
+        call().flush(),
     ]
 
 
@@ -424,7 +460,7 @@ def should_save_json_schema_validation_results_per_file(subtests: SubTests) -> N
                 DATASET_TITLE_KEY: any_dataset_title(),
             },
             any_lambda_context(),
-        ) == {SUCCESS_KEY: True}
+        ) == {SUCCESS_KEY: True, ASSET_COUNT_KEY: 0}
 
     hash_key = get_hash_key(dataset_id, version_id)
     validation_results_model = validation_results_model_with_meta()
@@ -557,7 +593,7 @@ def should_insert_asset_urls_and_checksums_into_database(subtests: SubTests) ->
                     DATASET_TITLE_KEY: any_dataset_title(),
                 },
                 any_lambda_context(),
-            ) == {SUCCESS_KEY: True}
+            ) == {SUCCESS_KEY: True, ASSET_COUNT_KEY: 2}
 
             # Then
             actual_asset_items = processing_assets_model.query(
@@ -662,7 +698,7 @@ def should_successfully_validate_partially_uploaded_dataset(subtests: SubTests)
                 DATASET_TITLE_KEY: dataset_title,
             },
             any_lambda_context(),
-        ) == {SUCCESS_KEY: True}
+        ) == {SUCCESS_KEY: True, ASSET_COUNT_KEY: 1}
 
         validation_results_model = validation_results_model_with_meta()
         with subtests.test(msg="Catalog validation results"):
@@ -827,6 +863,17 @@ def should_detect_invalid_datetime() -> None:
         STACCollectionSchemaValidator.validate(stac_object)
 
 
+def should_report_validation_error_against_original_schema() -> None:
+    stac_object = deepcopy(MINIMAL_VALID_STAC_ITEM_OBJECT)
+    stac_object["properties"]["datetime"] = "not a datetime"
+
+    with raises(ValidationError) as error:
+        STACItemSchemaValidator.validate(stac_object)
+
+    expected_error = best_match(get_validator(LINZ_SCHEMA.uri).iter_errors(stac_object))
+    assert str(error.value) == str(expected_error)
+
+
 def should_validate_metadata_files_recursively() -> None:
     base_url = any_s3_url()
     parent_url = f"{base_url}/{any_safe_filename()}"
@@ -906,6 +953,155 @@ def should_only_validate_each_file_once() -> None:
     assert url_reader.mock_calls == [call(root_url), call(child_url), call(item_url)]
 
 
+def should_keep_traversal_order_when_reading_linked_files_concurrently(subtests: SubTests) -> None:
+    # Given a collection linking to more items than can be read at once
+    base_url = any_s3_url()
+    root_url = f"{base_url}/{any_safe_filename()}"
+    item_urls = [f"{base_url}/{any_safe_filename()}" for _ in range(5)]
+    asset_urls = [f"{base_url}/{any_safe_filename()}" for _ in item_urls]
+
+    root_stac_object = deepcopy(MINIMAL_VALID_STAC_COLLECTION_OBJECT)
+    root_stac_object[STAC_LINKS_KEY] = [
+        {STAC_HREF_KEY: item_url, STAC_REL_KEY: STAC_REL_ITEM} for item_url in item_urls
+    ]
+    url_to_response = {root_url: MockGeostoreS3Response(root_stac_object, file_in_staging=True)}
+    for item_url, asset_url in zip(item_urls, asset_urls):
+        item_stac_object = deepcopy(MINIMAL_VALID_STAC_ITEM_OBJECT)
+        item_stac_object[STAC_ASSETS_KEY] = {
+            any_asset_name(): {
+                LINZ_STAC_CREATED_KEY: any_past_datetime_string(),
+                LINZ_STAC_UPDATED_KEY: any_past_datetime_string(),
+                STAC_HREF_KEY: asset_url,
+                STAC_FILE_CHECKSUM_KEY: any_hex_multihash(),
+            }
+        }
+        url_to_response[item_url] = MockGeostoreS3Response(item_stac_object, file_in_staging=True)
+    url_reader = MockJSONURLReader(url_to_response, call_limit=len(url_to_response))
+
+    with patch("geostore.check_stac_metadata.utils.processing_assets_model_with_meta"):
+        validator = STACDatasetValidator(
+            any_hash_key(),
+            url_reader,
+            MockAssetGarbageCollector(),
+            MockValidationResultFactory(),
+            max_concurrent_reads=2,
+        )
+
+    # When
+    validator.validate(root_url)
+
+    # Then
+    with subtests.test(msg="Metadata order"):
+        assert [
+            metadata_file[PROCESSING_ASSET_URL_KEY] for metadata_file in validator.dataset_metadata
+        ] == [root_url, *item_urls]
+    with subtests.test(msg="Asset order"):
+        assert [asset[PROCESSING_ASSET_URL_KEY] for asset in validator.dataset_assets] == asset_urls
+    with subtests.test(msg="Read each file once"):
+        assert sorted(call_.args[0] for call_ in url_reader.call_args_list) == sorted(
+            url_to_response
+        )
+
+
+def should_index_unchanged_assets_after_changed_assets(subtests: SubTests) -> None:
+    # Given an unchanged asset listed before a changed one
+    hash_key = any_hash_key()
+    unchanged_asset = {
+        PROCESSING_ASSET_URL_KEY: f"{any_s3_url()}/{any_safe_filename()}",
+        PROCESSING_ASSET_MULTIHASH_KEY: any_hex_multihash(),
+    }
+    changed_asset = {
+        PROCESSING_ASSET_URL_KEY: f"{any_s3_url()}/{any_safe_filename()}",
+        PROCESSING_ASSET_MULTIHASH_KEY: any_hex_multihash(),
+    }
+    current_asset = MagicMock()
+    unchanged_asset_finder = MagicMock()
+    unchanged_asset_finder.get_unchanged_assets.side_effect = lambda url, _multihash: (
+        [current_asset] if url == unchanged_asset[PROCESSING_ASSET_URL_KEY] else []
+    )
+
+    with patch(
+        "geostore.check_stac_metadata.utils.processing_assets_model_with_meta"
+    ) as processing_assets_model_with_meta_mock:
+        validator = STACDatasetValidator(
+            hash_key,
+            MockJSONURLReader({}),
+            MockAssetGarbageCollector(),
+            MockValidationResultFactory(),
+            unchanged_asset_finder=unchanged_asset_finder,
+        )
+    validator.dataset_assets = [unchanged_asset, changed_asset]
+    validator.processing_assets_writer = MagicMock()
+
+    # When
+    validator.process_assets()
+
+    # Then
+    with subtests.test(msg="Changed asset"):
+        assert processing_assets_model_with_meta_mock.return_value.call_args_list[0] == call(
+            hash_key=hash_key,
+            range_key=f"{ProcessingAssetType.DATA.value}{DB_KEY_SEPARATOR}0",
+            url=changed_asset[PROCESSING_ASSET_URL_KEY],
+            filename=basename(changed_asset[PROCESSING_ASSET_URL_KEY]),
+            multihash=changed_asset[PROCESSING_ASSET_MULTIHASH_KEY],
+            exists_in_staging=None,
+            unchanged=None,
+        )
+    with subtests.test(msg="Unchanged asset"):
+        assert processing_assets_model_with_meta_mock.return_value.call_args_list[1] == call(
+            hash_key=hash_key,
+            range_key=f"{ProcessingAssetType.DATA.value}{DB_KEY_SEPARATOR}1",
+            url=unchanged_asset[PROCESSING_ASSET_URL_KEY],
+            filename=basename(unchanged_asset[PROCESSING_ASSET_URL_KEY]),
+            multihash=unchanged_asset[PROCESSING_ASSET_MULTIHASH_KEY],
+            exists_in_staging=False,
+            unchanged=True,
+        )
+    with subtests.test(msg="Current asset kept"):
+        unchanged_asset_finder.mark_assets_as_replaced.assert_called_once_with([current_asset])
+
+
+@patch("geostore.check_stac_metadata.utils.get_s3_client_for_role")
+def should_treat_asset_as_unchanged_only_if_stored_object_matches(
+    get_s3_client_for_role_mock: MagicMock, subtests: SubTests
+) -> None:
+    # Given a current version asset with the same filename and checksum
+    filename = any_safe_filename()
+    url = f"{any_s3_url()}/{filename}"
+    multihash = any_hex_multihash()
+    current_asset = MagicMock(multihash=multihash)
+    asset_garbage_collector = MockAssetGarbageCollector()
+    asset_garbage_collector.get_current_assets.return_value = [current_asset]
+    staging_s3_client = MagicMock()
+    geostore_s3_client = MagicMock()
+    get_s3_client_for_role_mock.side_effect = [staging_s3_client, geostore_s3_client]
+    unchanged_asset_finder = UnchangedAssetFinder(
+        any_role_arn(), any_dataset_title(), asset_garbage_collector
+    )
+    stored_object = {"ContentLength": 1, "ETag": '"same"'}
+    geostore_s3_client.head_object.return_value = stored_object
+
+    with subtests.test(msg="Same size and ETag"):
+        staging_s3_client.head_object.return_value = dict(stored_object)
+        assert unchanged_asset_finder.get_unchanged_assets(url, multihash) == [current_asset]
+
+    with subtests.test(msg="Different ETag"):
+        staging_s3_client.head_object.return_value = {**stored_object, "ETag": '"other"'}
+        assert unchanged_asset_finder.get_unchanged_assets(url, multihash) == []
+
+    with subtests.test(msg="Missing staging object"):
+        staging_s3_client.head_object.side_effect = ClientError(
+            _ClientErrorResponseTypeDef(Error=_ClientErrorResponseError(Code="404")),
+            any_error_message(),
+        )
+        assert unchanged_asset_finder.get_unchanged_assets(url, multihash) == []
+
+    with subtests.test(msg="Different checksum"):
+        staging_s3_client.head_object.reset_mock()
+        assert unchanged_asset_finder.get_unchanged_assets(url, any_hex_multihash()) == []
+        staging_s3_client.head_object.assert_not_called()
+
+
 def should_collect_assets_from_validated_collection_metadata_files(subtests: SubTests) -> None:
     # Given one asset in another directory and one relative link
     base_url = any_s3_url()
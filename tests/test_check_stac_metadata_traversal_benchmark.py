@@ -0,0 +1,54 @@
+from time import perf_counter
+from typing import Callable
+from unittest.mock import MagicMock, patch
+
+from pytest import mark
+from pytest_subtests import SubTests
+
+from geostore.check_stac_metadata.utils import STAC_TYPE_VALIDATION_MAP, STACDatasetValidator
+
+from .aws_utils import (
+    MockAssetGarbageCollector,
+    MockGeostoreS3Response,
+    MockJSONURLReader,
+    MockValidationResultFactory,
+    any_s3_url,
+)
+from .dynamodb_generators import any_hash_key
+from .general_generators import any_safe_filename
+from .stac_generators import any_synthetic_stac_collection
+
+ITEM_COUNTS = [1_000, 10_000, 100_000]
+
+
+@mark.benchmark
+@patch("geostore.check_stac_metadata.utils.get_param", MagicMock())
+@patch("geostore.check_stac_metadata.utils.processing_assets_model_with_meta", MagicMock())
+@patch.dict(STAC_TYPE_VALIDATION_MAP, {key: MagicMock() for key in STAC_TYPE_VALIDATION_MAP})
+def should_traverse_metadata_in_linear_time(
+    record_property: Callable[[str, object], None], subtests: SubTests
+) -> None:
+    # Seconds per item should stay roughly the same as the item count grows
+    for item_count in ITEM_COUNTS:
+        collection_url = f"{any_s3_url()}/{any_safe_filename()}"
+        url_reader = MockJSONURLReader(
+            {
+                url: MockGeostoreS3Response(stac_object, file_in_staging=True)
+                for url, stac_object in any_synthetic_stac_collection(
+                    collection_url, item_count
+                ).items()
+            }
+        )
+        validator = STACDatasetValidator(
+            any_hash_key(), url_reader, MockAssetGarbageCollector(), MockValidationResultFactory()
+        )
+
+        start = perf_counter()
+        validator.validate(collection_url)
+        record_property(
+            f"{item_count}_items_microseconds_per_item",
+            (perf_counter() - start) / item_count * 1_000_000,
+        )
+
+        with subtests.test(msg=f"Traversed {item_count:,} items"):
+            assert len(validator.traversed_urls) == item_count + 1
@@ -15,6 +15,7 @@ from pytest import mark
 from pytest_subtests import SubTests
 from typer.testing import CliRunner
 
+from geostore.api_keys import ATTRIBUTES_KEY, CURSOR_KEY, NEXT_CURSOR_KEY, PAGE_SIZE_KEY
 from geostore.aws_keys import AWS_DEFAULT_REGION_KEY, BODY_KEY, STATUS_CODE_KEY
 from geostore.cli import (
     DATASET_ID_ARGUMENT,
@@ -23,6 +24,7 @@ from geostore.cli import (
     EXECUTION_ARN_ARGUMENT,
     ID_ARGUMENT,
     METADATA_URL_ARGUMENT,
+    PAGE_SIZE_ARGUMENT,
     S3_ROLE_ARN_ARGUMENT,
     TITLE_ARGUMENT,
     VERSION_FLAG,
@@ -34,9 +36,12 @@ from geostore.stac_format import STAC_ASSETS_KEY, STAC_FILE_CHECKSUM_KEY, STAC_H
 from geostore.step_function import Outcome
 from geostore.step_function_keys import (
     ASSET_UPLOAD_KEY,
+    DATASETS_KEY,
     DATASET_ID_SHORT_KEY,
+    DATASET_TITLE_KEY,
     ERRORS_KEY,
     ERROR_CHECK_KEY,
+    ERROR_COUNTS_KEY,
     ERROR_DETAILS_KEY,
     ERROR_RESULT_KEY,
     ERROR_URL_KEY,
@@ -282,6 +287,52 @@ def should_list_datasets(subtests: SubTests) -> None:
         assert result.exit_code == 0
 
 
+@patch("boto3.client")
+def should_print_each_page_of_datasets(boto3_client_mock: MagicMock, subtests: SubTests) -> None:
+    # Given two pages of datasets
+    titles = [any_dataset_title(), any_dataset_title()]
+    next_cursor = any_name()
+    response_bodies = [
+        {DATASETS_KEY: [{DATASET_TITLE_KEY: titles[0]}], NEXT_CURSOR_KEY: next_cursor},
+        {DATASETS_KEY: [{DATASET_TITLE_KEY: titles[1]}]},
+    ]
+    boto3_client_mock.return_value.invoke.side_effect = [
+        InvocationResponseTypeDef(
+            StatusCode=HTTPStatus.OK,
+            FunctionError="",
+            LogResult="",
+            Payload=stream_contents(
+                dumps(get_response_object(HTTPStatus.OK, response_body)).encode()
+            ),
+            ExecutedVersion=LAMBDA_EXECUTED_VERSION,
+            ResponseMetadata=any_response_metadata(),
+        )
+        for response_body in response_bodies
+    ]
+
+    # When
+    result = CLI_RUNNER.invoke(app, ["dataset", "list", f"{PAGE_SIZE_ARGUMENT}=1"])
+
+    # Then
+    with subtests.test(msg="should print one title per line"):
+        assert result.stdout == f"{titles[0]}\n{titles[1]}\n"
+
+    with subtests.test(msg="should only request titles"):
+        first_request = loads(
+            boto3_client_mock.return_value.invoke.call_args_list[0].kwargs["Payload"]
+        )
+        assert first_request[BODY_KEY][ATTRIBUTES_KEY] == [DATASET_TITLE_KEY]
+
+    with subtests.test(msg="should request the next page with the cursor"):
+        second_request = loads(
+            boto3_client_mock.return_value.invoke.call_args_list[1].kwargs["Payload"]
+        )
+        assert second_request[BODY_KEY][CURSOR_KEY] == next_cursor
+
+    with subtests.test(msg="should indicate success via exit code"):
+        assert result.exit_code == 0, result
+
+
 @mark.infrastructure
 def should_filter_datasets_listing(subtests: SubTests) -> None:
     # Given two datasets
@@ -398,6 +449,79 @@ def should_print_version_import_status_verbatim(
         assert result.exit_code == 0, result
 
 
+@patch("boto3.client")
+def should_stream_all_validation_error_pages(
+    boto3_client_mock: MagicMock, subtests: SubTests
+) -> None:
+    # Given two pages of validation errors
+    errors = [
+        {
+            ERROR_CHECK_KEY: any_name(),
+            ERROR_DETAILS_KEY: {"message": any_name()},
+            ERROR_RESULT_KEY: ValidationResult.FAILED.value,
+            ERROR_URL_KEY: any_s3_url(),
+        }
+        for _ in range(2)
+    ]
+    next_cursor = any_name()
+    page_size = 1
+    response_bodies = [
+        {
+            VALIDATION_KEY: {
+                STATUS_KEY: Outcome.FAILED.value,
+                ERRORS_KEY: [errors[0]],
+                ERROR_COUNTS_KEY: {},
+                NEXT_CURSOR_KEY: next_cursor,
+            }
+        },
+        {
+            VALIDATION_KEY: {
+                STATUS_KEY: Outcome.FAILED.value,
+                ERRORS_KEY: [errors[1]],
+                ERROR_COUNTS_KEY: {},
+            }
+        },
+    ]
+    boto3_client_mock.return_value.invoke.side_effect = [
+        InvocationResponseTypeDef(
+            StatusCode=HTTPStatus.OK,
+            FunctionError="",
+            LogResult="",
+            Payload=stream_contents(
+                dumps(get_response_object(HTTPStatus.OK, response_body)).encode()
+            ),
+            ExecutedVersion=LAMBDA_EXECUTED_VERSION,
+            ResponseMetadata=any_response_metadata(),
+        )
+        for response_body in response_bodies
+    ]
+
+    # When
+    result = CLI_RUNNER.invoke(
+        app,
+        [
+            "version",
+            "validation-errors",
+            f"{EXECUTION_ARN_ARGUMENT}={any_arn_formatted_string()}",
+            f"{PAGE_SIZE_ARGUMENT}={page_size}",
+        ],
+    )
+
+    # Then
+    with subtests.test(msg="should print one error per line"):
+        assert [loads(line) for line in result.stdout.splitlines()] == errors
+
+    with subtests.test(msg="should request the next page with the cursor"):
+        second_request = loads(
+            boto3_client_mock.return_value.invoke.call_args_list[1].kwargs["Payload"]
+        )
+        assert second_request[BODY_KEY][CURSOR_KEY] == next_cursor
+        assert second_request[BODY_KEY][PAGE_SIZE_KEY] == page_size
+
+    with subtests.test(msg="should indicate success via exit code"):
+        assert result.exit_code == 0, result
+
+
 @mark.infrastructure
 def should_get_version_import_status(subtests: SubTests) -> None:
     asset_filename = any_safe_filename()
@@ -7,19 +7,27 @@ from pytest import mark, raises
 from pytest_subtests import SubTests
 
 from geostore.content_iterator.task import (
+    ARRAY_SIZE_KEY,
     ASSETS_TABLE_NAME_KEY,
+    BATCH_SIZE,
+    BATCH_SIZE_KEY,
     CONTENT_KEY,
     FIRST_ITEM_KEY,
     ITERATION_SIZE_KEY,
     MAX_ITERATION_SIZE,
+    MAX_SLICES_PER_ITERATION,
+    MAX_SLICE_SIZE,
     NEXT_ITEM_KEY,
     RESULTS_TABLE_NAME_KEY,
+    SLICES_KEY,
     lambda_handler,
 )
 from geostore.models import DB_KEY_SEPARATOR
 from geostore.processing_assets_model import ProcessingAssetType, processing_assets_model_with_meta
 from geostore.step_function import get_hash_key
 from geostore.step_function_keys import (
+    ASSET_COUNT_KEY,
+    CHECK_STAC_METADATA_KEY,
     DATASET_ID_KEY,
     METADATA_URL_KEY,
     NEW_VERSION_ID_KEY,
@@ -181,8 +189,27 @@ def should_return_minus_one_next_item_if_remaining_item_count_is_less_than_itera
         FIRST_ITEM_KEY: str(next_item_index),
         ITERATION_SIZE_KEY: remaining_item_count,
         NEXT_ITEM_KEY: -1,
-        ASSETS_TABLE_NAME_KEY: assets_table_name,
-        RESULTS_TABLE_NAME_KEY: results_table_name,
+        SLICES_KEY: [
+            *(
+                {
+                    FIRST_ITEM_KEY: str(next_item_index + index * MAX_SLICE_SIZE),
+                    ITERATION_SIZE_KEY: MAX_SLICE_SIZE,
+                    BATCH_SIZE_KEY: str(BATCH_SIZE),
+                    ARRAY_SIZE_KEY: MAX_SLICE_SIZE // BATCH_SIZE,
+                    ASSETS_TABLE_NAME_KEY: assets_table_name,
+                    RESULTS_TABLE_NAME_KEY: results_table_name,
+                }
+                for index in range(MAX_SLICES_PER_ITERATION - 1)
+            ),
+            {
+                FIRST_ITEM_KEY: str(next_item_index + MAX_ITERATION_SIZE - MAX_SLICE_SIZE),
+                ITERATION_SIZE_KEY: MAX_SLICE_SIZE - 1,
+                BATCH_SIZE_KEY: str(BATCH_SIZE),
+                ARRAY_SIZE_KEY: MAX_SLICE_SIZE // BATCH_SIZE,
+                ASSETS_TABLE_NAME_KEY: assets_table_name,
+                RESULTS_TABLE_NAME_KEY: results_table_name,
+            },
+        ],
     }
 
     response = lambda_handler(event, any_lambda_context())
@@ -211,8 +238,17 @@ def should_return_minus_one_next_item_if_remaining_item_count_matches_iteration_
         FIRST_ITEM_KEY: str(next_item_index),
         ITERATION_SIZE_KEY: MAX_ITERATION_SIZE,
         NEXT_ITEM_KEY: -1,
-        ASSETS_TABLE_NAME_KEY: assets_table_name,
-        RESULTS_TABLE_NAME_KEY: results_table_name,
+        SLICES_KEY: [
+            {
+                FIRST_ITEM_KEY: str(next_item_index + index * MAX_SLICE_SIZE),
+                ITERATION_SIZE_KEY: MAX_SLICE_SIZE,
+                BATCH_SIZE_KEY: str(BATCH_SIZE),
+                ARRAY_SIZE_KEY: MAX_SLICE_SIZE // BATCH_SIZE,
+                ASSETS_TABLE_NAME_KEY: assets_table_name,
+                RESULTS_TABLE_NAME_KEY: results_table_name,
+            }
+            for index in range(MAX_SLICES_PER_ITERATION)
+        ],
     }
 
     response = lambda_handler(event, any_lambda_context())
@@ -241,8 +277,17 @@ def should_return_content_when_remaining_item_count_is_more_than_iteration_size(
         FIRST_ITEM_KEY: str(next_item_index),
         ITERATION_SIZE_KEY: MAX_ITERATION_SIZE,
         NEXT_ITEM_KEY: next_item_index + MAX_ITERATION_SIZE,
-        ASSETS_TABLE_NAME_KEY: assets_table_name,
-        RESULTS_TABLE_NAME_KEY: results_table_name,
+        SLICES_KEY: [
+            {
+                FIRST_ITEM_KEY: str(next_item_index + index * MAX_SLICE_SIZE),
+                ITERATION_SIZE_KEY: MAX_SLICE_SIZE,
+                BATCH_SIZE_KEY: str(BATCH_SIZE),
+                ARRAY_SIZE_KEY: MAX_SLICE_SIZE // BATCH_SIZE,
+                ASSETS_TABLE_NAME_KEY: assets_table_name,
+                RESULTS_TABLE_NAME_KEY: results_table_name,
+            }
+            for index in range(MAX_SLICES_PER_ITERATION)
+        ],
     }
 
     response = lambda_handler(event, any_lambda_context())
@@ -250,6 +295,55 @@ def should_return_content_when_remaining_item_count_is_more_than_iteration_size(
     assert response == expected_response, response
 
 
+@patch("geostore.content_iterator.task.processing_assets_model_with_meta")
+@patch("geostore.content_iterator.task.get_param")
+def should_return_array_size_including_partial_last_batch(
+    _get_param_mock: MagicMock,
+    processing_assets_model_mock: MagicMock,
+) -> None:
+    remaining_item_count = BATCH_SIZE + 1
+    next_item_index = any_next_item_index()
+    event = deepcopy(SUBSEQUENT_EVENT)
+    event[CONTENT_KEY][NEXT_ITEM_KEY] = next_item_index
+    processing_assets_model_mock.return_value.count.return_value = (
+        next_item_index + remaining_item_count
+    )
+
+    response = lambda_handler(event, any_lambda_context())
+
+    assert response[SLICES_KEY][0][ARRAY_SIZE_KEY] == 2, response
+
+
+@patch("geostore.content_iterator.task.processing_assets_model_with_meta")
+def should_return_no_slices_when_there_are_no_assets(
+    processing_assets_model_mock: MagicMock,
+) -> None:
+    processing_assets_model_mock.return_value.count.return_value = 0
+
+    response = lambda_handler(deepcopy(INITIAL_EVENT), any_lambda_context())
+
+    assert not response[SLICES_KEY], response
+
+
+@patch("geostore.content_iterator.task.processing_assets_model_with_meta")
+def should_use_asset_count_reported_by_metadata_check(
+    processing_assets_model_mock: MagicMock, subtests: SubTests
+) -> None:
+    next_item_index = any_next_item_index()
+    remaining_item_count = BATCH_SIZE + 1
+    event = deepcopy(SUBSEQUENT_EVENT)
+    event[CONTENT_KEY][NEXT_ITEM_KEY] = next_item_index
+    event[CHECK_STAC_METADATA_KEY] = {ASSET_COUNT_KEY: next_item_index + remaining_item_count}
+
+    response = lambda_handler(event, any_lambda_context())
+
+    with subtests.test(msg="Iteration size"):
+        assert response[ITERATION_SIZE_KEY] == remaining_item_count, response
+
+    with subtests.test(msg="Assets not counted"):
+        processing_assets_model_mock.return_value.count.assert_not_called()
+
+
 @mark.infrastructure
 def should_count_only_asset_files() -> None:
     # Given a single metadata and asset entry in the database
@@ -11,13 +11,26 @@ from mypy_boto3_lambda import LambdaClient
 from pytest import mark
 from pytest_subtests import SubTests
 
-from geostore.api_keys import MESSAGE_KEY
+from geostore.api_keys import (
+    ATTRIBUTES_KEY,
+    CURSOR_KEY,
+    MESSAGE_KEY,
+    NEXT_CURSOR_KEY,
+    PAGE_SIZE_KEY,
+)
 from geostore.aws_keys import BODY_KEY, HTTP_METHOD_KEY, STATUS_CODE_KEY
 from geostore.dataset_properties import TITLE_PATTERN
 from geostore.datasets.entrypoint import lambda_handler
 from geostore.datasets.get import get_dataset_filter, get_dataset_single, handle_get
+from geostore.datasets.list import list_datasets
+from geostore.datasets_model import DatasetsModelBase
 from geostore.resources import Resource
-from geostore.step_function_keys import DATASET_ID_SHORT_KEY, DATASET_TITLE_KEY, DESCRIPTION_KEY
+from geostore.step_function_keys import (
+    DATASETS_KEY,
+    DATASET_ID_SHORT_KEY,
+    DATASET_TITLE_KEY,
+    DESCRIPTION_KEY,
+)
 
 from .aws_utils import Dataset, S3Object, any_lambda_context
 from .general_generators import any_dictionary_key, any_safe_filename, random_string
@@ -122,6 +135,42 @@ def should_return_all_datasets(subtests: SubTests) -> None:
                 assert dataset_id in actual_dataset_ids
 
 
+@mark.infrastructure
+def should_return_datasets_page_by_page(subtests: SubTests) -> None:
+    # Given two datasets
+    with Dataset() as first_dataset, Dataset() as second_dataset:
+        expected_titles = {first_dataset.title, second_dataset.title}
+
+        # When requesting one dataset title at a time
+        body = {PAGE_SIZE_KEY: 1, ATTRIBUTES_KEY: [DATASET_TITLE_KEY]}
+        pages = []
+        while True:
+            response = lambda_handler(
+                {HTTP_METHOD_KEY: "GET", BODY_KEY: body}, any_lambda_context()
+            )
+            pages.append(response[BODY_KEY][DATASETS_KEY])
+            if NEXT_CURSOR_KEY not in response[BODY_KEY]:
+                break
+            body[CURSOR_KEY] = response[BODY_KEY][NEXT_CURSOR_KEY]
+
+    # Then we should get every dataset in its own page
+    with subtests.test(msg="page sizes"):
+        assert all(len(page) <= 1 for page in pages)
+
+    entries = [entry for page in pages for entry in page]
+    actual_titles = {entry[DATASET_TITLE_KEY] for entry in entries}
+    with subtests.test(msg="titles"):
+        assert expected_titles <= actual_titles
+
+    with subtests.test(msg="ordered by title"):
+        titles = [entry[DATASET_TITLE_KEY] for entry in entries]
+        assert titles == sorted(titles)
+
+    with subtests.test(msg="projected attributes"):
+        expected_keys = {DatasetsModelBase.id.attr_name, DATASET_ID_SHORT_KEY, DATASET_TITLE_KEY}
+        assert all(set(entry) == expected_keys for entry in entries)
+
+
 @mark.infrastructure
 def should_return_single_dataset_filtered_by_title(subtests: SubTests) -> None:
     # Given matching and non-matching dataset instances
@@ -258,6 +307,26 @@ def should_return_error_when_trying_to_get_datasets_with_missing_property() -> N
     }
 
 
+def should_return_error_when_listing_datasets_with_cursor_but_without_page_size() -> None:
+    response = list_datasets({CURSOR_KEY: random_string(10)})
+
+    assert response == {
+        STATUS_CODE_KEY: HTTPStatus.BAD_REQUEST,
+        BODY_KEY: {
+            MESSAGE_KEY: f"Bad Request: '{PAGE_SIZE_KEY}' is a dependency of '{CURSOR_KEY}'"
+        },
+    }
+
+
+def should_return_error_when_listing_datasets_with_invalid_cursor() -> None:
+    response = list_datasets({PAGE_SIZE_KEY: 1, CURSOR_KEY: "invalid"})
+
+    assert response == {
+        STATUS_CODE_KEY: HTTPStatus.BAD_REQUEST,
+        BODY_KEY: {MESSAGE_KEY: f"Bad Request: Invalid {CURSOR_KEY}"},
+    }
+
+
 def should_return_error_when_trying_to_update_dataset_with_missing_property() -> None:
     response = lambda_handler({HTTP_METHOD_KEY: "PATCH", BODY_KEY: {}}, any_lambda_context())
 
@@ -1,12 +1,24 @@
+from hashlib import sha256
 from io import BytesIO
 from json import dumps
+from typing import TYPE_CHECKING
 from unittest.mock import MagicMock, patch
 from urllib.parse import quote
 
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
 from mypy_boto3_s3 import S3Client
-from pytest import mark
+from pytest import mark, raises
+from pytest_subtests import SubTests
 
-from geostore.import_asset_file.task import lambda_handler
+from geostore.aws_response import AWS_CODE_ACCESS_DENIED
+from geostore.import_asset_file.task import (
+    SERVER_SIDE_COPY_CONFIG,
+    UPLOAD_CONFIG,
+    ChecksumMismatchError,
+    importer,
+    lambda_handler,
+)
 from geostore.import_dataset_file import (
     EXCEPTION_PREFIX,
     INVOCATION_ID_KEY,
@@ -21,8 +33,9 @@ from geostore.import_dataset_file import (
     TASK_ID_KEY,
 )
 from geostore.import_dataset_keys import NEW_KEY_KEY, ORIGINAL_KEY_KEY, TARGET_BUCKET_NAME_KEY
+from geostore.parameter_store import ParameterName, get_param
 from geostore.resources import Resource
-from geostore.s3 import CHUNK_SIZE
+from geostore.s3 import get_s3_client_for_role
 from geostore.step_function_keys import S3_ROLE_ARN_KEY
 
 from .aws_utils import (
@@ -30,6 +43,7 @@ from .aws_utils import (
     any_invocation_id,
     any_invocation_schema_version,
     any_lambda_context,
+    any_operation_name,
     any_role_arn,
     any_s3_bucket_arn,
     any_s3_bucket_name,
@@ -43,8 +57,15 @@ from .general_generators import (
     any_safe_file_path,
     any_safe_filename,
 )
+from .stac_generators import any_hex_multihash, sha256_hex_digest_to_multihash
+
+if TYPE_CHECKING:
+    from botocore.exceptions import _ClientErrorResponseError, _ClientErrorResponseTypeDef
+else:
+    _ClientErrorResponseError = _ClientErrorResponseTypeDef = dict
 
 
+@patch("geostore.import_asset_file.task.copy_server_side", MagicMock(return_value=False))
 @patch("geostore.import_asset_file.task.TARGET_S3_CLIENT.upload_fileobj")
 def should_treat_unhandled_exception_as_permanent_failure(upload_fileobj_mock: MagicMock) -> None:
     # Given
@@ -84,6 +105,241 @@ def should_treat_unhandled_exception_as_permanent_failure(upload_fileobj_mock: M
     ]
 
 
+@patch("geostore.import_asset_file.task.TARGET_S3_CLIENT")
+def should_copy_asset_server_side(target_s3_client_mock: MagicMock) -> None:
+    # Given
+    source_bucket_name = any_s3_bucket_name()
+    original_key = any_safe_file_path()
+    target_bucket_name = any_s3_bucket_name()
+    new_key = any_safe_file_path()
+    source_s3_client_mock = MagicMock()
+
+    # When
+    importer(
+        source_bucket_name,
+        original_key,
+        target_bucket_name,
+        new_key,
+        source_s3_client_mock,
+        any_role_arn(),
+    )
+
+    # Then
+    source_s3_client_mock.copy.assert_called_once_with(
+        CopySource={"Bucket": source_bucket_name, "Key": original_key},
+        Bucket=target_bucket_name,
+        Key=new_key,
+        Config=SERVER_SIDE_COPY_CONFIG,
+    )
+    source_s3_client_mock.get_object.assert_not_called()
+    target_s3_client_mock.upload_fileobj.assert_not_called()
+
+
+@patch("geostore.import_asset_file.task.TARGET_S3_CLIENT")
+def should_stream_asset_when_server_side_copy_is_denied(
+    target_s3_client_mock: MagicMock, subtests: SubTests
+) -> None:
+    # Given
+    source_bucket_name = any_s3_bucket_name()
+    target_bucket_name = any_s3_bucket_name()
+    source_s3_client_mock = MagicMock()
+    source_s3_client_mock.copy.side_effect = ClientError(
+        _ClientErrorResponseTypeDef(Error=_ClientErrorResponseError(Code=AWS_CODE_ACCESS_DENIED)),
+        any_operation_name(),
+    )
+
+    source_s3_role_arn = any_role_arn()
+
+    # When
+    for _ in range(2):
+        importer(
+            source_bucket_name,
+            any_safe_file_path(),
+            target_bucket_name,
+            any_safe_file_path(),
+            source_s3_client_mock,
+            source_s3_role_arn,
+        )
+
+    # Then
+    with subtests.test(msg="Streams the asset"):
+        assert target_s3_client_mock.upload_fileobj.call_count == 2
+
+    with subtests.test(msg="Doesn't retry the server-side copy between the same buckets"):
+        source_s3_client_mock.copy.assert_called_once()
+
+
+@patch("geostore.import_asset_file.task.TARGET_S3_CLIENT", MagicMock())
+def should_copy_server_side_with_other_role_when_one_role_is_denied() -> None:
+    # Given a role which can't copy between two buckets
+    source_bucket_name = any_s3_bucket_name()
+    target_bucket_name = any_s3_bucket_name()
+    denied_source_s3_client_mock = MagicMock()
+    denied_source_s3_client_mock.copy.side_effect = ClientError(
+        _ClientErrorResponseTypeDef(Error=_ClientErrorResponseError(Code=AWS_CODE_ACCESS_DENIED)),
+        any_operation_name(),
+    )
+    importer(
+        source_bucket_name,
+        any_safe_file_path(),
+        target_bucket_name,
+        any_safe_file_path(),
+        denied_source_s3_client_mock,
+        any_role_arn(),
+    )
+    allowed_source_s3_client_mock = MagicMock()
+
+    # When importing between the same buckets with another role
+    importer(
+        source_bucket_name,
+        any_safe_file_path(),
+        target_bucket_name,
+        any_safe_file_path(),
+        allowed_source_s3_client_mock,
+        any_role_arn(),
+    )
+
+    # Then
+    allowed_source_s3_client_mock.copy.assert_called_once()
+    allowed_source_s3_client_mock.get_object.assert_not_called()
+
+
+@patch("geostore.import_asset_file.task.TARGET_S3_CLIENT")
+def should_hash_asset_while_copying_it(target_s3_client_mock: MagicMock) -> None:
+    # Given
+    asset_contents = any_file_contents()
+    source_s3_client_mock = MagicMock()
+    source_s3_client_mock.get_object.return_value = {
+        "Body": BytesIO(initial_bytes=asset_contents),
+        "ContentLength": len(asset_contents),
+    }
+    target_bucket_name = any_s3_bucket_name()
+    new_key = any_safe_file_path()
+
+    # When
+    importer(
+        any_s3_bucket_name(),
+        any_safe_file_path(),
+        target_bucket_name,
+        new_key,
+        source_s3_client_mock,
+        any_role_arn(),
+        sha256_hex_digest_to_multihash(sha256(asset_contents).hexdigest()),
+    )
+
+    # Then
+    target_s3_client_mock.put_object.assert_called_once_with(
+        Bucket=target_bucket_name, Key=new_key, Body=asset_contents
+    )
+
+
+@patch("geostore.import_asset_file.task.TARGET_S3_CLIENT")
+def should_not_upload_asset_on_checksum_mismatch(target_s3_client_mock: MagicMock) -> None:
+    # Given
+    asset_contents = any_file_contents()
+    source_s3_client_mock = MagicMock()
+    source_s3_client_mock.get_object.return_value = {
+        "Body": BytesIO(initial_bytes=asset_contents),
+        "ContentLength": len(asset_contents),
+    }
+
+    # When
+    with raises(ChecksumMismatchError):
+        importer(
+            any_s3_bucket_name(),
+            any_safe_file_path(),
+            any_s3_bucket_name(),
+            any_safe_file_path(),
+            source_s3_client_mock,
+            any_role_arn(),
+            any_hex_multihash(),
+        )
+
+    # Then
+    target_s3_client_mock.put_object.assert_not_called()
+
+
+@patch(
+    "geostore.import_asset_file.task.UPLOAD_CONFIG",
+    TransferConfig(max_concurrency=1),  # Wait for each part before reading the next
+)
+@patch("geostore.import_asset_file.task.TARGET_S3_CLIENT")
+def should_hash_multipart_asset_while_uploading_it(target_s3_client_mock: MagicMock) -> None:
+    # Given
+    part_size = UPLOAD_CONFIG.multipart_chunksize
+    asset_contents = any_file_contents(byte_count=part_size + 1)
+    source_s3_client_mock = MagicMock()
+    source_s3_client_mock.get_object.return_value = {
+        "Body": BytesIO(initial_bytes=asset_contents),
+        "ContentLength": len(asset_contents),
+    }
+    upload_id = any_safe_filename()
+    target_s3_client_mock.create_multipart_upload.return_value = {"UploadId": upload_id}
+    target_s3_client_mock.upload_part.side_effect = lambda Body, **_kwargs: {
+        "ETag": sha256(Body).hexdigest()
+    }
+    target_bucket_name = any_s3_bucket_name()
+    new_key = any_safe_file_path()
+
+    # When
+    importer(
+        any_s3_bucket_name(),
+        any_safe_file_path(),
+        target_bucket_name,
+        new_key,
+        source_s3_client_mock,
+        any_role_arn(),
+        sha256_hex_digest_to_multihash(sha256(asset_contents).hexdigest()),
+    )
+
+    # Then
+    target_s3_client_mock.complete_multipart_upload.assert_called_once_with(
+        Bucket=target_bucket_name,
+        Key=new_key,
+        UploadId=upload_id,
+        MultipartUpload={
+            "Parts": [
+                {"ETag": sha256(asset_contents[:part_size]).hexdigest(), "PartNumber": 1},
+                {"ETag": sha256(asset_contents[part_size:]).hexdigest(), "PartNumber": 2},
+            ]
+        },
+    )
+    target_s3_client_mock.abort_multipart_upload.assert_not_called()
+
+
+@patch("geostore.import_asset_file.task.TARGET_S3_CLIENT")
+def should_abort_multipart_upload_on_checksum_mismatch(target_s3_client_mock: MagicMock) -> None:
+    # Given
+    asset_contents = any_file_contents(byte_count=UPLOAD_CONFIG.multipart_chunksize + 1)
+    source_s3_client_mock = MagicMock()
+    source_s3_client_mock.get_object.return_value = {
+        "Body": BytesIO(initial_bytes=asset_contents),
+        "ContentLength": len(asset_contents),
+    }
+    upload_id = any_safe_filename()
+    target_s3_client_mock.create_multipart_upload.return_value = {"UploadId": upload_id}
+    target_bucket_name = any_s3_bucket_name()
+    new_key = any_safe_file_path()
+
+    # When
+    with raises(ChecksumMismatchError):
+        importer(
+            any_s3_bucket_name(),
+            any_safe_file_path(),
+            target_bucket_name,
+            new_key,
+            source_s3_client_mock,
+            any_role_arn(),
+            any_hex_multihash(),
+        )
+
+    # Then
+    target_s3_client_mock.abort_multipart_upload.assert_called_once_with(
+        Bucket=target_bucket_name, Key=new_key, UploadId=upload_id
+    )
+    target_s3_client_mock.complete_multipart_upload.assert_not_called()
+
+
 @mark.infrastructure
 def should_copy_empty_file(s3_client: S3Client) -> None:
     # Given a single-chunk asset file
@@ -126,7 +382,7 @@ def should_copy_empty_file(s3_client: S3Client) -> None:
 @mark.infrastructure
 def should_copy_multi_chunk_file(s3_client: S3Client) -> None:
     # Given a multi-chunk asset file
-    asset_contents = any_file_contents(byte_count=CHUNK_SIZE + 1)
+    asset_contents = any_file_contents(byte_count=TransferConfig().multipart_chunksize + 1)
     target_filename = any_safe_filename()
     target_bucket = Resource.STORAGE_BUCKET_NAME.resource_name
 
@@ -161,3 +417,47 @@ def should_copy_multi_chunk_file(s3_client: S3Client) -> None:
         finally:
             # Then
             delete_s3_key(target_bucket, target_filename, s3_client)
+
+
+@mark.infrastructure
+def should_make_server_side_copy_readable_by_geostore_role(s3_client: S3Client) -> None:
+    # Given an asset file copied server-side by the dataset role
+    asset_contents = any_file_contents()
+    target_filename = any_safe_filename()
+    target_bucket = Resource.STORAGE_BUCKET_NAME.resource_name
+
+    with S3Object(
+        file_object=BytesIO(initial_bytes=asset_contents),
+        bucket_name=Resource.STAGING_BUCKET_NAME.resource_name,
+        key=any_safe_filename(),
+    ) as asset_file:
+        event = {
+            TASKS_KEY: [
+                {
+                    S3_BUCKET_ARN_KEY: f"arn:aws:s3:::{asset_file.bucket_name}",
+                    S3_KEY_KEY: quote(
+                        dumps(
+                            {
+                                NEW_KEY_KEY: target_filename,
+                                ORIGINAL_KEY_KEY: asset_file.key,
+                                S3_ROLE_ARN_KEY: get_s3_role_arn(),
+                                TARGET_BUCKET_NAME_KEY: target_bucket,
+                            }
+                        )
+                    ),
+                    TASK_ID_KEY: any_task_id(),
+                }
+            ],
+            INVOCATION_ID_KEY: any_invocation_id(),
+            INVOCATION_SCHEMA_VERSION_KEY: any_invocation_schema_version(),
+        }
+        try:
+            # When
+            lambda_handler(event, any_lambda_context())
+
+            # Then
+            geostore_s3_client = get_s3_client_for_role(get_param(ParameterName.S3_USERS_ROLE_ARN))
+            response = geostore_s3_client.get_object(Bucket=target_bucket, Key=target_filename)
+            assert response["Body"].read() == asset_contents
+        finally:
+            delete_s3_key(target_bucket, target_filename, s3_client)
@@ -3,16 +3,39 @@ from datetime import timedelta
 from hashlib import sha256
 from io import BytesIO
 from json import dumps
+from os import environ
+from typing import TYPE_CHECKING, Callable, Iterator, List
+from unittest.mock import MagicMock, patch
 
 import smart_open
+from botocore.exceptions import ClientError
 from mypy_boto3_s3 import S3Client
 from mypy_boto3_s3control import S3ControlClient
 from pytest import mark
 from pytest_subtests import SubTests
 
+from geostore.environment import (
+    DIRECT_IMPORT_MAX_BYTES_VARIABLE_NAME,
+    DIRECT_IMPORT_MAX_OBJECTS_VARIABLE_NAME,
+)
 from geostore.error_response_keys import ERROR_MESSAGE_KEY
-from geostore.import_dataset.task import lambda_handler
+from geostore.import_dataset.task import (
+    FAILURE_CODE_KEY,
+    FAILURE_REASON_KEY,
+    MAX_DIRECT_IMPORT_ATTEMPTS,
+    lambda_handler,
+)
+from geostore.import_dataset_file import (
+    RESULTS_KEY,
+    RESULT_CODE_KEY,
+    RESULT_CODE_PERMANENT_FAILURE,
+    RESULT_CODE_SUCCEEDED,
+    RESULT_CODE_TEMPORARY_FAILURE,
+    RESULT_STRING_KEY,
+)
+from geostore.import_file_batch_job_id_keys import ASSET_JOB_ID_KEY, METADATA_JOB_ID_KEY
 from geostore.models import DATASET_ID_PREFIX, DB_KEY_SEPARATOR, VERSION_ID_PREFIX
+from geostore.processing_assets_model import ProcessingAssetType, ProcessingAssetsModelBase
 from geostore.resources import Resource
 from geostore.s3 import S3_URL_PREFIX
 from geostore.stac_format import (
@@ -24,18 +47,28 @@ from geostore.stac_format import (
     STAC_REL_KEY,
 )
 from geostore.step_function_keys import (
+    ASSET_UPLOAD_KEY,
     DATASET_ID_KEY,
     DATASET_TITLE_KEY,
+    ERRORS_KEY,
+    FAILED_TASKS_KEY,
+    FAILURE_REASONS_KEY,
+    METADATA_UPLOAD_KEY,
     METADATA_URL_KEY,
     NEW_VERSION_ID_KEY,
+    S3_BATCH_STATUS_COMPLETE,
+    S3_BATCH_STATUS_FAILED,
     S3_ROLE_ARN_KEY,
+    STATUS_KEY,
 )
 from geostore.sts import get_account_number
+from geostore.types import JsonObject
 
 from .aws_utils import (
     Dataset,
     ProcessingAsset,
     S3Object,
+    any_job_id,
     any_lambda_context,
     any_role_arn,
     any_s3_url,
@@ -45,16 +78,22 @@ from .aws_utils import (
     wait_for_copy_jobs,
 )
 from .file_utils import json_dict_to_file_object
-from .general_generators import any_file_contents, any_safe_filename
+from .general_generators import any_error_message, any_file_contents, any_safe_filename
 from .stac_generators import (
     any_asset_name,
     any_dataset_id,
     any_dataset_title,
     any_dataset_version_id,
+    any_hex_multihash,
     sha256_hex_digest_to_multihash,
 )
 from .stac_objects import MINIMAL_VALID_STAC_COLLECTION_OBJECT
 
+if TYPE_CHECKING:
+    from botocore.exceptions import _ClientErrorResponseError, _ClientErrorResponseTypeDef
+else:
+    _ClientErrorResponseError = _ClientErrorResponseTypeDef = dict
+
 
 def should_return_error_when_missing_required_property(subtests: SubTests) -> None:
     # Given
@@ -78,6 +117,279 @@ def should_return_error_when_missing_required_property(subtests: SubTests) -> No
             assert response == {ERROR_MESSAGE_KEY: f"'{key}' is a required property"}
 
 
+def any_import_event() -> JsonObject:
+    return {
+        DATASET_ID_KEY: any_dataset_id(),
+        DATASET_TITLE_KEY: any_dataset_title(),
+        METADATA_URL_KEY: any_s3_url(),
+        S3_ROLE_ARN_KEY: any_role_arn(),
+        NEW_VERSION_ID_KEY: any_dataset_version_id(),
+    }
+
+
+def any_processing_asset() -> ProcessingAssetsModelBase:
+    return ProcessingAssetsModelBase(
+        url=any_s3_url(), filename=any_safe_filename(), multihash=any_hex_multihash()
+    )
+
+
+def get_import_items_returning(
+    items: List[ProcessingAssetsModelBase],
+) -> Callable[[JsonObject, ProcessingAssetType], Iterator[ProcessingAssetsModelBase]]:
+    def get_import_items(
+        _event: JsonObject, processing_asset_type: ProcessingAssetType
+    ) -> Iterator[ProcessingAssetsModelBase]:
+        # One asset and the rest metadata
+        if processing_asset_type == ProcessingAssetType.DATA:
+            return iter(items[:1])
+        return iter(items[1:])
+
+    return get_import_items
+
+
+def import_function_response(result_code: str, result_string: str) -> JsonObject:
+    payload = {RESULTS_KEY: [{RESULT_CODE_KEY: result_code, RESULT_STRING_KEY: result_string}]}
+    return {"Payload": BytesIO(initial_bytes=dumps(payload).encode())}
+
+
+@patch("geostore.import_dataset.task.create_import_job")
+@patch("geostore.import_dataset.task.LAMBDA_CLIENT.invoke")
+@patch("geostore.import_dataset.task.get_s3_client_for_role")
+@patch("geostore.import_dataset.task.get_import_items")
+def should_import_small_dataset_directly(
+    get_import_items_mock: MagicMock,
+    get_s3_client_for_role_mock: MagicMock,
+    invoke_mock: MagicMock,
+    create_import_job_mock: MagicMock,
+    subtests: SubTests,
+) -> None:
+    # Given
+    items = [any_processing_asset() for _ in range(3)]
+    get_import_items_mock.side_effect = get_import_items_returning(items)
+    get_s3_client_for_role_mock.return_value.head_object.return_value = {"ContentLength": 1}
+    invoke_mock.side_effect = lambda **_kwargs: import_function_response(
+        RESULT_CODE_SUCCEEDED, any_error_message()
+    )
+    expected_status = {
+        STATUS_KEY: S3_BATCH_STATUS_COMPLETE,
+        ERRORS_KEY: {FAILED_TASKS_KEY: 0, FAILURE_REASONS_KEY: []},
+    }
+
+    # When
+    response = lambda_handler(any_import_event(), any_lambda_context())
+
+    # Then
+    with subtests.test(msg="Response"):
+        assert response == {ASSET_UPLOAD_KEY: expected_status, METADATA_UPLOAD_KEY: expected_status}
+
+    with subtests.test(msg="Imported each file"):
+        assert invoke_mock.call_count == len(items)
+
+    with subtests.test(msg="Created no import jobs"):
+        create_import_job_mock.assert_not_called()
+
+
+@patch.dict(environ, {DIRECT_IMPORT_MAX_BYTES_VARIABLE_NAME: "1"})
+@patch("geostore.import_dataset.task.create_import_job")
+@patch("geostore.import_dataset.task.LAMBDA_CLIENT.invoke")
+@patch("geostore.import_dataset.task.get_s3_client_for_role")
+@patch("geostore.import_dataset.task.get_import_items")
+def should_create_import_jobs_when_dataset_is_too_big_to_import_directly(
+    get_import_items_mock: MagicMock,
+    get_s3_client_for_role_mock: MagicMock,
+    invoke_mock: MagicMock,
+    create_import_job_mock: MagicMock,
+    subtests: SubTests,
+) -> None:
+    # Given
+    get_import_items_mock.side_effect = get_import_items_returning(
+        [any_processing_asset() for _ in range(2)]
+    )
+    get_s3_client_for_role_mock.return_value.head_object.return_value = {"ContentLength": 1}
+    job_id = any_job_id()
+    create_import_job_mock.return_value = job_id
+
+    # When
+    response = lambda_handler(any_import_event(), any_lambda_context())
+
+    # Then
+    with subtests.test(msg="Response"):
+        assert response == {ASSET_JOB_ID_KEY: job_id, METADATA_JOB_ID_KEY: job_id}
+
+    with subtests.test(msg="Imported no files directly"):
+        invoke_mock.assert_not_called()
+
+
+@patch("geostore.import_dataset.task.create_import_job")
+@patch("geostore.import_dataset.task.LAMBDA_CLIENT.invoke")
+@patch("geostore.import_dataset.task.get_s3_client_for_role")
+@patch("geostore.import_dataset.task.get_import_items")
+def should_create_import_jobs_when_a_file_cannot_be_read(
+    get_import_items_mock: MagicMock,
+    get_s3_client_for_role_mock: MagicMock,
+    invoke_mock: MagicMock,
+    create_import_job_mock: MagicMock,
+    subtests: SubTests,
+) -> None:
+    # Given a file removed from staging after validation
+    get_import_items_mock.side_effect = get_import_items_returning(
+        [any_processing_asset() for _ in range(2)]
+    )
+    get_s3_client_for_role_mock.return_value.head_object.side_effect = [
+        {"ContentLength": 1},
+        ClientError(
+            _ClientErrorResponseTypeDef(
+                Error=_ClientErrorResponseError(Code="404", Message="Not Found")
+            ),
+            operation_name="HeadObject",
+        ),
+    ]
+    job_id = any_job_id()
+    create_import_job_mock.return_value = job_id
+
+    # When
+    response = lambda_handler(any_import_event(), any_lambda_context())
+
+    # Then the jobs report the missing file like any other failed task
+    with subtests.test(msg="Response"):
+        assert response == {ASSET_JOB_ID_KEY: job_id, METADATA_JOB_ID_KEY: job_id}
+
+    with subtests.test(msg="Imported no files directly"):
+        invoke_mock.assert_not_called()
+
+
+@patch.dict(environ, {DIRECT_IMPORT_MAX_OBJECTS_VARIABLE_NAME: "1"})
+@patch("geostore.import_dataset.task.create_import_job")
+@patch("geostore.import_dataset.task.get_s3_client_for_role")
+@patch("geostore.import_dataset.task.get_import_items")
+def should_not_check_object_sizes_when_dataset_has_too_many_files_to_import_directly(
+    get_import_items_mock: MagicMock,
+    get_s3_client_for_role_mock: MagicMock,
+    create_import_job_mock: MagicMock,
+) -> None:
+    # Given
+    get_import_items_mock.side_effect = get_import_items_returning(
+        [any_processing_asset() for _ in range(2)]
+    )
+    create_import_job_mock.return_value = any_job_id()
+
+    # When
+    lambda_handler(any_import_event(), any_lambda_context())
+
+    # Then
+    get_s3_client_for_role_mock.assert_not_called()
+
+
+@patch("geostore.import_dataset.task.LAMBDA_CLIENT.invoke")
+@patch("geostore.import_dataset.task.get_s3_client_for_role")
+@patch("geostore.import_dataset.task.get_import_items")
+def should_retry_temporary_direct_import_failures(
+    get_import_items_mock: MagicMock,
+    get_s3_client_for_role_mock: MagicMock,
+    invoke_mock: MagicMock,
+) -> None:
+    # Given
+    get_import_items_mock.side_effect = get_import_items_returning([any_processing_asset()])
+    get_s3_client_for_role_mock.return_value.head_object.return_value = {"ContentLength": 1}
+    invoke_mock.side_effect = [
+        import_function_response(RESULT_CODE_TEMPORARY_FAILURE, any_error_message()),
+        import_function_response(RESULT_CODE_SUCCEEDED, any_error_message()),
+    ]
+
+    # When
+    response = lambda_handler(any_import_event(), any_lambda_context())
+
+    # Then
+    assert response[ASSET_UPLOAD_KEY][STATUS_KEY] == S3_BATCH_STATUS_COMPLETE
+
+
+@patch("geostore.import_dataset.task.LAMBDA_CLIENT.invoke")
+@patch("geostore.import_dataset.task.get_s3_client_for_role")
+@patch("geostore.import_dataset.task.get_import_items")
+def should_retry_direct_imports_when_invocation_fails(
+    get_import_items_mock: MagicMock,
+    get_s3_client_for_role_mock: MagicMock,
+    invoke_mock: MagicMock,
+) -> None:
+    # Given
+    get_import_items_mock.side_effect = get_import_items_returning([any_processing_asset()])
+    get_s3_client_for_role_mock.return_value.head_object.return_value = {"ContentLength": 1}
+    invoke_mock.side_effect = [
+        ClientError(
+            _ClientErrorResponseTypeDef(
+                Error=_ClientErrorResponseError(
+                    Code="TooManyRequestsException", Message=any_error_message()
+                )
+            ),
+            operation_name="Invoke",
+        ),
+        import_function_response(RESULT_CODE_SUCCEEDED, any_error_message()),
+    ]
+
+    # When
+    response = lambda_handler(any_import_event(), any_lambda_context())
+
+    # Then
+    assert response[ASSET_UPLOAD_KEY][STATUS_KEY] == S3_BATCH_STATUS_COMPLETE
+    assert invoke_mock.call_count == 2
+
+
+@patch("geostore.import_dataset.task.LAMBDA_CLIENT.invoke")
+@patch("geostore.import_dataset.task.get_s3_client_for_role")
+@patch("geostore.import_dataset.task.get_import_items")
+def should_report_failed_direct_imports(
+    get_import_items_mock: MagicMock,
+    get_s3_client_for_role_mock: MagicMock,
+    invoke_mock: MagicMock,
+    subtests: SubTests,
+) -> None:
+    # Given an asset which keeps timing out and a metadata file which fails
+    get_import_items_mock.side_effect = get_import_items_returning(
+        [any_processing_asset(), any_processing_asset()]
+    )
+    get_s3_client_for_role_mock.return_value.head_object.return_value = {"ContentLength": 1}
+    asset_result_string = any_error_message()
+    metadata_result_string = any_error_message()
+    invoke_mock.side_effect = [
+        import_function_response(RESULT_CODE_TEMPORARY_FAILURE, asset_result_string)
+        for _ in range(MAX_DIRECT_IMPORT_ATTEMPTS)
+    ] + [import_function_response(RESULT_CODE_PERMANENT_FAILURE, metadata_result_string)]
+
+    # When
+    with patch("geostore.import_dataset.task.MAX_CONCURRENT_DIRECT_IMPORTS", 1):
+        response = lambda_handler(any_import_event(), any_lambda_context())
+
+    # Then
+    with subtests.test(msg="Asset upload"):
+        assert response[ASSET_UPLOAD_KEY] == {
+            STATUS_KEY: S3_BATCH_STATUS_FAILED,
+            ERRORS_KEY: {
+                FAILED_TASKS_KEY: 1,
+                FAILURE_REASONS_KEY: [
+                    {
+                        FAILURE_CODE_KEY: RESULT_CODE_TEMPORARY_FAILURE,
+                        FAILURE_REASON_KEY: asset_result_string,
+                    }
+                ],
+            },
+        }
+
+    with subtests.test(msg="Metadata upload"):
+        assert response[METADATA_UPLOAD_KEY] == {
+            STATUS_KEY: S3_BATCH_STATUS_FAILED,
+            ERRORS_KEY: {
+                FAILED_TASKS_KEY: 1,
+                FAILURE_REASONS_KEY: [
+                    {
+                        FAILURE_CODE_KEY: RESULT_CODE_PERMANENT_FAILURE,
+                        FAILURE_REASON_KEY: metadata_result_string,
+                    }
+                ],
+            },
+        }
+
+
+@patch.dict(environ, {DIRECT_IMPORT_MAX_OBJECTS_VARIABLE_NAME: "0"})
 @mark.timeout(timedelta(minutes=20).total_seconds())
 @mark.infrastructure
 def should_batch_copy_files_to_storage(
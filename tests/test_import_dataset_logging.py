@@ -1,9 +1,11 @@
+from os import environ
 from unittest.mock import MagicMock, patch
 
 from jsonschema import ValidationError
 from pytest import mark
 from pytest_subtests import SubTests
 
+from geostore.environment import DIRECT_IMPORT_MAX_OBJECTS_VARIABLE_NAME
 from geostore.import_dataset.task import lambda_handler
 from geostore.logging_keys import (
     GIT_COMMIT,
@@ -77,6 +79,7 @@ def should_log_schema_validation_warning(validate_schema_mock: MagicMock) -> Non
         )
 
 
+@patch.dict(environ, {DIRECT_IMPORT_MAX_OBJECTS_VARIABLE_NAME: "0"})
 @patch("geostore.import_dataset.task.S3_CLIENT.head_object")
 @mark.infrastructure
 def should_log_assets_added_to_manifest(
@@ -132,6 +135,7 @@ def should_log_assets_added_to_manifest(
                 )
 
 
+@patch.dict(environ, {DIRECT_IMPORT_MAX_OBJECTS_VARIABLE_NAME: "0"})
 @patch("geostore.import_dataset.task.S3CONTROL_CLIENT.create_job")
 @patch("geostore.import_dataset.task.S3_CLIENT.head_object")
 @mark.infrastructure
@@ -8,8 +8,9 @@ from unittest.mock import MagicMock, patch
 
 from pytest import mark
 
-from geostore.api_keys import MESSAGE_KEY, STATUS_KEY, SUCCESS_KEY
+from geostore.api_keys import CURSOR_KEY, MESSAGE_KEY, STATUS_KEY, SUCCESS_KEY
 from geostore.aws_keys import BODY_KEY, HTTP_METHOD_KEY, STATUS_CODE_KEY
+from geostore.check import Check
 from geostore.import_file_batch_job_id_keys import ASSET_JOB_ID_KEY, METADATA_JOB_ID_KEY
 from geostore.import_status import entrypoint
 from geostore.models import DATASET_ID_PREFIX, DB_KEY_SEPARATOR, VERSION_ID_PREFIX
@@ -19,6 +20,7 @@ from geostore.step_function_keys import (
     DATASET_ID_KEY,
     ERRORS_KEY,
     ERROR_CHECK_KEY,
+    ERROR_COUNTS_KEY,
     ERROR_DETAILS_KEY,
     ERROR_RESULT_KEY,
     ERROR_URL_KEY,
@@ -64,9 +66,30 @@ def should_return_required_property_error_when_missing_mandatory_execution_arn()
     }
 
 
+def should_return_error_when_cursor_is_invalid() -> None:
+    # When
+    response = entrypoint.lambda_handler(
+        {
+            HTTP_METHOD_KEY: "GET",
+            BODY_KEY: {EXECUTION_ARN_KEY: any_arn_formatted_string(), CURSOR_KEY: "invalid"},
+        },
+        any_lambda_context(),
+    )
+
+    # Then
+    assert response == {
+        STATUS_CODE_KEY: HTTPStatus.BAD_REQUEST,
+        BODY_KEY: {MESSAGE_KEY: f"Bad Request: Invalid {CURSOR_KEY}"},
+    }
+
+
+@patch("geostore.step_function.save_final_import_status")
+@patch("geostore.step_function.get_final_import_status", return_value=None)
 @patch("geostore.step_function.STEP_FUNCTIONS_CLIENT.describe_execution")
 def should_report_upload_status_as_pending_when_validation_incomplete(
     describe_execution_mock: MagicMock,
+    _get_final_import_status_mock: MagicMock,
+    _save_final_import_status_mock: MagicMock,
 ) -> None:
     # Given
     describe_execution_mock.return_value = {
@@ -80,14 +103,18 @@ def should_report_upload_status_as_pending_when_validation_incomplete(
         STATUS_CODE_KEY: HTTPStatus.OK,
         BODY_KEY: {
             STEP_FUNCTION_KEY: {STATUS_KEY: "Running"},
-            VALIDATION_KEY: {STATUS_KEY: Outcome.PENDING.value, ERRORS_KEY: []},
+            VALIDATION_KEY: {
+                STATUS_KEY: Outcome.PENDING.value,
+                ERRORS_KEY: [],
+                ERROR_COUNTS_KEY: {},
+            },
             METADATA_UPLOAD_KEY: {STATUS_KEY: Outcome.PENDING.value, ERRORS_KEY: []},
             ASSET_UPLOAD_KEY: {STATUS_KEY: Outcome.PENDING.value, ERRORS_KEY: []},
         },
     }
 
     with patch("geostore.step_function.get_step_function_validation_results") as validation_mock:
-        validation_mock.return_value = []
+        validation_mock.return_value = {ERRORS_KEY: [], ERROR_COUNTS_KEY: {}}
         # When attempting to create the instance
         response = entrypoint.lambda_handler(
             {HTTP_METHOD_KEY: "GET", BODY_KEY: {EXECUTION_ARN_KEY: any_arn_formatted_string()}},
@@ -130,6 +157,7 @@ def should_retrieve_validation_failures(describe_step_function_mock: MagicMock)
                         ERROR_URL_KEY: url,
                     }
                 ],
+                ERROR_COUNTS_KEY: {check: 1},
             },
             METADATA_UPLOAD_KEY: {STATUS_KEY: Outcome.SKIPPED.value, ERRORS_KEY: []},
             ASSET_UPLOAD_KEY: {STATUS_KEY: Outcome.SKIPPED.value, ERRORS_KEY: []},
@@ -154,11 +182,15 @@ def should_retrieve_validation_failures(describe_step_function_mock: MagicMock)
         assert response == expected_response
 
 
+@patch("geostore.step_function.save_final_import_status")
+@patch("geostore.step_function.get_final_import_status", return_value=None)
 @patch("geostore.step_function.STEP_FUNCTIONS_CLIENT.describe_execution")
 @patch("geostore.step_function.S3CONTROL_CLIENT.describe_job")
 def should_report_s3_batch_upload_task_failures(
     describe_s3_job_mock: MagicMock,
     describe_step_function_mock: MagicMock,
+    _get_final_import_status_mock: MagicMock,
+    _save_final_import_status_mock: MagicMock,
 ) -> None:
     # Given
     metadata_job_id = any_job_id()
@@ -201,7 +233,11 @@ def should_report_s3_batch_upload_task_failures(
         STATUS_CODE_KEY: HTTPStatus.OK,
         BODY_KEY: {
             STEP_FUNCTION_KEY: {STATUS_KEY: "Succeeded"},
-            VALIDATION_KEY: {STATUS_KEY: Outcome.PASSED.value, ERRORS_KEY: []},
+            VALIDATION_KEY: {
+                STATUS_KEY: Outcome.PASSED.value,
+                ERRORS_KEY: [],
+                ERROR_COUNTS_KEY: {},
+            },
             METADATA_UPLOAD_KEY: {
                 STATUS_KEY: S3_BATCH_STATUS_FAILED,
                 ERRORS_KEY: {FAILED_TASKS_KEY: metadata_failed_task_count, FAILURE_REASONS_KEY: []},
@@ -215,7 +251,7 @@ def should_report_s3_batch_upload_task_failures(
     with patch("geostore.step_function.get_account_number") as get_account_number_mock, patch(
         "geostore.step_function.get_step_function_validation_results"
     ) as validation_mock:
-        validation_mock.return_value = []
+        validation_mock.return_value = {ERRORS_KEY: [], ERROR_COUNTS_KEY: {}}
         get_account_number_mock.return_value = any_account_id()
 
         # When
@@ -228,11 +264,15 @@ def should_report_s3_batch_upload_task_failures(
         assert response == expected_response
 
 
+@patch("geostore.step_function.save_final_import_status")
+@patch("geostore.step_function.get_final_import_status", return_value=None)
 @patch("geostore.step_function.STEP_FUNCTIONS_CLIENT.describe_execution")
 @patch("geostore.step_function.S3CONTROL_CLIENT.describe_job")
 def should_report_s3_batch_upload_failures(
     describe_s3_job_mock: MagicMock,
     describe_step_function_mock: MagicMock,
+    _get_final_import_status_mock: MagicMock,
+    _save_final_import_status_mock: MagicMock,
 ) -> None:
     # Given
     describe_step_function_mock.return_value = {
@@ -263,7 +303,11 @@ def should_report_s3_batch_upload_failures(
         STATUS_CODE_KEY: HTTPStatus.OK,
         BODY_KEY: {
             STEP_FUNCTION_KEY: {STATUS_KEY: "Succeeded"},
-            VALIDATION_KEY: {STATUS_KEY: Outcome.PASSED.value, ERRORS_KEY: []},
+            VALIDATION_KEY: {
+                STATUS_KEY: Outcome.PASSED.value,
+                ERRORS_KEY: [],
+                ERROR_COUNTS_KEY: {},
+            },
             METADATA_UPLOAD_KEY: {
                 STATUS_KEY: S3_BATCH_STATUS_COMPLETE,
                 ERRORS_KEY: {
@@ -288,7 +332,7 @@ def should_report_s3_batch_upload_failures(
     with patch("geostore.step_function.get_account_number") as get_account_number_mock, patch(
         "geostore.step_function.get_step_function_validation_results"
     ) as validation_mock:
-        validation_mock.return_value = []
+        validation_mock.return_value = {ERRORS_KEY: [], ERROR_COUNTS_KEY: {}}
         get_account_number_mock.return_value = any_account_id()
 
         # When
@@ -301,6 +345,8 @@ def should_report_s3_batch_upload_failures(
         assert response == expected_response
 
 
+@patch("geostore.step_function.save_final_import_status")
+@patch("geostore.step_function.get_final_import_status", return_value=None)
 @patch("geostore.step_function.get_step_function_validation_results")
 @patch("geostore.step_function.STEP_FUNCTIONS_CLIENT.describe_execution")
 @patch("geostore.step_function.get_account_number")
@@ -308,6 +354,8 @@ def should_report_validation_as_skipped_if_not_started_due_to_failing_pipeline(
     get_account_number_mock: MagicMock,
     describe_step_function_mock: MagicMock,
     get_step_function_validation_results_mock: MagicMock,
+    _get_final_import_status_mock: MagicMock,
+    _save_final_import_status_mock: MagicMock,
 ) -> None:
     get_account_number_mock.return_value = any_account_id()
     describe_step_function_mock.return_value = {
@@ -317,13 +365,17 @@ def should_report_validation_as_skipped_if_not_started_due_to_failing_pipeline(
         ),
         OUTPUT_KEY: dumps({}),
     }
-    get_step_function_validation_results_mock.return_value = []
+    get_step_function_validation_results_mock.return_value = {ERRORS_KEY: [], ERROR_COUNTS_KEY: {}}
 
     expected_response = {
         STATUS_CODE_KEY: HTTPStatus.OK,
         BODY_KEY: {
             STEP_FUNCTION_KEY: {STATUS_KEY: "Failed"},
-            VALIDATION_KEY: {STATUS_KEY: Outcome.SKIPPED.value, ERRORS_KEY: []},
+            VALIDATION_KEY: {
+                STATUS_KEY: Outcome.SKIPPED.value,
+                ERRORS_KEY: [],
+                ERROR_COUNTS_KEY: {},
+            },
             METADATA_UPLOAD_KEY: {STATUS_KEY: Outcome.SKIPPED.value, ERRORS_KEY: []},
             ASSET_UPLOAD_KEY: {STATUS_KEY: Outcome.SKIPPED.value, ERRORS_KEY: []},
         },
@@ -339,6 +391,8 @@ def should_report_validation_as_skipped_if_not_started_due_to_failing_pipeline(
     assert response == expected_response
 
 
+@patch("geostore.step_function.save_final_import_status")
+@patch("geostore.step_function.get_final_import_status", return_value=None)
 @patch("geostore.step_function.get_step_function_validation_results")
 @patch("geostore.step_function.STEP_FUNCTIONS_CLIENT.describe_execution")
 @patch("geostore.step_function.get_account_number")
@@ -346,6 +400,8 @@ def should_fail_validation_if_it_has_errors_but_step_function_does_not_report_st
     get_account_number_mock: MagicMock,
     describe_step_function_mock: MagicMock,
     get_step_function_validation_results_mock: MagicMock,
+    _get_final_import_status_mock: MagicMock,
+    _save_final_import_status_mock: MagicMock,
 ) -> None:
     # Given
     get_account_number_mock.return_value = any_account_id()
@@ -356,13 +412,24 @@ def should_fail_validation_if_it_has_errors_but_step_function_does_not_report_st
         ),
         OUTPUT_KEY: dumps({}),
     }
-    validation_error = {ERROR_RESULT_KEY: ValidationResult.FAILED.value}
-    get_step_function_validation_results_mock.return_value = [validation_error]
+    validation_error = {
+        ERROR_CHECK_KEY: Check.CHECKSUM.value,
+        ERROR_RESULT_KEY: ValidationResult.FAILED.value,
+    }
+    error_counts = {Check.CHECKSUM.value: 1}
+    get_step_function_validation_results_mock.return_value = {
+        ERRORS_KEY: [validation_error],
+        ERROR_COUNTS_KEY: error_counts,
+    }
     expected_response = {
         STATUS_CODE_KEY: HTTPStatus.OK,
         BODY_KEY: {
             STEP_FUNCTION_KEY: {STATUS_KEY: "Failed"},
-            VALIDATION_KEY: {STATUS_KEY: Outcome.FAILED.value, ERRORS_KEY: [validation_error]},
+            VALIDATION_KEY: {
+                STATUS_KEY: Outcome.FAILED.value,
+                ERRORS_KEY: [validation_error],
+                ERROR_COUNTS_KEY: error_counts,
+            },
             METADATA_UPLOAD_KEY: {STATUS_KEY: Outcome.SKIPPED.value, ERRORS_KEY: []},
             ASSET_UPLOAD_KEY: {STATUS_KEY: Outcome.SKIPPED.value, ERRORS_KEY: []},
         },
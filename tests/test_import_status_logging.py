@@ -12,15 +12,27 @@ from geostore.logging_keys import (
     LOG_MESSAGE_STEP_FUNCTION_RESPONSE,
 )
 from geostore.parameter_store import ParameterName, get_param
-from geostore.step_function_keys import DATASET_ID_KEY, EXECUTION_ARN_KEY, NEW_VERSION_ID_KEY
+from geostore.step_function_keys import (
+    DATASET_ID_KEY,
+    ERRORS_KEY,
+    ERROR_COUNTS_KEY,
+    EXECUTION_ARN_KEY,
+    NEW_VERSION_ID_KEY,
+)
 
 from .aws_utils import any_arn_formatted_string
 from .general_generators import any_error_message
 from .stac_generators import any_dataset_id, any_dataset_version_id
 
 
+@patch("geostore.step_function.save_final_import_status")
+@patch("geostore.step_function.get_final_import_status", return_value=None)
 @patch("geostore.step_function.STEP_FUNCTIONS_CLIENT.describe_execution")
-def should_log_payload(describe_step_function_mock: MagicMock) -> None:
+def should_log_payload(
+    describe_step_function_mock: MagicMock,
+    _get_final_import_status_mock: MagicMock,
+    _save_final_import_status_mock: MagicMock,
+) -> None:
     # Given
     event = {
         HTTP_METHOD_KEY: "GET",
@@ -37,7 +49,7 @@ def should_log_payload(describe_step_function_mock: MagicMock) -> None:
     with patch("geostore.import_status.get.LOGGER.debug") as logger_mock, patch(
         "geostore.step_function.get_step_function_validation_results"
     ) as validation_mock:
-        validation_mock.return_value = []
+        validation_mock.return_value = {ERRORS_KEY: [], ERROR_COUNTS_KEY: {}}
 
         # When
         get_import_status(event)
@@ -72,9 +84,13 @@ def should_log_schema_validation_warning(validate_schema_mock: MagicMock) -> Non
         )
 
 
+@patch("geostore.step_function.save_final_import_status")
+@patch("geostore.step_function.get_final_import_status", return_value=None)
 @patch("geostore.step_function.STEP_FUNCTIONS_CLIENT.describe_execution")
 def should_log_stepfunctions_status_response(
     describe_execution_mock: MagicMock,
+    _get_final_import_status_mock: MagicMock,
+    _save_final_import_status_mock: MagicMock,
 ) -> None:
     # Given
     describe_execution_mock.return_value = describe_execution_response = {
@@ -87,7 +103,7 @@ def should_log_stepfunctions_status_response(
     with patch("geostore.step_function.LOGGER.debug") as logger_mock, patch(
         "geostore.step_function.get_account_number"
     ), patch("geostore.step_function.get_step_function_validation_results") as validation_mock:
-        validation_mock.return_value = []
+        validation_mock.return_value = {ERRORS_KEY: [], ERROR_COUNTS_KEY: {}}
         # When
         get_import_status({EXECUTION_ARN_KEY: any_arn_formatted_string()})
 
@@ -0,0 +1,15 @@
+from typing import Callable
+
+from pytest import mark
+
+from .import_utils import get_lambda_handler_module_names, import_module_in_new_process
+
+
+@mark.benchmark
+def should_report_lambda_handler_module_import_times(
+    record_property: Callable[[str, object], None]
+) -> None:
+    for module_name in get_lambda_handler_module_names():
+        record_property(
+            f"{module_name} import seconds", import_module_in_new_process(module_name)["seconds"]
+        )
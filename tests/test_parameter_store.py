@@ -1,3 +1,6 @@
+from json import dump
+from os import environ
+from tempfile import NamedTemporaryFile
 from unittest.mock import MagicMock, patch
 
 from pytest import mark, raises
@@ -5,11 +8,18 @@ from pytest import mark, raises
 from geostore import parameter_store
 from geostore.parameter_store import (
     LOG_MESSAGE_PARAMETER_NOT_FOUND,
+    PARAMETERS_FILE_VARIABLE_NAME,
+    PARAMETERS_TTL_VARIABLE_NAME,
+    PARAMETER_OVERRIDE_VARIABLE_NAME_PREFIX,
+    PARAMETER_VALUES,
     SSM_CLIENT,
     ParameterName,
     get_param,
+    preload_params,
 )
 
+from .general_generators import any_name
+
 
 @mark.infrastructure
 @patch(f"{parameter_store.__name__}.{ParameterName.__name__}")
@@ -24,3 +34,69 @@ def should_log_missing_parameter_name(parameter_name_mock: MagicMock) -> None:
         logger_mock.assert_any_call(
             LOG_MESSAGE_PARAMETER_NOT_FOUND, extra={"parameter_value": parameter_name}
         )
+
+
+def should_return_parameter_from_environment_override() -> None:
+    value = any_name()
+
+    with patch.dict(
+        environ,
+        {f"{PARAMETER_OVERRIDE_VARIABLE_NAME_PREFIX}{ParameterName.GIT_COMMIT.name}": value},
+    ), patch(f"{parameter_store.__name__}.SSM_CLIENT") as ssm_client_mock:
+        assert get_param(ParameterName.GIT_COMMIT) == value
+
+    ssm_client_mock.get_parameter.assert_not_called()
+
+
+def should_return_parameter_from_parameters_file() -> None:
+    value = any_name()
+
+    with NamedTemporaryFile(mode="w", suffix=".json") as parameters_file:
+        dump({ParameterName.S3_USERS_ROLE_ARN.name: value}, parameters_file)
+        parameters_file.flush()
+
+        with patch.dict(environ, {PARAMETERS_FILE_VARIABLE_NAME: parameters_file.name}), patch(
+            f"{parameter_store.__name__}.SSM_CLIENT"
+        ) as ssm_client_mock:
+            assert get_param(ParameterName.S3_USERS_ROLE_ARN) == value
+
+    ssm_client_mock.get_parameter.assert_not_called()
+
+
+@patch.dict(PARAMETER_VALUES, clear=True)
+@patch(f"{parameter_store.__name__}.SSM_CLIENT")
+def should_preload_parameters_in_a_single_request(ssm_client_mock: MagicMock) -> None:
+    parameter_values = {
+        ParameterName.GIT_COMMIT: any_name(),
+        ParameterName.STORAGE_DATASETS_TABLE_NAME: any_name(),
+    }
+    ssm_client_mock.get_parameters.return_value = {
+        "Parameters": [
+            {"Name": parameter.value, "Value": value}
+            for parameter, value in parameter_values.items()
+        ]
+    }
+
+    preload_params(*parameter_values)
+
+    ssm_client_mock.get_parameters.assert_called_once_with(
+        Names=[parameter.value for parameter in parameter_values]
+    )
+    for parameter, value in parameter_values.items():
+        assert get_param(parameter) == value
+    ssm_client_mock.get_parameter.assert_not_called()
+
+
+@patch.dict(PARAMETER_VALUES, clear=True)
+@patch(f"{parameter_store.__name__}.SSM_CLIENT")
+def should_fetch_parameter_again_after_ttl(ssm_client_mock: MagicMock) -> None:
+    first_value = any_name()
+    second_value = any_name()
+    ssm_client_mock.get_parameter.side_effect = [
+        {"Parameter": {"Value": first_value}},
+        {"Parameter": {"Value": second_value}},
+    ]
+
+    with patch.dict(environ, {PARAMETERS_TTL_VARIABLE_NAME: "0"}):
+        assert get_param(ParameterName.GIT_COMMIT) == first_value
+        assert get_param(ParameterName.GIT_COMMIT) == second_value
@@ -8,19 +8,23 @@ from uuid import uuid4
 import smart_open
 from mypy_boto3_s3 import S3Client
 from mypy_boto3_sqs import SQSServiceResource
-from pytest import mark, raises
+from pystac import Catalog
+from pytest import mark
 from pytest_subtests import SubTests
 
 from geostore.aws_keys import BODY_KEY
 from geostore.logging_keys import GIT_COMMIT, LOG_MESSAGE_LAMBDA_FAILURE
 from geostore.parameter_store import ParameterName, get_param
 from geostore.populate_catalog.task import (
+    BATCH_ITEM_FAILURES_KEY,
     CATALOG_FILENAME,
+    ITEM_IDENTIFIER_KEY,
+    MESSAGE_ID_KEY,
     RECORDS_KEY,
     ROOT_CATALOG_DESCRIPTION,
     ROOT_CATALOG_ID,
     ROOT_CATALOG_TITLE,
-    handle_message,
+    handle_messages,
     lambda_handler,
 )
 from geostore.resources import Resource
@@ -43,9 +47,21 @@ from geostore.stac_format import (
 from geostore.types import JsonList
 from geostore.update_root_catalog.task import SQS_MESSAGE_GROUP_ID
 
-from .aws_utils import Dataset, S3Object, any_lambda_context, any_s3_url, delete_s3_key
+from .aws_utils import (
+    Dataset,
+    S3Object,
+    any_lambda_context,
+    any_s3_url,
+    any_sqs_message_id,
+    delete_s3_key,
+)
 from .file_utils import json_dict_to_file_object
-from .general_generators import any_error_message, any_exception_class, any_safe_filename
+from .general_generators import (
+    any_description,
+    any_error_message,
+    any_exception_class,
+    any_safe_filename,
+)
 from .stac_generators import any_dataset_version_id
 from .stac_objects import (
     MINIMAL_VALID_STAC_CATALOG_OBJECT,
@@ -107,7 +123,11 @@ def should_create_new_root_catalog_if_doesnt_exist(subtests: SubTests, s3_client
 
         try:
             lambda_handler(
-                {RECORDS_KEY: [{BODY_KEY: dataset_metadata.key}]},
+                {
+                    RECORDS_KEY: [
+                        {BODY_KEY: dataset_metadata.key, MESSAGE_ID_KEY: any_sqs_message_id()}
+                    ]
+                },
                 any_lambda_context(),
             )
 
@@ -260,7 +280,7 @@ def should_update_root_catalog_with_new_version_catalog(subtests: SubTests) -> N
         ]
 
         lambda_handler(
-            {RECORDS_KEY: [{BODY_KEY: dataset_metadata.key}]},
+            {RECORDS_KEY: [{BODY_KEY: dataset_metadata.key, MESSAGE_ID_KEY: any_sqs_message_id()}]},
             any_lambda_context(),
         )
 
@@ -396,7 +416,7 @@ def should_update_root_catalog_with_new_version_collection(subtests: SubTests) -
         ]
 
         lambda_handler(
-            {RECORDS_KEY: [{BODY_KEY: dataset_metadata.key}]},
+            {RECORDS_KEY: [{BODY_KEY: dataset_metadata.key, MESSAGE_ID_KEY: any_sqs_message_id()}]},
             any_lambda_context(),
         )
 
@@ -498,7 +518,7 @@ def should_not_add_duplicate_child_link_to_root(subtests: SubTests) -> None:
         ]
 
         lambda_handler(
-            {RECORDS_KEY: [{BODY_KEY: dataset_metadata.key}]},
+            {RECORDS_KEY: [{BODY_KEY: dataset_metadata.key, MESSAGE_ID_KEY: any_sqs_message_id()}]},
             any_lambda_context(),
         )
 
@@ -665,11 +685,44 @@ def should_log_error_message_when_an_exception_is_raised_trying_to_update_catalo
 
     pystac_read_file_mock.side_effect = error
 
-    with patch("geostore.populate_catalog.task.LOGGER.warning") as logger_mock, raises(
-        exception_class
-    ):
-        handle_message(any_s3_url())
+    with patch("geostore.populate_catalog.task.LOGGER.warning") as logger_mock:
+        handle_messages({any_sqs_message_id(): any_s3_url()})
 
     logger_mock.assert_any_call(
         expected_message, extra={GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)}
     )
+
+
+@patch("geostore.populate_catalog.task.add_to_root_catalog")
+@patch("geostore.populate_catalog.task.read_file")
+def should_add_datasets_before_first_failure_to_root_catalog_at_once(
+    pystac_read_file_mock: MagicMock, add_to_root_catalog_mock: MagicMock, subtests: SubTests
+) -> None:
+    # Given a batch where the second dataset can't be read
+    first_dataset = Catalog(any_dataset_version_id(), any_description())
+    failing_message_id = any_sqs_message_id()
+    third_message_id = any_sqs_message_id()
+    pystac_read_file_mock.side_effect = [first_dataset, any_exception_class()()]
+
+    with patch("geostore.populate_catalog.task.LOGGER.warning"):
+        response = lambda_handler(
+            {
+                RECORDS_KEY: [
+                    {BODY_KEY: any_safe_filename(), MESSAGE_ID_KEY: any_sqs_message_id()},
+                    {BODY_KEY: any_safe_filename(), MESSAGE_ID_KEY: failing_message_id},
+                    {BODY_KEY: any_safe_filename(), MESSAGE_ID_KEY: third_message_id},
+                ]
+            },
+            any_lambda_context(),
+        )
+
+    with subtests.test(msg="Single root catalog update"):
+        add_to_root_catalog_mock.assert_called_once_with([first_dataset])
+
+    with subtests.test(msg="The failing message and every later message are retried"):
+        assert response == {
+            BATCH_ITEM_FAILURES_KEY: [
+                {ITEM_IDENTIFIER_KEY: failing_message_id},
+                {ITEM_IDENTIFIER_KEY: third_message_id},
+            ]
+        }
@@ -1,3 +1,4 @@
+# pylint: disable=too-many-lines
 from copy import deepcopy
 from datetime import timedelta
 from hashlib import sha256
@@ -20,6 +21,7 @@ from pytest_subtests import SubTests
 from geostore.api_keys import STATUS_KEY
 from geostore.aws_keys import BODY_KEY, HTTP_METHOD_KEY, STATUS_CODE_KEY
 from geostore.datasets_model import datasets_model_with_meta
+from geostore.environment import DIRECT_IMPORT_MAX_OBJECTS_VARIABLE_NAME
 from geostore.models import DATASET_ID_PREFIX
 from geostore.parameter_store import ParameterName
 from geostore.populate_catalog.task import CATALOG_FILENAME, ROOT_CATALOG_TITLE
@@ -65,7 +67,9 @@ from geostore.sts import get_account_number
 
 from .aws_utils import (
     S3_BATCH_JOB_COMPLETED_STATE,
+    LambdaEnvironment,
     S3Object,
+    assert_imported_directly,
     delete_copy_job_files,
     delete_s3_key,
     get_s3_role_arn,
@@ -134,7 +138,6 @@ def should_successfully_run_dataset_version_creation_process_with_single_asset(
     step_functions_client: SFNClient,
     lambda_client: LambdaClient,
     s3_client: S3Client,
-    s3_control_client: S3ControlClient,
     subtests: SubTests,
 ) -> None:
     # pylint: disable=too-many-locals
@@ -146,9 +149,6 @@ def should_successfully_run_dataset_version_creation_process_with_single_asset(
     asset_contents = any_file_contents()
     asset_filename = any_safe_filename()
 
-    metadata_copy_job_result = None
-    asset_copy_job_result = None
-
     dataset_title = any_dataset_title()
 
     with S3Object(
@@ -219,15 +219,8 @@ def should_successfully_run_dataset_version_creation_process_with_single_asset(
                 CATALOG_FILENAME,
                 s3_client,
             )
-            account_id = get_account_number()
-
             import_dataset_response = loads(execution_output)[IMPORT_DATASET_KEY]
-            metadata_copy_job_result, asset_copy_job_result = wait_for_copy_jobs(
-                import_dataset_response,
-                account_id,
-                s3_control_client,
-                subtests,
-            )
+            assert_imported_directly(import_dataset_response, subtests)
         finally:
             # Cleanup
             for filename in [root_metadata_filename, child_metadata_filename, asset_filename]:
@@ -235,17 +228,6 @@ def should_successfully_run_dataset_version_creation_process_with_single_asset(
                 with subtests.test(msg=f"Delete {new_key}"):
                     delete_s3_key(Resource.STORAGE_BUCKET_NAME.resource_name, new_key, s3_client)
 
-            with subtests.test(msg="Delete copy job files"):
-                assert metadata_copy_job_result is not None
-                assert asset_copy_job_result is not None
-                delete_copy_job_files(
-                    metadata_copy_job_result,
-                    asset_copy_job_result,
-                    Resource.STORAGE_BUCKET_NAME.resource_name,
-                    s3_client,
-                    subtests,
-                )
-
             delete_s3_key(Resource.STORAGE_BUCKET_NAME.resource_name, CATALOG_FILENAME, s3_client)
 
     with subtests.test(msg="Should report import status after success"):
@@ -277,6 +259,132 @@ def should_successfully_run_dataset_version_creation_process_with_single_asset(
         assert status_payload == expected_status_payload
 
 
+@mark.timeout(timedelta(minutes=20).total_seconds())
+@mark.infrastructure
+def should_successfully_import_dataset_version_using_s3_batch_operations(
+    step_functions_client: SFNClient,
+    lambda_client: LambdaClient,
+    s3_client: S3Client,
+    s3_control_client: S3ControlClient,
+    subtests: SubTests,
+) -> None:
+    # pylint: disable=too-many-locals
+    key_prefix = any_safe_file_path()
+
+    metadata_filename = any_safe_filename()
+
+    asset_contents = any_file_contents()
+    asset_filename = any_safe_filename()
+
+    metadata_copy_job_result = None
+    asset_copy_job_result = None
+
+    dataset_title = any_dataset_title()
+
+    with S3Object(
+        file_object=BytesIO(initial_bytes=asset_contents),
+        bucket_name=Resource.STAGING_BUCKET_NAME.resource_name,
+        key=f"{key_prefix}/{asset_filename}",
+    ) as asset_s3_object, S3Object(
+        file_object=json_dict_to_file_object(
+            {
+                **deepcopy(MINIMAL_VALID_STAC_COLLECTION_OBJECT),
+                STAC_ASSETS_KEY: {
+                    any_asset_name(): {
+                        LINZ_STAC_CREATED_KEY: any_past_datetime_string(),
+                        LINZ_STAC_UPDATED_KEY: any_past_datetime_string(),
+                        STAC_HREF_KEY: asset_s3_object.url,
+                        STAC_FILE_CHECKSUM_KEY: sha256_hex_digest_to_multihash(
+                            sha256(asset_contents).hexdigest()
+                        ),
+                    },
+                },
+            }
+        ),
+        bucket_name=Resource.STAGING_BUCKET_NAME.resource_name,
+        key=f"{key_prefix}/{metadata_filename}",
+    ) as metadata_s3_object, LambdaEnvironment(
+        Resource.IMPORT_DATASET_FUNCTION_NAME.resource_name,
+        {DIRECT_IMPORT_MAX_OBJECTS_VARIABLE_NAME: "0"},
+    ):
+        # When
+        try:
+            dataset_response = invoke_dataset_lambda_function(lambda_client, dataset_title)
+            dataset_payload = load(dataset_response["Payload"])
+            dataset_id = dataset_payload[BODY_KEY][DATASET_ID_SHORT_KEY]
+
+            dataset_versions_response = invoke_dataset_version_lambda_function(
+                lambda_client, dataset_id, metadata_s3_object.url
+            )
+            dataset_versions_payload = load(dataset_versions_response["Payload"])
+            dataset_versions_body = dataset_versions_payload[BODY_KEY]
+
+            # Then the state machine only finishes after the upload callback
+            with subtests.test(msg="Should complete Step Function successfully"):
+                while (
+                    execution := step_functions_client.describe_execution(
+                        executionArn=dataset_versions_body[EXECUTION_ARN_KEY]
+                    )
+                )["status"] == "RUNNING":
+                    sleep(5)  # pragma: no cover
+
+                assert execution["status"] == "SUCCEEDED", execution
+
+            assert (execution_output := execution.get("output")), execution
+
+            import_dataset_response = loads(execution_output)[IMPORT_DATASET_KEY]
+            metadata_copy_job_result, asset_copy_job_result = wait_for_copy_jobs(
+                import_dataset_response,
+                get_account_number(),
+                s3_control_client,
+                subtests,
+            )
+
+            for filename in [metadata_filename, asset_filename]:
+                with subtests.test(msg=f"Should import {filename}"):
+                    wait_for_s3_key(
+                        Resource.STORAGE_BUCKET_NAME.resource_name,
+                        f"{dataset_title}/{filename}",
+                        s3_client,
+                    )
+
+            with subtests.test(msg="Should report import status after success"):
+                status_response = lambda_client.invoke(
+                    FunctionName=Resource.IMPORT_STATUS_ENDPOINT_FUNCTION_NAME.resource_name,
+                    Payload=dumps(
+                        {
+                            HTTP_METHOD_KEY: "GET",
+                            BODY_KEY: {EXECUTION_ARN_KEY: execution["executionArn"]},
+                        }
+                    ).encode(),
+                )
+                status_body = load(status_response["Payload"])[BODY_KEY]
+                for upload_key in [METADATA_UPLOAD_KEY, ASSET_UPLOAD_KEY]:
+                    assert status_body[upload_key] == {
+                        STATUS_KEY: S3_BATCH_JOB_COMPLETED_STATE,
+                        ERRORS_KEY: {FAILED_TASKS_KEY: 0, FAILURE_REASONS_KEY: []},
+                    }, status_body
+        finally:
+            # Cleanup
+            for filename in [metadata_filename, asset_filename]:
+                new_key = f"{dataset_title}/{filename}"
+                with subtests.test(msg=f"Delete {new_key}"):
+                    delete_s3_key(Resource.STORAGE_BUCKET_NAME.resource_name, new_key, s3_client)
+
+            with subtests.test(msg="Delete copy job files"):
+                assert metadata_copy_job_result is not None
+                assert asset_copy_job_result is not None
+                delete_copy_job_files(
+                    metadata_copy_job_result,
+                    asset_copy_job_result,
+                    Resource.STORAGE_BUCKET_NAME.resource_name,
+                    s3_client,
+                    subtests,
+                )
+
+            delete_s3_key(Resource.STORAGE_BUCKET_NAME.resource_name, CATALOG_FILENAME, s3_client)
+
+
 @mark.timeout(timedelta(minutes=20).total_seconds())
 @mark.infrastructure
 def should_successfully_run_dataset_version_creation_process_and_again_with_partial_upload(
@@ -284,7 +392,6 @@ def should_successfully_run_dataset_version_creation_process_and_again_with_part
     step_functions_client: SFNClient,
     lambda_client: LambdaClient,
     s3_client: S3Client,
-    s3_control_client: S3ControlClient,
     subtests: SubTests,
 ) -> None:
     # pylint: disable=too-many-locals
@@ -327,11 +434,6 @@ def should_successfully_run_dataset_version_creation_process_and_again_with_part
     second_asset_created = any_past_datetime_string()
     second_asset_updated = any_past_datetime_string()
 
-    first_metadata_copy_job_result = None
-    first_asset_copy_job_result = None
-    second_metadata_copy_job_result = None
-    second_asset_copy_job_result = None
-
     with S3Object(
         file_object=BytesIO(initial_bytes=first_asset_contents),
         bucket_name=Resource.STAGING_BUCKET_NAME.resource_name,
@@ -480,12 +582,8 @@ def should_successfully_run_dataset_version_creation_process_and_again_with_part
 
             assert (execution_output := execution.get("output")), execution
 
-            account_id = get_account_number()
-
             first_import_dataset_response = loads(execution_output)[IMPORT_DATASET_KEY]
-            first_metadata_copy_job_result, first_asset_copy_job_result = wait_for_copy_jobs(
-                first_import_dataset_response, account_id, s3_control_client, subtests
-            )
+            assert_imported_directly(first_import_dataset_response, subtests)
 
             #  Wait for Item metadata file to include a link to geostore root catalog
             expected_link_object = {
@@ -609,9 +707,7 @@ def should_successfully_run_dataset_version_creation_process_and_again_with_part
                 assert (execution_output := execution.get("output")), execution
 
                 second_import_dataset_response = loads(execution_output)[IMPORT_DATASET_KEY]
-                second_metadata_copy_job_result, second_asset_copy_job_result = wait_for_copy_jobs(
-                    second_import_dataset_response, account_id, s3_control_client, subtests
-                )
+                assert_imported_directly(second_import_dataset_response, subtests)
 
                 #  Wait for Item metadata file to include a link to geostore root catalog
                 expected_link_object = {
@@ -763,27 +859,6 @@ def should_successfully_run_dataset_version_creation_process_and_again_with_part
                 with subtests.test(msg=f"Delete {key}"):
                     delete_s3_key(Resource.STORAGE_BUCKET_NAME.resource_name, key, s3_client)
 
-            with subtests.test(msg="Delete first version copy job files"):
-                assert first_metadata_copy_job_result is not None
-                assert first_asset_copy_job_result is not None
-                delete_copy_job_files(
-                    first_metadata_copy_job_result,
-                    first_asset_copy_job_result,
-                    Resource.STORAGE_BUCKET_NAME.resource_name,
-                    s3_client,
-                    subtests,
-                )
-            with subtests.test(msg="Delete second version copy job files"):
-                assert second_metadata_copy_job_result is not None
-                assert second_asset_copy_job_result is not None
-                delete_copy_job_files(
-                    second_metadata_copy_job_result,
-                    second_asset_copy_job_result,
-                    Resource.STORAGE_BUCKET_NAME.resource_name,
-                    s3_client,
-                    subtests,
-                )
-
 
 @mark.infrastructure
 def should_end_step_function_successfully_when_non_collection_or_catalog_submitted(
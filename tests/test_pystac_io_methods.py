@@ -0,0 +1,113 @@
+from io import BytesIO
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+from pytest import raises
+from pytest_subtests import SubTests
+
+from geostore.pystac_io_methods import (
+    AWS_CODE_NOT_MODIFIED,
+    OBJECT_CACHE,
+    S3StacIO,
+    concurrent_writes,
+)
+
+from .aws_utils import any_operation_name, any_s3_url
+from .general_generators import (
+    any_error_message,
+    any_etag,
+    any_exception_class,
+    any_file_contents,
+    any_safe_filename,
+)
+
+if TYPE_CHECKING:
+    from botocore.exceptions import _ClientErrorResponseError, _ClientErrorResponseTypeDef
+else:
+    _ClientErrorResponseError = _ClientErrorResponseTypeDef = dict
+
+
+def any_client_error(code: str) -> ClientError:
+    return ClientError(
+        _ClientErrorResponseTypeDef(
+            Error=_ClientErrorResponseError(Code=code, Message=any_error_message())
+        ),
+        any_operation_name(),
+    )
+
+
+@patch.dict(OBJECT_CACHE, clear=True)
+@patch("geostore.pystac_io_methods.S3_CLIENT")
+def should_only_write_changed_object_once(s3_client_mock: MagicMock, subtests: SubTests) -> None:
+    url = f"{any_s3_url()}/{any_safe_filename()}"
+    text = any_file_contents().hex()
+    s3_client_mock.head_object.side_effect = any_client_error("404")
+    s3_client_mock.put_object.return_value = {"ETag": any_etag()}
+
+    S3StacIO().write_text(url, text)
+    S3StacIO().write_text(url, text)
+
+    with subtests.test(msg="Checked stored object once"):
+        assert s3_client_mock.head_object.call_count == 1
+
+    with subtests.test(msg="Wrote object once"):
+        assert s3_client_mock.put_object.call_count == 1
+
+
+@patch.dict(OBJECT_CACHE, clear=True)
+@patch("geostore.pystac_io_methods.S3_CLIENT")
+def should_not_write_object_when_stored_object_is_identical(s3_client_mock: MagicMock) -> None:
+    s3_client_mock.head_object.side_effect = any_client_error(AWS_CODE_NOT_MODIFIED)
+
+    S3StacIO().write_text(f"{any_s3_url()}/{any_safe_filename()}", any_file_contents().hex())
+
+    s3_client_mock.put_object.assert_not_called()
+
+
+@patch.dict(OBJECT_CACHE, clear=True)
+@patch("geostore.pystac_io_methods.S3_CLIENT")
+def should_reuse_cached_text_when_object_is_not_modified(
+    s3_client_mock: MagicMock, subtests: SubTests
+) -> None:
+    url = f"{any_s3_url()}/{any_safe_filename()}"
+    text = any_file_contents().hex()
+    etag = any_etag()
+    s3_client_mock.get_object.side_effect = [
+        {"Body": BytesIO(text.encode()), "ETag": etag},
+        any_client_error(AWS_CODE_NOT_MODIFIED),
+    ]
+
+    with subtests.test(msg="First read"):
+        assert S3StacIO().read_text(url) == text
+
+    with subtests.test(msg="Second read"):
+        assert S3StacIO().read_text(url) == text
+
+    with subtests.test(msg="Conditional request"):
+        assert s3_client_mock.get_object.call_args.kwargs["IfNoneMatch"] == etag
+
+
+@patch.dict(OBJECT_CACHE, clear=True)
+@patch("geostore.pystac_io_methods.S3_CLIENT")
+def should_finish_concurrent_writes_when_leaving_context(s3_client_mock: MagicMock) -> None:
+    s3_client_mock.head_object.side_effect = any_client_error("404")
+    s3_client_mock.put_object.return_value = {"ETag": any_etag()}
+    urls = [f"{any_s3_url()}/{any_safe_filename()}" for _ in range(3)]
+
+    with concurrent_writes():
+        for url in urls:
+            S3StacIO().write_text(url, any_file_contents().hex())
+
+    assert s3_client_mock.put_object.call_count == len(urls)
+
+
+@patch.dict(OBJECT_CACHE, clear=True)
+@patch("geostore.pystac_io_methods.S3_CLIENT")
+def should_raise_concurrent_write_errors_when_leaving_context(s3_client_mock: MagicMock) -> None:
+    exception_class = any_exception_class()
+    s3_client_mock.head_object.side_effect = any_client_error("404")
+    s3_client_mock.put_object.side_effect = exception_class()
+
+    with raises(exception_class), concurrent_writes():
+        S3StacIO().write_text(f"{any_s3_url()}/{any_safe_filename()}", any_file_contents().hex())
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from geostore.s3 import CREDENTIALS_EXPIRY_MARGIN, ROLE_S3_CLIENTS_LOCK, get_s3_client_for_role
+from geostore.types import JsonObject
+
+from .aws_utils import any_role_arn
+from .general_generators import any_name
+
+
+def any_assume_role_response(expiration: datetime) -> JsonObject:
+    return {
+        "Credentials": {
+            "AccessKeyId": any_name(),
+            "SecretAccessKey": any_name(),
+            "SessionToken": any_name(),
+            "Expiration": expiration,
+        }
+    }
+
+
+@patch("geostore.s3.STS_CLIENT")
+def should_reuse_client_until_credentials_are_about_to_expire(sts_client_mock: MagicMock) -> None:
+    role_arn = any_role_arn()
+    sts_client_mock.assume_role.return_value = any_assume_role_response(
+        datetime.now(tz=timezone.utc) + CREDENTIALS_EXPIRY_MARGIN + timedelta(minutes=5)
+    )
+
+    first_client = get_s3_client_for_role(role_arn)
+    second_client = get_s3_client_for_role(role_arn)
+
+    assert first_client is second_client
+    sts_client_mock.assume_role.assert_called_once()
+
+
+@patch("geostore.s3.STS_CLIENT")
+def should_assume_role_again_when_credentials_are_about_to_expire(
+    sts_client_mock: MagicMock,
+) -> None:
+    role_arn = any_role_arn()
+    sts_client_mock.assume_role.return_value = any_assume_role_response(
+        datetime.now(tz=timezone.utc) + CREDENTIALS_EXPIRY_MARGIN - timedelta(minutes=5)
+    )
+
+    first_client = get_s3_client_for_role(role_arn)
+    second_client = get_s3_client_for_role(role_arn)
+
+    assert first_client is not second_client
+    assert sts_client_mock.assume_role.call_count == 2
+
+
+@patch("geostore.s3.STS_CLIENT")
+def should_cache_clients_per_role(sts_client_mock: MagicMock) -> None:
+    sts_client_mock.assume_role.return_value = any_assume_role_response(
+        datetime.now(tz=timezone.utc) + CREDENTIALS_EXPIRY_MARGIN + timedelta(minutes=5)
+    )
+
+    first_client = get_s3_client_for_role(any_role_arn())
+    second_client = get_s3_client_for_role(any_role_arn())
+
+    assert first_client is not second_client
+    assert sts_client_mock.assume_role.call_count == 2
+
+
+@patch("geostore.s3.STS_CLIENT")
+def should_not_hold_client_cache_lock_while_assuming_role(sts_client_mock: MagicMock) -> None:
+    def assume_role(**_kwargs: str) -> JsonObject:
+        assert not ROLE_S3_CLIENTS_LOCK.locked()
+        return any_assume_role_response(
+            datetime.now(tz=timezone.utc) + CREDENTIALS_EXPIRY_MARGIN + timedelta(minutes=5)
+        )
+
+    sts_client_mock.assume_role.side_effect = assume_role
+
+    get_s3_client_for_role(any_role_arn())
+
+    sts_client_mock.assume_role.assert_called_once()
@@ -2,8 +2,8 @@ from copy import deepcopy
 from io import BytesIO
 from json import dumps, load
 from os.path import basename
-from typing import TYPE_CHECKING
-from unittest.mock import MagicMock, patch
+from typing import TYPE_CHECKING, Any, Callable, Dict
+from unittest.mock import MagicMock, call, patch
 from urllib.parse import urlparse
 
 from _pytest.python_api import raises
@@ -14,20 +14,14 @@ from mypy_boto3_s3 import S3Client
 from pytest import mark
 from pytest_subtests import SubTests
 
-from geostore.import_asset_file.task import importer
 from geostore.import_metadata_file.task import S3_BODY_KEY
 from geostore.logging_keys import GIT_COMMIT
 from geostore.parameter_store import ParameterName, get_param
 from geostore.populate_catalog.task import CATALOG_FILENAME
 from geostore.pystac_io_methods import S3StacIO
 from geostore.resources import Resource
-from geostore.s3 import S3_URL_PREFIX, get_s3_client_for_role
-from geostore.s3_utils import (
-    KNOWN_ETAG_OF_EMPTY_FILE,
-    calculate_s3_etag,
-    get_s3_etag,
-    get_s3_url_reader,
-)
+from geostore.s3 import S3_URL_PREFIX
+from geostore.s3_utils import S3RangedReader, get_s3_staging_file_checker, get_s3_url_reader
 from geostore.stac_format import (
     STAC_HREF_KEY,
     STAC_LINKS_KEY,
@@ -40,6 +34,7 @@ from tests.aws_utils import (
     S3Object,
     any_error_code,
     any_operation_name,
+    any_role_arn,
     any_s3_bucket_name,
     any_s3_url,
     delete_s3_key,
@@ -48,6 +43,7 @@ from tests.aws_utils import (
 from tests.file_utils import json_dict_to_file_object
 from tests.general_generators import (
     any_error_message,
+    any_etag,
     any_file_contents,
     any_safe_file_path,
     any_safe_filename,
@@ -60,14 +56,21 @@ if TYPE_CHECKING:
 else:
     _ClientErrorResponseError = _ClientErrorResponseTypeDef = dict
 
-# https://docs.aws.amazon.com/AmazonS3/latest/API/API_Object.html
-# single chunk etag is 32 characters in length, (+2) with quotes as they are part of etag
-SINGLE_CHUNK_ETAG_LENGTH = 34
-# multi chunk etag includes a -x suffix (+2 characters), where x specifies the number of chunks
-MINIMUM_MULTI_CHUNK_ETAG_LENGTH = 36  # (+1) for every 10th multiplier
 
-# https://awscli.amazonaws.com/v2/documentation/api/latest/topic/s3-config.html#multipart-chunksize
-S3_DEFAULT_CHUNK_SIZE = 8_388_608
+def s3_get_object_stand_in(contents: bytes, etag: str) -> Callable[..., Dict[str, Any]]:
+    def get_object(**kwargs: str) -> Dict[str, Any]:
+        body = contents
+        if "Range" in kwargs:
+            assert kwargs["IfMatch"] == etag
+            start, end = kwargs["Range"].removeprefix("bytes=").split("-")
+            body = contents[int(start) : int(end) + 1]
+        return {
+            S3_BODY_KEY: StreamingBody(BytesIO(body), len(body)),
+            "ContentLength": len(body),
+            "ETag": etag,
+        }
+
+    return get_object
 
 
 @mark.infrastructure
@@ -145,7 +148,7 @@ def should_log_message_when_using_geostore_file_for_validation(
     s3_client_response = StreamingBody(BytesIO(json_bytes), len(json_bytes))
     get_s3_client_for_role_mock.return_value.get_object.side_effect = [
         error,
-        {S3_BODY_KEY: s3_client_response},
+        {S3_BODY_KEY: s3_client_response, "ContentLength": len(json_bytes)},
     ]
 
     expected_message = (
@@ -166,6 +169,98 @@ def should_log_message_when_using_geostore_file_for_validation(
         )
 
 
+def should_read_object_parts_in_order_using_ranged_gets(subtests: SubTests) -> None:
+    # Given
+    part_size = 10
+    contents = any_file_contents(byte_count=part_size * 7 + 1)
+    bucket_name = any_s3_bucket_name()
+    key = any_safe_file_path()
+    etag = any_etag()
+    s3_client_mock = MagicMock()
+    s3_client_mock.get_object.side_effect = s3_get_object_stand_in(contents, etag)
+
+    # When
+    reader = S3RangedReader(
+        s3_client_mock,
+        bucket_name,
+        key,
+        len(contents),
+        etag,
+        part_size=part_size,
+        max_concurrent_gets=3,
+    )
+
+    # Then
+    with subtests.test(msg="Contents"):
+        assert reader.read() == contents
+
+    with subtests.test(msg="Ranges"):
+        s3_client_mock.get_object.assert_has_calls(
+            [
+                call(
+                    Bucket=bucket_name,
+                    Key=key,
+                    IfMatch=etag,
+                    Range=f"bytes={start}-{min(start + part_size, len(contents)) - 1}",
+                )
+                for start in range(0, len(contents), part_size)
+            ],
+            any_order=True,
+        )
+        assert s3_client_mock.get_object.call_count == 8
+
+
+def should_read_first_part_from_existing_response_body(subtests: SubTests) -> None:
+    # Given a response body for the whole object
+    part_size = 10
+    contents = any_file_contents(byte_count=part_size * 3 + 1)
+    etag = any_etag()
+    first_part_body = BytesIO(initial_bytes=contents)
+    s3_client_mock = MagicMock()
+    s3_client_mock.get_object.side_effect = s3_get_object_stand_in(contents, etag)
+
+    # When
+    reader = S3RangedReader(
+        s3_client_mock,
+        any_s3_bucket_name(),
+        any_safe_file_path(),
+        len(contents),
+        etag,
+        first_part_body=StreamingBody(first_part_body, len(contents)),
+        part_size=part_size,
+        max_concurrent_gets=2,
+    )
+
+    # Then
+    with subtests.test(msg="Contents"):
+        assert reader.read() == contents
+
+    with subtests.test(msg="Ranged gets"):
+        assert sorted(
+            get_object_call.kwargs["Range"]
+            for get_object_call in s3_client_mock.get_object.call_args_list
+        ) == ["bytes=10-19", "bytes=20-29", "bytes=30-30"]
+
+    with subtests.test(msg="Closed response body"):
+        assert first_part_body.closed
+
+
+@patch("geostore.s3_utils.RANGED_GET_MIN_OBJECT_SIZE", 1)
+@patch("geostore.s3_utils.get_param", MagicMock())
+@patch("geostore.s3_utils.get_s3_client_for_role")
+def should_read_large_object_using_ranged_gets(get_s3_client_for_role_mock: MagicMock) -> None:
+    contents = any_file_contents()
+    get_s3_client_for_role_mock.return_value.get_object.side_effect = s3_get_object_stand_in(
+        contents, any_etag()
+    )
+
+    s3_url_reader = get_s3_url_reader(any_role_arn(), any_dataset_title(), MagicMock())
+    s3_response = s3_url_reader(any_s3_url())
+
+    assert isinstance(s3_response.response, S3RangedReader)
+    assert s3_response.response.read() == contents
+
+
 @patch("geostore.s3_utils.get_s3_client_for_role")
 def should_raise_any_client_error_other_than_no_such_key(
     get_s3_client_for_role_mock: MagicMock,
@@ -191,179 +286,48 @@ def should_raise_any_client_error_other_than_no_such_key(
         s3_url_reader(any_s3_url())
 
 
-@mark.infrastructure
-def should_return_accurate_etag_value_for_empty_file(s3_client: S3Client) -> None:
-    asset_filename = any_safe_filename()
-    asset_contents = any_file_contents(byte_count=0)
-
-    staging_bucket = Resource.STAGING_BUCKET_NAME.resource_name
-    storage_bucket = Resource.STORAGE_BUCKET_NAME.resource_name
-
-    local_etag = calculate_s3_etag(asset_contents)
-
-    with S3Object(
-        file_object=BytesIO(initial_bytes=asset_contents),
-        bucket_name=staging_bucket,
-        key=asset_filename,
-    ):
-        try:
-            # import from staging to storage to ensure aws hasn't changed how etag is calculated
-            importer(
-                source_bucket_name=staging_bucket,
-                original_key=asset_filename,
-                target_bucket_name=storage_bucket,
-                new_key=asset_filename,
-                source_s3_client=get_s3_client_for_role(get_s3_role_arn()),
-            )
-
-            s3_etag = get_s3_etag(
-                s3_bucket=storage_bucket, s3_object_key=f"{asset_filename}", logger=get_log()
-            )
-
-            assert local_etag == KNOWN_ETAG_OF_EMPTY_FILE
-            assert local_etag == s3_etag
-        finally:
-            delete_s3_key(Resource.STORAGE_BUCKET_NAME.resource_name, asset_filename, s3_client)
-
-
-@mark.infrastructure
-def should_return_accurate_etag_value_for_file_smaller_than_single_chunk_size(
-    s3_client: S3Client,
-) -> None:
-    asset_filename = any_safe_filename()
-    asset_contents = any_file_contents(byte_count=S3_DEFAULT_CHUNK_SIZE - 1)
-
-    staging_bucket = Resource.STAGING_BUCKET_NAME.resource_name
-    storage_bucket = Resource.STORAGE_BUCKET_NAME.resource_name
-
-    local_etag = calculate_s3_etag(asset_contents)
-
-    with S3Object(
-        file_object=BytesIO(initial_bytes=asset_contents),
-        bucket_name=staging_bucket,
-        key=f"{asset_filename}",
-    ):
-        try:
-            # import from staging to storage to ensure aws hasn't changed how etag is calculated
-            importer(
-                source_bucket_name=staging_bucket,
-                original_key=asset_filename,
-                target_bucket_name=storage_bucket,
-                new_key=asset_filename,
-                source_s3_client=get_s3_client_for_role(get_s3_role_arn()),
-            )
-
-            s3_etag = get_s3_etag(
-                s3_bucket=storage_bucket, s3_object_key=f"{asset_filename}", logger=get_log()
-            )
-
-            # ensure single chunk size file
-            assert len(local_etag) == SINGLE_CHUNK_ETAG_LENGTH
-            assert local_etag == s3_etag
-        finally:
-            delete_s3_key(Resource.STORAGE_BUCKET_NAME.resource_name, asset_filename, s3_client)
-
-
-@mark.infrastructure
-def should_return_accurate_etag_value_for_single_chunk_size_file(
-    s3_client: S3Client,
+@patch("geostore.s3_utils.get_s3_client_for_role")
+def should_check_staging_file_existence_without_reading_it(
+    get_s3_client_for_role_mock: MagicMock, subtests: SubTests
 ) -> None:
-    asset_filename = any_safe_filename()
-    asset_contents = any_file_contents(byte_count=S3_DEFAULT_CHUNK_SIZE)
-
-    staging_bucket = Resource.STAGING_BUCKET_NAME.resource_name
-    storage_bucket = Resource.STORAGE_BUCKET_NAME.resource_name
-
-    local_etag = calculate_s3_etag(asset_contents)
-
-    with S3Object(
-        file_object=BytesIO(initial_bytes=asset_contents),
-        bucket_name=staging_bucket,
-        key=f"{asset_filename}",
-    ):
-        try:
-            # import from staging to storage to ensure aws hasn't changed how etag is calculated
-            importer(
-                source_bucket_name=staging_bucket,
-                original_key=asset_filename,
-                target_bucket_name=storage_bucket,
-                new_key=asset_filename,
-                source_s3_client=get_s3_client_for_role(get_s3_role_arn()),
-            )
-
-            s3_etag = get_s3_etag(
-                s3_bucket=storage_bucket, s3_object_key=f"{asset_filename}", logger=get_log()
-            )
-
-            # file size exactly at single chunk returns 34 characters etag rather than 32 characters
-            # (i.e. "656dadd6d61e0ebfd29264e34d742df3-1") where -1 suffix denotes 1 chunk
-            assert len(local_etag) == SINGLE_CHUNK_ETAG_LENGTH + 2  # +2 characters for -1 suffix
-            assert local_etag == s3_etag
-        finally:
-            delete_s3_key(Resource.STORAGE_BUCKET_NAME.resource_name, asset_filename, s3_client)
-
+    # Given one staged file and one missing file
+    get_s3_client_for_role_mock.return_value.head_object.side_effect = [
+        {},
+        ClientError(
+            _ClientErrorResponseTypeDef(
+                Error=_ClientErrorResponseError(Code="404", Message="Not Found")
+            ),
+            "HeadObject",
+        ),
+    ]
 
-@mark.infrastructure
-def should_return_accurate_etag_value_for_multi_chunk_size_file(s3_client: S3Client) -> None:
-    asset_filename = any_safe_filename()
-    asset_contents = any_file_contents(byte_count=S3_DEFAULT_CHUNK_SIZE + 1)
+    # When
+    is_in_staging = get_s3_staging_file_checker(any_role_arn())
 
-    staging_bucket = Resource.STAGING_BUCKET_NAME.resource_name
-    storage_bucket = Resource.STORAGE_BUCKET_NAME.resource_name
+    # Then
+    with subtests.test(msg="Staged file"):
+        assert is_in_staging(any_s3_url())
 
-    local_etag = calculate_s3_etag(asset_contents)
+    with subtests.test(msg="Missing file"):
+        assert not is_in_staging(any_s3_url())
 
-    with S3Object(
-        file_object=BytesIO(initial_bytes=asset_contents),
-        bucket_name=staging_bucket,
-        key=asset_filename,
-    ):
-        try:
-            # import from staging to storage to ensure aws hasn't changed how etag is calculated
-            importer(
-                source_bucket_name=staging_bucket,
-                original_key=asset_filename,
-                target_bucket_name=storage_bucket,
-                new_key=asset_filename,
-                source_s3_client=get_s3_client_for_role(get_s3_role_arn()),
-            )
-
-            s3_etag = get_s3_etag(
-                s3_bucket=storage_bucket, s3_object_key=f"{asset_filename}", logger=get_log()
-            )
-
-            # ensure multi chunk size file
-            assert len(local_etag) == MINIMUM_MULTI_CHUNK_ETAG_LENGTH
-            assert local_etag == s3_etag
-        finally:
-            delete_s3_key(Resource.STORAGE_BUCKET_NAME.resource_name, asset_filename, s3_client)
+    with subtests.test(msg="Should not read files"):
+        get_s3_client_for_role_mock.return_value.get_object.assert_not_called()
 
 
 @patch("geostore.s3_utils.get_s3_client_for_role")
-def should_return_none_etag_if_s3_object_is_missing(
+def should_raise_any_staging_file_check_error_other_than_not_found(
     get_s3_client_for_role_mock: MagicMock,
 ) -> None:
-    # Given
-    bucket = any_s3_bucket_name()
-    collection_metadata_filename = any_safe_filename()
-
-    operation_name = any_operation_name()
-    error_message = any_error_message()
-    error = ClientError(
+    get_s3_client_for_role_mock.return_value.head_object.side_effect = ClientError(
         _ClientErrorResponseTypeDef(
-            Error=_ClientErrorResponseError(Code="404", Message=error_message)
+            Error=_ClientErrorResponseError(Code=any_error_code(), Message=any_error_message())
         ),
-        operation_name,
+        any_operation_name(),
     )
 
-    get_s3_client_for_role_mock.return_value.head_object.side_effect = error
-
-    logger_mock = MagicMock()
-
-    etag = get_s3_etag(
-        s3_bucket=bucket, s3_object_key=collection_metadata_filename, logger=logger_mock
-    )
-    assert etag is None
+    with raises(ClientError):
+        get_s3_staging_file_checker(any_role_arn())(any_s3_url())
 
 
 @mark.infrastructure
@@ -398,38 +362,3 @@ def should_not_overwrite_s3_file_when_etag_is_unchanged(
             collection_metadata_filename,
             s3_client,
         )
-
-
-@patch("geostore.s3_utils.get_s3_client_for_role")
-def should_log_error_message_if_failure_to_get_object_etag_is_other_than_no_such_key(
-    get_s3_client_for_role_mock: MagicMock,
-) -> None:
-    # Given
-    bucket = any_s3_bucket_name()
-    collection_metadata_filename = any_safe_filename()
-
-    error_code = any_error_code()
-    operation_name = any_operation_name()
-    error_message = any_error_message()
-    error = ClientError(
-        _ClientErrorResponseTypeDef(
-            Error=_ClientErrorResponseError(Code=error_code, Message=error_message)
-        ),
-        operation_name,
-    )
-
-    get_s3_client_for_role_mock.return_value.head_object.side_effect = error
-
-    expected_message = (
-        f"Unable to fetch eTag for “{collection_metadata_filename}” "
-        f"in s3://{bucket} due to “{error}”"
-    )
-
-    logger_mock = MagicMock()
-
-    get_s3_etag(s3_bucket=bucket, s3_object_key=collection_metadata_filename, logger=logger_mock)
-
-    # Then
-    logger_mock.debug.assert_any_call(
-        expected_message, extra={GIT_COMMIT: get_param(ParameterName.GIT_COMMIT)}
-    )
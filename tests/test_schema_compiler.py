@@ -0,0 +1,83 @@
+from jsonschema import Draft7Validator, RefResolver, ValidationError
+from pytest import raises
+
+from geostore.check_stac_metadata.schema_compiler import compile_schemas
+from geostore.types import JsonObject
+
+BASE_URL = "https://example.com/schemas/"
+COORDINATE_SCHEMA_URL = f"{BASE_URL}coordinate.json"
+GEOMETRY_SCHEMA_URL = f"{BASE_URL}geometry.json"
+FEATURE_SCHEMA_URL = f"{BASE_URL}feature.json"
+
+COORDINATE_SCHEMA: JsonObject = {
+    "$id": COORDINATE_SCHEMA_URL,
+    "type": "array",
+    "items": {"type": "number"},
+}
+GEOMETRY_SCHEMA: JsonObject = {
+    "$id": GEOMETRY_SCHEMA_URL,
+    "definitions": {
+        "point": {"type": "object", "properties": {"coordinates": {"$ref": "coordinate.json"}}},
+        "collection": {
+            "type": "object",
+            "properties": {"geometries": {"type": "array", "items": {"$ref": "#/definitions/any"}}},
+        },
+        "any": {"oneOf": [{"$ref": "#/definitions/point"}, {"$ref": "#/definitions/collection"}]},
+    },
+    "$ref": "#/definitions/any",
+}
+FEATURE_SCHEMA: JsonObject = {
+    "$id": FEATURE_SCHEMA_URL,
+    "type": "object",
+    "required": ["geometry"],
+    "properties": {"geometry": {"$ref": "geometry.json"}},
+}
+SCHEMA_STORE = {
+    COORDINATE_SCHEMA_URL: COORDINATE_SCHEMA,
+    GEOMETRY_SCHEMA_URL: GEOMETRY_SCHEMA,
+    FEATURE_SCHEMA_URL: FEATURE_SCHEMA,
+}
+
+
+def should_inline_references_to_other_schemas() -> None:
+    compiled_schemas = compile_schemas(SCHEMA_STORE)
+
+    assert compiled_schemas[FEATURE_SCHEMA_URL]["properties"]["geometry"]["oneOf"][0] == {
+        "type": "object",
+        "properties": {"coordinates": COORDINATE_SCHEMA},
+    }
+
+
+def should_keep_recursive_references_as_absolute_urls() -> None:
+    compiled_schemas = compile_schemas(SCHEMA_STORE)
+
+    collection_schema = compiled_schemas[FEATURE_SCHEMA_URL]["properties"]["geometry"]["oneOf"][1]
+    assert collection_schema["properties"]["geometries"]["items"] == {
+        "$ref": f"{GEOMETRY_SCHEMA_URL}#/definitions/any"
+    }
+
+
+def should_compile_each_referenced_definition_once() -> None:
+    compiled_schemas = compile_schemas(SCHEMA_STORE)
+
+    assert compiled_schemas[FEATURE_SCHEMA_URL]["properties"]["geometry"] is (
+        compiled_schemas[GEOMETRY_SCHEMA_URL]
+    )
+
+
+def should_not_modify_original_schemas() -> None:
+    compile_schemas(SCHEMA_STORE)
+
+    assert FEATURE_SCHEMA["properties"] == {"geometry": {"$ref": "geometry.json"}}
+
+
+def should_validate_the_same_as_original_schema() -> None:
+    compiled_schemas = compile_schemas(SCHEMA_STORE)
+    validator = Draft7Validator(
+        compiled_schemas[FEATURE_SCHEMA_URL],
+        resolver=RefResolver.from_schema(FEATURE_SCHEMA, store=SCHEMA_STORE),
+    )
+
+    validator.validate({"geometry": {"geometries": [{"coordinates": [1, 2]}, {"geometries": []}]}})
+    with raises(ValidationError):
+        validator.validate({"geometry": {"geometries": [{"coordinates": ["not a number"]}]}})
@@ -0,0 +1,33 @@
+from copy import deepcopy
+from time import perf_counter
+from typing import Callable
+
+from pytest import mark
+
+from geostore.check_stac_metadata.stac_validators import (
+    LINZ_SCHEMA,
+    get_compiled_validator,
+    get_validator,
+)
+
+from .stac_objects import MINIMAL_VALID_STAC_ITEM_OBJECT
+
+ITEM_COUNT = 1_000
+
+
+@mark.benchmark
+def should_report_item_validation_throughput(
+    record_property: Callable[[str, object], None]
+) -> None:
+    items = [deepcopy(MINIMAL_VALID_STAC_ITEM_OBJECT) for _ in range(ITEM_COUNT)]
+
+    for name, validator in [
+        ("Reference resolution", get_validator(LINZ_SCHEMA.uri)),
+        ("Compiled", get_compiled_validator(LINZ_SCHEMA.uri)),
+    ]:
+        validator.validate(items[0])  # Warm up any lazily populated caches
+
+        start = perf_counter()
+        for item in items:
+            validator.validate(item)
+        record_property(f"{name} items/s", ITEM_COUNT / (perf_counter() - start))
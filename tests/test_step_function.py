@@ -1,16 +1,48 @@
+from json import dumps
 from os.path import basename
 from unittest.mock import MagicMock, patch
 
 from pytest import mark
 from pytest_subtests import SubTests
 
+from geostore.api_keys import NEXT_CURSOR_KEY
+from geostore.check import Check
 from geostore.logging_keys import GIT_COMMIT
-from geostore.models import DB_KEY_SEPARATOR
+from geostore.models import CHECK_ID_PREFIX, DB_KEY_SEPARATOR, URL_ID_PREFIX
+from geostore.pagination import decode_cursor
 from geostore.parameter_store import ParameterName, get_param
 from geostore.processing_assets_model import ProcessingAssetType, processing_assets_model_with_meta
-from geostore.step_function import AssetGarbageCollector, get_hash_key
-from geostore.step_function_keys import CURRENT_VERSION_EMPTY_VALUE
-from tests.aws_utils import ProcessingAsset, any_s3_url
+from geostore.step_function import (
+    AssetGarbageCollector,
+    Outcome,
+    ValidationErrorsPage,
+    get_hash_key,
+    get_import_status_given_arn,
+    get_step_function_validation_results,
+    is_final_import_status,
+)
+from geostore.step_function_keys import (
+    ASSET_UPLOAD_KEY,
+    CURRENT_VERSION_EMPTY_VALUE,
+    DATASET_ID_KEY,
+    ERRORS_KEY,
+    ERROR_CHECK_KEY,
+    ERROR_COUNTS_KEY,
+    JOB_STATUS_ABORTED,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_RUNNING,
+    JOB_STATUS_SUCCEEDED,
+    JOB_STATUS_TIMED_OUT,
+    METADATA_UPLOAD_KEY,
+    NEW_VERSION_ID_KEY,
+    S3_BATCH_STATUS_CANCELLED,
+    S3_BATCH_STATUS_COMPLETE,
+    STATUS_KEY,
+    STEP_FUNCTION_KEY,
+    VALIDATION_KEY,
+)
+from tests.aws_utils import ProcessingAsset, any_arn_formatted_string, any_s3_url
+from tests.general_generators import any_safe_filename
 from tests.stac_generators import any_dataset_id, any_dataset_version_id
 
 
@@ -20,6 +52,7 @@ def should_mark_asset_as_replaced(subtests: SubTests) -> None:
 
     dataset_id = any_dataset_id()
     current_version_id = any_dataset_version_id()
+    new_version_id = any_dataset_version_id()
     url = any_s3_url()
     filename = basename(url)
     logger_mock = MagicMock()
@@ -37,7 +70,7 @@ def should_mark_asset_as_replaced(subtests: SubTests) -> None:
         range_key=f"{ProcessingAssetType.METADATA.value}{DB_KEY_SEPARATOR}0",
         url=url,
         filename=filename,
-        replaced_in_new_version=True,
+        replaced_in_version=new_version_id,
     )
 
     with ProcessingAsset(
@@ -45,9 +78,15 @@ def should_mark_asset_as_replaced(subtests: SubTests) -> None:
         url=url,
     ):
         # When
-        AssetGarbageCollector(
-            dataset_id, current_version_id, ProcessingAssetType.METADATA, logger_mock
-        ).mark_asset_as_replaced(filename)
+        asset_garbage_collector = AssetGarbageCollector(
+            dataset_id,
+            current_version_id,
+            new_version_id,
+            ProcessingAssetType.METADATA,
+            logger_mock,
+        )
+        asset_garbage_collector.mark_asset_as_replaced(filename)
+        asset_garbage_collector.flush()
 
         # Then
         with subtests.test(msg="Log is recorded"):
@@ -85,7 +124,11 @@ def should_do_nothing_if_no_asset_returned(subtests: SubTests) -> None:
 
     # When
     AssetGarbageCollector(
-        dataset_id, current_version_id, ProcessingAssetType.METADATA, logger_mock
+        dataset_id,
+        current_version_id,
+        any_dataset_version_id(),
+        ProcessingAssetType.METADATA,
+        logger_mock,
     ).mark_asset_as_replaced(filename)
 
     # Then
@@ -106,7 +149,11 @@ def should_return_early_if_no_dataset_version(
 
     # When
     AssetGarbageCollector(
-        dataset_id, current_version_id, ProcessingAssetType.METADATA, logger_mock
+        dataset_id,
+        current_version_id,
+        any_dataset_version_id(),
+        ProcessingAssetType.METADATA,
+        logger_mock,
     ).mark_asset_as_replaced(filename)
 
     # Then
@@ -115,3 +162,233 @@ def should_return_early_if_no_dataset_version(
 
     with subtests.test(msg="Log is not recorded"):
         logger_mock.debug.assert_not_called()
+
+
+@patch("geostore.step_function.processing_assets_model_with_meta")
+def should_write_replaced_assets_in_batches(
+    processing_assets_model_mock: MagicMock, subtests: SubTests
+) -> None:
+    # Given
+    replaced_items = [MagicMock(), MagicMock()]
+    processing_assets_model = processing_assets_model_mock.return_value
+    processing_assets_model.filename_index.query.return_value = replaced_items
+    new_version_id = any_dataset_version_id()
+    asset_garbage_collector = AssetGarbageCollector(
+        any_dataset_id(),
+        any_dataset_version_id(),
+        new_version_id,
+        ProcessingAssetType.DATA,
+        MagicMock(),
+    )
+
+    # When
+    asset_garbage_collector.mark_asset_as_replaced(any_safe_filename())
+    asset_garbage_collector.flush()
+
+    # Then
+    with subtests.test(msg="Items are looked up by filename"):
+        processing_assets_model.filename_index.query.assert_called_once()
+
+    for index, item in enumerate(replaced_items):
+        with subtests.test(msg=f"Item {index} is marked as replaced"):
+            assert item.replaced_in_version == new_version_id
+
+        with subtests.test(msg=f"Item {index} is not updated individually"):
+            item.update.assert_not_called()
+
+    with subtests.test(msg="Items are written in one batch"):
+        processing_assets_model.batch_write.assert_called_once_with()
+
+
+@patch("geostore.step_function.get_final_import_status")
+@patch("geostore.step_function.STEP_FUNCTIONS_CLIENT.describe_execution")
+def should_return_stored_import_status_without_describing_execution(
+    describe_execution_mock: MagicMock, get_final_import_status_mock: MagicMock
+) -> None:
+    # Given
+    import_status = {STEP_FUNCTION_KEY: {STATUS_KEY: JOB_STATUS_FAILED.title()}}
+    get_final_import_status_mock.return_value = import_status
+
+    # When
+    result = get_import_status_given_arn(any_arn_formatted_string())
+
+    # Then
+    assert result == import_status
+    describe_execution_mock.assert_not_called()
+
+
+@patch("geostore.step_function.save_final_import_status")
+@patch("geostore.step_function.get_final_import_status", return_value=None)
+@patch(
+    "geostore.step_function.get_step_function_validation_results",
+    return_value={ERRORS_KEY: [], ERROR_COUNTS_KEY: {}},
+)
+@patch("geostore.step_function.STEP_FUNCTIONS_CLIENT.describe_execution")
+def should_store_import_status_when_execution_has_succeeded(
+    describe_execution_mock: MagicMock,
+    _get_step_function_validation_results_mock: MagicMock,
+    _get_final_import_status_mock: MagicMock,
+    save_final_import_status_mock: MagicMock,
+) -> None:
+    # Given
+    execution_arn = any_arn_formatted_string()
+    describe_execution_mock.return_value = {
+        STATUS_KEY: JOB_STATUS_SUCCEEDED,
+        "input": dumps(
+            {DATASET_ID_KEY: any_dataset_id(), NEW_VERSION_ID_KEY: any_dataset_version_id()}
+        ),
+    }
+
+    # When
+    result = get_import_status_given_arn(execution_arn)
+
+    # Then
+    save_final_import_status_mock.assert_called_once_with(execution_arn, result)
+
+
+@patch("geostore.step_function.save_final_import_status")
+@patch("geostore.step_function.get_final_import_status", return_value=None)
+@patch(
+    "geostore.step_function.get_step_function_validation_results",
+    return_value={ERRORS_KEY: [], ERROR_COUNTS_KEY: {}},
+)
+@patch("geostore.step_function.STEP_FUNCTIONS_CLIENT.describe_execution")
+def should_not_store_import_status_of_failed_execution(
+    describe_execution_mock: MagicMock,
+    _get_step_function_validation_results_mock: MagicMock,
+    _get_final_import_status_mock: MagicMock,
+    save_final_import_status_mock: MagicMock,
+) -> None:
+    # Given a failed execution, which could be redriven
+    describe_execution_mock.return_value = {
+        STATUS_KEY: JOB_STATUS_FAILED,
+        "input": dumps(
+            {DATASET_ID_KEY: any_dataset_id(), NEW_VERSION_ID_KEY: any_dataset_version_id()}
+        ),
+    }
+
+    # When
+    result = get_import_status_given_arn(any_arn_formatted_string())
+
+    # Then
+    assert result[VALIDATION_KEY][STATUS_KEY] == Outcome.SKIPPED.value
+    save_final_import_status_mock.assert_not_called()
+
+
+def should_treat_stopped_execution_with_finished_uploads_as_final() -> None:
+    for step_function_status in [JOB_STATUS_ABORTED, JOB_STATUS_TIMED_OUT]:
+        assert is_final_import_status(
+            {
+                STEP_FUNCTION_KEY: {STATUS_KEY: step_function_status.title()},
+                METADATA_UPLOAD_KEY: {STATUS_KEY: S3_BATCH_STATUS_COMPLETE},
+                ASSET_UPLOAD_KEY: {STATUS_KEY: S3_BATCH_STATUS_CANCELLED},
+            }
+        )
+
+
+def should_not_treat_stopped_execution_with_unfinished_uploads_as_final() -> None:
+    assert not is_final_import_status(
+        {
+            STEP_FUNCTION_KEY: {STATUS_KEY: JOB_STATUS_ABORTED.title()},
+            METADATA_UPLOAD_KEY: {STATUS_KEY: S3_BATCH_STATUS_COMPLETE},
+            ASSET_UPLOAD_KEY: {STATUS_KEY: Outcome.PENDING.value},
+        }
+    )
+
+
+@patch("geostore.step_function.save_final_import_status")
+@patch("geostore.step_function.get_final_import_status", return_value=None)
+@patch(
+    "geostore.step_function.get_step_function_validation_results",
+    return_value={ERRORS_KEY: [], ERROR_COUNTS_KEY: {}},
+)
+@patch("geostore.step_function.STEP_FUNCTIONS_CLIENT.describe_execution")
+def should_not_store_import_status_while_execution_is_running(
+    describe_execution_mock: MagicMock,
+    _get_step_function_validation_results_mock: MagicMock,
+    _get_final_import_status_mock: MagicMock,
+    save_final_import_status_mock: MagicMock,
+) -> None:
+    # Given
+    describe_execution_mock.return_value = {
+        STATUS_KEY: JOB_STATUS_RUNNING,
+        "input": dumps(
+            {DATASET_ID_KEY: any_dataset_id(), NEW_VERSION_ID_KEY: any_dataset_version_id()}
+        ),
+    }
+
+    # When
+    get_import_status_given_arn(any_arn_formatted_string())
+
+    # Then
+    save_final_import_status_mock.assert_not_called()
+
+
+def any_failed_validation_item(check: Check) -> MagicMock:
+    item = MagicMock()
+    item.sk = f"{CHECK_ID_PREFIX}{check.value}{DB_KEY_SEPARATOR}{URL_ID_PREFIX}{any_s3_url()}"
+    item.details.attribute_values = {}
+    return item
+
+
+@patch("geostore.step_function.validation_results_model_with_meta")
+def should_count_validation_errors_beyond_the_requested_page(
+    validation_results_model_mock: MagicMock, subtests: SubTests
+) -> None:
+    # Given more failures than fit in a page
+    page_item = any_failed_validation_item(Check.CHECKSUM)
+    last_evaluated_key = {"pk": {"S": any_dataset_id()}}
+    page_results = MagicMock()
+    page_results.__iter__.return_value = iter([page_item])
+    page_results.last_evaluated_key = last_evaluated_key
+    all_items = [
+        page_item,
+        any_failed_validation_item(Check.CHECKSUM),
+        any_failed_validation_item(Check.JSON_SCHEMA),
+    ]
+    query_mock = validation_results_model_mock.return_value.validation_outcome_index.query
+    query_mock.side_effect = [page_results, all_items]
+
+    # When
+    results = get_step_function_validation_results(
+        any_dataset_id(), any_dataset_version_id(), ValidationErrorsPage(size=1)
+    )
+
+    # Then
+    with subtests.test(msg="Page of errors"):
+        assert [error[ERROR_CHECK_KEY] for error in results[ERRORS_KEY]] == [Check.CHECKSUM.value]
+
+    with subtests.test(msg="Cursor"):
+        assert decode_cursor(results[NEXT_CURSOR_KEY]) == last_evaluated_key
+
+    with subtests.test(msg="Counts"):
+        assert results[ERROR_COUNTS_KEY] == {
+            Check.CHECKSUM.value: 2,
+            Check.JSON_SCHEMA.value: 1,
+        }
+
+
+@patch("geostore.step_function.validation_results_model_with_meta")
+def should_not_count_validation_errors_for_later_pages(
+    validation_results_model_mock: MagicMock, subtests: SubTests
+) -> None:
+    # Given a page after the first one
+    page_results = MagicMock()
+    page_results.__iter__.return_value = iter([any_failed_validation_item(Check.CHECKSUM)])
+    page_results.last_evaluated_key = None
+    query_mock = validation_results_model_mock.return_value.validation_outcome_index.query
+    query_mock.return_value = page_results
+
+    # When
+    results = get_step_function_validation_results(
+        any_dataset_id(),
+        any_dataset_version_id(),
+        ValidationErrorsPage(size=1, start_key={"pk": {"S": any_dataset_id()}}),
+    )
+
+    # Then
+    with subtests.test(msg="No counts"):
+        assert ERROR_COUNTS_KEY not in results
+
+    with subtests.test(msg="Only the page is queried"):
+        query_mock.assert_called_once()
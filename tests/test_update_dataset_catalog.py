@@ -3,7 +3,7 @@ from unittest.mock import ANY, MagicMock, patch
 
 from jsonschema import ValidationError
 from mypy_boto3_s3 import S3Client
-from pytest import mark
+from pytest import mark, raises
 from pytest_subtests import SubTests
 
 from geostore.datasets_model import datasets_model_with_meta
@@ -22,7 +22,13 @@ from geostore.step_function_keys import (
     NEW_VERSION_S3_LOCATION,
     S3_ROLE_ARN_KEY,
 )
-from geostore.update_root_catalog.task import SQS_MESSAGE_GROUP_ID, lambda_handler
+from geostore.update_root_catalog.task import (
+    DELETE_OBJECTS_MAX_KEYS,
+    SQS_MESSAGE_GROUP_ID,
+    S3DeletionError,
+    delete_s3_objects,
+    lambda_handler,
+)
 
 from .aws_utils import (
     Dataset,
@@ -30,6 +36,7 @@ from .aws_utils import (
     S3Object,
     any_lambda_context,
     any_role_arn,
+    any_s3_bucket_name,
     any_s3_url,
 )
 from .file_utils import json_dict_to_file_object
@@ -147,6 +154,102 @@ def should_delete_s3_files_that_dont_exist_in_new_version(
             )["DeleteMarkers"][0]["IsLatest"]
 
 
+@mark.infrastructure
+def should_only_keep_s3_files_replaced_in_new_version(
+    s3_client: S3Client, subtests: SubTests
+) -> None:
+    # Given a file replaced in the new version, and one only marked by an abandoned version
+    version_id = any_dataset_version_id()
+    current_version_id = any_dataset_version_id()
+    replaced_filename = f"{any_safe_filename()}.json"
+    dropped_filename = f"{any_safe_filename()}.json"
+
+    with Dataset(current_dataset_version=current_version_id) as dataset, S3Object(
+        file_object=json_dict_to_file_object(deepcopy(MINIMAL_VALID_STAC_COLLECTION_OBJECT)),
+        bucket_name=Resource.STORAGE_BUCKET_NAME.resource_name,
+        key=f"{dataset.title}/{replaced_filename}",
+    ) as replaced_metadata, S3Object(
+        file_object=json_dict_to_file_object(deepcopy(MINIMAL_VALID_STAC_COLLECTION_OBJECT)),
+        bucket_name=Resource.STORAGE_BUCKET_NAME.resource_name,
+        key=f"{dataset.title}/{dropped_filename}",
+    ) as dropped_metadata, patch(
+        "geostore.update_root_catalog.task.SQS_RESOURCE"
+    ):
+        current_hash_key = get_hash_key(dataset.dataset_id, current_version_id)
+        replaced_url = f"{any_s3_url()}/{replaced_filename}"
+
+        with ProcessingAsset(
+            current_hash_key, replaced_url, replaced_in_version=version_id
+        ), ProcessingAsset(
+            current_hash_key,
+            f"{any_s3_url()}/{dropped_filename}",
+            index=1,
+            replaced_in_version=any_dataset_version_id(),
+        ):
+            # When
+            lambda_handler(
+                {
+                    DATASET_ID_KEY: dataset.dataset_id,
+                    DATASET_TITLE_KEY: dataset.title,
+                    CURRENT_VERSION_ID_KEY: current_version_id,
+                    NEW_VERSION_ID_KEY: version_id,
+                    METADATA_URL_KEY: replaced_url,
+                    S3_ROLE_ARN_KEY: any_role_arn(),
+                },
+                any_lambda_context(),
+            )
+
+            # Then
+            with subtests.test(msg="Replaced file is kept"):
+                assert "DeleteMarkers" not in s3_client.list_object_versions(
+                    Bucket=Resource.STORAGE_BUCKET_NAME.resource_name,
+                    Prefix=replaced_metadata.key,
+                )
+
+            with subtests.test(msg="File marked by abandoned version is deleted"):
+                assert s3_client.list_object_versions(
+                    Bucket=Resource.STORAGE_BUCKET_NAME.resource_name,
+                    Prefix=dropped_metadata.key,
+                )["DeleteMarkers"][0]["IsLatest"]
+
+
+@mark.infrastructure
+def should_keep_s3_files_with_legacy_replacement_mark(s3_client: S3Client) -> None:
+    # Given a file marked by a version started before replacement marks had version IDs
+    current_version_id = any_dataset_version_id()
+    filename = f"{any_safe_filename()}.json"
+
+    with Dataset(current_dataset_version=current_version_id) as dataset, S3Object(
+        file_object=json_dict_to_file_object(deepcopy(MINIMAL_VALID_STAC_COLLECTION_OBJECT)),
+        bucket_name=Resource.STORAGE_BUCKET_NAME.resource_name,
+        key=f"{dataset.title}/{filename}",
+    ) as metadata, patch("geostore.update_root_catalog.task.SQS_RESOURCE"):
+        url = f"{any_s3_url()}/{filename}"
+
+        with ProcessingAsset(
+            get_hash_key(dataset.dataset_id, current_version_id),
+            url,
+            replaced_in_new_version=True,
+        ):
+            # When
+            lambda_handler(
+                {
+                    DATASET_ID_KEY: dataset.dataset_id,
+                    DATASET_TITLE_KEY: dataset.title,
+                    CURRENT_VERSION_ID_KEY: current_version_id,
+                    NEW_VERSION_ID_KEY: any_dataset_version_id(),
+                    METADATA_URL_KEY: url,
+                    S3_ROLE_ARN_KEY: any_role_arn(),
+                },
+                any_lambda_context(),
+            )
+
+            # Then
+            assert "DeleteMarkers" not in s3_client.list_object_versions(
+                Bucket=Resource.STORAGE_BUCKET_NAME.resource_name, Prefix=metadata.key
+            )
+
+
 @mark.infrastructure
 @patch("geostore.update_root_catalog.task.validate")
 def should_return_required_property_error_when_missing_mandatory_property(
@@ -163,3 +266,38 @@ def should_return_required_property_error_when_missing_mandatory_property(
             any_lambda_context(),
         )
         assert response == {ERROR_MESSAGE_KEY: error_message}
+
+
+@patch("geostore.update_root_catalog.task.S3_CLIENT.delete_objects")
+def should_delete_objects_in_batches(delete_objects_mock: MagicMock, subtests: SubTests) -> None:
+    keys = [any_safe_filename() for _ in range(DELETE_OBJECTS_MAX_KEYS + 1)]
+    delete_objects_mock.return_value = {}
+
+    delete_s3_objects(any_s3_bucket_name(), iter(keys))
+
+    deleted_keys = [
+        deleted_object["Key"]
+        for call in delete_objects_mock.call_args_list
+        for deleted_object in call.kwargs["Delete"]["Objects"]
+    ]
+    with subtests.test(msg="Batch count"):
+        assert delete_objects_mock.call_count == 2
+
+    with subtests.test(msg="Deleted keys"):
+        assert sorted(deleted_keys) == sorted(keys)
+
+
+@patch("geostore.update_root_catalog.task.S3_CLIENT.delete_objects")
+def should_raise_error_after_deleting_all_batches_when_any_key_fails(
+    delete_objects_mock: MagicMock,
+) -> None:
+    keys = [any_safe_filename() for _ in range(DELETE_OBJECTS_MAX_KEYS + 1)]
+    delete_objects_mock.side_effect = [
+        {"Errors": [{"Key": keys[0], "Code": "AccessDenied", "Message": any_error_message()}]},
+        {},
+    ]
+
+    with raises(S3DeletionError):
+        delete_s3_objects(any_s3_bucket_name(), keys)
+
+    assert delete_objects_mock.call_count == 2
@@ -0,0 +1,127 @@
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+from jsonschema import ValidationError
+from pytest import raises
+
+from geostore.step_function_keys import (
+    S3_BATCH_STATUS_CANCELLED,
+    S3_BATCH_STATUS_COMPLETE,
+    S3_BATCH_STATUS_FAILED,
+)
+from geostore.upload_callback import resume_if_uploads_finished
+from geostore.upload_completion.task import lambda_handler
+from geostore.upload_task_tokens_model import upload_task_tokens_model_with_meta
+
+from .aws_utils import (
+    any_job_id,
+    any_lambda_context,
+    any_operation_name,
+    any_task_token,
+    s3_batch_job_status_changed_event,
+)
+from .general_generators import any_error_message
+
+if TYPE_CHECKING:
+    from botocore.exceptions import _ClientErrorResponseError, _ClientErrorResponseTypeDef
+else:
+    _ClientErrorResponseError = _ClientErrorResponseTypeDef = dict
+
+ACTIVE_JOB_STATUS = "Active"
+
+
+def should_raise_exception_when_missing_job_details() -> None:
+    with raises(ValidationError):
+        lambda_handler({}, any_lambda_context())
+
+
+@patch("geostore.upload_callback.STEP_FUNCTIONS_CLIENT.send_task_success")
+@patch("geostore.upload_completion.task.get_job_status")
+@patch("geostore.upload_completion.task.get_upload_task_token")
+def should_resume_execution_when_last_import_job_completes(
+    get_upload_task_token_mock: MagicMock,
+    get_job_status_mock: MagicMock,
+    send_task_success_mock: MagicMock,
+) -> None:
+    job_id = any_job_id()
+    task_token = any_task_token()
+    get_upload_task_token_mock.return_value = upload_task_tokens_model_with_meta()(
+        job_id=job_id, task_token=task_token, job_ids={job_id, any_job_id()}
+    )
+    get_job_status_mock.return_value = S3_BATCH_STATUS_COMPLETE
+
+    lambda_handler(
+        s3_batch_job_status_changed_event(job_id, S3_BATCH_STATUS_COMPLETE), any_lambda_context()
+    )
+
+    assert send_task_success_mock.call_args.kwargs["taskToken"] == task_token
+
+
+@patch("geostore.upload_callback.STEP_FUNCTIONS_CLIENT.send_task_success")
+@patch("geostore.upload_completion.task.get_job_status")
+@patch("geostore.upload_completion.task.get_upload_task_token")
+def should_not_resume_execution_while_other_import_job_is_active(
+    get_upload_task_token_mock: MagicMock,
+    get_job_status_mock: MagicMock,
+    send_task_success_mock: MagicMock,
+) -> None:
+    job_id = any_job_id()
+    get_upload_task_token_mock.return_value = upload_task_tokens_model_with_meta()(
+        job_id=job_id, task_token=any_task_token(), job_ids={job_id, any_job_id()}
+    )
+    get_job_status_mock.return_value = ACTIVE_JOB_STATUS
+
+    lambda_handler(
+        s3_batch_job_status_changed_event(job_id, S3_BATCH_STATUS_COMPLETE), any_lambda_context()
+    )
+
+    send_task_success_mock.assert_not_called()
+
+
+@patch("geostore.upload_callback.STEP_FUNCTIONS_CLIENT.send_task_success")
+@patch("geostore.upload_completion.task.get_job_status")
+@patch("geostore.upload_completion.task.get_upload_task_token")
+def should_resume_execution_when_any_import_job_fails(
+    get_upload_task_token_mock: MagicMock,
+    get_job_status_mock: MagicMock,
+    send_task_success_mock: MagicMock,
+) -> None:
+    job_id = any_job_id()
+    get_upload_task_token_mock.return_value = upload_task_tokens_model_with_meta()(
+        job_id=job_id, task_token=any_task_token(), job_ids={job_id, any_job_id()}
+    )
+    get_job_status_mock.return_value = ACTIVE_JOB_STATUS
+
+    lambda_handler(
+        s3_batch_job_status_changed_event(job_id, S3_BATCH_STATUS_FAILED), any_lambda_context()
+    )
+
+    send_task_success_mock.assert_called_once()
+
+
+@patch("geostore.upload_callback.STEP_FUNCTIONS_CLIENT.send_task_success")
+@patch("geostore.upload_completion.task.get_upload_task_token")
+def should_ignore_jobs_without_waiting_execution(
+    get_upload_task_token_mock: MagicMock, send_task_success_mock: MagicMock
+) -> None:
+    get_upload_task_token_mock.return_value = None
+
+    lambda_handler(
+        s3_batch_job_status_changed_event(any_job_id(), S3_BATCH_STATUS_COMPLETE),
+        any_lambda_context(),
+    )
+
+    send_task_success_mock.assert_not_called()
+
+
+@patch("geostore.upload_callback.STEP_FUNCTIONS_CLIENT.send_task_success")
+def should_ignore_execution_which_is_no_longer_waiting(send_task_success_mock: MagicMock) -> None:
+    send_task_success_mock.side_effect = ClientError(
+        _ClientErrorResponseTypeDef(
+            Error=_ClientErrorResponseError(Code="TaskTimedOut", Message=any_error_message())
+        ),
+        any_operation_name(),
+    )
+
+    assert resume_if_uploads_finished(any_task_token(), {any_job_id(): S3_BATCH_STATUS_CANCELLED})
@@ -11,11 +11,14 @@ from geostore.step_function_keys import (
     ASSET_UPLOAD_KEY,
     DATASET_ID_KEY,
     ERRORS_KEY,
+    ERROR_COUNTS_KEY,
     FAILED_TASKS_KEY,
     FAILURE_REASONS_KEY,
     IMPORT_DATASET_KEY,
     METADATA_UPLOAD_KEY,
     NEW_VERSION_ID_KEY,
+    S3_BATCH_STATUS_COMPLETE,
+    S3_BATCH_STATUS_FAILED,
     STATUS_KEY,
     VALIDATION_KEY,
 )
@@ -23,6 +26,7 @@ from geostore.types import JsonObject
 from geostore.upload_status.task import lambda_handler
 
 from .aws_utils import any_account_id, any_batch_job_status, any_job_id, any_lambda_context
+from .general_generators import any_error_message
 from .stac_generators import any_dataset_id, any_dataset_version_id
 
 
@@ -47,7 +51,7 @@ def should_report_upload_statuses(
     metadata_job_id = any_job_id()
     metadata_job_status = any_batch_job_status()
 
-    get_step_function_validation_results_mock.return_value = []
+    get_step_function_validation_results_mock.return_value = {ERRORS_KEY: [], ERROR_COUNTS_KEY: {}}
 
     def describe_job(AccountId: str, JobId: str) -> JsonObject:  # pylint: disable=invalid-name
         assert AccountId == cast(str, account_id)
@@ -71,7 +75,7 @@ def should_report_upload_statuses(
     describe_job_mock.side_effect = describe_job
 
     expected_response = {
-        VALIDATION_KEY: {STATUS_KEY: Outcome.PASSED.value, ERRORS_KEY: []},
+        VALIDATION_KEY: {STATUS_KEY: Outcome.PASSED.value, ERRORS_KEY: [], ERROR_COUNTS_KEY: {}},
         ASSET_UPLOAD_KEY: {
             STATUS_KEY: asset_job_status,
             ERRORS_KEY: {FAILED_TASKS_KEY: 0, FAILURE_REASONS_KEY: []},
@@ -98,3 +102,42 @@ def should_report_upload_statuses(
 
     # Then
     assert response == expected_response
+
+
+@patch("geostore.step_function.get_step_function_validation_results")
+@patch("geostore.step_function.S3CONTROL_CLIENT.describe_job")
+def should_report_direct_import_statuses(
+    describe_job_mock: MagicMock, get_step_function_validation_results_mock: MagicMock
+) -> None:
+    # Given
+    get_step_function_validation_results_mock.return_value = {ERRORS_KEY: [], ERROR_COUNTS_KEY: {}}
+    asset_upload_status = {
+        STATUS_KEY: S3_BATCH_STATUS_COMPLETE,
+        ERRORS_KEY: {FAILED_TASKS_KEY: 0, FAILURE_REASONS_KEY: []},
+    }
+    metadata_upload_status = {
+        STATUS_KEY: S3_BATCH_STATUS_FAILED,
+        ERRORS_KEY: {FAILED_TASKS_KEY: 1, FAILURE_REASONS_KEY: [{any_error_message(): None}]},
+    }
+
+    # When
+    response = lambda_handler(
+        {
+            DATASET_ID_KEY: any_dataset_id(),
+            NEW_VERSION_ID_KEY: any_dataset_version_id(),
+            VALIDATION_KEY: {SUCCESS_KEY: True},
+            IMPORT_DATASET_KEY: {
+                METADATA_UPLOAD_KEY: metadata_upload_status,
+                ASSET_UPLOAD_KEY: asset_upload_status,
+            },
+        },
+        any_lambda_context(),
+    )
+
+    # Then
+    assert response == {
+        VALIDATION_KEY: {STATUS_KEY: Outcome.PASSED.value, ERRORS_KEY: [], ERROR_COUNTS_KEY: {}},
+        ASSET_UPLOAD_KEY: asset_upload_status,
+        METADATA_UPLOAD_KEY: metadata_upload_status,
+    }
+    describe_job_mock.assert_not_called()
@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock, patch
+
+from jsonschema import ValidationError
+from pytest import raises
+from pytest_subtests import SubTests
+
+from geostore.import_file_batch_job_id_keys import ASSET_JOB_ID_KEY, METADATA_JOB_ID_KEY
+from geostore.step_function_keys import IMPORT_DATASET_KEY, S3_BATCH_STATUS_COMPLETE, TASK_TOKEN_KEY
+from geostore.wait_for_upload.task import lambda_handler
+
+from .aws_utils import any_job_id, any_lambda_context, any_task_token
+
+
+def should_raise_exception_when_missing_task_token() -> None:
+    with raises(ValidationError):
+        lambda_handler(
+            {
+                IMPORT_DATASET_KEY: {
+                    METADATA_JOB_ID_KEY: any_job_id(),
+                    ASSET_JOB_ID_KEY: any_job_id(),
+                }
+            },
+            any_lambda_context(),
+        )
+
+
+@patch("geostore.upload_callback.STEP_FUNCTIONS_CLIENT.send_task_success")
+@patch("geostore.wait_for_upload.task.get_job_status")
+@patch("geostore.wait_for_upload.task.save_upload_task_token")
+def should_resume_execution_when_import_jobs_finished_before_waiting(
+    save_upload_task_token_mock: MagicMock,
+    get_job_status_mock: MagicMock,
+    send_task_success_mock: MagicMock,
+    subtests: SubTests,
+) -> None:
+    task_token = any_task_token()
+    metadata_job_id = any_job_id()
+    asset_job_id = any_job_id()
+    get_job_status_mock.return_value = S3_BATCH_STATUS_COMPLETE
+
+    lambda_handler(
+        {
+            TASK_TOKEN_KEY: task_token,
+            IMPORT_DATASET_KEY: {
+                METADATA_JOB_ID_KEY: metadata_job_id,
+                ASSET_JOB_ID_KEY: asset_job_id,
+            },
+        },
+        any_lambda_context(),
+    )
+
+    with subtests.test(msg="Saved task token"):
+        save_upload_task_token_mock.assert_called_once_with(
+            task_token, [metadata_job_id, asset_job_id]
+        )
+
+    with subtests.test(msg="Resumed execution"):
+        assert send_task_success_mock.call_args.kwargs["taskToken"] == task_token
+
+
+@patch("geostore.upload_callback.STEP_FUNCTIONS_CLIENT.send_task_success")
+@patch("geostore.wait_for_upload.task.get_job_status")
+@patch("geostore.wait_for_upload.task.save_upload_task_token")
+def should_wait_for_active_import_jobs(
+    _save_upload_task_token_mock: MagicMock,
+    get_job_status_mock: MagicMock,
+    send_task_success_mock: MagicMock,
+) -> None:
+    get_job_status_mock.return_value = "Active"
+
+    lambda_handler(
+        {
+            TASK_TOKEN_KEY: any_task_token(),
+            IMPORT_DATASET_KEY: {METADATA_JOB_ID_KEY: any_job_id(), ASSET_JOB_ID_KEY: any_job_id()},
+        },
+        any_lambda_context(),
+    )
+
+    send_task_success_mock.assert_not_called()